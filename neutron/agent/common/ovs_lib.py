@@ -106,6 +106,94 @@ class VifPort(object):
                     self.switch.br_name)
 
 
+class PortRecord(object):
+    """An interface of a bridge, with the name and the tag of its port."""
+
+    __slots__ = ('name', 'port_name', 'tag', 'ofport', 'external_ids',
+                 'iface_id', 'mac')
+
+    def __init__(self, name, port_name, tag, ofport, external_ids):
+        self.name = name
+        self.port_name = port_name
+        self.tag = tag
+        self.ofport = ofport
+        self.external_ids = external_ids
+        self.iface_id = external_ids.get('iface-id')
+        self.mac = external_ids.get('attached-mac')
+
+    def __repr__(self):
+        return ("PortRecord(name=%s, port_name=%s, tag=%s, ofport=%s, "
+                "external_ids=%s)") % (self.name, self.port_name, self.tag,
+                                       self.ofport, self.external_ids)
+
+
+class PortSnapshot(object):
+    """The interfaces of a bridge, read at once and indexed.
+
+    See OVSBridge.get_port_snapshot.  The interfaces with no ofport
+    assigned yet, or a failed one, are not indexed by ofport.
+    """
+
+    def __init__(self, bridge, records, seqno=None):
+        self.bridge = bridge
+        self.records = tuple(records)
+        self.seqno = seqno
+        self.by_name = {}
+        self.by_ofport = {}
+        self.by_iface_id = {}
+        for record in self.records:
+            self.by_name[record.name] = record
+            if record.ofport not in (UNASSIGNED_OFPORT, INVALID_OFPORT):
+                self.by_ofport[record.ofport] = record
+            if record.iface_id:
+                self.by_iface_id[record.iface_id] = record
+
+    def __len__(self):
+        return len(self.records)
+
+    def get_vif_port_set(self):
+        edge_ports = set()
+        for record in self.records:
+            if record.ofport == UNASSIGNED_OFPORT:
+                LOG.warning("Found not yet ready openvswitch port: %s",
+                            record.name)
+            elif record.ofport == INVALID_OFPORT:
+                LOG.warning("Found failed openvswitch port: %s",
+                            record.name)
+            elif record.mac is not None and record.iface_id:
+                edge_ports.add(record.iface_id)
+        return edge_ports
+
+    def get_port_tag_dict(self):
+        return {record.port_name: record.tag for record in self.records}
+
+    def get_vif_port_to_ofport_map(self):
+        # fall back to basic interface name
+        return {record.iface_id or record.name: int(record.ofport)
+                for record in self.records
+                if record.ofport != UNASSIGNED_OFPORT}
+
+    def get_vifs_by_ids(self, port_ids):
+        result = {}
+        for port_id in port_ids:
+            result[port_id] = None
+            record = self.by_iface_id.get(port_id)
+            if record is None:
+                LOG.info("Port %(port_id)s not present in bridge "
+                         "%(br_name)s",
+                         {'port_id': port_id,
+                          'br_name': self.bridge.br_name})
+                continue
+            if record.ofport in (UNASSIGNED_OFPORT, INVALID_OFPORT):
+                LOG.warning("ofport: %(ofport)s for VIF: %(vif)s "
+                            "is not a positive integer",
+                            {'ofport': record.ofport, 'vif': port_id})
+                continue
+            result[port_id] = VifPort(record.name, record.ofport, port_id,
+                                      record.mac, self.bridge)
+        return result
+
+
 class BaseOVS(object):
 
     def __init__(self):
@@ -213,6 +301,7 @@ class OVSBridge(BaseOVS):
         super(OVSBridge, self).__init__()
         self.br_name = br_name
         self.datapath_type = datapath_type
+        self._port_snapshot = None
         self._default_cookie = generate_random_cookie()
         self._highest_protocol_needed = constants.OPENFLOW10
 
@@ -513,6 +602,36 @@ class OVSBridge(BaseOVS):
                                    if_exists=if_exists).
                 execute(check_error=check_error, log_errors=log_errors))
 
+    def get_port_snapshot(self):
+        """Return the interfaces of the bridge as a PortSnapshot.
+
+        With the native OVSDB interface, they are read in a single pass over
+        the in-memory tables of the IDL, and the previous snapshot is
+        returned as long as the IDL sequence number does not change.
+        """
+        if not hasattr(self.ovsdb, 'port_snapshot'):
+            port_info = self.get_ports_attributes(
+                'Port', columns=['name', 'tag'], if_exists=True)
+            port_tags = {p['name']: p['tag'] for p in port_info}
+            interface_info = self.get_ports_attributes(
+                'Interface', columns=['name', 'external_ids', 'ofport'],
+                if_exists=True)
+            return PortSnapshot(self, [
+                PortRecord(x['name'], x['name'],
+                           port_tags.get(x['name'], []),
+                           x['ofport'], x['external_ids'])
+                for x in interface_info])
+        snapshot = self._port_snapshot
+        result = self.ovsdb.port_snapshot(
+            self.br_name, snapshot.seqno if snapshot else None).execute(
+                check_error=True)
+        if result is not None:
+            seqno, rows = result
+            snapshot = PortSnapshot(
+                self, [PortRecord(*row) for row in rows], seqno)
+            self._port_snapshot = snapshot
+        return snapshot
+
     # returns a VIF object for each VIF port
     def get_vif_ports(self, ofport_filter=None):
         edge_ports = []
@@ -532,7 +651,9 @@ class OVSBridge(BaseOVS):
 
         return edge_ports
 
-    def get_vif_port_to_ofport_map(self):
+    def get_vif_port_to_ofport_map(self, port_snapshot=None):
+        if port_snapshot is not None:
+            return port_snapshot.get_vif_port_to_ofport_map()
         results = self.get_ports_attributes(
             'Interface', columns=['name', 'external_ids', 'ofport'],
             if_exists=True)
@@ -547,7 +668,9 @@ class OVSBridge(BaseOVS):
                 pass
         return port_map
 
-    def get_vif_port_set(self):
+    def get_vif_port_set(self, port_snapshot=None):
+        if port_snapshot is not None:
+            return port_snapshot.get_vif_port_set()
         edge_ports = set()
         results = self.get_ports_attributes(
             'Interface', columns=['name', 'external_ids', 'ofport'],
@@ -569,7 +692,7 @@ class OVSBridge(BaseOVS):
         if 'iface-id' in external_ids:
             return external_ids['iface-id']
 
-    def get_port_tag_dict(self):
+    def get_port_tag_dict(self, port_snapshot=None):
         """Get a dict of port names and associated vlan tags.
 
         e.g. the returned dict is of the following form::
@@ -583,12 +706,18 @@ class OVSBridge(BaseOVS):
         The TAG ID is only available in the "Port" table and is not available
         in the "Interface" table queried by the get_vif_port_set() method.
 
+        :param port_snapshot: a PortSnapshot of the bridge to get the tags
+                              from instead of querying the "Port" table.
         """
+        if port_snapshot is not None:
+            return port_snapshot.get_port_tag_dict()
         results = self.get_ports_attributes(
             'Port', columns=['name', 'tag'], if_exists=True)
         return {p['name']: p['tag'] for p in results}
 
-    def get_vifs_by_ids(self, port_ids):
+    def get_vifs_by_ids(self, port_ids, port_snapshot=None):
+        if port_snapshot is not None:
+            return port_snapshot.get_vifs_by_ids(port_ids)
         interface_info = self.get_ports_attributes(
             "Interface", columns=["name", "external_ids", "ofport"],
             if_exists=True)
@@ -743,30 +872,35 @@ class OVSBridge(BaseOVS):
                     queues=queues))
         return qos_uuid
 
-    def update_ingress_bw_limit_for_port(self, port_name, max_kbps,
-                                         max_burst_kbps):
+    def _set_ingress_bw_limit(self, txn, port_name, qos_uuid, queue_uuid,
+                              max_kbps, max_burst_kbps):
         max_bw_in_bits = str(max_kbps * 1000)
         max_burst_in_bits = str(max_burst_kbps * 1000)
         queue_other_config = {
             'max-rate': max_bw_in_bits,
             'burst': max_burst_in_bits,
         }
+        queue_uuid = self._update_bw_limit_queue(
+            txn, port_name, queue_uuid, QOS_DEFAULT_QUEUE,
+            queue_other_config
+        )
+
+        qos_uuid = self._update_bw_limit_profile(
+            txn, port_name, qos_uuid, queue_uuid, QOS_DEFAULT_QUEUE
+        )
+
+        txn.add(self.ovsdb.db_set(
+            'Port', port_name, ('qos', qos_uuid)))
+
+    def update_ingress_bw_limit_for_port(self, port_name, max_kbps,
+                                         max_burst_kbps):
         qos = self.find_qos(port_name)
         queue = self.find_queue(port_name, QOS_DEFAULT_QUEUE)
         qos_uuid = qos['_uuid'] if qos else None
         queue_uuid = queue['_uuid'] if queue else None
         with self.ovsdb.transaction(check_error=True) as txn:
-            queue_uuid = self._update_bw_limit_queue(
-                txn, port_name, queue_uuid, QOS_DEFAULT_QUEUE,
-                queue_other_config
-            )
-
-            qos_uuid = self._update_bw_limit_profile(
-                txn, port_name, qos_uuid, queue_uuid, QOS_DEFAULT_QUEUE
-            )
-
-            txn.add(self.ovsdb.db_set(
-                'Port', port_name, ('qos', qos_uuid)))
+            self._set_ingress_bw_limit(txn, port_name, qos_uuid, queue_uuid,
+                                       max_kbps, max_burst_kbps)
 
     def get_ingress_bw_limit_for_port(self, port_name):
         max_kbps = None
@@ -794,6 +928,76 @@ class OVSBridge(BaseOVS):
             if queue:
                 txn.add(self.ovsdb.db_destroy('Queue', queue['_uuid']))
 
+    def _find_ports_qos_uuids(self):
+        """Return the uuids of the QoS and Queue rows by port name."""
+        qos_uuids = {}
+        queue_uuids = {}
+        for row in self.ovsdb.db_find(
+                'QoS', columns=['_uuid', 'external_ids']).execute(
+                    check_error=True):
+            if 'id' in row['external_ids']:
+                qos_uuids[row['external_ids']['id']] = row['_uuid']
+        for row in self.ovsdb.db_find(
+                'Queue', columns=['_uuid', 'external_ids']).execute(
+                    check_error=True):
+            external_ids = row['external_ids']
+            if (external_ids.get('queue_type') == str(QOS_DEFAULT_QUEUE) and
+                    'id' in external_ids):
+                queue_uuids[external_ids['id']] = row['_uuid']
+        return qos_uuids, queue_uuids
+
+    def set_bw_limits_for_ports(self, egress_limits=None,
+                                ingress_limits=None):
+        """Set or delete the bandwidth limits of several ports at once.
+
+        The existing QoS and Queue rows are looked up once and all the
+        changes are made by a single OVSDB transaction. The ports which are
+        not on the bridge anymore are skipped, so that they do not fail the
+        transaction of the others.
+
+        :param egress_limits: dict of (max_kbps, max_burst_kbps) tuples by
+                              port name, None deleting the limit of the port.
+        :param ingress_limits: same as egress_limits, for the ingress
+                               bandwidth limits.
+        """
+        egress_limits = egress_limits or {}
+        ingress_limits = ingress_limits or {}
+        if not egress_limits and not ingress_limits:
+            return
+        port_names = set(self.get_port_name_list())
+        qos_uuids, queue_uuids = (
+            self._find_ports_qos_uuids() if ingress_limits else ({}, {}))
+        with self.ovsdb.transaction(check_error=True) as txn:
+            for port_name, limit in egress_limits.items():
+                if port_name not in port_names:
+                    LOG.debug("Port %s not found, skipping its egress "
+                              "bandwidth limit", port_name)
+                    continue
+                max_kbps, max_burst_kbps = limit or (0, 0)
+                txn.add(self.ovsdb.db_set(
+                    'Interface', port_name,
+                    ('ingress_policing_rate', max_kbps)))
+                txn.add(self.ovsdb.db_set(
+                    'Interface', port_name,
+                    ('ingress_policing_burst', max_burst_kbps)))
+            for port_name, limit in ingress_limits.items():
+                qos_uuid = qos_uuids.get(port_name)
+                queue_uuid = queue_uuids.get(port_name)
+                if limit is not None:
+                    if port_name not in port_names:
+                        LOG.debug("Port %s not found, skipping its ingress "
+                                  "bandwidth limit", port_name)
+                        continue
+                    self._set_ingress_bw_limit(txn, port_name, qos_uuid,
+                                               queue_uuid, *limit)
+                    continue
+                if port_name in port_names:
+                    txn.add(self.ovsdb.db_clear('Port', port_name, 'qos'))
+                if qos_uuid:
+                    txn.add(self.ovsdb.db_destroy('QoS', qos_uuid))
+                if queue_uuid:
+                    txn.add(self.ovsdb.db_destroy('Queue', queue_uuid))
+
     def __enter__(self):
         self.create()
         return self
@@ -100,6 +100,46 @@ class QosAgentDriver(object):
                     port, rule.rule_type,
                     ingress=self._rule_is_ingress_direction(rule))
 
+    def update_ports(self, ports, old_qos_policy, qos_policy):
+        """Apply an updated QoS policy on the ports it is attached to.
+
+        Only the rules which differ between the two revisions of the policy
+        are deleted from or updated on the ports. Drivers able to program
+        the rules of several ports at once override it to apply the whole
+        policy update in one go.
+
+        :param ports: the port objects the policy is attached to.
+        :param old_qos_policy: the previous revision of the QoS policy.
+        :param qos_policy: the updated QoS policy to be applied on the ports.
+        """
+        deleted_rules, updated_rules = self._diff_rules(old_qos_policy,
+                                                        qos_policy)
+        for port in ports:
+            for rule in deleted_rules:
+                self._handle_rule_delete(
+                    port, rule.rule_type,
+                    ingress=self._rule_is_ingress_direction(rule))
+            self._apply_rules('update', port, updated_rules)
+
+    def _rule_key(self, rule):
+        # A policy has at most one rule of each type and direction
+        return rule.rule_type, self._rule_is_ingress_direction(rule)
+
+    def _diff_rules(self, old_qos_policy, qos_policy):
+        """Return the supported rules deleted and updated by a policy update.
+
+        The updated rules include the rules added to the policy.
+        """
+        old_rules = list(self._iterate_rules(old_qos_policy.rules))
+        new_rules = list(self._iterate_rules(qos_policy.rules))
+        old_rules_by_key = {self._rule_key(rule): rule for rule in old_rules}
+        new_keys = set(self._rule_key(rule) for rule in new_rules)
+        deleted_rules = [rule for rule in old_rules
+                         if self._rule_key(rule) not in new_keys]
+        updated_rules = [rule for rule in new_rules
+                         if old_rules_by_key.get(self._rule_key(rule)) != rule]
+        return deleted_rules, updated_rules
+
     def _iterate_rules(self, rules):
         for rule in rules:
             rule_type = rule.rule_type
@@ -119,7 +159,10 @@ class QosAgentDriver(object):
         handler(port)
 
     def _handle_update_create_rules(self, action, port, qos_policy):
-        for rule in self._iterate_rules(qos_policy.rules):
+        self._apply_rules(action, port, self._iterate_rules(qos_policy.rules))
+
+    def _apply_rules(self, action, port, rules):
+        for rule in rules:
             if rule.should_apply_to_port(port):
                 handler_name = "".join((action, "_", rule.rule_type))
                 handler = getattr(self, handler_name)
@@ -284,12 +327,11 @@ class QosAgentExtension(l2_agent_extension.L2AgentExtension):
         old_qos_policy = self.policy_map.get_policy(qos_policy.id)
         if old_qos_policy:
             if self._policy_rules_modified(old_qos_policy, qos_policy):
-                for port in self.policy_map.get_ports(qos_policy):
-                    #NOTE(QoS): for now, just reflush the rules on the port.
-                    #           Later, we may want to apply the difference
-                    #           between the old and new rule lists.
-                    self.qos_driver.delete(port, old_qos_policy)
-                    self.qos_driver.update(port, qos_policy)
+                # The driver applies the difference between the old and
+                # new rule lists, the policy being shared by all its ports
+                self.qos_driver.update_ports(
+                    list(self.policy_map.get_ports(qos_policy)),
+                    old_qos_policy, qos_policy)
             self.policy_map.update_policy(qos_policy)
 
     def _process_reset_port(self, port):
@@ -631,6 +631,11 @@ class L3NATAgent(ha.AgentMixin,
                             ns_manager.keep_ext_net(ext_net_id)
                         elif is_snat_agent and not r.get('ha'):
                             ns_manager.ensure_snat_cleanup(r['id'])
+                    ri = self.router_info.get(r['id'])
+                    if ri:
+                        # a full sync also repairs what was changed on the
+                        # node behind our back, process the whole router
+                        ri.reset_applied_state()
                     update = queue.RouterUpdate(
                         r['id'],
                         queue.PRIORITY_SYNC_ROUTERS_TASK,
@@ -48,6 +48,11 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
         self.rtr_fip_connect = False
         self.fip_ns = None
         self._pending_arp_set = set()
+        # While floating IPs are processed, the ip rules and routes are
+        # queued here and applied with one 'ip -batch' per namespace.
+        self._fip_batch = None
+        self._fip_batch_rules = None
+        self._fip_batch_garps = []
 
     def get_centralized_router_cidrs(self):
         return self.centralized_floatingips_set
@@ -130,31 +135,70 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
             self.rtr_fip_subnet = self.fip_ns.local_subnets.allocate(
                 self.router_id)
         rtr_2_fip, __ = self.rtr_fip_subnet.get_pair()
-        device = ip_lib.IPDevice(fip_2_rtr_name, namespace=fip_ns_name)
-        device.route.add_route(fip_cidr, str(rtr_2_fip.ip))
         interface_name = (
             self.fip_ns.get_ext_device_name(
                 self.fip_ns.agent_gateway_port['id']))
+        if self._fip_batch is not None:
+            self._fip_batch.add(fip_ns_name, 'route', 'replace', fip_cidr,
+                                'via', rtr_2_fip.ip, 'dev', fip_2_rtr_name)
+            # The route must be in place before advertising the address
+            self._fip_batch_garps.append(
+                (fip_ns_name, interface_name, floating_ip))
+            return lib_constants.FLOATINGIP_STATUS_ACTIVE
+        device = ip_lib.IPDevice(fip_2_rtr_name, namespace=fip_ns_name)
+        device.route.add_route(fip_cidr, str(rtr_2_fip.ip))
         ip_lib.send_ip_addr_adv_notif(fip_ns_name,
                                       interface_name,
                                       floating_ip)
         return lib_constants.FLOATINGIP_STATUS_ACTIVE
 
+    def _get_batch_fip_rules(self):
+        """Return the canonical ip rules of the router namespace.
+
+        They are listed once per batch and then kept in sync with the queued
+        commands, instead of listing them again for every rule added.
+        """
+        if self._fip_batch_rules is None:
+            ip_rule = ip_lib.IPRule(namespace=self.ns_name)
+            self._fip_batch_rules = ip_rule.rule.list_rules(
+                lib_constants.IP_VERSION_4)
+        return self._fip_batch_rules
+
     def _add_floating_ip_rule(self, floating_ip, fixed_ip):
         rule_pr = self.fip_ns.allocate_rule_priority(floating_ip)
         self.floating_ips_dict[floating_ip] = rule_pr
-        ip_rule = ip_lib.IPRule(namespace=self.ns_name)
-        ip_rule.rule.add(ip=fixed_ip,
-                         table=dvr_fip_ns.FIP_RT_TBL,
-                         priority=rule_pr)
+        if self._fip_batch is None:
+            ip_rule = ip_lib.IPRule(namespace=self.ns_name)
+            ip_rule.rule.add(ip=fixed_ip,
+                             table=dvr_fip_ns.FIP_RT_TBL,
+                             priority=rule_pr)
+            return
+        rule = ip_lib.IpRuleCommand._make_canonical(
+            common_utils.get_ip_version(fixed_ip),
+            {'from': fixed_ip, 'table': dvr_fip_ns.FIP_RT_TBL,
+             'priority': rule_pr})
+        rules = self._get_batch_fip_rules()
+        if rule not in rules:
+            rules.append(rule)
+            self._fip_batch.add(self.ns_name, 'rule', 'add', 'from', fixed_ip,
+                                'table', dvr_fip_ns.FIP_RT_TBL,
+                                'priority', rule_pr)
 
     def _remove_floating_ip_rule(self, floating_ip):
         if floating_ip in self.floating_ips_dict:
             rule_pr = self.floating_ips_dict[floating_ip]
-            ip_rule = ip_lib.IPRule(namespace=self.ns_name)
-            ip_rule.rule.delete(ip=floating_ip,
-                                table=dvr_fip_ns.FIP_RT_TBL,
-                                priority=rule_pr)
+            if self._fip_batch is not None:
+                self._fip_batch.add(self.ns_name, 'rule', 'del',
+                                    'table', dvr_fip_ns.FIP_RT_TBL,
+                                    'priority', rule_pr)
+                self._fip_batch_rules = [
+                    rule for rule in self._get_batch_fip_rules()
+                    if rule.get('priority') != str(rule_pr)]
+            else:
+                ip_rule = ip_lib.IPRule(namespace=self.ns_name)
+                ip_rule.rule.delete(ip=floating_ip,
+                                    table=dvr_fip_ns.FIP_RT_TBL,
+                                    priority=rule_pr)
             self.fip_ns.deallocate_rule_priority(floating_ip)
             #TODO(rajeev): Handle else case - exception/log?
 
@@ -174,6 +218,10 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
             fip_ns_name = self.fip_ns.get_name()
             self._remove_floating_ip_rule(floating_ip)
 
+            if self._fip_batch is not None:
+                self._fip_batch.add(fip_ns_name, 'route', 'del', fip_cidr,
+                                    'via', rtr_2_fip.ip, 'dev', fip_2_rtr_name)
+                return
             device = ip_lib.IPDevice(fip_2_rtr_name, namespace=fip_ns_name)
 
             device.route.delete_route(fip_cidr, str(rtr_2_fip.ip))
@@ -184,6 +232,33 @@ class DvrLocalRouter(dvr_router_base.DvrRouterBase):
         self._remove_floating_ip_rule(floating_ip)
         self._add_floating_ip_rule(floating_ip, fip['fixed_ip_address'])
 
+    def process_floating_ip_addresses(self, interface_name):
+        """Plumb the floating IPs with one 'ip -batch' per namespace.
+
+        With many floating IPs on a compute node, running one ip command per
+        rule and route dominates the processing time, so they are queued
+        while the floating IPs are walked and applied at once afterwards.
+        A failing command makes the whole call raise, the same way a single
+        failing ip command would.
+        """
+        self._fip_batch = ip_lib.IPBatch()
+        self._fip_batch_rules = None
+        self._fip_batch_garps = []
+        try:
+            fip_statuses = super(
+                DvrLocalRouter, self).process_floating_ip_addresses(
+                    interface_name)
+            batch, self._fip_batch = self._fip_batch, None
+            batch.execute()
+            for ns_name, device_name, floating_ip in self._fip_batch_garps:
+                ip_lib.send_ip_addr_adv_notif(ns_name, device_name,
+                                              floating_ip)
+        finally:
+            self._fip_batch = None
+            self._fip_batch_rules = None
+            self._fip_batch_garps = []
+        return fip_statuses
+
     def add_floating_ip(self, fip, interface_name, device):
         # Special Handling for DVR - update FIP namespace
         ip_cidr = common_utils.ip_to_cidr(fip['floating_ip_address'])
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
 
 import eventlet
@@ -81,6 +82,15 @@ class AgentMixin(object):
         # state change sequence is under the proper order.
         self.state_change_notifier = batch_notifier.BatchNotifier(
             self._calculate_batch_duration(), self.notify_server)
+        # Transitions received from keepalived-state-change are merged over
+        # a short window and the local actions of the batch are run
+        # concurrently, so that a failover of many routers at once is not
+        # handled one router after the other.
+        self.state_change_batcher = batch_notifier.BatchNotifier(
+            self.conf.ha_state_change_batch_window,
+            self._process_state_changes)
+        self._state_change_pool = eventlet.GreenPool(
+            self.conf.ha_state_change_workers)
         eventlet.spawn(self._start_keepalived_notifications_server)
 
     def _get_router_info(self, router_id):
@@ -109,14 +119,46 @@ class AgentMixin(object):
         return self.conf.ha_vrrp_advert_int
 
     def enqueue_state_change(self, router_id, state):
-        state_change_data = {"router_id": router_id, "state": state}
         LOG.info('Router %(router_id)s transitioned to %(state)s',
-                 state_change_data)
-
+                 {"router_id": router_id, "state": state})
+        self.state_change_batcher.queue_event((router_id, state))
+
+    def _process_state_changes(self, batched_events):
+        # Only the last transition of each router within the batch matters,
+        # earlier ones have already been superseded by keepalived.
+        states = collections.OrderedDict()
+        for router_id, state in batched_events:
+            states.pop(router_id, None)
+            states[router_id] = state
+        LOG.debug('Processing HA state changes for %d routers', len(states))
+        processed = self._state_change_pool.imap(
+            self._safe_process_state_change, states.keys(), states.values())
+        # queued without yielding, so the whole batch is reported to the
+        # server in a single RPC call
+        for router_id, state, success in processed:
+            if success:
+                self.state_change_notifier.queue_event((router_id, state))
+
+    def _safe_process_state_change(self, router_id, state):
+        try:
+            success = self._process_state_change(router_id, state)
+        except Exception:
+            LOG.exception('Failed to process state change to %(state)s for '
+                          'router %(router_id)s',
+                          {'router_id': router_id, 'state': state})
+            success = False
+        return router_id, state, success
+
+    def _process_state_change(self, router_id, state):
+        """Run the local actions of a transition, return True when done."""
+        state_change_data = {"router_id": router_id, "state": state}
         ri = self._get_router_info(router_id)
         if ri is None:
-            return
+            return False
 
+        # NOTE: keepalived-state-change only reports a transition to master
+        # once the VIPs are configured, the steps below depend on them and
+        # must stay in this order for a given router.
         # TODO(dalvarez): Fix bug 1677279 by moving the IPv6 parameters
         # configuration to keepalived-state-change in order to remove the
         # dependency that currently exists on l3-agent running for the IPv6
@@ -126,8 +168,8 @@ class AgentMixin(object):
             self._update_metadata_proxy(ri, router_id, state)
         self._update_radvd_daemon(ri, state)
         self.pd.process_ha_state(router_id, state == 'master')
-        self.state_change_notifier.queue_event((router_id, state))
         self.l3_ext_manager.ha_state_change(self.context, state_change_data)
+        return True
 
     def _configure_ipv6_params_on_ext_gw_port_if_necessary(self, ri, state):
         # If ipv6 is enabled on the platform, ipv6_gateway config flag is
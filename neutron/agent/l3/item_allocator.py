@@ -19,6 +19,11 @@ from oslo_log import log as logging
 
 LOG = logging.getLogger(__name__)
 
+# The journal is compacted when it holds more than COMPACTION_RATIO times the
+# number of live records, and at least COMPACTION_MIN_RECORDS records.
+COMPACTION_RATIO = 2
+COMPACTION_MIN_RECORDS = 64
+
 
 class ItemAllocator(object):
     """Manages allocation of items from a pool
@@ -32,6 +37,13 @@ class ItemAllocator(object):
     The persistent datastore is a file. The records are one per line of
     the format: key<delimiter>value.  For example if the delimiter is a ','
     (the default value) then the records will be: key,value (one per line)
+
+    The file is an append-only journal: an allocation appends a key,value
+    record and a release appends a key, record (empty value), so that each
+    change costs a single small write. When a key appears several times the
+    last record wins. The journal is compacted, i.e. rewritten with only the
+    live records, when it grows well beyond the number of live records and
+    when it is loaded.
     """
 
     def __init__(self, state_file, ItemClass, item_pool, delimiter=','):
@@ -41,6 +53,7 @@ class ItemAllocator(object):
         """
         self.ItemClass = ItemClass
         self.state_file = state_file
+        self.delimiter = delimiter
 
         self.allocations = {}
 
@@ -48,10 +61,15 @@ class ItemAllocator(object):
         self.pool = item_pool
 
         read_error = False
-        for line in self._read():
+        lines = self._read()
+        for line in lines:
             try:
                 key, saved_value = line.strip().split(delimiter)
-                self.remembered[key] = self.ItemClass(saved_value)
+                if saved_value:
+                    self.remembered[key] = self.ItemClass(saved_value)
+                else:
+                    # release record
+                    self.remembered.pop(key, None)
             except ValueError:
                 read_error = True
                 LOG.warning("Invalid line in %(file)s, "
@@ -59,9 +77,13 @@ class ItemAllocator(object):
                             {'file': state_file, 'line': line})
 
         self.pool.difference_update(self.remembered.values())
+        self._journal_records = len(lines)
         if read_error:
             LOG.debug("Re-writing file %s due to read error", state_file)
             self._write_allocations()
+        elif self._journal_records > len(self.remembered):
+            LOG.debug("Compacting allocations journal %s", state_file)
+            self._write_allocations()
 
     def lookup(self, key):
         """Try to lookup an item of ItemClass type.
@@ -107,23 +129,38 @@ class ItemAllocator(object):
                 raise RuntimeError("Cannot allocate item of type:"
                                    " %s from pool using file %s"
                                    % (self.ItemClass, self.state_file))
+            # the forgotten allocations must not be replayed on restart
+            self._write_allocations()
 
         self.allocations[key] = self.pool.pop()
-        self._write_allocations()
+        self._append_record(key, self.allocations[key])
         return self.allocations[key]
 
     def release(self, key):
         self.pool.add(self.allocations.pop(key))
-        self._write_allocations()
+        self._append_record(key, '')
+
+    def _append_record(self, key, value):
+        self._journal_records += 1
+        live_records = len(self.allocations) + len(self.remembered)
+        if (self._journal_records > COMPACTION_MIN_RECORDS and
+                self._journal_records > COMPACTION_RATIO * live_records):
+            self._write_allocations()
+        else:
+            self._write(["%s%s%s\n" % (key, self.delimiter, value)],
+                        append=True)
 
     def _write_allocations(self):
-        current = ["%s,%s\n" % (k, v) for k, v in self.allocations.items()]
-        remembered = ["%s,%s\n" % (k, v) for k, v in self.remembered.items()]
+        current = ["%s%s%s\n" % (k, self.delimiter, v)
+                   for k, v in self.allocations.items()]
+        remembered = ["%s%s%s\n" % (k, self.delimiter, v)
+                      for k, v in self.remembered.items()]
         current.extend(remembered)
         self._write(current)
+        self._journal_records = len(current)
 
-    def _write(self, lines):
-        with open(self.state_file, "w") as f:
+    def _write(self, lines, append=False):
+        with open(self.state_file, "a" if append else "w") as f:
             f.writelines(lines)
 
     def _read(self):
@@ -13,6 +13,9 @@
 #    under the License.
 
 import collections
+import contextlib
+import copy
+import time
 
 import netaddr
 from neutron_lib import constants as lib_constants
@@ -40,6 +43,19 @@ ADDRESS_SCOPE_MARK_ID_MIN = 1024
 ADDRESS_SCOPE_MARK_ID_MAX = 2048
 DEFAULT_ADDRESS_SCOPE = "noscope"
 
+# Router keys which do not affect what is configured on the node
+ROUTER_IGNORED_KEYS = frozenset(['name', 'description', 'status', 'tags',
+                                 'revision_number', 'created_at',
+                                 'updated_at'])
+# Sections of RouterInfo.process and the router keys that can be updated
+# without reprocessing them. A change to any other key reprocesses the
+# section.
+ROUTER_SECTION_SKIP_KEYS = {
+    'internal_ports': frozenset([lib_constants.FLOATINGIP_KEY, 'routes']),
+    'external': frozenset(['routes']),
+    'address_scope': frozenset(['routes']),
+}
+
 
 class RouterInfo(object):
 
@@ -55,6 +71,11 @@ class RouterInfo(object):
         self.ex_gw_port = None
         self._snat_enabled = None
         self.fip_map = {}
+        # floating IP address -> NAT rules installed for it
+        self._fip_nat_rules = None
+        # copy of the router dict as of the last successful process()
+        self._applied_router = None
+        self.section_timings = {}
         self.internal_ports = []
         self.pd_subnets = {}
         self.floating_ips = set()
@@ -211,18 +232,28 @@ class RouterInfo(object):
 
         Configures iptables rules for the floating ips of the given router
         """
-        # Clear out all iptables rules for floating ips
-        self.iptables_manager.ipv4['nat'].clear_rules_by_tag('floating_ip')
-
-        floating_ips = self.get_floating_ips()
-        # Loop once to ensure that floating ips are configured.
-        for fip in floating_ips:
-            # Rebuild iptables rules for the floating ip.
-            for chain, rule in self.floating_forward_rules(fip):
-                self.iptables_manager.ipv4['nat'].add_rule(chain, rule,
-                                                           tag='floating_ip')
+        ipv4_nat = self.iptables_manager.ipv4['nat']
+        old_rules, self._fip_nat_rules = self._fip_nat_rules, None
+        if old_rules is None:
+            # Clear out all iptables rules for floating ips
+            ipv4_nat.clear_rules_by_tag('floating_ip')
+            old_rules = {}
+
+        new_rules = {fip['floating_ip_address']:
+                     self.floating_forward_rules(fip)
+                     for fip in self.get_floating_ips()}
+        # Only touch the rules of the floating ips which changed
+        for fip_ip, rules in old_rules.items():
+            if new_rules.get(fip_ip) != rules:
+                for chain, rule in rules:
+                    ipv4_nat.remove_rule(chain, rule)
+        for fip_ip, rules in new_rules.items():
+            if old_rules.get(fip_ip) != rules:
+                for chain, rule in rules:
+                    ipv4_nat.add_rule(chain, rule, tag='floating_ip')
 
         self.iptables_manager.apply()
+        self._fip_nat_rules = new_rules
 
     def _process_pd_iptables_rules(self, prefix, subnet_id):
         """Configure iptables rules for prefix delegated subnets"""
@@ -1131,16 +1162,60 @@ class RouterInfo(object):
         :param agent: Passes the agent in order to send RPC messages.
         """
         LOG.debug("process router updates")
-        self._process_internal_ports()
-        self.agent.pd.sync_router(self.router['id'])
-        self.process_external()
-        self.process_address_scope()
+        sections = self._get_sections_to_process()
+        self.section_timings = {}
+        if 'internal_ports' in sections:
+            with self._section_timer('internal_ports'):
+                self._process_internal_ports()
+                self.agent.pd.sync_router(self.router['id'])
+        if 'external' in sections:
+            with self._section_timer('external'):
+                self.process_external()
+        if 'address_scope' in sections:
+            with self._section_timer('address_scope'):
+                self.process_address_scope()
         # Process static routes for router
-        self.routes_updated(self.routes, self.router['routes'])
+        with self._section_timer('routes'):
+            self.routes_updated(self.routes, self.router['routes'])
         self.routes = self.router['routes']
+        LOG.debug("Router %(router_id)s sections processed in %(timings)s",
+                  {'router_id': self.router_id,
+                   'timings': self.section_timings})
 
         # Update ex_gw_port on the router info cache
         self.ex_gw_port = self.get_ex_gw_port()
         self.fip_map = dict([(fip['floating_ip_address'],
                               fip['fixed_ip_address'])
                              for fip in self.get_floating_ips()])
+        if isinstance(self.router, dict):
+            self._applied_router = copy.deepcopy(self.router)
+
+    def reset_applied_state(self):
+        """Make the next process() reprocess every section."""
+        self._applied_router = None
+        self._fip_nat_rules = None
+
+    def _get_changed_router_keys(self):
+        """Return the keys changed since the last process, or None."""
+        old = self._applied_router
+        if old is None or not isinstance(self.router, dict):
+            return None
+        return {key for key in set(old) | set(self.router)
+                if key not in ROUTER_IGNORED_KEYS and
+                old.get(key) != self.router.get(key)}
+
+    def _get_sections_to_process(self):
+        changed_keys = self._get_changed_router_keys()
+        if changed_keys is None:
+            return set(ROUTER_SECTION_SKIP_KEYS)
+        return {section for section, skip_keys in
+                ROUTER_SECTION_SKIP_KEYS.items()
+                if changed_keys - skip_keys}
+
+    @contextlib.contextmanager
+    def _section_timer(self, section):
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.section_timings[section] = time.time() - start
@@ -16,6 +16,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
 
 from oslo_utils import excutils
@@ -136,3 +137,36 @@ class FdbInterface(object):
         if dev:
             cmd += ['dev', dev]
         return utils.execute(cmd, run_as_root=True, **kwargs)
+
+    @classmethod
+    def get_dsts(cls, dev, **kwargs):
+        """Return a dict of the destinations of the entries of dev by MAC.
+
+        Only the entries with a destination, such as those of a VXLAN
+        interface, are returned.
+        """
+        dsts = collections.defaultdict(set)
+        for line in cls.show(dev, **kwargs).splitlines():
+            fields = line.split()
+            if 'dst' in fields[1:-1]:
+                dsts[fields[0]].add(fields[fields.index('dst') + 1])
+        return dsts
+
+    @classmethod
+    def execute_batch(cls, commands, **kwargs):
+        """Run several FDB commands with a single 'bridge -batch' invocation.
+
+        :param commands: iterable of (op, mac, dev, ip_dst) tuples, ip_dst
+                         being None for the commands without a destination.
+        """
+        lines = []
+        for op, mac, dev, ip_dst in commands:
+            cmd = ['fdb', op, mac, 'dev', dev]
+            if ip_dst is not None:
+                cmd += ['dst', ip_dst]
+            lines.append('%s\n' % ' '.join(cmd))
+        if not lines:
+            return
+        return utils.execute(['bridge', '-force', '-batch', '-'],
+                             process_input=''.join(lines), run_as_root=True,
+                             **kwargs)
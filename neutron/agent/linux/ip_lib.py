@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import os
 import re
 import time
@@ -1210,6 +1211,43 @@ def add_namespace_to_cmd(cmd, namespace=None):
     return ['ip', 'netns', 'exec', namespace] + cmd if namespace else cmd
 
 
+def execute_batch(commands, namespace=None, force=True):
+    """Run several ip commands with a single 'ip -batch' invocation.
+
+    :param commands: iterable of argument sequences, each one being an ip
+                     command without the leading 'ip', e.g.
+                     ('route', 'del', '1.2.3.4/32', 'dev', 'eth0')
+    :param force: keep going after a failing command; the invocation still
+                  exits non-zero (and so raises) if any command failed.
+    """
+    lines = ['%s\n' % ' '.join(str(arg) for arg in command)
+             for command in commands]
+    if not lines:
+        return
+    options = ['-force'] if force else []
+    cmd = add_namespace_to_cmd(['ip'], namespace) + options + ['-batch', '-']
+    return utils.execute(cmd, process_input=''.join(lines),
+                         run_as_root=True)
+
+
+class IPBatch(object):
+    """Queue ip commands to run them with one 'ip -batch' per namespace."""
+
+    def __init__(self):
+        self._commands = collections.OrderedDict()
+
+    def __len__(self):
+        return sum(len(commands) for commands in self._commands.values())
+
+    def add(self, namespace, *args):
+        self._commands.setdefault(namespace, []).append(args)
+
+    def execute(self, force=True):
+        commands, self._commands = self._commands, collections.OrderedDict()
+        for namespace, ns_commands in commands.items():
+            execute_batch(ns_commands, namespace=namespace, force=force)
+
+
 def get_ipv6_lladdr(mac_addr):
     return '%s/64' % netaddr.EUI(mac_addr).ipv6_link_local()
 
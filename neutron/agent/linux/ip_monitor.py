@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet.queue
 from oslo_log import log as logging
 from oslo_utils import excutils
 
@@ -84,3 +85,82 @@ class IPMonitor(async_process.AsyncProcess):
 
     def stop(self):
         super(IPMonitor, self).stop(block=True)
+
+
+class IPLinkMonitorEvent(object):
+    def __init__(self, line, deleted, index, name, mac):
+        self.line = line
+        self.deleted = deleted
+        self.index = index
+        self.name = name
+        self.mac = mac
+
+    def __str__(self):
+        return self.line
+
+    @classmethod
+    def from_text(cls, line):
+        link = line.split()
+
+        deleted = bool(link) and link[0] == 'Deleted'
+        if deleted:
+            link = link[1:]
+
+        try:
+            index = int(link[0].rstrip(':'))
+            name = ip_lib.remove_interface_suffix(link[1].rstrip(':'))
+        except (IndexError, ValueError):
+            with excutils.save_and_reraise_exception():
+                LOG.error('Unable to parse link "%s"', line)
+
+        try:
+            mac = link[link.index('link/ether') + 1]
+        except (IndexError, ValueError):
+            mac = None
+
+        return cls(line, deleted, index, name, mac)
+
+
+class IPLinkMonitor(async_process.AsyncProcess):
+    """Wrapper over `ip monitor link`.
+
+    To react to the links added, changed and removed in the namespace:
+        m = IPLinkMonitor()
+        m.start()
+        while True:
+            for event in m.get_events(timeout=2):
+                print(event.name, event.deleted)
+    """
+
+    def __init__(self, namespace=None, run_as_root=False):
+        super(IPLinkMonitor, self).__init__(['ip', '-o', 'monitor', 'link'],
+                                            run_as_root=run_as_root,
+                                            namespace=namespace)
+
+    def get_events(self, timeout=None):
+        """Return the link events received since the previous call.
+
+        :param timeout: the number of seconds to wait for an event when none
+                        was received, no wait if None.
+        """
+        lines = list(self.iter_stdout())
+        if not lines and timeout:
+            try:
+                lines.append(self._stdout_lines.get(timeout=timeout))
+            except eventlet.queue.Empty:
+                pass
+            lines.extend(self.iter_stdout())
+        events = []
+        for line in lines:
+            try:
+                events.append(IPLinkMonitorEvent.from_text(line))
+            except (IndexError, ValueError):
+                # Logged by from_text
+                continue
+        return events
+
+    def start(self):
+        super(IPLinkMonitor, self).start(block=True)
+
+    def stop(self):
+        super(IPLinkMonitor, self).stop(block=True)
@@ -13,12 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import re
 
 from neutron_lib import exceptions
 from neutron_lib.services.qos import constants as qos_consts
 
 from neutron._i18n import _
+from neutron.agent.common import utils
 from neutron.agent.linux import ip_lib
 
 
@@ -90,15 +92,77 @@ def bits_to_kilobits(value, base):
     return int((value + (base - 1)) / base)
 
 
+def execute_batch(commands, namespace=None, **kwargs):
+    """Run several tc commands with a single 'tc -batch' invocation.
+
+    The invocation keeps going after a failing command, and still exits
+    non-zero if any command failed.
+
+    :param commands: iterable of argument sequences, each one being a tc
+                     command without the leading 'tc', e.g.
+                     ('qdisc', 'del', 'dev', 'tap0', 'root')
+    """
+    lines = ['%s\n' % ' '.join(str(arg) for arg in command)
+             for command in commands]
+    if not lines:
+        return
+    cmd = ip_lib.add_namespace_to_cmd(['tc', '-force', '-batch', '-'],
+                                      namespace)
+    return utils.execute(cmd, process_input=''.join(lines),
+                         run_as_root=True, **kwargs)
+
+
+class TcBatch(object):
+    """Queue tc commands to run them with 'tc -batch' per namespace.
+
+    The commands allowed to fail, i.e. the deletions of qdiscs which may
+    not exist, are run first by an invocation whose failure is ignored,
+    then the other ones by an invocation raising on failure. A batch thus
+    suits the updates deleting the limits of devices before setting them
+    again.
+    """
+
+    def __init__(self):
+        self._deletes = collections.OrderedDict()
+        self._commands = collections.OrderedDict()
+
+    def __len__(self):
+        return sum(len(commands)
+                   for queue in (self._deletes, self._commands)
+                   for commands in queue.values())
+
+    def add(self, namespace, cmd, extra_ok_codes=None):
+        queue = self._deletes if extra_ok_codes else self._commands
+        queue.setdefault(namespace, []).append(cmd)
+
+    def execute(self):
+        deletes, self._deletes = self._deletes, collections.OrderedDict()
+        commands, self._commands = self._commands, collections.OrderedDict()
+        for namespace, ns_commands in deletes.items():
+            execute_batch(ns_commands, namespace=namespace,
+                          check_exit_code=False, log_fail_as_error=False)
+        for namespace, ns_commands in commands.items():
+            execute_batch(ns_commands, namespace=namespace)
+
+
 class TcCommand(ip_lib.IPDevice):
 
-    def __init__(self, name, kernel_hz, namespace=None):
+    def __init__(self, name, kernel_hz, namespace=None, batch=None):
+        """Run the tc commands of a device.
+
+        :param batch: optional TcBatch queueing the commands changing the
+                      limits of the device instead of running them. The
+                      commands reading the limits are not to be used then.
+        """
         if kernel_hz <= 0:
             raise InvalidKernelHzValue(value=kernel_hz)
         super(TcCommand, self).__init__(name, namespace=namespace)
         self.kernel_hz = kernel_hz
+        self.batch = batch
 
     def _execute_tc_cmd(self, cmd, **kwargs):
+        if self.batch is not None:
+            return self.batch.add(self.namespace, cmd, **kwargs)
         cmd = ['tc'] + cmd
         ip_wrapper = ip_lib.IPWrapper(self.namespace)
         return ip_wrapper.netns.execute(cmd, run_as_root=True, **kwargs)
@@ -14,6 +14,7 @@
 
 import hashlib
 import hmac
+import threading
 
 import httplib2
 from neutron_lib import constants
@@ -29,7 +30,10 @@ import webob
 
 from neutron._i18n import _
 from neutron.agent.linux import utils as agent_utils
+from neutron.agent.metadata import port_cache
+from neutron.agent import resource_cache
 from neutron.agent import rpc as agent_rpc
+from neutron.api.rpc.callbacks import resources
 from neutron.common import cache_utils as cache
 from neutron.common import constants as n_const
 from neutron.common import rpc as n_rpc
@@ -79,6 +83,28 @@ class MetadataProxyHandler(object):
 
         self.plugin_rpc = MetadataPluginAPI(topics.PLUGIN)
         self.context = context.get_admin_context_without_session()
+        self._port_index = None
+        self._port_index_lock = threading.Lock()
+        if self.conf.metadata_port_push_cache:
+            # the index is kept up to date by push notifications, the TTL
+            # based cache would only serve stale results on top of it
+            self._cache = False
+
+    def _get_port_index(self):
+        # NOTE: the handler is built before the API workers are forked, so
+        # the RPC consumers are only set up on the first request each
+        # worker serves.
+        if self._port_index is None:
+            with self._port_index_lock:
+                # concurrent first requests must not each start a cache
+                if self._port_index is None:
+                    port_index = port_cache.MetadataPortIndex()
+                    port_index.subscribe()
+                    rcache = resource_cache.RemoteResourceCache(
+                        [resources.PORT])
+                    rcache.start_watcher()
+                    self._port_index = port_index
+        return self._port_index
 
     @webob.dec.wsgify(RequestClass=webob.Request)
     def __call__(self, req):
@@ -120,6 +146,10 @@ class MetadataProxyHandler(object):
     @cache.cache_method_results
     def _get_router_networks(self, router_id):
         """Find all networks connected to given router."""
+        if self.conf.metadata_port_push_cache:
+            return self._get_port_index().get_router_networks(
+                router_id,
+                lambda: self._get_ports_from_server(router_id=router_id))
         internal_ports = self._get_ports_from_server(router_id=router_id)
         return tuple(p['network_id'] for p in internal_ports)
 
@@ -132,6 +162,11 @@ class MetadataProxyHandler(object):
                          searched for
 
         """
+        if self.conf.metadata_port_push_cache:
+            return self._get_port_index().get_ports_for_remote_address(
+                remote_address, networks,
+                lambda: self._get_ports_from_server(
+                    networks=networks, ip_address=remote_address))
         return self._get_ports_from_server(networks=networks,
                                            ip_address=remote_address)
 
@@ -0,0 +1,216 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import threading
+
+from neutron_lib import constants
+from oslo_log import log as logging
+
+from neutron.api.rpc.callbacks import resources
+from neutron.callbacks import events
+from neutron.callbacks import registry
+
+LOG = logging.getLogger(__name__)
+
+
+def _address_key(network_id, ip_address):
+    return ('address', network_id, str(ip_address))
+
+
+def _router_key(router_id):
+    return ('router', router_id)
+
+
+class _InflightCall(object):
+    """Result holder shared by all the callers waiting on the same query."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class MetadataPortIndex(object):
+    """Invalidation driven index of the ports the metadata proxy looks up.
+
+    Ports are indexed by (network_id, ip_address) and by the router they are
+    an interface of. An index key is only answered locally once it has been
+    populated by a server query; from then on it is kept up to date by the
+    port push notifications delivered through the RemoteResourceCache, so
+    it never expires. Concurrent misses for the same keys share a single
+    server query.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # port_id -> trimmed port dict
+        self._ports = {}
+        # index key -> set of port ids
+        self._index = collections.defaultdict(set)
+        # index keys whose content is known to be complete
+        self._complete = set()
+        # in-flight server queries, by the tuple of index keys they fill
+        self._inflight = {}
+        # sequence number of the last push touching a key or port id; only
+        # needed (and kept) while server queries are in flight
+        self._seq = 0
+        self._touched = {}
+
+    def subscribe(self):
+        for event in (events.AFTER_UPDATE, events.AFTER_DELETE):
+            registry.subscribe(self._handle_port_event, resources.PORT, event)
+
+    @staticmethod
+    def _port_from_obj(port_obj):
+        return {'id': port_obj.id,
+                'network_id': port_obj.network_id,
+                'device_id': port_obj.device_id,
+                'device_owner': port_obj.device_owner,
+                'tenant_id': port_obj.project_id,
+                'ip_addresses': tuple(str(ip.ip_address)
+                                      for ip in port_obj.fixed_ips)}
+
+    @staticmethod
+    def _port_from_dict(port):
+        return {'id': port['id'],
+                'network_id': port['network_id'],
+                'device_id': port['device_id'],
+                'device_owner': port['device_owner'],
+                'tenant_id': port['tenant_id'],
+                'ip_addresses': tuple(str(ip['ip_address'])
+                                      for ip in port.get('fixed_ips', []))}
+
+    @staticmethod
+    def _port_keys(port):
+        keys = set(_address_key(port['network_id'], ip)
+                   for ip in port['ip_addresses'])
+        if port['device_owner'] in constants.ROUTER_INTERFACE_OWNERS:
+            keys.add(_router_key(port['device_id']))
+        return keys
+
+    def _remove_port(self, port_id):
+        port = self._ports.pop(port_id, None)
+        if not port:
+            return set()
+        keys = self._port_keys(port)
+        for key in keys:
+            self._index[key].discard(port_id)
+            if not self._index[key] and key not in self._complete:
+                del self._index[key]
+        return keys
+
+    def _add_port(self, port):
+        keys = self._port_keys(port)
+        self._ports[port['id']] = port
+        for key in keys:
+            self._index[key].add(port['id'])
+        return keys
+
+    def _touch(self, port_id, keys):
+        if not self._inflight:
+            return
+        self._touched[port_id] = self._seq
+        for key in keys:
+            self._touched[key] = self._seq
+
+    def _handle_port_event(self, resource, event, trigger, **kwargs):
+        port_id = kwargs['resource_id']
+        updated = kwargs.get('updated')
+        with self._lock:
+            self._seq += 1
+            keys = self._remove_port(port_id)
+            if event != events.AFTER_DELETE and updated is not None:
+                port = self._port_from_obj(updated)
+                new_keys = self._port_keys(port)
+                # only keep ports somebody has asked for, either directly or
+                # through a key we are answering locally
+                if keys or new_keys & self._complete:
+                    self._add_port(port)
+                keys |= new_keys
+            self._touch(port_id, keys)
+
+    def _lookup(self, keys):
+        """Return the port dicts for keys or None if any key is unknown."""
+        with self._lock:
+            if not all(key in self._complete for key in keys):
+                return None
+            return [self._ports[port_id]
+                    for key in keys for port_id in self._index[key]]
+
+    def _fetch(self, keys, fetch_func):
+        """Run fetch_func once for all concurrent callers asking for keys."""
+        with self._lock:
+            call = self._inflight.get(keys)
+            owner = call is None
+            if owner:
+                call = self._inflight[keys] = _InflightCall()
+                start_seq = self._seq
+        if not owner:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            ports = fetch_func()
+        except Exception as e:
+            call.error = e
+            raise
+        else:
+            call.result = ports
+            self._populate(keys, ports, start_seq)
+            return ports
+        finally:
+            with self._lock:
+                del self._inflight[keys]
+                if not self._inflight:
+                    self._touched.clear()
+            call.done.set()
+
+    def _populate(self, keys, ports, start_seq):
+        with self._lock:
+            for port in ports:
+                if self._touched.get(port['id'], 0) > start_seq:
+                    # a push notification is more recent than our reply
+                    continue
+                self._remove_port(port['id'])
+                self._add_port(self._port_from_dict(port))
+            for key in keys:
+                if self._touched.get(key, 0) <= start_seq:
+                    self._complete.add(key)
+
+    def get_router_networks(self, router_id, fetch_func):
+        """Return the networks router_id is connected to.
+
+        :param fetch_func: callable returning the router interface ports
+                           from the server on a miss
+        """
+        keys = (_router_key(router_id),)
+        ports = self._lookup(keys)
+        if ports is None:
+            ports = self._fetch(keys, fetch_func)
+        return tuple(sorted(set(p['network_id'] for p in ports)))
+
+    def get_ports_for_remote_address(self, remote_address, networks,
+                                     fetch_func):
+        """Return the ports having remote_address on any of networks.
+
+        :param fetch_func: callable returning the matching ports from the
+                           server on a miss
+        """
+        keys = tuple(sorted(set(_address_key(network_id, remote_address)
+                                for network_id in networks)))
+        ports = self._lookup(keys)
+        if ports is None:
+            ports = self._fetch(keys, fetch_func)
+        return ports
@@ -14,7 +14,9 @@
 
 from debtcollector import moves
 from oslo_config import cfg
+from ovsdbapp.backend.ovs_idl import command
 from ovsdbapp.backend.ovs_idl import connection
+from ovsdbapp.backend.ovs_idl import idlutils
 from ovsdbapp.backend.ovs_idl import transaction
 from ovsdbapp.backend.ovs_idl import vlog
 from ovsdbapp.schema.open_vswitch import impl_idl
@@ -54,7 +56,37 @@ def api_factory(context):
     return NeutronOvsdbIdl(_connection)
 
 
+class PortSnapshotCommand(command.BaseCommand):
+    """Read the interfaces of a bridge from the IDL in-memory tables.
+
+    The result is a (seqno, rows) tuple, rows being (name, port_name, tag,
+    ofport, external_ids) tuples, or None if the database did not change
+    since the given IDL sequence number.
+    """
+
+    def __init__(self, api, bridge, seqno=None):
+        super(PortSnapshotCommand, self).__init__(api)
+        self.bridge = bridge
+        self.seqno = seqno
+
+    def run_idl(self, txn):
+        seqno = self.api.idl.change_seqno
+        if seqno == self.seqno:
+            self.result = None
+            return
+        br = idlutils.row_by_value(self.api.idl, 'Bridge', 'name', self.bridge)
+        get_value = idlutils.get_column_value
+        self.result = (seqno, [
+            (iface.name, port.name, get_value(port, 'tag'),
+             get_value(iface, 'ofport'), iface.external_ids)
+            for port in br.ports if port.name != self.bridge
+            for iface in port.interfaces])
+
+
 class NeutronOvsdbIdl(impl_idl.OvsdbIdl):
     def __init__(self, connection):
         vlog.use_python_logger()
         super(NeutronOvsdbIdl, self).__init__(connection)
+
+    def port_snapshot(self, bridge, seqno=None):
+        return PortSnapshotCommand(self, bridge, seqno)
@@ -104,6 +104,7 @@ class PluginApi(object):
         1.4 - tunnel_sync rpc signature upgrade to obtain 'host'
         1.5 - Support update_device_list and
               get_devices_details_list_and_failed_devices
+        1.6 - Support get_network_fdb and get_network_fdb_digests
     '''
 
     def __init__(self, topic):
@@ -156,6 +157,16 @@ class PluginApi(object):
         return cctxt.call(context, 'tunnel_sync', tunnel_ip=tunnel_ip,
                           tunnel_type=tunnel_type, host=host)
 
+    def get_network_fdb(self, context, network_id, host):
+        cctxt = self.client.prepare(version='1.6')
+        return cctxt.call(context, 'get_network_fdb',
+                          network_id=network_id, host=host)
+
+    def get_network_fdb_digests(self, context, network_ids, host):
+        cctxt = self.client.prepare(version='1.6')
+        return cctxt.call(context, 'get_network_fdb_digests',
+                          network_ids=network_ids, host=host)
+
 
 def create_cache_for_l2_agent():
     """Create a push-notifications cache for L2 agent related resources."""
@@ -21,12 +21,14 @@ from oslo_config import cfg
 import oslo_i18n
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
+import six
 from six.moves.urllib import parse
 from webob import exc
 
 from neutron._i18n import _
 from neutron.api import extensions
 from neutron.common import constants
+from neutron.common import utils
 from neutron import wsgi
 
 
@@ -92,21 +94,21 @@ def get_filters_from_dict(data, attr_info, skips=None):
     return res
 
 
-def get_previous_link(request, items, id_key):
+def get_previous_link(request, items, id_key, marker_func=None):
     params = request.GET.copy()
     params.pop('marker', None)
     if items:
-        marker = items[0][id_key]
+        marker = marker_func(items[0]) if marker_func else items[0][id_key]
         params['marker'] = marker
     params['page_reverse'] = True
     return "%s?%s" % (prepare_url(request.path_url), parse.urlencode(params))
 
 
-def get_next_link(request, items, id_key):
+def get_next_link(request, items, id_key, marker_func=None):
     params = request.GET.copy()
     params.pop('marker', None)
     if items:
-        marker = items[-1][id_key]
+        marker = marker_func(items[-1]) if marker_func else items[-1][id_key]
         params['marker'] = marker
     params.pop('page_reverse', None)
     return "%s?%s" % (prepare_url(request.path_url), parse.urlencode(params))
@@ -210,7 +212,7 @@ def get_page_reverse(request):
 
 
 def get_pagination_links(request, items, limit,
-                         marker, page_reverse, key="id"):
+                         marker, page_reverse, key="id", marker_func=None):
     key = key if key else 'id'
     links = []
     if not limit:
@@ -218,11 +220,11 @@ def get_pagination_links(request, items, limit,
     if not (len(items) < limit and not page_reverse):
         links.append({"rel": "next",
                       "href": get_next_link(request, items,
-                                            key)})
+                                            key, marker_func)})
     if not (len(items) < limit and page_reverse):
         links.append({"rel": "previous",
                       "href": get_previous_link(request, items,
-                                                key)})
+                                                key, marker_func)})
     return links
 
 
@@ -308,15 +310,45 @@ class PaginationEmulatedHelper(PaginationHelper):
 
 class PaginationNativeHelper(PaginationEmulatedHelper):
 
+    def __init__(self, request, primary_key='id'):
+        super(PaginationNativeHelper, self).__init__(request, primary_key)
+        self.sort_keys = [primary_key]
+
     def update_args(self, args):
         if self.primary_key not in dict(args.get('sorts', [])).keys():
             args.setdefault('sorts', []).append((self.primary_key, True))
+        self.sort_keys = [key for key, _direction in args['sorts']]
         args.update({'limit': self.limit, 'marker': self.marker,
                      'page_reverse': self.page_reverse})
 
+    def update_fields(self, original_fields, fields_to_add):
+        super(PaginationNativeHelper, self).update_fields(original_fields,
+                                                          fields_to_add)
+        if not original_fields or not cfg.CONF.pagination_cursor_markers:
+            return
+        for key in self.sort_keys:
+            if key not in original_fields:
+                original_fields.append(key)
+                fields_to_add.append(key)
+
     def paginate(self, items):
         return items
 
+    def _get_marker(self, item):
+        values = [item.get(key) for key in self.sort_keys]
+        # only plain values can be compared to the columns they come from
+        if not all(isinstance(value, (six.string_types, six.integer_types,
+                                      float)) for value in values):
+            return item[self.primary_key]
+        return utils.encode_pagination_cursor(self.sort_keys, values)
+
+    def get_links(self, items):
+        if not cfg.CONF.pagination_cursor_markers:
+            return super(PaginationNativeHelper, self).get_links(items)
+        return get_pagination_links(
+            self.request, items, self.limit, self.marker,
+            self.page_reverse, self.primary_key, self._get_marker)
+
 
 class NoPaginationHelper(PaginationHelper):
     pass
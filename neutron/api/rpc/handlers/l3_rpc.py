@@ -26,6 +26,7 @@ import oslo_messaging
 from neutron.common import constants as n_const
 from neutron.common import utils
 from neutron.db import api as db_api
+from neutron.db import query_stats
 from neutron.extensions import l3
 
 
@@ -105,6 +106,7 @@ class L3RpcCallback(object):
                                                     router_ids=None)
         return self.l3plugin.list_router_ids_on_host(context, host)
 
+    @query_stats.instrument
     @db_api.retry_db_errors
     def sync_routers(self, context, **kwargs):
         """Sync routers according to filters to a specific agent.
@@ -25,6 +25,7 @@ from neutron.callbacks import registry
 from neutron.common import constants
 from neutron.common import rpc as n_rpc
 from neutron.common import topics
+from neutron.db import query_stats
 from neutron.db import securitygroups_rpc_base as sg_rpc_base
 
 LOG = logging.getLogger(__name__)
@@ -101,6 +102,7 @@ class SecurityGroupServerRpcCallback(object):
         ports = self._get_devices_info(context, devices_info)
         return self.plugin.security_group_rules_for_ports(context, ports)
 
+    @query_stats.instrument
     def security_group_info_for_devices(self, context, **kwargs):
         """Return security group information for requested devices.
 
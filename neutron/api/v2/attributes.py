@@ -18,6 +18,11 @@ from neutron_lib.api.definitions import network as net_def
 from neutron_lib.api.definitions import port as port_def
 from neutron_lib.api.definitions import subnet as subnet_def
 from neutron_lib.api.definitions import subnetpool as subnetpool_def
+from neutron_lib.api import validators
+from neutron_lib import constants
+from webob import exc
+
+from neutron._i18n import _
 
 
 # Defining a constant to avoid repeating string literal in several modules
@@ -44,3 +49,128 @@ def get_collection_info(collection):
     :param collection: Collection or plural name of the resource
     """
     return RESOURCE_ATTRIBUTE_MAP.get(collection)
+
+
+class BodyValidator(object):
+    """Request body validation compiled from a resource's attribute map.
+
+    Applies to a request item what AttributeInfo.fill_post_defaults (or the
+    allow_put check for updates), verify_attributes and convert_values do,
+    with the attribute map walked and the validators looked up once, when
+    the BodyValidator is built, rather than for every item of every request.
+    """
+
+    def __init__(self, attr_info, is_create):
+        # tenant_id and project_id are both expected in the attribute map
+        attrs.populate_project_info(attr_info)
+        self.attr_info = attr_info
+        self.is_create = is_create
+        self.fingerprint = _fingerprint(attr_info)
+        self._attr_ops = attrs.AttributeInfo(attr_info)
+        self._known = frozenset(attr_info)
+        self._post_plan = []
+        self._put_forbidden = []
+        self._conversions = []
+        for attr, attr_vals in attr_info.items():
+            if not is_create:
+                if not attr_vals.get('allow_put'):
+                    self._put_forbidden.append(attr)
+            elif attr_vals['allow_post']:
+                self._post_plan.append(
+                    (attr, True, 'default' in attr_vals,
+                     attr_vals.get('default')))
+            else:
+                self._post_plan.append((attr, False, False, None))
+            if 'convert_to' in attr_vals or 'validate' in attr_vals:
+                rules = [(rule, validators.get_validator(rule), arg)
+                         for rule, arg in attr_vals.get('validate',
+                                                        {}).items()]
+                self._conversions.append(
+                    (attr, attr_vals.get('convert_to'), rules))
+
+    def __call__(self, context, res_dict):
+        """Validate res_dict in place.
+
+        :raises: webob.exc.HTTPBadRequest if res_dict is invalid.
+        """
+        self._attr_ops.populate_project_id(context, res_dict, self.is_create)
+        if not self._known.issuperset(res_dict):
+            extra_keys = set(res_dict) - self._known
+            msg = _("Unrecognized attribute(s) '%s'") % ', '.join(extra_keys)
+            raise exc.HTTPBadRequest(msg)
+        if self.is_create:
+            self._fill_post_defaults(res_dict)
+        else:
+            for attr in self._put_forbidden:
+                if attr in res_dict:
+                    msg = _("Cannot update read-only attribute %s") % attr
+                    raise exc.HTTPBadRequest(msg)
+        self._convert_values(res_dict)
+
+    def _fill_post_defaults(self, res_dict):
+        for attr, allow_post, has_default, default in self._post_plan:
+            if attr in res_dict:
+                if not allow_post:
+                    msg = _("Attribute '%s' not allowed in POST") % attr
+                    raise exc.HTTPBadRequest(msg)
+            elif has_default:
+                res_dict[attr] = default
+            elif allow_post:
+                msg = _("Failed to parse request. Required "
+                        "attribute '%s' not specified") % attr
+                raise exc.HTTPBadRequest(msg)
+
+    def _convert_values(self, res_dict):
+        for attr, convert_to, rules in self._conversions:
+            value = res_dict.get(attr, constants.ATTR_NOT_SPECIFIED)
+            if value is constants.ATTR_NOT_SPECIFIED:
+                continue
+            if convert_to:
+                value = res_dict[attr] = convert_to(value)
+            for rule, validator, arg in rules:
+                # Validators registered after the compilation
+                validator = validator or validators.get_validator(rule)
+                res = validator(value, arg)
+                if res:
+                    msg_dict = dict(attr=attr, reason=res)
+                    msg = _("Invalid input for %(attr)s. "
+                            "Reason: %(reason)s.") % msg_dict
+                    raise exc.HTTPBadRequest(msg)
+
+
+_body_validators = {}
+
+
+def _fingerprint(attr_info):
+    # Extensions extend an attribute map by adding or replacing the dicts of
+    # its attributes, and tests by replacing the whole map.
+    return id(attr_info), tuple((attr, id(attr_vals))
+                                for attr, attr_vals in attr_info.items())
+
+
+def get_body_validator(resource, attr_info, is_create):
+    """Return the BodyValidator of a resource, compiling it if needed.
+
+    The BodyValidator is compiled again if attr_info changed since.
+
+    :param resource: The resource name.
+    :param attr_info: The attribute map of the resource.
+    :param is_create: Whether to validate create or update request bodies.
+    """
+    key = (resource, is_create)
+    validator = _body_validators.get(key)
+    if (validator is None or validator.attr_info is not attr_info or
+            validator.fingerprint != _fingerprint(attr_info)):
+        validator = _body_validators[key] = BodyValidator(attr_info,
+                                                          is_create)
+    return validator
+
+
+def compile_body_validators(resources):
+    """Compile the BodyValidators of resources.
+
+    :param resources: An iterable of (resource name, attribute map) pairs.
+    """
+    for resource, attr_info in resources:
+        for is_create in (True, False):
+            get_body_validator(resource, attr_info, is_create)
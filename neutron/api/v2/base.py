@@ -16,11 +16,11 @@
 import collections
 import copy
 
-from neutron_lib.api import attributes
 from neutron_lib.api import faults
 from neutron_lib.callbacks import events
 from neutron_lib.callbacks import registry
 from neutron_lib import exceptions
+from oslo_config import cfg
 from oslo_log import log as logging
 from oslo_policy import policy as oslo_policy
 from oslo_utils import excutils
@@ -28,6 +28,7 @@ import webob.exc
 
 from neutron._i18n import _
 from neutron.api import api_common
+from neutron.api.v2 import attributes as v2_attributes
 from neutron.api.v2 import resource as wsgi_resource
 from neutron.common import constants as n_const
 from neutron.common import exceptions as n_exc
@@ -36,6 +37,7 @@ from neutron.db import api as db_api
 from neutron import policy
 from neutron import quota
 from neutron.quota import resource_registry
+from neutron import wsgi
 
 
 LOG = logging.getLogger(__name__)
@@ -297,6 +299,16 @@ class Controller(object):
         obj_list = obj_getter(request.context, **kwargs)
         obj_list = sorting_helper.sort(obj_list)
         obj_list = pagination_helper.paginate(obj_list)
+        if (cfg.CONF.stream_list_responses and
+                not pagination_helper.get_links(obj_list)):
+            # Without pagination links to build, the items are checked,
+            # filtered and serialized one by one as the response is sent
+            collection = {self._collection: wsgi.StreamedCollection(
+                self._iter_items(request, obj_list, do_authz,
+                                 fields_to_add or []))}
+            resource_registry.resync_resource(
+                request.context, self._resource, request.context.tenant_id)
+            return collection
         # Check authz
         if do_authz:
             # FIXME(salvatore-orlando): obj_getter might return references to
@@ -329,6 +341,24 @@ class Controller(object):
             request.context, self._resource, request.context.tenant_id)
         return collection
 
+    def _iter_items(self, request, obj_list, do_authz, fields_to_strip):
+        """Lazily authorize and filter the items of a list response."""
+        if do_authz:
+            obj_list = (obj for obj in obj_list
+                        if policy.check(request.context,
+                                        self._plugin_handlers[self.SHOW],
+                                        obj,
+                                        plugin=self._plugin,
+                                        pluralized=self._collection))
+        to_strip = None
+        for obj in obj_list:
+            if to_strip is None:
+                # As for regular list responses, the first visible item
+                # decides which attributes are filtered out by policy
+                to_strip = fields_to_strip + (
+                    self._exclude_attributes_by_policy(request.context, obj))
+            yield self._filter_attributes(obj, fields_to_strip=to_strip)
+
     def _item(self, request, id, do_authz=False, field_list=None,
               parent_id=None):
         """Retrieves and formats a single element of the requested entity."""
@@ -683,6 +713,8 @@ class Controller(object):
             raise webob.exc.HTTPBadRequest(_("Resource body required"))
 
         LOG.debug("Request body: %(body)s", {'body': body})
+        validator = v2_attributes.get_body_validator(resource, attr_info,
+                                                     is_create)
         try:
             if collection in body:
                 if not allow_bulk:
@@ -691,12 +723,21 @@ class Controller(object):
                 if not body[collection]:
                     raise webob.exc.HTTPBadRequest(_("Resources required"))
                 bulk_body = [
-                    Controller.prepare_request_body(
+                    Controller._prepare_request_item(
                         context, item if resource in item
-                        else {resource: item}, is_create, resource, attr_info,
-                        allow_bulk) for item in body[collection]
+                        else {resource: item}, resource, validator)
+                    for item in body[collection]
                 ]
                 return {collection: bulk_body}
+        except (AttributeError, TypeError):
+            msg = _("Body contains invalid data")
+            raise webob.exc.HTTPBadRequest(msg)
+        return Controller._prepare_request_item(context, body, resource,
+                                                validator)
+
+    @staticmethod
+    def _prepare_request_item(context, body, resource, validator):
+        try:
             res_dict = body.get(resource)
         except (AttributeError, TypeError):
             msg = _("Body contains invalid data")
@@ -704,22 +745,7 @@ class Controller(object):
         if res_dict is None:
             msg = _("Unable to find '%s' in request body") % resource
             raise webob.exc.HTTPBadRequest(msg)
-
-        attr_ops = attributes.AttributeInfo(attr_info)
-        attr_ops.populate_project_id(context, res_dict, is_create)
-        attributes.populate_project_info(attr_info)
-        attr_ops.verify_attributes(res_dict)
-
-        if is_create:  # POST
-            attr_ops.fill_post_defaults(
-                res_dict, exc_cls=webob.exc.HTTPBadRequest)
-        else:  # PUT
-            for attr, attr_vals in attr_info.items():
-                if attr in res_dict and not attr_vals['allow_put']:
-                    msg = _("Cannot update read-only attribute %s") % attr
-                    raise webob.exc.HTTPBadRequest(msg)
-
-        attr_ops.convert_values(res_dict, exc_cls=webob.exc.HTTPBadRequest)
+        validator(context, res_dict)
         return body
 
     def _validate_network_tenant_ownership(self, request, resource_item):
@@ -17,12 +17,14 @@
 Utility methods for working with WSGI servers redux
 """
 
+from oslo_config import cfg
 from oslo_log import log as logging
 import webob.dec
 import webob.exc
 
 from neutron.api import api_common
 from neutron.common import utils
+from neutron.db import query_stats
 from neutron import wsgi
 
 
@@ -95,7 +97,10 @@ def Resource(controller, faults=None, deserializers=None, serializers=None,
                     controller._collection, args['id'], revision_number)
 
             method = getattr(controller, action)
-            result = method(request=request, **args)
+            with query_stats.collect(
+                    '%s %s' % (request.method, request.path),
+                    request.context.request_id) as stats:
+                result = method(request=request, **args)
         except Exception as e:
             mapped_exc = api_common.convert_exception_to_http_exc(e, faults,
                                                                   language)
@@ -112,15 +117,26 @@ def Resource(controller, faults=None, deserializers=None, serializers=None,
             raise mapped_exc
 
         status = action_status.get(action, 200)
-        body = serializer.serialize(result)
-        # NOTE(jkoelker) Comply with RFC2616 section 9.7
-        if status == 204:
-            content_type = ''
-            body = None
-
-        return webob.Response(request=request, status=status,
-                              content_type=content_type,
-                              body=body)
+        if (status != 204 and wsgi.is_streamed(result) and
+                hasattr(serializer, 'serialize_chunks')):
+            # NOTE: the items are only pulled, filtered and serialized
+            # while the response body is sent
+            response = webob.Response(
+                request=request, status=status, content_type=content_type,
+                app_iter=serializer.serialize_chunks(result))
+        else:
+            body = serializer.serialize(result)
+            # NOTE(jkoelker) Comply with RFC2616 section 9.7
+            if status == 204:
+                content_type = ''
+                body = None
+
+            response = webob.Response(request=request, status=status,
+                                      content_type=content_type,
+                                      body=body)
+        if stats is not None and cfg.CONF.query_stats_header:
+            response.headers[query_stats.HEADER] = str(stats)
+        return response
     # NOTE(blogan): this is something that is needed for the transition to
     # pecan.  This will allow the pecan code to have a handle on the controller
     # for an extension so it can reuse the code instead of forcing every
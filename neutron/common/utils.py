@@ -18,6 +18,7 @@
 
 """Utilities and helper functions."""
 
+import base64
 import functools
 import importlib
 import os
@@ -35,10 +36,12 @@ import eventlet
 from eventlet.green import subprocess
 import netaddr
 from neutron_lib import constants as n_const
+from neutron_lib import exceptions as n_exc
 from neutron_lib.utils import helpers
 from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_log import log as logging
+from oslo_serialization import jsonutils
 from oslo_utils import excutils
 import six
 
@@ -783,3 +786,46 @@ def resolve_ref(ref):
     if isinstance(ref, weakref.ref):
         ref = ref()
     return ref
+
+
+_PAGINATION_CURSOR_PREFIX = 'k1.'
+
+
+def encode_pagination_cursor(keys, values):
+    """Return an opaque pagination marker for the sort key values of an item.
+
+    :param keys: The sort keys, the primary key included.
+    :param values: The values of the keys for the last item seen.
+    """
+    data = jsonutils.dump_as_bytes([list(keys), list(values)])
+    return _PAGINATION_CURSOR_PREFIX + base64.urlsafe_b64encode(
+        data).decode('ascii').rstrip('=')
+
+
+def decode_pagination_cursor(marker):
+    """Return the (keys, values) of a marker built by encode_pagination_cursor.
+
+    None is returned if marker is not such a cursor, e.g. a resource id.
+
+    :raises BadRequest: if marker is a malformed cursor.
+    """
+    if (not isinstance(marker, six.string_types) or
+            not marker.startswith(_PAGINATION_CURSOR_PREFIX)):
+        return None
+    data = marker[len(_PAGINATION_CURSOR_PREFIX):]
+    data += '=' * (-len(data) % 4)
+    try:
+        keys, values = jsonutils.loads(
+            base64.urlsafe_b64decode(data.encode('ascii')))
+    except (TypeError, ValueError, UnicodeError):
+        keys = values = None
+    # the values end up in the SQL criteria, only scalars are accepted
+    if (not isinstance(keys, list) or not isinstance(values, list) or
+            not keys or len(keys) != len(values) or
+            not all(isinstance(key, six.string_types) for key in keys) or
+            not all(value is None or isinstance(
+                value, six.string_types + six.integer_types + (float, bool))
+                for value in values)):
+        raise n_exc.BadRequest(resource='marker',
+                               msg=_("Invalid pagination marker"))
+    return keys, values
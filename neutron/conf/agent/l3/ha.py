@@ -43,6 +43,21 @@ OPTS = [
                       'keepalived server connection requests. '
                       'More threads create a higher CPU load '
                       'on the agent node.')),
+    cfg.FloatOpt('ha_state_change_batch_window',
+                 default=0.5,
+                 min=0,
+                 help=_('Time in seconds during which the HA router state '
+                        'transitions received from keepalived are merged '
+                        'and then processed as a single batch. Only the last '
+                        'transition of a router within a batch is applied '
+                        'and the states of the batch are reported to the '
+                        'server in a single call.')),
+    cfg.IntOpt('ha_state_change_workers',
+               default=16,
+               min=1,
+               help=_('Maximum number of HA routers for which the local '
+                      'actions of a state transition (metadata proxy, radvd, '
+                      'IPv6 gateway settings) are run concurrently.')),
     cfg.IntOpt('ha_vrrp_health_check_interval',
                default=0,
                help=_('The VRRP health check interval in seconds. Values > 0 '
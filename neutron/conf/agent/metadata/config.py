@@ -73,7 +73,16 @@ METADATA_PROXY_HANDLER_OPTS = [
                help=_("Client certificate for nova metadata api server.")),
     cfg.StrOpt('nova_client_priv_key',
                default='',
-               help=_("Private key of client certificate."))
+               help=_("Private key of client certificate.")),
+    cfg.BoolOpt('metadata_port_push_cache',
+                default=False,
+                help=_("Keep the ports looked up by the metadata proxy in a "
+                       "local index which is updated by the port push "
+                       "notifications sent by the Neutron server, instead "
+                       "of the time based cache. Concurrent lookups of the "
+                       "same address share a single query to the server. "
+                       "Requires a Neutron server sending port push "
+                       "notifications (ML2)."))
 ]
 
 
@@ -51,6 +51,40 @@ core_opts = [
                help=_("The maximum number of items returned in a single "
                       "response, value was 'infinite' or negative integer "
                       "means no limit")),
+    cfg.BoolOpt('pagination_cursor_markers', default=False,
+                help=_("Use opaque cursors encoding the sort key values of "
+                       "the boundary item as markers in the pagination "
+                       "links of plugins supporting native pagination. The "
+                       "next page is then read with an index range scan "
+                       "instead of loading the marker resource first. "
+                       "Resource ids are still accepted as markers.")),
+    cfg.BoolOpt('estimated_collection_count', default=False,
+                help=_("Count all the networks or ports with the row count "
+                       "estimated by the database statistics instead of a "
+                       "full table scan. Only unfiltered counts requested "
+                       "with an admin context are estimated.")),
+    cfg.BoolOpt('stream_list_responses', default=False,
+                help=_("Stream the body of the collection (list) responses "
+                       "which are not paginated: the items are filtered and "
+                       "serialized one by one while the response is sent, "
+                       "instead of building the whole body in memory "
+                       "first. Note that an error happening once the "
+                       "response has started can only be reported by "
+                       "closing the connection.")),
+    cfg.BoolOpt('query_stats', default=False,
+                help=_("Count the SQL statements, their time and rows for "
+                       "each API request and main RPC handler, and log them "
+                       "at debug level.")),
+    cfg.BoolOpt('query_stats_header', default=False,
+                help=_("When query_stats is enabled, also return the counts "
+                       "of an API request in the X-Neutron-Query-Stats "
+                       "response header. The statements issued while a "
+                       "streamed response is sent are not included.")),
+    cfg.IntOpt('query_stats_repeat_threshold', default=20, min=0,
+               help=_("When query_stats is enabled, log a warning for the "
+                      "requests executing the same statement at least this "
+                      "many times, which is typical of N+1 query patterns. "
+                      "0 disables the warning.")),
     cfg.ListOpt('default_availability_zones', default=[],
                 help=_("Default value of availability zone hints. The "
                        "availability zone aware schedulers use this when "
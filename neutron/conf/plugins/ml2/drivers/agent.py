@@ -26,6 +26,16 @@ agent_opts = [
                help=_("Set new timeout in seconds for new rpc calls after "
                       "agent receives SIGTERM. If value is set to 0, rpc "
                       "timeout won't be changed")),
+    cfg.BoolOpt('monitor_links', default=True,
+                help=_("Follow the local devices from the events of their "
+                       "links, reported by 'ip monitor link', rather than "
+                       "polling all of them every polling interval. The "
+                       "devices are still all polled every "
+                       "full_scan_interval seconds. Only used by the agents "
+                       "supporting it, such as the Linux bridge agent.")),
+    cfg.IntOpt('full_scan_interval', default=60, min=1,
+               help=_("The number of seconds between the polls of all the "
+                      "local devices when monitor_links is enabled.")),
 ]
 
 
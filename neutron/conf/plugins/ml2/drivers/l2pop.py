@@ -22,6 +22,12 @@ l2_population_options = [
     cfg.IntOpt('agent_boot_time', default=180,
                help=_('Delay within which agent is expected to update '
                       'existing ports when it restarts')),
+    cfg.FloatOpt('fdb_batch_interval', default=0, min=0,
+                 help=_('Number of seconds over which the forwarding entries '
+                        'fanned out to the agents are merged per network '
+                        'into a single add and a single remove message. '
+                        'The entries are sent as they change when set to '
+                        '0.')),
 ]
 
 
@@ -93,6 +93,14 @@ ovs_opts = [
                help=_("Timeout in seconds to wait for a single "
                       "OpenFlow request. "
                       "Used only for 'native' driver.")),
+    cfg.BoolOpt('diff_flows_on_start', default=False,
+                help=_("On start, keep the flows installed by the previous "
+                       "run of the agent which did not change instead of "
+                       "installing them again, and delete the stale flows "
+                       "with a single atomic OpenFlow bundle. Requires "
+                       "Open vSwitch 2.6 or later. Ignored when "
+                       "drop_flows_on_start is set. "
+                       "Used only for 'native' driver.")),
 ]
 
 agent_opts = [
@@ -140,7 +148,20 @@ agent_opts = [
                        "outgoing IP packet carrying GRE/VXLAN tunnel.")),
     cfg.StrOpt('agent_type', default=n_const.AGENT_TYPE_OVS,
                deprecated_for_removal=True,
-               help=_("Selects the Agent Type reported"))
+               help=_("Selects the Agent Type reported")),
+    cfg.StrOpt('metrics_socket',
+               help=_("Path of a UNIX domain socket on which the agent "
+                      "serves, as JSON, the timings of its rpc_loop phases "
+                      "and its flow-mod counts per bridge and table. Only "
+                      "the total time of each phase is reported in the "
+                      "agent configurations. Not served if unset.")),
+    cfg.StrOpt('local_vlan_map_file',
+               help=_("Path of the file in which the agent saves the local "
+                      "VLAN ids of its networks and the ports bound to "
+                      "them. On restart, the agent restores the local VLAN "
+                      "ids from this file, and only reads from OVSDB the "
+                      "configuration of the ports whose tag does not match "
+                      "it. Not saved if unset.")),
 ]
 
 
@@ -27,6 +27,12 @@ service_opts = [
                help=_('Number of separate API worker processes for service. '
                       'If not specified, the default is equal to the number '
                       'of CPUs available for best performance.')),
+    cfg.BoolOpt('api_warm_up',
+                default=True,
+                help=_('Load the policy rules and configure the database '
+                       'mappers before forking the API workers, so that '
+                       'they share them with the parent process instead of '
+                       'building them on their first request.')),
     cfg.IntOpt('rpc_workers',
                default=1,
                help=_('Number of RPC worker processes for service.')),
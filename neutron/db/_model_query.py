@@ -18,12 +18,16 @@ NOTE: This module shall not be used by external projects. It will be moved
 
 from neutron_lib.api import attributes
 from neutron_lib.db import utils as db_utils
+from neutron_lib import exceptions as n_exc
 from oslo_db.sqlalchemy import utils as sa_utils
+import sqlalchemy as sa
 from sqlalchemy import sql, or_, and_
 from sqlalchemy.ext import associationproxy
 
+from neutron._i18n import _
 from neutron.common import utils
 from neutron.db import _utils as ndb_utils
+from neutron.db import standard_attr
 from neutron.objects import utils as obj_utils
 
 # Classes implementing extensions will register hooks into this dictionary
@@ -60,6 +64,15 @@ _model_query_hooks = {
 }
 
 
+# Filters on the standard attributes of the resources which are not
+# attributes of their models, registered by register_standard_attr_filter()
+_standard_attr_filters = {}
+
+# The columns of the standard attributes exposed by the resource models
+STANDARD_ATTR_COLUMNS = ('description', 'revision_number',
+                         'created_at', 'updated_at')
+
+
 def register_hook(model, name, query_hook, filter_hook,
                   result_filters=None):
     """Register a hook to be invoked when a query is executed.
@@ -173,8 +186,51 @@ def get_by_id(context, model, object_id):
     return query.filter(model.id == object_id).one()
 
 
+def register_standard_attr_filter(name, criterion_builder):
+    """Register a filter on the standard attributes of the resources.
+
+    :param name: The name of the filter, e.g. changed_since.
+    :type name: str
+
+    :param criterion_builder: Called with the values of the filter, returns
+                              a criterion on the StandardAttribute model.
+    :type criterion_builder: callable
+
+    The filter applies to the models with standard attributes which have
+    no attribute of that name. The criteria of all the standard attribute
+    filters of a query are applied on a single join to the standard
+    attributes table.
+    """
+    _standard_attr_filters[name] = criterion_builder
+
+
+def _column_criterion(column, value):
+    if isinstance(value, obj_utils.StringMatchingFilterObj):
+        if value.is_contains:
+            return column.contains(value.contains)
+        elif value.is_starts:
+            return column.startswith(value.starts)
+        elif value.is_ends:
+            return column.endswith(value.ends)
+    elif None in value:
+        # in_() operator does not support NULL element so we have
+        # to do multiple equals matches
+        return or_(*[column == v for v in value])
+    else:
+        return column.in_(value)
+
+
+def _filter_standard_attrs(query, model, criteria):
+    std_attr = standard_attr.StandardAttribute
+    query = query.join(std_attr, model.standard_attr_id == std_attr.id)
+    return query.filter(*criteria)
+
+
 def apply_filters(query, model, filters, context=None):
     if filters:
+        has_standard_attrs = issubclass(model,
+                                        standard_attr.HasStandardAttributes)
+        standard_attr_criteria = []
         for key, value in filters.items():
             column = getattr(model, key, None)
             # NOTE(kevinbenton): if column is a hybrid property that
@@ -186,28 +242,26 @@ def apply_filters(query, model, filters, context=None):
                 if not value:
                     query = query.filter(sql.false())
                     return query
-                if isinstance(column, associationproxy.AssociationProxy):
+                if has_standard_attrs and key in STANDARD_ATTR_COLUMNS:
+                    # filter the columns of the standard attributes table
+                    # rather than through their association proxies, which
+                    # would take a subquery per value
+                    standard_attr_criteria.append(_column_criterion(
+                        getattr(standard_attr.StandardAttribute, key),
+                        value))
+                elif isinstance(column, associationproxy.AssociationProxy):
                     # association proxies don't support in_ so we have to
                     # do multiple equals matches
                     query = query.filter(
                         or_(*[column == v for v in value]))
-                elif isinstance(value, obj_utils.StringMatchingFilterObj):
-                    if value.is_contains:
-                        query = query.filter(
-                            column.contains(value.contains))
-                    elif value.is_starts:
-                        query = query.filter(
-                            column.startswith(value.starts))
-                    elif value.is_ends:
-                        query = query.filter(
-                            column.endswith(value.ends))
-                elif None in value:
-                    # in_() operator does not support NULL element so we have
-                    # to do multiple equals matches
-                    query = query.filter(
-                        or_(*[column == v for v in value]))
                 else:
-                    query = query.filter(column.in_(value))
+                    criterion = _column_criterion(column, value)
+                    if criterion is not None:
+                        query = query.filter(criterion)
+            elif has_standard_attrs and key in _standard_attr_filters:
+                if value:
+                    standard_attr_criteria.append(
+                        _standard_attr_filters[key](value))
             elif key == 'shared' and hasattr(model, 'rbac_entries'):
                 # translate a filter on shared into a query against the
                 # object's rbac entries
@@ -244,6 +298,9 @@ def apply_filters(query, model, filters, context=None):
                     # scoped query
                     query = query.outerjoin(model.rbac_entries)
                 query = query.filter(is_shared)
+        criteria = [c for c in standard_attr_criteria if c is not None]
+        if criteria:
+            query = _filter_standard_attrs(query, model, criteria)
         for hook in get_hooks(model):
             result_filter = utils.resolve_ref(hook.get('result_filters', None))
             if result_filter:
@@ -268,6 +325,10 @@ def get_collection_query(context, model, filters=None, sorts=None, limit=None,
             if k not in sort_keys:
                 sort_keys.append(k)
                 sort_dirs.append('asc')
+        if isinstance(marker_obj, ndb_utils.KeysetMarker):
+            collection = collection.filter(
+                _keyset_criteria(model, sort_keys, sort_dirs, marker_obj))
+            marker_obj = None
         collection = sa_utils.paginate_query(collection, model, limit,
                                              marker=marker_obj,
                                              sort_keys=sort_keys,
@@ -275,6 +336,36 @@ def get_collection_query(context, model, filters=None, sorts=None, limit=None,
     return collection
 
 
+def _keyset_criteria(model, sort_keys, sort_dirs, marker):
+    """Return the criteria selecting the rows sorted after a KeysetMarker.
+
+    The marker must hold the values of leading sort keys up to the primary
+    key, which makes the order total. Besides the usual disjunction, the
+    criteria include a range condition on the first sort key so that the
+    page is read with an index range scan on it.
+    """
+    keys = marker.keys
+    primary_keys = set(column.key
+                       for column in sa.inspect(model).primary_key)
+    if (keys != sort_keys[:len(keys)] or
+            not primary_keys.issubset(keys)):
+        raise n_exc.BadRequest(resource='marker',
+                               msg=_("Invalid pagination marker"))
+    columns = [getattr(model, key) for key in keys]
+    after = []
+    for i, (column, value) in enumerate(zip(columns, marker.values)):
+        equal = [c == v for c, v in zip(columns[:i], marker.values[:i])]
+        if sort_dirs[i] == 'desc':
+            after.append(and_(*(equal + [column < value])))
+        else:
+            after.append(and_(*(equal + [column > value])))
+    if sort_dirs[0] == 'desc':
+        leading = columns[0] <= marker.values[0]
+    else:
+        leading = columns[0] >= marker.values[0]
+    return and_(leading, or_(*after))
+
+
 def _unique_keys(model):
     # just grab first set of unique keys and use them.
     # if model has no unqiue sets, 'paginate_query' will
@@ -301,5 +392,39 @@ def get_collection(context, model, dict_func,
     return items
 
 
-def get_collection_count(context, model, filters=None):
+def _estimated_row_count(context, model):
+    """Return the row count of the table of model from the DB statistics.
+
+    None is returned if the backend does not provide one.
+    """
+    session = context.session
+    dialect = session.get_bind().dialect.name
+    if dialect == 'mysql':
+        statement = sql.text("SELECT table_rows "
+                             "FROM information_schema.tables "
+                             "WHERE table_schema = DATABASE() "
+                             "AND table_name = :table")
+    elif dialect == 'postgresql':
+        statement = sql.text("SELECT reltuples FROM pg_class "
+                             "WHERE relname = :table")
+    else:
+        return None
+    row = session.execute(statement,
+                          {'table': model.__table__.name}).first()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def get_collection_count(context, model, filters=None, estimate=False):
+    """Return the number of resources matching filters.
+
+    :param estimate: Return the row count estimated by the database for
+                     unfiltered admin queries, which does not scan the table.
+                     The exact count is returned if no estimate is available.
+    """
+    if estimate and not filters and context.is_admin:
+        count = _estimated_row_count(context, model)
+        if count is not None:
+            return count
     return get_collection_query(context, model, filters).count()
@@ -32,8 +32,24 @@ _resource_extend_functions = {
 # resources that each method will extend on class initialization.
 _DECORATED_EXTEND_METHODS = collections.defaultdict(list)
 
+# This dictionary will store, for the functions declaring them, the response
+# attributes a function produces and the model relationships it reads.
+# Functions without a declaration are always applied.
+_EXTEND_FUNC_DECLARATIONS = {
+    # <func> : (frozenset(<attributes>), frozenset(<relationships>)),
+    # ...
+}
+
+
+def _declare(func, attributes, relationships):
+    if attributes is None:
+        return
+    func = getattr(func, '__func__', func)
+    _EXTEND_FUNC_DECLARATIONS[func] = (frozenset(attributes),
+                                       frozenset(relationships or ()))
+
 
-def register_funcs(resource, funcs):
+def register_funcs(resource, funcs, attributes=None, relationships=None):
     """Add functions to extend a resource.
 
     :param resource: A resource collection name.
@@ -49,7 +65,20 @@ def register_funcs(resource, funcs):
             foo_res['bar'] = foo_db.bar_info  # example
             return foo_res
 
+    :param attributes: The resource attributes set by funcs, if known. When
+                       given, funcs are skipped for responses restricted to
+                       fields not including any of them.
+    :type attributes: list of str
+
+    :param relationships: The relationships of the resource model read by
+                          funcs; they do not need to be eager loaded when
+                          funcs are skipped.
+    :type relationships: list of str
+
     """
+    for f in funcs:
+        if callable(f):
+            _declare(f, attributes, relationships)
     funcs = [utils.make_weak_ref(f) if callable(f) else f
              for f in funcs]
     _resource_extend_functions.setdefault(resource, []).extend(funcs)
@@ -68,14 +97,53 @@ def get_funcs(resource):
     return _resource_extend_functions.get(resource, [])
 
 
-def apply_funcs(resource_type, response, db_object):
+def _is_needed(func, fields):
+    if not fields:
+        return True
+    declaration = _EXTEND_FUNC_DECLARATIONS.get(
+        getattr(func, '__func__', func))
+    return declaration is None or not declaration[0].isdisjoint(fields)
+
+
+def apply_funcs(resource_type, response, db_object, fields=None):
+    """Apply the functions extending a resource to a response.
+
+    :param fields: The fields the response will be restricted to, if any.
+                   Functions declaring attributes none of which is in fields
+                   are not applied.
+    """
     for func in get_funcs(resource_type):
         resolved_func = utils.resolve_ref(func)
-        if resolved_func:
+        if resolved_func and _is_needed(resolved_func, fields):
             resolved_func(response, db_object)
 
 
-def extends(resources):
+def get_unneeded_relationships(resource_type, fields):
+    """Return the model relationships no applied function will read.
+
+    Those are the relationships declared by the functions apply_funcs skips
+    for fields, unless another function that is applied declares them too.
+    """
+    unneeded = set()
+    needed = set()
+    if not fields:
+        return unneeded
+    for func in get_funcs(resource_type):
+        resolved_func = utils.resolve_ref(func)
+        if not resolved_func:
+            continue
+        declaration = _EXTEND_FUNC_DECLARATIONS.get(
+            getattr(resolved_func, '__func__', resolved_func))
+        if declaration is None:
+            continue
+        if _is_needed(resolved_func, fields):
+            needed |= declaration[1]
+        else:
+            unneeded |= declaration[1]
+    return unneeded - needed
+
+
+def extends(resources, attributes=None, relationships=None):
     """Use to decorate methods on classes before initialization.
 
     Any classes that use this must themselves be decorated with the
@@ -86,9 +154,18 @@ def extends(resources):
                       be registered with each resource as an extend function.
     :type resources: list of str
 
+    :param attributes: The resource attributes set by the decorated method,
+                       see register_funcs().
+    :type attributes: list of str
+
+    :param relationships: The model relationships read by the decorated
+                          method, see register_funcs().
+    :type relationships: list of str
+
     """
     def decorator(method):
         _DECORATED_EXTEND_METHODS[method].extend(resources)
+        _declare(method, attributes, relationships)
         return method
     return decorator
 
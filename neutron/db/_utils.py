@@ -22,6 +22,7 @@ from oslo_log import log as logging
 from oslo_utils import excutils
 from sqlalchemy.ext import associationproxy
 
+from neutron.common import utils
 
 LOG = logging.getLogger(__name__)
 
@@ -133,7 +134,29 @@ def get_marker_obj(plugin, context, resource, limit, marker):
     :param context: The request context.
     :param resource: The resource name.
     :param limit: Indicates if pagination is in effect.
-    :param marker: The id of the marker object.
+    :param marker: The id of the marker object, or a pagination cursor
+                   in which case a KeysetMarker is returned without any
+                   lookup.
     """
     if limit and marker:
+        keyset_marker = get_keyset_marker(marker)
+        if keyset_marker:
+            return keyset_marker
         return getattr(plugin, '_get_%s' % resource)(context, marker)
+
+
+class KeysetMarker(object):
+    """The sort key values of the last item seen, decoded from a cursor."""
+
+    def __init__(self, keys, values):
+        self.keys = keys
+        self.values = values
+
+
+def get_keyset_marker(marker):
+    """Return a KeysetMarker if marker is a pagination cursor, else None.
+
+    :raises BadRequest: if marker is a malformed cursor.
+    """
+    cursor = utils.decode_pagination_cursor(marker)
+    return KeysetMarker(*cursor) if cursor else None
@@ -238,6 +238,11 @@ def sqla_remove(*args):
     _REGISTERED_SQLA_EVENTS.remove(args)
 
 
+def sqla_listening(*args):
+    """Whether a listener is registered through sqla_listen."""
+    return args in _REGISTERED_SQLA_EVENTS
+
+
 def sqla_remove_all():
     for args in _REGISTERED_SQLA_EVENTS:
         try:
@@ -35,6 +35,7 @@ from neutron.db import _utils as db_utils
 from neutron.db import api as db_api
 from neutron.db import common_db_mixin
 from neutron.db import models_v2
+from neutron.db import request_cache
 from neutron.objects import base as base_obj
 from neutron.objects import ports as port_obj
 from neutron.objects import subnet as subnet_obj
@@ -157,7 +158,7 @@ class DbBasePluginCommon(common_db_mixin.CommonDbMixin):
             res['shared'] = subnet.shared
             # Call auxiliary extend functions, if any
             resource_extend.apply_funcs(subnet_def.COLLECTION_NAME,
-                                        res, subnet.db_obj)
+                                        res, subnet.db_obj, fields)
         else:
             res['cidr'] = subnet['cidr']
             res['allocation_pools'] = [{'start': pool['first_ip'],
@@ -175,7 +176,7 @@ class DbBasePluginCommon(common_db_mixin.CommonDbMixin):
                                                     subnet.rbac_entries)
             # Call auxiliary extend functions, if any
             resource_extend.apply_funcs(subnet_def.COLLECTION_NAME,
-                                        res, subnet)
+                                        res, subnet, fields)
 
         return db_utils.resource_fields(res, fields)
 
@@ -215,10 +216,15 @@ class DbBasePluginCommon(common_db_mixin.CommonDbMixin):
                "device_owner": port["device_owner"]}
         # Call auxiliary extend functions, if any
         if process_extensions:
-            resource_extend.apply_funcs(port_def.COLLECTION_NAME, res, port)
+            resource_extend.apply_funcs(port_def.COLLECTION_NAME, res, port,
+                                        fields)
         return db_utils.resource_fields(res, fields)
 
     def _get_network(self, context, id):
+        return request_cache.get(context, request_cache.NETWORK, id,
+                                 lambda: self._load_network(context, id))
+
+    def _load_network(self, context, id):
         try:
             network = model_query.get_by_id(context, models_v2.Network, id)
         except exc.NoResultFound:
@@ -228,6 +234,10 @@ class DbBasePluginCommon(common_db_mixin.CommonDbMixin):
     def _get_subnet(self, context, id):
         # TODO(slaweq): remove this method when all will be switched to use OVO
         # objects only
+        return request_cache.get(context, request_cache.SUBNET, id,
+                                 lambda: self._load_subnet(context, id))
+
+    def _load_subnet(self, context, id):
         try:
             subnet = model_query.get_by_id(context, models_v2.Subnet, id)
         except exc.NoResultFound:
@@ -294,7 +304,8 @@ class DbBasePluginCommon(common_db_mixin.CommonDbMixin):
         res['shared'] = self._is_network_shared(context, network.rbac_entries)
         # Call auxiliary extend functions, if any
         if process_extensions:
-            resource_extend.apply_funcs(net_def.COLLECTION_NAME, res, network)
+            resource_extend.apply_funcs(net_def.COLLECTION_NAME, res, network,
+                                        fields)
         return db_utils.resource_fields(res, fields)
 
     def _is_network_shared(self, context, rbac_entries):
@@ -37,6 +37,7 @@ from oslo_utils import uuidutils
 from sqlalchemy import and_
 from sqlalchemy import exc as sql_exc
 from sqlalchemy import not_
+from sqlalchemy import orm
 
 from neutron._i18n import _
 from neutron.api.rpc.agentnotifiers import l3_rpc_agent_api
@@ -52,6 +53,7 @@ from neutron.db import ipam_pluggable_backend
 from neutron.db import models_v2
 from neutron.db import rbac_db_mixin as rbac_mixin
 from neutron.db import rbac_db_models as rbac_db
+from neutron.db import request_cache
 from neutron.db import standardattrdescription_db as stattr_db
 from neutron.extensions import l3
 from neutron import ipam
@@ -154,6 +156,7 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
 
     def __init__(self):
         self.set_ipam_backend()
+        request_cache.register()
         if cfg.CONF.notify_nova_on_port_status_changes:
             # Import nova conditionally to support the use case of Neutron
             # being used outside of an OpenStack context.
@@ -500,8 +503,9 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
 
     @db_api.retry_if_session_inactive()
     def get_networks_count(self, context, filters=None):
-        return model_query.get_collection_count(context, models_v2.Network,
-                                                filters=filters)
+        return model_query.get_collection_count(
+            context, models_v2.Network, filters=filters,
+            estimate=cfg.CONF.estimated_collection_count)
 
     @db_api.retry_if_session_inactive()
     def create_subnet_bulk(self, context, subnets):
@@ -1396,6 +1400,12 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
                                       sorts=sorts, limit=limit,
                                       marker_obj=marker_obj,
                                       page_reverse=page_reverse)
+        # do not eager load what only the skipped extend functions would read
+        for name in resource_extend.get_unneeded_relationships(
+                port_def.COLLECTION_NAME, fields):
+            relationship = getattr(models_v2.Port, name, None)
+            if relationship is not None:
+                query = query.options(orm.lazyload(relationship))
         items = [self._make_port_dict(c, fields) for c in query]
         if limit and page_reverse:
             items.reverse()
@@ -1403,6 +1413,10 @@ class NeutronDbPluginV2(db_base_plugin_common.DbBasePluginCommon,
 
     @db_api.retry_if_session_inactive()
     def get_ports_count(self, context, filters=None):
+        if not filters:
+            return model_query.get_collection_count(
+                context, models_v2.Port,
+                estimate=cfg.CONF.estimated_collection_count)
         return self._get_ports_query(context, filters).count()
 
     def _enforce_device_owner_not_router_intf_or_device_id(self, context,
@@ -175,16 +175,33 @@ class DNSDbMixin(object):
                 [floatingip_data['floating_ip_address']])
 
     def _process_dns_floatingip_delete(self, context, floatingip_data):
+        self._delete_floatingips_from_external_dns_service(
+            context, self._get_dns_floatingips_delete_data(
+                context, [floatingip_data]))
+
+    def _get_dns_floatingips_delete_data(self, context, floatingips_data):
+        """Return the published DNS records of floating IPs to delete.
+
+        They are removed with the floating IPs, so they are read before to
+        be deleted from the external DNS service afterwards.
+        """
         if not utils.is_extension_supported(self._core_plugin,
                                             dns_apidef.ALIAS):
-            return
-        dns_data_db = fip_obj.FloatingIPDNS.get_object(context,
-                floatingip_id=floatingip_data['id'])
-        if dns_data_db:
+            return []
+        addresses = {floatingip_data['id']:
+                     floatingip_data['floating_ip_address']
+                     for floatingip_data in floatingips_data}
+        return [(dns_data_db['published_dns_domain'],
+                 dns_data_db['published_dns_name'],
+                 addresses[dns_data_db['floatingip_id']])
+                for dns_data_db in fip_obj.FloatingIPDNS.get_objects(
+                    context, floatingip_id=list(addresses))]
+
+    def _delete_floatingips_from_external_dns_service(self, context,
+                                                      dns_data):
+        for dns_domain, dns_name, floating_ip_address in dns_data:
             self._delete_floatingip_from_external_dns_service(
-                context, dns_data_db['published_dns_domain'],
-                dns_data_db['published_dns_name'],
-                [floatingip_data['floating_ip_address']])
+                context, dns_domain, dns_name, [floating_ip_address])
 
     def _validate_floatingip_dns(self, dns_name, dns_domain):
         if dns_domain and not dns_name:
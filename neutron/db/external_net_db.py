@@ -85,7 +85,8 @@ class External_net_db_mixin(object):
             context, network_id=net_id)
 
     @staticmethod
-    @resource_extend.extends([net_def.COLLECTION_NAME])
+    @resource_extend.extends([net_def.COLLECTION_NAME],
+                             attributes=[extnet_apidef.EXTERNAL])
     def _extend_network_dict_l3(network_res, network_db):
         # Comparing with None for converting uuid into bool
         network_res[extnet_apidef.EXTERNAL] = network_db.external is not None
@@ -117,7 +117,9 @@ class ExtraDhcpOptMixin(object):
         return bool(dopts)
 
     @staticmethod
-    @resource_extend.extends([port_def.COLLECTION_NAME])
+    @resource_extend.extends([port_def.COLLECTION_NAME],
+                             attributes=[edo_ext.EXTRADHCPOPTS],
+                             relationships=['dhcp_opts'])
     def _extend_port_dict_extra_dhcp_opt(res, port):
         res[edo_ext.EXTRADHCPOPTS] = [{'opt_name': dho.opt_name,
                                        'opt_value': dho.opt_value,
@@ -1361,7 +1361,12 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
         return self._create_floatingip(context, floatingip, initial_status)
 
     def _update_floatingip(self, context, id, floatingip):
+        update = self._update_floatingip_db(context, id, floatingip)
+        return self._update_floatingip_postcommit(context, *update)
+
+    def _update_floatingip_db(self, context, id, floatingip):
         fip = floatingip['floatingip']
+        dns_data = None
         with context.session.begin(subtransactions=True):
             floatingip_obj = self._get_floatingip(context, id)
             old_floatingip = self._make_floatingip_dict(floatingip_obj)
@@ -1382,7 +1387,12 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
             floatingip_obj = l3_obj.FloatingIP.get_object(
                 context, id=floatingip_obj.id)
             floatingip_db = floatingip_obj.db_obj
+        return (old_floatingip, floatingip_dict, floatingip_db,
+                assoc_result, dns_data)
 
+    def _update_floatingip_postcommit(self, context, old_floatingip,
+                                      floatingip_dict, floatingip_db,
+                                      assoc_result, dns_data):
         registry.notify(resources.FLOATING_IP,
                         events.AFTER_UPDATE,
                         self._update_fip_assoc,
@@ -1409,6 +1419,29 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
             context, id, floatingip)
         return floatingip
 
+    def _update_floatingips(self, context, floatingips):
+        """Update several floating IPs, returning (old, new) dict pairs.
+
+        The floating IPs are all updated in a single transaction, the
+        notifications are sent once it is committed.
+        """
+        with db_api.context_manager.writer.using(context):
+            updates = [self._update_floatingip_db(context, id, floatingip)
+                       for id, floatingip in floatingips]
+        return [self._update_floatingip_postcommit(context, *update)
+                for update in updates]
+
+    @db_api.retry_if_session_inactive()
+    def update_floatingip_bulk(self, context, floatingips):
+        """Update several floating IPs.
+
+        :param floatingips: list of (floating IP id, floating IP body)
+                            pairs, the bodies being those update_floatingip
+                            accepts.
+        """
+        return [floatingip for _old_floatingip, floatingip in
+                self._update_floatingips(context, floatingips)]
+
     @db_api.retry_if_session_inactive()
     def update_floatingip_status(self, context, floatingip_id, status):
         """Update operational status for floating IP in neutron DB."""
@@ -1433,6 +1466,50 @@ class L3_NAT_dbonly_mixin(l3.RouterPluginBase,
     def delete_floatingip(self, context, id):
         self._delete_floatingip(context, id)
 
+    def _delete_floatingips(self, context, ids):
+        """Delete several floating IPs, returning their dicts.
+
+        The floating IP records are all deleted in one transaction. As for a
+        single floating IP, their DNS records are deleted from the external
+        DNS service and their ports deleted after it, since delete_port
+        yields in its post-commit activities. The ports are deleted in bulk
+        when the core plugin supports it.
+        """
+        dns_data = []
+        with db_api.context_manager.writer.using(context):
+            floatingips = l3_obj.FloatingIP.get_objects(context,
+                                                        id=list(ids))
+            found = {floatingip.id for floatingip in floatingips}
+            for id in ids:
+                if id not in found:
+                    raise l3.FloatingIPNotFound(floatingip_id=id)
+            floatingip_dicts = [self._make_floatingip_dict(floatingip)
+                                for floatingip in floatingips]
+            if self._is_dns_integration_supported:
+                dns_data = self._get_dns_floatingips_delete_data(
+                    context, floatingip_dicts)
+            port_ids = [floatingip.floating_port_id
+                        for floatingip in floatingips]
+            for floatingip in floatingips:
+                floatingip.delete()
+        if dns_data:
+            self._delete_floatingips_from_external_dns_service(context,
+                                                               dns_data)
+        delete_port_bulk = getattr(self._core_plugin, 'delete_port_bulk',
+                                   None)
+        if delete_port_bulk:
+            delete_port_bulk(context.elevated(), port_ids,
+                             l3_port_check=False)
+        else:
+            for port_id in port_ids:
+                self._core_plugin.delete_port(context.elevated(), port_id,
+                                              l3_port_check=False)
+        return floatingip_dicts
+
+    @db_api.retry_if_session_inactive()
+    def delete_floatingip_bulk(self, context, ids):
+        self._delete_floatingips(context, ids)
+
     @db_api.retry_if_session_inactive()
     def get_floatingip(self, context, id, fields=None):
         floatingip = self._get_floatingip(context, id)
@@ -1914,6 +1991,20 @@ class L3_NAT_db_mixin(L3_NAT_dbonly_mixin, L3RpcNotifierMixin):
         self.notify_router_updated(context, floating_ip['router_id'],
                                    'delete_floatingip')
 
+    def update_floatingip_bulk(self, context, floatingips):
+        updates = self._update_floatingips(context, floatingips)
+        router_ids = self._floatingips_to_router_ids(
+            [fip for update in updates for fip in update])
+        super(L3_NAT_db_mixin, self).notify_routers_updated(
+            context, router_ids, 'update_floatingip', {})
+        return [floatingip for _old_floatingip, floatingip in updates]
+
+    def delete_floatingip_bulk(self, context, ids):
+        floating_ips = self._delete_floatingips(context, ids)
+        router_ids = self._floatingips_to_router_ids(floating_ips)
+        super(L3_NAT_db_mixin, self).notify_routers_updated(
+            context, router_ids, 'delete_floatingip', {})
+
     def disassociate_floatingips(self, context, port_id, do_notify=True):
         """Disassociate all floating IPs linked to specific port.
 
@@ -1000,7 +1000,26 @@ class L3_NAT_with_dvr_db_mixin(_DVRAgentInterfaceMixin,
         agent_filters = {'host': [fip_host]}
         return self.get_l3_agents(context, filters=agent_filters)
 
-    def _notify_floating_ip_change(self, context, floating_ip):
+    def _notify_floating_ip_changes(self, context, floating_ips):
+        """Notify the changes of several floating IPs.
+
+        The agents are notified once for each router and fixed port, and
+        the centralized routers are updated all at once.
+        """
+        router_ids = set()
+        notified = set()
+        for floating_ip in floating_ips:
+            key = (floating_ip['router_id'], floating_ip['port_id'])
+            if key in notified:
+                continue
+            notified.add(key)
+            self._notify_floating_ip_change(context, floating_ip,
+                                            router_ids=router_ids)
+        if router_ids:
+            self.l3_rpc_notifier.routers_updated(context, list(router_ids))
+
+    def _notify_floating_ip_change(self, context, floating_ip,
+                                   router_ids=None):
         router_id = floating_ip['router_id']
         fixed_port_id = floating_ip['port_id']
         # we need to notify agents only in case Floating IP is associated
@@ -1043,6 +1062,8 @@ class L3_NAT_with_dvr_db_mixin(_DVRAgentInterfaceMixin,
                 for agent in centralized_agent_list:
                     self.l3_rpc_notifier.routers_updated_on_host(
                         context, [router_id], agent['host'])
+        elif router_ids is not None:
+            router_ids.add(router_id)
         else:
             self.notify_router_updated(context, router_id)
 
@@ -1061,6 +1082,23 @@ class L3_NAT_with_dvr_db_mixin(_DVRAgentInterfaceMixin,
         floating_ip = self._delete_floatingip(context, id)
         self._notify_floating_ip_change(context, floating_ip)
 
+    @db_api.retry_if_session_inactive()
+    def update_floatingip_bulk(self, context, floatingips):
+        updates = self._update_floatingips(context, floatingips)
+        changed = []
+        for old_floatingip, floatingip in updates:
+            changed.append(old_floatingip)
+            if (floatingip['router_id'] != old_floatingip['router_id'] or
+                    floatingip['port_id'] != old_floatingip['port_id']):
+                changed.append(floatingip)
+        self._notify_floating_ip_changes(context, changed)
+        return [floatingip for _old_floatingip, floatingip in updates]
+
+    @db_api.retry_if_session_inactive()
+    def delete_floatingip_bulk(self, context, ids):
+        floating_ips = self._delete_floatingips(context, ids)
+        self._notify_floating_ip_changes(context, floating_ips)
+
 
 def is_distributed_router(router):
     """Return True if router to be handled is distributed."""
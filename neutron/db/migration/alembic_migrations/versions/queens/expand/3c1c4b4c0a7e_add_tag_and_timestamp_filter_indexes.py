@@ -0,0 +1,33 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+#
+
+"""add tag and timestamp filter indexes
+
+Revision ID: 3c1c4b4c0a7e
+Revises: 594422d373ee
+Create Date: 2017-11-20 10:12:41.305861
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '3c1c4b4c0a7e'
+down_revision = '594422d373ee'
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_tags_tag_standard_attr_id', 'tags',
+                    ['tag', 'standard_attr_id'], unique=False)
+    op.create_index('ix_standardattributes_updated_at',
+                    'standardattributes', ['updated_at'], unique=False)
@@ -29,3 +29,10 @@ class Tag(model_base.BASEV2):
         'StandardAttribute', load_on_pending=True,
         backref=orm.backref('tags', lazy='subquery', viewonly=True))
     revises_on_change = ('standard_attr', )
+
+    __table_args__ = (
+        # the primary key serves the lookups by resource, this index the
+        # lookups by tag done by the tag filters
+        sa.Index('ix_tags_tag_standard_attr_id', 'tag', 'standard_attr_id'),
+        model_base.BASEV2.__table_args__
+    )
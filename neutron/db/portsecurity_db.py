@@ -28,7 +28,8 @@ class PortSecurityDbMixin(portsecurity_db_common.PortSecurityDbCommon):
 
     @staticmethod
     @resource_extend.extends([net_def.COLLECTION_NAME,
-                              port_def.COLLECTION_NAME])
+                              port_def.COLLECTION_NAME],
+                             attributes=[psec.PORTSECURITY])
     def _extend_port_security_dict(response_data, db_data):
         plugin = directory.get_plugin()
         if ('port-security' in
@@ -0,0 +1,183 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Accounting of the SQL statements issued while serving a request.
+
+The statements executed by the green thread serving an API request or an
+RPC call are counted, timed and their rows added up. The result is logged
+and can be returned to API clients in a response header. Statements run
+many times within the same request are reported as a likely N+1 pattern.
+"""
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from sqlalchemy import engine
+
+from neutron.db import api as db_api
+
+LOG = logging.getLogger(__name__)
+
+HEADER = 'X-Neutron-Query-Stats'
+
+# NOTE: threading.local is green thread local once eventlet monkey patched
+_local = threading.local()
+
+
+class QueryStats(object):
+    """The statements issued for one request."""
+
+    def __init__(self, name, request_id=None):
+        self.name = name
+        self.request_id = request_id
+        self.statements = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.repeats = collections.Counter()
+
+    def record(self, statement, duration, rows):
+        self.statements += 1
+        self.duration += duration
+        self.rows += max(rows, 0)
+        self.repeats[statement] += 1
+
+    def most_repeated(self):
+        """Return the (statement, count) executed the most, or None."""
+        most_common = self.repeats.most_common(1)
+        return most_common[0] if most_common else None
+
+    def __str__(self):
+        return 'statements=%d; time=%.3f; rows=%d' % (
+            self.statements, self.duration, self.rows)
+
+
+def _engine_connect(conn, branch):
+    # NOTE: oslo.db pings every connection checked out from the pool with
+    # an engine_connect listener of the engine, which runs after those of
+    # the Engine class. The ping is the first statement of the connection
+    # and is not one of the request.
+    if not branch and getattr(_local, 'stats', None) is not None:
+        conn.info['query_stats_connecting'] = True
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    if conn.info.pop('query_stats_connecting', False):
+        return
+    if getattr(_local, 'stats', None) is not None:
+        conn.info.setdefault('query_stats_start', []).append(time.time())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    stats = getattr(_local, 'stats', None)
+    starts = conn.info.get('query_stats_start')
+    if stats is None or not starts:
+        return
+    stats.record(statement, time.time() - starts.pop(), cursor.rowcount)
+
+
+def _listen():
+    for name, listener in (('engine_connect', _engine_connect),
+                           ('before_cursor_execute', _before_cursor_execute),
+                           ('after_cursor_execute', _after_cursor_execute)):
+        if not db_api.sqla_listening(engine.Engine, name, listener):
+            db_api.sqla_listen(engine.Engine, name, listener)
+
+
+def _report(stats):
+    LOG.debug("%(name)s (request %(request_id)s) issued %(stats)s",
+              {'name': stats.name, 'request_id': stats.request_id,
+               'stats': stats})
+    most_repeated = stats.most_repeated()
+    threshold = cfg.CONF.query_stats_repeat_threshold
+    if most_repeated and threshold and most_repeated[1] >= threshold:
+        LOG.warning("%(name)s (request %(request_id)s) executed the same "
+                    "statement %(count)d times, this is likely an N+1 query "
+                    "pattern: %(statement)s",
+                    {'name': stats.name, 'request_id': stats.request_id,
+                     'count': most_repeated[1],
+                     'statement': most_repeated[0][:500]})
+
+
+@contextlib.contextmanager
+def record(name, request_id=None):
+    """Record the statements issued in the block into a QueryStats.
+
+    When already recording, e.g. in an RPC handler called by an API
+    request, the statements are added to the outer QueryStats.
+    """
+    stats = getattr(_local, 'stats', None)
+    if stats is not None:
+        yield stats
+        return
+    _listen()
+    stats = _local.stats = QueryStats(name, request_id)
+    try:
+        yield stats
+    finally:
+        _local.stats = None
+
+
+@contextlib.contextmanager
+def collect(name, request_id=None):
+    """Record and report the statements issued in the block if enabled.
+
+    Yields the QueryStats, or None when query_stats is disabled.
+    """
+    if not cfg.CONF.query_stats:
+        yield None
+        return
+    outer = getattr(_local, 'stats', None) is not None
+    with record(name, request_id) as stats:
+        try:
+            yield stats
+        finally:
+            if not outer:
+                _report(stats)
+
+
+def begin(name, request_id=None):
+    """Start recording the statements issued, if query_stats is enabled.
+
+    For the callers which cannot wrap the request in a collect() block.
+    Returns the QueryStats to pass to end(), or None when query_stats is
+    disabled or the statements are already recorded by an outer caller.
+    """
+    if not cfg.CONF.query_stats or getattr(_local, 'stats', None) is not None:
+        return None
+    _listen()
+    stats = _local.stats = QueryStats(name, request_id)
+    return stats
+
+
+def end(stats):
+    """Stop recording and report the statements of a begin() call."""
+    if stats is None:
+        return
+    if getattr(_local, 'stats', None) is stats:
+        _local.stats = None
+    _report(stats)
+
+
+def instrument(f):
+    """Collect the statements issued by an RPC handler method."""
+    @functools.wraps(f)
+    def wrapper(self, context, *args, **kwargs):
+        with collect(f.__name__, getattr(context, 'request_id', None)):
+            return f(self, context, *args, **kwargs)
+    return wrapper
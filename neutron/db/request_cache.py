@@ -0,0 +1,149 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Memoization of lookups within a database transaction.
+
+A port operation looks up its network, subnets and network segments many
+times, from the plugin, the IPAM backend and the mechanism driver contexts.
+The results of these lookups are kept on the session of the neutron context
+for the duration of the transaction, so that each is read once. They are
+dropped when the transaction ends and whenever a row of a model they were
+read from is written in the session. Nothing is cached until the listeners
+doing so are registered with register().
+"""
+
+import itertools
+
+from neutron_lib.db import model_base
+from sqlalchemy import orm
+
+from neutron.db import api as db_api
+from neutron.db.models import segment as segment_model
+from neutron.db import models_v2
+
+_INFO_KEY = 'neutron_request_cache'
+_MISSING = object()
+
+NETWORK = 'network'
+SUBNET = 'subnet'
+SEGMENTS = 'segments'
+
+# The models whose writes invalidate each kind of cached lookup
+_MODELS = {
+    NETWORK: (models_v2.Network,),
+    SUBNET: (models_v2.Subnet,),
+    SEGMENTS: (segment_model.NetworkSegment,),
+}
+
+
+def _get_cache(context):
+    # Without the listeners, nothing would drop the stale lookups
+    if not db_api.sqla_listening(orm.session.Session, 'after_commit',
+                                 _clear_on_commit):
+        return None
+    session = context.session
+    # Outside of a transaction every statement sees the latest data
+    if session.transaction is None or not session.is_active:
+        return None
+    return session.info.setdefault(_INFO_KEY, {})
+
+
+def _scoped_key(context, key):
+    # The lookups are filtered by the query hooks according to the
+    # credentials, and elevated copies of a context share its session.
+    return (key, context.is_admin, context.is_advsvc, context.project_id)
+
+
+def get(context, kind, key, loader):
+    """Return the result of loader() for key, loading it once.
+
+    :param kind: the kind of lookup, one of NETWORK, SUBNET or SEGMENTS.
+    :param key: the key of the looked up item within its kind.
+    :param loader: called without arguments when the item is not cached.
+    """
+    return get_many(context, kind, [key],
+                    lambda keys: {key: loader()})[key]
+
+
+def get_many(context, kind, keys, loader):
+    """Return a dict of the results of loader() for keys.
+
+    :param loader: called with the list of the keys which are not cached,
+                   returns a dict mapping each of them to its result.
+    """
+    cache = _get_cache(context)
+    if cache is None:
+        return loader(list(keys))
+    entries = cache.setdefault(kind, {})
+    result = {}
+    missing = []
+    for key in keys:
+        value = entries.get(_scoped_key(context, key), _MISSING)
+        # Objects since expunged from the session are loaded again
+        if value is _MISSING or (isinstance(value, model_base.BASEV2) and
+                                 value not in context.session):
+            missing.append(key)
+        else:
+            result[key] = value
+    if missing:
+        loaded = loader(missing)
+        for key, value in loaded.items():
+            entries[_scoped_key(context, key)] = value
+        result.update(loaded)
+    return result
+
+
+def clear(session):
+    session.info.pop(_INFO_KEY, None)
+
+
+def _invalidate_written(session, flush_context):
+    cache = session.info.get(_INFO_KEY)
+    if not cache:
+        return
+    for obj in itertools.chain(session.new, session.dirty, session.deleted):
+        for kind in list(cache):
+            if isinstance(obj, _MODELS[kind]):
+                del cache[kind]
+
+
+def _invalidate_bulk_update(update_context):
+    clear(update_context.session)
+
+
+def _invalidate_bulk_delete(delete_context):
+    clear(delete_context.session)
+
+
+def _clear_on_commit(session):
+    clear(session)
+
+
+def _clear_on_rollback(session, previous_transaction):
+    clear(session)
+
+
+_LISTENERS = (
+    ('after_flush', _invalidate_written),
+    ('after_bulk_update', _invalidate_bulk_update),
+    ('after_bulk_delete', _invalidate_bulk_delete),
+    ('after_soft_rollback', _clear_on_rollback),
+    # registered last, _get_cache checks it
+    ('after_commit', _clear_on_commit),
+)
+
+
+def register():
+    """Register the session listeners dropping the stale lookups."""
+    for name, listener in _LISTENERS:
+        if not db_api.sqla_listening(orm.session.Session, name, listener):
+            db_api.sqla_listen(orm.session.Session, name, listener)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
+
 import netaddr
 from neutron_lib import constants as const
 from neutron_lib.utils import helpers
@@ -115,13 +117,39 @@ class SecurityGroupServerNotifierRpcMixin(sg_db.SecurityGroupDbMixin):
                 [const.DEVICE_OWNER_DHCP, const.ROUTER_INTERFACE_OWNERS]):
                 sec_groups |= set(port.get(ext_sg.SECURITYGROUPS))
 
-        if sec_groups:
-            self.notifier.security_groups_member_updated(
-                context, list(sec_groups))
+        if not sec_groups:
+            return
+        pending = getattr(context, '_pending_sg_member_updates', None)
+        if pending is not None:
+            pending |= sec_groups
+            return
+        self.notifier.security_groups_member_updated(
+            context, list(sec_groups))
 
     def notify_security_groups_member_updated(self, context, port):
         self.notify_security_groups_member_updated_bulk(context, [port])
 
+    @contextlib.contextmanager
+    def coalesce_security_group_member_updates(self, context):
+        """Notify the member updates of the block at once when it exits.
+
+        The agents then receive a single notification for all the security
+        groups whose members were changed by a bulk operation, instead of
+        one per port.
+        """
+        if getattr(context, '_pending_sg_member_updates', None) is not None:
+            yield
+            return
+        context._pending_sg_member_updates = set()
+        try:
+            yield
+        finally:
+            sec_groups = context._pending_sg_member_updates
+            context._pending_sg_member_updates = None
+            if sec_groups:
+                self.notifier.security_groups_member_updated(
+                    context, list(sec_groups))
+
 
 class SecurityGroupInfoAPIMixin(object):
     """API for retrieving security group info for SG agent code."""
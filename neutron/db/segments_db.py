@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from neutron_lib.callbacks import events
 from neutron_lib.callbacks import registry
 from neutron_lib.callbacks import resources
@@ -18,6 +20,7 @@ from oslo_utils import uuidutils
 
 from neutron.db import api as db_api
 from neutron.db.models import segment as segments_model
+from neutron.db import request_cache
 from neutron.objects import base as base_obj
 from neutron.objects import network as network_obj
 
@@ -71,16 +74,30 @@ def get_networks_segments(context, network_ids, filter_dynamic=False):
         return {}
 
     with db_api.context_manager.reader.using(context):
-        filters = {
-            'network_id': network_ids,
-        }
-        if filter_dynamic is not None:
-            filters['is_dynamic'] = filter_dynamic
-        objs = network_obj.NetworkSegment.get_objects(context, **filters)
-        result = {net_id: [] for net_id in network_ids}
-        for record in objs:
-            result[record.network_id].append(_make_segment_dict(record))
-        return result
+        segments = request_cache.get_many(
+            context, request_cache.SEGMENTS,
+            [(net_id, filter_dynamic) for net_id in network_ids],
+            functools.partial(_load_networks_segments, context))
+        # the segment dicts are copied as they are cached
+        return {net_id: [dict(segment)
+                         for segment in segments[(net_id, filter_dynamic)]]
+                for net_id in network_ids}
+
+
+def _load_networks_segments(context, keys):
+    network_ids = [net_id for net_id, _filter_dynamic in keys]
+    filter_dynamic = keys[0][1]
+    filters = {
+        'network_id': network_ids,
+    }
+    if filter_dynamic is not None:
+        filters['is_dynamic'] = filter_dynamic
+    objs = network_obj.NetworkSegment.get_objects(context, **filters)
+    result = {key: [] for key in keys}
+    for record in objs:
+        result[(record.network_id, filter_dynamic)].append(
+            _make_segment_dict(record))
+    return result
 
 
 def get_segment_by_id(context, segment_id):
@@ -63,6 +63,12 @@ class StandardAttribute(model_base.BASEV2):
     updated_at = sa.Column(sqlalchemytypes.TruncatedDateTime,
                            onupdate=timeutils.utcnow)
 
+    __table_args__ = (
+        # serves the changed_since filter
+        sa.Index('ix_standardattributes_updated_at', 'updated_at'),
+        model_base.BASEV2.__table_args__
+    )
+
     __mapper_args__ = {
         # see http://docs.sqlalchemy.org/en/latest/orm/versioning.html for
         # details about how this works
@@ -22,7 +22,8 @@ class StandardAttrDescriptionMixin(object):
 
     @staticmethod
     @resource_extend.extends(
-        list(standard_attr.get_standard_attr_resource_model_map()))
+        list(standard_attr.get_standard_attr_resource_model_map()),
+        attributes=['description'])
     def _extend_standard_attr_description(res, db_object):
         if not hasattr(db_object, 'description'):
             return
@@ -12,7 +12,7 @@
 #    under the License.
 #
 
-from sqlalchemy.orm import aliased
+import sqlalchemy as sa
 
 from neutron.db.models import tag as tag_model
 
@@ -24,6 +24,21 @@ def _get_tag_list(tag_strings):
     return list(tags)
 
 
+def _tagged_with_any(query, tags):
+    """Select the standard attribute ids having any of the tags."""
+    return query.session.query(tag_model.Tag.standard_attr_id).filter(
+        tag_model.Tag.tag.in_(tags))
+
+
+def _tagged_with_all(query, tags):
+    """Select the standard attribute ids having all of the tags."""
+    subq = _tagged_with_any(query, tags)
+    if len(tags) > 1:
+        subq = subq.group_by(tag_model.Tag.standard_attr_id).having(
+            sa.func.count(tag_model.Tag.tag) == len(tags))
+    return subq
+
+
 def apply_tag_filters(model, query, filters):
     """Apply tag filters
 
@@ -45,45 +60,30 @@ def apply_tag_filters(model, query, filters):
           'GET /v2.0/networks?tags-any=red,blue' is equivalent to
           'GET /v2.0/networks?tags-any=red&tags-any=blue'
           it means 'red' or 'blue'.
+
+    Each filter is a semi-join against the tags table rather than a join,
+    so that resources matching several tags are not returned more than
+    once and the tags are looked up with the index on tag.
     """
 
     if 'tags' in filters:
         tags = _get_tag_list(filters.pop('tags'))
-        first_tag = tags.pop(0)
-        query = query.join(tag_model.Tag,
-            model.standard_attr_id == tag_model.Tag.standard_attr_id)
-        query = query.filter(tag_model.Tag.tag == first_tag)
-
-        for tag in tags:
-            tag_alias = aliased(tag_model.Tag)
-            query = query.join(tag_alias,
-                model.standard_attr_id == tag_alias.standard_attr_id)
-            query = query.filter(tag_alias.tag == tag)
+        query = query.filter(
+            model.standard_attr_id.in_(_tagged_with_all(query, tags)))
 
     if 'tags-any' in filters:
         tags = _get_tag_list(filters.pop('tags-any'))
-        query = query.join(tag_model.Tag,
-            model.standard_attr_id == tag_model.Tag.standard_attr_id)
-        query = query.filter(tag_model.Tag.tag.in_(tags))
+        query = query.filter(
+            model.standard_attr_id.in_(_tagged_with_any(query, tags)))
 
     if 'not-tags' in filters:
         tags = _get_tag_list(filters.pop('not-tags'))
-        first_tag = tags.pop(0)
-        subq = query.session.query(tag_model.Tag.standard_attr_id)
-        subq = subq.filter(tag_model.Tag.tag == first_tag)
-
-        for tag in tags:
-            tag_alias = aliased(tag_model.Tag)
-            subq = subq.join(tag_alias,
-                tag_model.Tag.standard_attr_id == tag_alias.standard_attr_id)
-            subq = subq.filter(tag_alias.tag == tag)
-
-        query = query.filter(~model.standard_attr_id.in_(subq))
+        query = query.filter(
+            ~model.standard_attr_id.in_(_tagged_with_all(query, tags)))
 
     if 'not-tags-any' in filters:
         tags = _get_tag_list(filters.pop('not-tags-any'))
-        subq = query.session.query(tag_model.Tag.standard_attr_id)
-        subq = subq.filter(tag_model.Tag.tag.in_(tags))
-        query = query.filter(~model.standard_attr_id.in_(subq))
+        query = query.filter(
+            ~model.standard_attr_id.in_(_tagged_with_any(query, tags)))
 
     return query
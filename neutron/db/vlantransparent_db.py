@@ -23,7 +23,8 @@ class Vlantransparent_db_mixin(object):
     """Mixin class to add vlan transparent methods to db_base_plugin_v2."""
 
     @staticmethod
-    @resource_extend.extends([net_def.COLLECTION_NAME])
+    @resource_extend.extends([net_def.COLLECTION_NAME],
+                             attributes=[vlantransparent.VLANTRANSPARENT])
     def _extend_network_dict_vlan_transparent(network_res, network_db):
         network_res[vlantransparent.VLANTRANSPARENT] = (
             network_db.vlan_transparent)
@@ -29,6 +29,7 @@ from oslo_versionedobjects import fields as obj_fields
 import six
 
 from neutron._i18n import _
+from neutron.db import _utils as ndb_utils
 from neutron.db import api as db_api
 from neutron.db import standard_attr
 from neutron.objects.db import api as obj_db_api
@@ -88,8 +89,9 @@ class Pager(object):
             if getattr(self, attr) is not None
         }
         if self.marker and self.limit:
-            res['marker_obj'] = obj_db_api.get_object(
-                context, model, id=self.marker)
+            res['marker_obj'] = (
+                ndb_utils.get_keyset_marker(self.marker) or
+                obj_db_api.get_object(context, model, id=self.marker))
         return res
 
     def __str__(self):
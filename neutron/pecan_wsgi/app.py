@@ -29,6 +29,7 @@ def v2_factory(global_config, **local_config):
     #   As request enters lower priority called before higher.
     #   Reponse from controller is passed from higher priority to lower.
     app_hooks = [
+        hooks.QueryStatsHook(),  # priority 80
         hooks.UserFilterHook(),  # priority 90
         hooks.ContextHook(),  # priority 95
         hooks.ExceptionTranslationHook(),  # priority 100
@@ -137,16 +137,45 @@ class CollectionsController(utils.NeutronPecanController):
         lister_args = [neutron_context]
         if 'parent_id' in request.context:
             lister_args.append(request.context['parent_id'])
-        return {self.collection: self.plugin_lister(*lister_args,
-                **query_params)}
+        items = self.plugin_lister(*lister_args, **query_params)
+        if request.context.get('streamable'):
+            # NOTE: the items are not rendered here, the PolicyHook
+            # streams them to the response body once they are filtered
+            request.context['streamed_items'] = items
+            return pecan.response
+        return {self.collection: items}
 
     @utils.when(index, method='HEAD')
     @utils.when(index, method='PATCH')
-    @utils.when(index, method='PUT')
-    @utils.when(index, method='DELETE')
     def not_supported(self):
         pecan.abort(405)
 
+    @utils.when(index, method='PUT')
+    def put(self, *args, **kwargs):
+        # NOTE: the ids of the resources to update are popped from the
+        # items of the request body by the BodyValidationHook
+        if not self.plugin_bulk_updater:
+            pecan.abort(405)
+        if 'resource_ids' not in request.context:
+            msg = _("Unable to find '%s' in request body") % self.collection
+            raise webob.exc.HTTPBadRequest(msg)
+        neutron_context = request.context['neutron_context']
+        data = [(resource_id, {self.resource: item})
+                for resource_id, item in zip(request.context['resource_ids'],
+                                             request.context['resources'])]
+        return {self.collection: self.plugin_bulk_updater(neutron_context,
+                                                          data)}
+
+    @utils.when_delete(index)
+    def delete(self):
+        # NOTE: the ids of the resources to delete are the values of the id
+        # query parameters
+        if not self.plugin_bulk_deleter:
+            pecan.abort(405)
+        neutron_context = request.context['neutron_context']
+        return self.plugin_bulk_deleter(neutron_context,
+                                        request.context['resource_ids'])
+
     @utils.when(index, method='POST')
     def post(self, *args, **kwargs):
         if 'resources' not in request.context:
@@ -275,6 +275,18 @@ class NeutronPecanController(object):
     def plugin_updater(self):
         return getattr(self.plugin, self._plugin_handlers[self.UPDATE])
 
+    @property
+    def plugin_bulk_updater(self):
+        # NOTE: bulk updates and deletes are not emulated, they are only
+        # available with plugins implementing them natively
+        return getattr(self.plugin,
+                       '%s_bulk' % self._plugin_handlers[self.UPDATE], None)
+
+    @property
+    def plugin_bulk_deleter(self):
+        return getattr(self.plugin,
+                       '%s_bulk' % self._plugin_handlers[self.DELETE], None)
+
 
 class ShimRequest(object):
 
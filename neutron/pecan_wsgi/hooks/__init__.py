@@ -19,6 +19,7 @@ from neutron.pecan_wsgi.hooks import notifier
 from neutron.pecan_wsgi.hooks import ownership_validation
 from neutron.pecan_wsgi.hooks import policy_enforcement
 from neutron.pecan_wsgi.hooks import query_parameters
+from neutron.pecan_wsgi.hooks import query_stats
 from neutron.pecan_wsgi.hooks import quota_enforcement
 from neutron.pecan_wsgi.hooks import translation
 from neutron.pecan_wsgi.hooks import userfilters
@@ -32,4 +33,5 @@ PolicyHook = policy_enforcement.PolicyHook
 QuotaEnforcementHook = quota_enforcement.QuotaEnforcementHook
 NotifierHook = notifier.NotifierHook
 QueryParametersHook = query_parameters.QueryParametersHook
+QueryStatsHook = query_stats.QueryStatsHook
 UserFilterHook = userfilters.UserFilterHook
@@ -27,6 +27,10 @@ class BodyValidationHook(hooks.PecanHook):
     priority = 120
 
     def before(self, state):
+        is_bulk = utils.is_bulk_request(state)
+        if is_bulk and state.request.method == 'DELETE':
+            self._set_bulk_delete_ids(state)
+            return
         if state.request.method not in ('POST', 'PUT'):
             return
         resource = state.request.context.get('resource')
@@ -51,6 +55,8 @@ class BodyValidationHook(hooks.PecanHook):
             # there is no resource in the request. This can happen when a
             # member action is being processed or on agent scheduler operations
             return
+        if is_bulk:
+            self._set_bulk_update_ids(state, json_data)
         # Prepare data to be passed to the plugin from request body
         controller = utils.get_controller(state)
         data = v2_base.Controller.prepare_request_body(
@@ -59,7 +65,7 @@ class BodyValidationHook(hooks.PecanHook):
             is_create,
             resource,
             controller.resource_info,
-            allow_bulk=is_create)
+            allow_bulk=is_create or is_bulk)
         if collection in data:
             state.request.context['resources'] = [item[resource] for item in
                                                   data[collection]]
@@ -67,3 +73,36 @@ class BodyValidationHook(hooks.PecanHook):
         else:
             state.request.context['resources'] = [data[resource]]
             state.request.context['is_bulk'] = False
+
+    @staticmethod
+    def _check_bulk_ids(resource_ids):
+        if not resource_ids:
+            raise webob.exc.HTTPBadRequest(_("Resources required"))
+        if len(set(resource_ids)) != len(resource_ids):
+            msg = _("Duplicate resource ids in bulk request")
+            raise webob.exc.HTTPBadRequest(msg)
+
+    def _set_bulk_update_ids(self, state, json_data):
+        # The items of a bulk update carry the id of the resource they
+        # update, which is not an updatable attribute
+        collection = state.request.context.get('collection')
+        items = json_data.get(collection)
+        if not isinstance(items, list):
+            msg = _("Unable to find '%s' in request body") % collection
+            raise webob.exc.HTTPBadRequest(msg)
+        resource_ids = []
+        for item in items:
+            if not isinstance(item, dict) or not item.get('id'):
+                msg = _("The items of a bulk update require an id")
+                raise webob.exc.HTTPBadRequest(msg)
+            resource_ids.append(item.pop('id'))
+        self._check_bulk_ids(resource_ids)
+        state.request.context['resource_ids'] = resource_ids
+
+    def _set_bulk_delete_ids(self, state):
+        if state.request.body:
+            msg = _("Request body is not supported in DELETE.")
+            raise webob.exc.HTTPBadRequest(msg)
+        resource_ids = state.request.GET.getall('id')
+        self._check_bulk_ids(resource_ids)
+        state.request.context['resource_ids'] = resource_ids
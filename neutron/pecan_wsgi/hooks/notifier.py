@@ -44,6 +44,9 @@ class NotifierHook(hooks.PecanHook):
             return
         action = pecan_constants.ACTION_MAP.get(state.request.method)
         event = '%s.%s.start' % (resource, action)
+        if state.request.context.get('resource_ids') is not None:
+            self._notify_bulk_start(state, resource, action, event)
+            return
         if action in ('create', 'update'):
             # notifier just gets plain old body without any treatment other
             # than the population of the object ID being operated on
@@ -61,6 +64,21 @@ class NotifierHook(hooks.PecanHook):
         self._notifier.info(state.request.context.get('neutron_context'),
                             event, payload)
 
+    def _notify_bulk_start(self, state, resource, action, event):
+        # the items of bulk updates and deletes are notified one by one, as
+        # for the equivalent single requests
+        neutron_context = state.request.context.get('neutron_context')
+        if action == 'update':
+            collection = state.request.context.get('collection')
+            for item in state.request.json[collection]:
+                payload = {resource: dict(item)}
+                payload['id'] = payload[resource].pop('id')
+                self._notifier.info(neutron_context, event, payload)
+        else:
+            for resource_id in state.request.context['resource_ids']:
+                self._notifier.info(neutron_context, event,
+                                    {resource + '_id': resource_id})
+
     def after(self, state):
         resource_name = state.request.context.get('resource')
         collection_name = state.request.context.get('collection')
@@ -79,6 +97,11 @@ class NotifierHook(hooks.PecanHook):
                       "status code: %s", state.response.status_int)
             return
 
+        if state.request.context.get('resource_ids') is not None:
+            self._notify_bulk_end(state, resource_name, collection_name,
+                                  action)
+            return
+
         original = {}
         if (action in ('delete', 'update') and
                 state.request.context.get('original_resources', [])):
@@ -108,3 +131,25 @@ class NotifierHook(hooks.PecanHook):
             result[resource_name + '_id'] = resource_id
 
         self._notifier.info(neutron_context, notifier_method, result)
+
+    def _notify_bulk_end(self, state, resource_name, collection_name,
+                         action):
+        neutron_context = state.request.context.get('neutron_context')
+        originals = state.request.context.get('original_resources', [])
+        if action == 'delete':
+            results = [{resource_name: original} for original in originals]
+            originals = [{}] * len(results)
+        else:
+            results = [{resource_name: item}
+                       for item in state.response.json[collection_name]]
+        notifier_method = '%s.%s.end' % (resource_name, action)
+        notifier_action = utils.get_controller(state).plugin_handlers[action]
+        for original, result in zip(originals, results):
+            registry.notify(resource_name, events.BEFORE_RESPONSE, self,
+                            context=neutron_context, data=result,
+                            method_name=notifier_method,
+                            action=notifier_action,
+                            collection=collection_name, original=original)
+            if action == 'delete':
+                result[resource_name + '_id'] = result[resource_name]['id']
+            self._notifier.info(neutron_context, notifier_method, result)
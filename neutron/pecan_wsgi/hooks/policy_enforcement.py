@@ -27,8 +27,10 @@ from neutron.extensions import quotasv2
 from neutron import manager
 from neutron.pecan_wsgi import constants as pecan_constants
 from neutron.pecan_wsgi.controllers import quota
+from neutron.pecan_wsgi.hooks import userfilters
 from neutron.pecan_wsgi.hooks import utils
 from neutron import policy
+from neutron import wsgi
 
 LOG = logging.getLogger(__name__)
 
@@ -39,21 +41,24 @@ def _custom_getter(resource, resource_id):
         return quota.get_tenant_quotas(resource_id)[quotasv2.RESOURCE_NAME]
 
 
+def _get_fetch_fields(method, controller):
+    if method != 'PUT':
+        return []
+    return [name for (name, value) in controller.resource_info.items()
+            if (value.get('required_by_policy') or
+                value.get('primary_key') or 'default' not in value)]
+
+
 def fetch_resource(method, neutron_context, controller,
                    collection, resource, resource_id,
                    parent_id=None):
-    field_list = []
-    if method == 'PUT':
-        attrs = controller.resource_info
-        if not attrs:
-            # this isn't a request for a normal resource. it could be
-            # an action like removing a network from a dhcp agent.
-            # return None and assume the custom controller for this will
-            # handle the necessary logic.
-            return
-        field_list = [name for (name, value) in attrs.items()
-                      if (value.get('required_by_policy') or
-                          value.get('primary_key') or 'default' not in value)]
+    if method == 'PUT' and not controller.resource_info:
+        # this isn't a request for a normal resource. it could be
+        # an action like removing a network from a dhcp agent.
+        # return None and assume the custom controller for this will
+        # handle the necessary logic.
+        return
+    field_list = _get_fetch_fields(method, controller)
     plugin = manager.NeutronManager.get_plugin_for_resource(collection)
     if plugin:
         if utils.is_member_action(controller):
@@ -71,6 +76,23 @@ def fetch_resource(method, neutron_context, controller,
         return _custom_getter(resource, resource_id)
 
 
+def fetch_resources(method, neutron_context, controller, resource_ids):
+    """Fetch the resources of a bulk request with a single list call.
+
+    The resources are returned in the order of resource_ids. Like for a
+    single resource, a missing one fails the whole request.
+    """
+    field_list = _get_fetch_fields(method, controller)
+    found = {item[controller.primary_key]: item
+             for item in controller.plugin_lister(
+                 neutron_context, filters={'id': resource_ids},
+                 fields=field_list)}
+    if set(resource_ids) - set(found):
+        msg = _('The resource could not be found.')
+        raise webob.exc.HTTPNotFound(msg)
+    return [found[resource_id] for resource_id in resource_ids]
+
+
 class PolicyHook(hooks.PecanHook):
     priority = 140
 
@@ -99,13 +121,26 @@ class PolicyHook(hooks.PecanHook):
         action = controller.plugin_handlers[
             pecan_constants.ACTION_MAP[state.request.method]]
 
-        # NOTE(salv-orlando): As bulk updates are not supported, in case of PUT
+        # NOTE(salv-orlando): Unless it is a bulk request, in case of PUT
         # requests there will be only a single item to process, and its
         # identifier would have been already retrieved by the lookup process;
         # in the case of DELETE requests there won't be any item to process in
         # the request body
         original_resources = []
-        if needs_prefetch:
+        resource_ids = state.request.context.get('resource_ids')
+        if needs_prefetch and resource_ids is not None:
+            # the resources of bulk requests are all fetched at once
+            original_resources = fetch_resources(
+                state.request.method, neutron_context, controller,
+                resource_ids)
+            items = resources_copy or [{}] * len(original_resources)
+            resources_copy = []
+            for resource_obj, item in zip(original_resources, items):
+                obj = copy.copy(resource_obj)
+                obj.update(item)
+                obj[const.ATTRIBUTES_TO_UPDATE] = item.keys()
+                resources_copy.append(obj)
+        elif needs_prefetch:
             try:
                 item = resources_copy.pop()
             except IndexError:
@@ -158,6 +193,14 @@ class PolicyHook(hooks.PecanHook):
         # NOTE(kevinbenton): extension listing isn't controlled by policy
         if resource == 'extension':
             return
+        streamed_items = state.request.context.get('streamed_items')
+        if streamed_items is not None:
+            policy.init()
+            self._stream_collection(
+                state, controller, resource, collection, streamed_items,
+                controller.plugin_handlers[controller.SHOW],
+                manager.NeutronManager.get_plugin_for_resource(collection))
+            return
         try:
             data = state.response.json
         except ValueError:
@@ -200,6 +243,33 @@ class PolicyHook(hooks.PecanHook):
             resp = resp[0]
         state.response.json = {key: resp}
 
+    def _stream_collection(self, state, controller, resource, collection,
+                           items, action, plugin):
+        """Authorize, filter and serialize the items as they are sent.
+
+        The items are the plugin result, which the controller did not
+        render. The user requested fields are filtered here as well, and
+        the following hooks leave the streamed response alone.
+        """
+        neutron_context = state.request.context.get('neutron_context')
+        user_fields = state.request.params.getall('fields')
+
+        def _iter_items():
+            for item in items:
+                if not policy.check(neutron_context, action, item,
+                                    plugin=plugin, pluralized=collection):
+                    continue
+                item = self._get_filtered_item(state.request, controller,
+                                               resource, collection, item)
+                yield (userfilters.filter_item(item, user_fields)
+                       if user_fields else item)
+
+        body = {collection: wsgi.StreamedCollection(_iter_items())}
+        state.request.context['streamed'] = True
+        state.response.content_type = 'application/json'
+        state.response.app_iter = (
+            wsgi.JSONDictSerializer().serialize_chunks(body))
+
     def _get_filtered_item(self, request, controller, resource, collection,
                            data):
         neutron_context = request.context.get('neutron_context')
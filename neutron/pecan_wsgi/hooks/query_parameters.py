@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo_config import cfg
 from pecan import hooks
 
 from neutron.api import api_common
@@ -108,6 +109,15 @@ class QueryParametersHook(hooks.PecanHook):
         pagination_helper.update_fields(query_params.get('fields', []),
                                         added_fields)
         state.request.context['query_params'] = query_params
+        # the items can only be streamed when the sorting does not have to
+        # be emulated over the whole list, and without pagination links
+        # to build from it
+        state.request.context['streamable'] = (
+            cfg.CONF.stream_list_responses and
+            not (isinstance(sorting_helper,
+                            api_common.SortingEmulatedHelper) and
+                 sorting_helper.sort_dict) and
+            not getattr(pagination_helper, 'limit', None))
 
     def _process_if_match_headers(self, state):
         collection = state.request.context.get('collection')
@@ -126,7 +136,8 @@ class QueryParametersHook(hooks.PecanHook):
         collection = state.request.context.get('collection')
         # NOTE(blogan): don't paginate extension list or non-GET requests
         if (not resource or resource == 'extension' or
-                state.request.method != 'GET'):
+                state.request.method != 'GET' or
+                state.request.context.get('streamed')):
             return
         try:
             data = state.response.json
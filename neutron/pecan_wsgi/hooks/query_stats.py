@@ -0,0 +1,43 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from oslo_config import cfg
+from pecan import hooks
+
+from neutron.db import query_stats
+
+
+class QueryStatsHook(hooks.PecanHook):
+    """Counts the SQL statements issued while serving the request."""
+
+    # run before and after every other hook, so that the statements issued
+    # by the policy, quota and notifier hooks are counted as well
+    priority = 80
+
+    def before(self, state):
+        ctx = state.request.environ.get('neutron.context')
+        request_id = (getattr(ctx, 'request_id', None) or
+                      state.request.environ.get('openstack.request_id'))
+        state.request.context['query_stats'] = query_stats.begin(
+            '%s %s' % (state.request.method, state.request.path), request_id)
+
+    def after(self, state):
+        stats = state.request.context.pop('query_stats', None)
+        query_stats.end(stats)
+        if stats is not None and cfg.CONF.query_stats_header:
+            state.response.headers[query_stats.HEADER] = str(stats)
+
+    def on_error(self, state, e):
+        # NOTE: after is not run for every error, the statements stop
+        # being recorded here so that they do not leak to the next
+        # request served by the green thread
+        query_stats.end(state.request.context.pop('query_stats', None))
@@ -15,6 +15,14 @@
 from pecan import hooks
 
 
+def filter_item(item, fields):
+    return {
+        field: value
+        for field, value in item.items()
+        if field in fields
+    }
+
+
 class UserFilterHook(hooks.PecanHook):
 
     # we do this at the very end to ensure user-defined filters
@@ -23,7 +31,8 @@ class UserFilterHook(hooks.PecanHook):
 
     def after(self, state):
         user_fields = state.request.params.getall('fields')
-        if not user_fields:
+        # streamed list responses are filtered as they are sent
+        if not user_fields or state.request.context.get('streamed'):
             return
         try:
             data = state.response.json
@@ -46,8 +55,4 @@ class UserFilterHook(hooks.PecanHook):
         state.response.json = data
 
     def _filter_item(self, item, fields):
-        return {
-            field: value
-            for field, value in item.items()
-            if field in fields
-        }
+        return filter_item(item, fields)
@@ -28,3 +28,23 @@ def get_controller(state):
 def is_member_action(controller):
     return isinstance(controller,
                       resource.MemberActionController)
+
+
+def is_bulk_request(state):
+    """Whether the request updates or deletes several resources at once.
+
+    Bulk updates and deletes target a collection rather than one of its
+    items, and are only available for the plugins implementing them.
+    """
+    method = state.request.method
+    if method not in ('PUT', 'DELETE'):
+        return False
+    if (state.request.context.get('resource_id') or
+            state.request.context.get('parent_id')):
+        return False
+    controller = get_controller(state)
+    if not isinstance(controller, resource.CollectionsController):
+        return False
+    if method == 'PUT':
+        return bool(controller.plugin_bulk_updater)
+    return bool(controller.plugin_bulk_deleter)
@@ -142,6 +142,20 @@ class CommonAgentManagerBase(object):
         :return: dict -- A dictionary of timestamps keyed by device
         """
 
+    def get_link_device(self, link_event):
+        """Get the device of a link from an event of the link
+
+        Managers implementing this let the common agent follow the devices
+        from the link events of the host rather than polling all of them
+        every polling interval.
+
+        :param link_event: ip_monitor.IPLinkMonitorEvent -- a link event
+        :return: str -- the device in the format get_all_devices returns, or
+            None if the link is not of the managed type
+        :raises: NotImplementedError if link events are not supported
+        """
+        raise NotImplementedError()
+
     @abc.abstractmethod
     def get_extension_driver_type(self):
         """Get the agent extension driver type.
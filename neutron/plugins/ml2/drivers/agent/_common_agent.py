@@ -33,6 +33,7 @@ from oslo_utils import excutils
 from osprofiler import profiler
 
 from neutron.agent.l2 import l2_agent_extensions_manager as ext_manager
+from neutron.agent.linux import ip_monitor
 from neutron.agent import rpc as agent_rpc
 from neutron.agent import securitygroups_rpc as agent_sg_rpc
 from neutron.api.rpc.callbacks import resources
@@ -67,6 +68,10 @@ class CommonAgentLoop(service.Service):
         self.quitting_rpc_timeout = quitting_rpc_timeout
         self.agent_type = agent_type
         self.agent_binary = agent_binary
+        self.link_monitor = None
+        # the (device, deleted) changes of links not scanned yet
+        self.link_changes = []
+        self.last_full_scan = None
 
     def _validate_manager_class(self):
         if not isinstance(self.mgr,
@@ -112,6 +117,7 @@ class CommonAgentLoop(service.Service):
 
     def stop(self, graceful=True):
         LOG.info("Stopping %s agent.", self.agent_type)
+        self._stop_link_monitor()
         if graceful and self.quitting_rpc_timeout:
             self.set_rpc_timeout(self.quitting_rpc_timeout)
         super(CommonAgentLoop, self).stop(graceful)
@@ -368,12 +374,112 @@ class CommonAgentLoop(service.Service):
                 if previous_timestamps.get(device) and
                 timestamp != previous_timestamps.get(device)}
 
+    def _start_link_monitor(self):
+        self.link_changes = []
+        self.last_full_scan = None
+        if not cfg.CONF.AGENT.monitor_links:
+            return
+        link_monitor = ip_monitor.IPLinkMonitor()
+        try:
+            link_monitor.start()
+        except Exception:
+            LOG.exception("Failed to start the link monitor, polling the "
+                          "devices")
+            return
+        self.link_monitor = link_monitor
+
+    def _stop_link_monitor(self):
+        link_monitor, self.link_monitor = self.link_monitor, None
+        if link_monitor is not None:
+            try:
+                link_monitor.stop()
+            except Exception:
+                LOG.debug("The link monitor was already stopped",
+                          exc_info=True)
+
+    def _queue_link_changes(self, events):
+        """Queue the changes of managed devices reported by link events.
+
+        :return: True if any managed device changed.
+        """
+        changed = False
+        for event in events:
+            try:
+                device = self.mgr.get_link_device(event)
+            except NotImplementedError:
+                LOG.info("%s agent does not support link events, polling "
+                         "the devices", self.agent_type)
+                self._stop_link_monitor()
+                return False
+            if device is not None:
+                self.link_changes.append((device, event.deleted))
+                changed = True
+        return changed
+
+    def _links_monitored(self):
+        """Whether the link events cover the changes since the last scan."""
+        if self.link_monitor is None:
+            return False
+        if not self.link_monitor.is_active():
+            LOG.warning("The link monitor is not running, restarting it "
+                        "and polling the devices")
+            self._stop_link_monitor()
+            self._start_link_monitor()
+            return False
+        self._queue_link_changes(self.link_monitor.get_events())
+        return (self.link_monitor is not None and
+                self.last_full_scan is not None and
+                time.time() - self.last_full_scan <
+                cfg.CONF.AGENT.full_scan_interval)
+
+    def _scan_all_devices(self):
+        if self.link_monitor is not None:
+            # The events received so far are covered by the scan
+            self.link_monitor.get_events()
+            self.link_changes = []
+            self.last_full_scan = time.time()
+        current_devices = self.mgr.get_all_devices()
+        return (current_devices,
+                self.mgr.get_devices_modified_timestamps(current_devices))
+
+    def _scan_changed_devices(self, previous):
+        current_devices = set(previous['current'])
+        timestamps = dict(previous['timestamps'])
+        changed = set()
+        for device, deleted in self.link_changes:
+            if deleted:
+                current_devices.discard(device)
+                timestamps.pop(device, None)
+                changed.discard(device)
+            else:
+                current_devices.add(device)
+                changed.add(device)
+        self.link_changes = []
+        if changed:
+            timestamps.update(
+                self.mgr.get_devices_modified_timestamps(changed))
+        return current_devices, timestamps
+
+    def _wait_for_changes(self, timeout):
+        """Sleep for timeout seconds or until a managed device changes."""
+        deadline = time.time() + timeout
+        while self.link_monitor is not None and timeout > 0:
+            if self._queue_link_changes(
+                    self.link_monitor.get_events(timeout)):
+                return
+            timeout = deadline - time.time()
+        if timeout > 0:
+            time.sleep(timeout)
+
     def scan_devices(self, previous, sync):
         device_info = {}
 
         updated_devices = self.rpc_callbacks.get_and_clear_updated_devices()
 
-        current_devices = self.mgr.get_all_devices()
+        if previous is not None and not sync and self._links_monitored():
+            current_devices, timestamps = self._scan_changed_devices(previous)
+        else:
+            current_devices, timestamps = self._scan_all_devices()
         device_info['current'] = current_devices
 
         if previous is None:
@@ -391,8 +497,7 @@ class CommonAgentLoop(service.Service):
         # timestamps changing since the previous iteration. If a timestamp
         # doesn't exist for a device, this calculation is skipped for that
         # device.
-        device_info['timestamps'] = self.mgr.get_devices_modified_timestamps(
-            current_devices)
+        device_info['timestamps'] = timestamps
         locally_updated = self._get_devices_locally_modified(
             device_info['timestamps'], previous['timestamps'])
         if locally_updated:
@@ -431,6 +536,7 @@ class CommonAgentLoop(service.Service):
         LOG.info("%s Agent RPC Daemon Started!", self.agent_type)
         device_info = None
         sync = True
+        self._start_link_monitor()
 
         while True:
             start = time.time()
@@ -459,7 +565,7 @@ class CommonAgentLoop(service.Service):
             # sleep till end of polling interval
             elapsed = (time.time() - start)
             if (elapsed < self.polling_interval):
-                time.sleep(self.polling_interval - elapsed)
+                self._wait_for_changes(self.polling_interval - elapsed)
             else:
                 LOG.debug("Loop iteration exceeded interval "
                           "(%(polling_interval)s vs. %(elapsed)s)!",
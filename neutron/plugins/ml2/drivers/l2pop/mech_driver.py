@@ -25,6 +25,7 @@ from oslo_log import log as logging
 from neutron._i18n import _
 from neutron.conf.plugins.ml2.drivers import l2pop as config
 from neutron.db import l3_hamode_db
+from neutron.db import segments_db
 from neutron.plugins.ml2.drivers.l2pop import db as l2pop_db
 from neutron.plugins.ml2.drivers.l2pop import rpc as l2pop_rpc
 
@@ -37,7 +38,8 @@ class L2populationMechanismDriver(api.MechanismDriver):
 
     def __init__(self):
         super(L2populationMechanismDriver, self).__init__()
-        self.L2populationAgentNotify = l2pop_rpc.L2populationAgentNotifyAPI()
+        self.L2populationAgentNotify = l2pop_rpc.L2populationAgentNotifyAPI(
+            batch_interval=cfg.CONF.l2pop.fdb_batch_interval)
 
     def initialize(self):
         LOG.debug("Experimental L2 population driver")
@@ -221,6 +223,38 @@ class L2populationMechanismDriver(api.MechanismDriver):
 
         return agent_fdb_entries
 
+    def get_network_fdb(self, context, agent_host, network_id):
+        """Return the forwarding entries of a network for an agent.
+
+        These are the entries the agent is sent when its first port of the
+        network comes up, an empty dict if it has none.
+        """
+        agent = l2pop_db.get_agent_by_host(context, agent_host)
+        if not agent:
+            return {}
+        for segment in segments_db.get_network_segments(context,
+                                                        network_id):
+            if self._validate_segment(segment, None, agent):
+                return self._create_agent_fdb(context, agent, segment,
+                                              network_id)
+        return {}
+
+    def get_network_fdb_digests(self, context, agent_host, network_ids):
+        """Return the digests of the forwarding entries of networks.
+
+        An agent can compare them with the digests of its entries, as
+        computed by l2pop_rpc.get_fdb_digest, to find the networks to
+        fetch with get_network_fdb.
+        """
+        digests = {}
+        for network_id in network_ids:
+            fdb_entries = self.get_network_fdb(context, agent_host,
+                                               network_id)
+            if fdb_entries:
+                digests[network_id] = l2pop_rpc.get_fdb_digest(
+                    fdb_entries[network_id]['ports'])
+        return digests
+
     def _get_tunnels(self, tunnel_network_ports, exclude_host):
         agents = {}
         for __, agent in tunnel_network_ports:
@@ -14,12 +14,16 @@
 #    under the License.
 
 import collections
+import hashlib
+import itertools
 
+from neutron_lib import constants as const
 from oslo_log import log as logging
 import oslo_messaging
 
 from neutron.common import rpc as n_rpc
 from neutron.common import topics
+from neutron.notifiers import batch_notifier
 
 
 LOG = logging.getLogger(__name__)
@@ -28,15 +32,95 @@ LOG = logging.getLogger(__name__)
 PortInfo = collections.namedtuple("PortInfo", "mac_address ip_address")
 
 
+def get_fdb_digest(ports):
+    """Return a digest of the forwarding entries of a network.
+
+    :param ports: the [mac, ip] entries of the network by agent IP, as in
+                  the 'ports' of the fdb_entries of a network.
+    """
+    entries = sorted({(agent_ip, entry[0], entry[1])
+                      for agent_ip, agent_ports in ports.items()
+                      for entry in agent_ports})
+    return hashlib.sha1(''.join(
+        '%s %s %s\n' % entry for entry in entries).encode()).hexdigest()
+
+
 class L2populationAgentNotifyAPI(object):
 
-    def __init__(self, topic=topics.AGENT):
+    def __init__(self, topic=topics.AGENT, batch_interval=0):
         self.topic = topic
         self.topic_l2pop_update = topics.get_topic_name(topic,
                                                         topics.L2POPULATION,
                                                         topics.UPDATE)
         target = oslo_messaging.Target(topic=topic, version='1.0')
         self.client = n_rpc.get_client(target)
+        self._fanout_batch = None
+        if batch_interval:
+            self._fanout_batch = batch_notifier.BatchNotifier(
+                batch_interval, self._send_fanout_batch)
+
+    def _cast_fanout(self, context, method, fdb_entries):
+        cctxt = self.client.prepare(topic=self.topic_l2pop_update, fanout=True)
+        cctxt.cast(context, method, fdb_entries=fdb_entries)
+
+    def _send_fanout_batch(self, notifications):
+        """Send batched fanout notifications.
+
+        The adds and removes of forwarding entries are merged per network,
+        the last change of an entry winning, into one remove_fdb_entries
+        message followed by one add_fdb_entries message. The removes go
+        first as an agent may remove the flows of an entry by MAC only,
+        which would wipe those of the same MAC added on another host. The
+        other notifications are sent in order with the merged messages.
+        """
+        networks = collections.OrderedDict()
+        context = None
+
+        def flush():
+            merged = {'add_fdb_entries': {}, 'remove_fdb_entries': {}}
+            for network_id, network in networks.items():
+                # The agents set up the tunnels to the agents of the added
+                # entries, even if none of the entries is left, unless the
+                # flooding entry of the agent was removed since
+                tunnels = (('add_fdb_entries', agent_ip, None)
+                           for agent_ip in network['added_agents'])
+                for method, agent_ip, entry in itertools.chain(
+                        tunnels, network['changes'].values()):
+                    entries = merged[method].setdefault(
+                        network_id, dict(network['template'], ports={}))
+                    agent_ports = entries['ports'].setdefault(agent_ip, [])
+                    if entry is not None:
+                        agent_ports.append(entry)
+            for method in ('remove_fdb_entries', 'add_fdb_entries'):
+                if merged[method]:
+                    self._cast_fanout(context, method, merged[method])
+            networks.clear()
+
+        for context, method, fdb_entries in notifications:
+            if method not in ('add_fdb_entries', 'remove_fdb_entries'):
+                flush()
+                self._cast_fanout(context, method, fdb_entries)
+                continue
+            for network_id, network_entries in fdb_entries.items():
+                network = networks.setdefault(
+                    network_id, {'template': {}, 'added_agents': set(),
+                                 'changes': collections.OrderedDict()})
+                network['template'].update(
+                    (key, value) for key, value in network_entries.items()
+                    if key != 'ports')
+                for agent_ip, entries in network_entries['ports'].items():
+                    if method == 'add_fdb_entries':
+                        network['added_agents'].add(agent_ip)
+                    for entry in entries:
+                        key = (agent_ip, tuple(entry))
+                        if (method == 'remove_fdb_entries' and
+                                key[1] == tuple(const.FLOODING_ENTRY)):
+                            network['added_agents'].discard(agent_ip)
+                        # Moved after the entries changed since its last
+                        # change
+                        network['changes'].pop(key, None)
+                        network['changes'][key] = (method, agent_ip, entry)
+        flush()
 
     def _notification_fanout(self, context, method, fdb_entries):
         LOG.debug('Fanout notify l2population agents at %(topic)s '
@@ -45,8 +129,10 @@ class L2populationAgentNotifyAPI(object):
                    'method': method,
                    'fdb_entries': fdb_entries})
 
-        cctxt = self.client.prepare(topic=self.topic_l2pop_update, fanout=True)
-        cctxt.cast(context, method, fdb_entries=fdb_entries)
+        if self._fanout_batch:
+            self._fanout_batch.queue_event((context, method, fdb_entries))
+        else:
+            self._cast_fanout(context, method, fdb_entries)
 
     def _notification_host(self, context, method, fdb_entries, host):
         LOG.debug('Notify l2population agent %(host)s at %(topic)s the '
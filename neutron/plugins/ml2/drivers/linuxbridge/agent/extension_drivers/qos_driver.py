@@ -39,6 +39,11 @@ class QosLinuxbridgeAgentDriver(qos.QosLinuxAgentDriver):
     IPTABLES_DIRECTION_PREFIX = {const.INGRESS_DIRECTION: "i",
                                  const.EGRESS_DIRECTION: "o"}
 
+    def __init__(self):
+        super(QosLinuxbridgeAgentDriver, self).__init__()
+        # The tc commands queued while updating several ports
+        self._tc_batch = None
+
     def initialize(self):
         LOG.info("Initializing Linux bridge QoS extension")
         self.iptables_manager = iptables_manager.IptablesManager(use_ipv6=True)
@@ -58,6 +63,19 @@ class QosLinuxbridgeAgentDriver(qos.QosLinuxAgentDriver):
     def _dscp_rule_tag(self, device):
         return "dscp-%s" % device
 
+    def update_ports(self, ports, old_qos_policy, qos_policy):
+        # Run the tc commands of all the ports with a couple of 'tc -batch'
+        # and apply the iptables rules once, instead of forking a process
+        # per port and rule
+        self._tc_batch = tc_lib.TcBatch()
+        try:
+            with self.iptables_manager.defer_apply():
+                super(QosLinuxbridgeAgentDriver, self).update_ports(
+                    ports, old_qos_policy, qos_policy)
+            self._tc_batch.execute()
+        finally:
+            self._tc_batch = None
+
     @log_helpers.log_method_call
     def create_bandwidth_limit(self, port, rule):
         tc_wrapper = self._get_tc_wrapper(port)
@@ -162,4 +180,5 @@ class QosLinuxbridgeAgentDriver(qos.QosLinuxAgentDriver):
         return tc_lib.TcCommand(
             port['device'],
             cfg.CONF.QOS.kernel_hz,
+            batch=self._tc_batch,
         )
@@ -19,6 +19,7 @@
 # Based on the structure of the OpenVSwitch agent in the
 # Neutron OpenVSwitch Plugin.
 
+import itertools
 import sys
 
 import netaddr
@@ -652,6 +653,10 @@ class LinuxBridgeManager(amb.CommonAgentManagerBase):
                 devices.add(device)
         return devices
 
+    def get_link_device(self, link_event):
+        if link_event.name.startswith(constants.TAP_DEVICE_PREFIX):
+            return link_event.name
+
     def vxlan_ucast_supported(self):
         if not cfg.CONF.VXLAN.l2_population:
             return False
@@ -719,44 +724,115 @@ class LinuxBridgeManager(amb.CommonAgentManagerBase):
                                           lladdr=mac)
         return entry != []
 
-    def fdb_bridge_entry_exists(self, mac, interface, agent_ip=None):
-        entries = bridge_lib.FdbInterface.show(interface)
-        if not agent_ip:
-            return mac in entries
-
-        return (agent_ip in entries and mac in entries)
-
-    def add_fdb_ip_entry(self, mac, ip, interface):
-        if cfg.CONF.VXLAN.arp_responder:
-            ip_lib.add_neigh_entry(ip, mac, interface)
-
-    def remove_fdb_ip_entry(self, mac, ip, interface):
-        if cfg.CONF.VXLAN.arp_responder:
-            ip_lib.delete_neigh_entry(ip, mac, interface)
+    def _get_neigh_entries(self, interface, ips):
+        entries = set()
+        for ip_version in {utils.get_ip_version(ip) for ip in ips}:
+            entries.update(
+                (entry['lladdr'], entry['dst'])
+                for entry in ip_lib.dump_neigh_entries(ip_version, interface))
+        return entries
+
+    def update_fdb_ip_entries(self, interface, add=(), remove=()):
+        """Program the ARP responder entries of a VXLAN interface at once.
+
+        The entries are compared with those of the interface, so that only
+        the missing ones are added and the present ones removed, with a
+        single 'ip -batch' invocation. If the batch fails, the entries are
+        programmed one by one so that a failing entry does not prevent the
+        others from being programmed.
+
+        :param add: iterable of the [mac, ip] entries to add
+        :param remove: iterable of the [mac, ip] entries to remove
+        """
+        if not cfg.CONF.VXLAN.arp_responder:
+            return
+        add = [tuple(entry) for entry in add]
+        remove = [tuple(entry) for entry in remove]
+        if not (add or remove):
+            return
+        existing = self._get_neigh_entries(
+            interface, {ip for mac, ip in add + remove})
+        commands = []
+        changes = []
+        for mac, ip in remove:
+            if (mac, ip) in existing:
+                existing.discard((mac, ip))
+                commands.append(('neigh', 'del', ip, 'lladdr', mac,
+                                 'dev', interface))
+                changes.append((ip_lib.delete_neigh_entry, mac, ip))
+        for mac, ip in add:
+            if (mac, ip) not in existing:
+                existing.add((mac, ip))
+                commands.append(('neigh', 'replace', ip, 'lladdr', mac,
+                                 'nud', 'permanent', 'dev', interface))
+                changes.append((ip_lib.add_neigh_entry, mac, ip))
+        try:
+            ip_lib.execute_batch(commands)
+        except RuntimeError:
+            LOG.warning("Unable to program the ARP responder entries of %s "
+                        "at once, programming them one by one", interface)
+            for change, mac, ip in changes:
+                try:
+                    change(ip, mac, interface)
+                except Exception:
+                    LOG.exception("Unable to program the ARP responder "
+                                  "entry of %(mac)s %(ip)s on %(interface)s",
+                                  {'mac': mac, 'ip': ip,
+                                   'interface': interface})
+
+    def update_fdb_entries(self, interface, add=None, remove=None):
+        """Program the FDB entries of a VXLAN interface at once.
+
+        The entries are compared with those of the interface, so that only
+        the missing ones are added and the present ones removed, with a
+        single 'bridge -batch' invocation. The ARP responder entries of the
+        ports are programmed along.
+
+        :param add: dict of the [mac, ip] ports to add by agent IP
+        :param remove: dict of the [mac, ip] ports to remove by agent IP
+        """
+        add = add or {}
+        remove = remove or {}
+        flooding_mac = constants.FLOODING_ENTRY[0]
+        flooding = self.vxlan_mode == lconst.VXLAN_UCAST
+        if not any(mac != flooding_mac or flooding
+                   for ports in itertools.chain(add.values(), remove.values())
+                   for mac, ip in ports):
+            return
+        dsts = bridge_lib.FdbInterface.get_dsts(interface)
+        commands = []
+        ip_add = []
+        ip_remove = []
+        for agent_ip, ports in remove.items():
+            for mac, ip in ports:
+                if mac != flooding_mac:
+                    ip_remove.append((mac, ip))
+                elif not flooding:
+                    continue
+                if agent_ip in dsts[mac]:
+                    dsts[mac].discard(agent_ip)
+                    commands.append(('delete', mac, interface, agent_ip))
+        for agent_ip, ports in add.items():
+            for mac, ip in ports:
+                if mac != flooding_mac:
+                    ip_add.append((mac, ip))
+                    if dsts[mac] != {agent_ip}:
+                        dsts[mac] = {agent_ip}
+                        commands.append(('replace', mac, interface, agent_ip))
+                elif flooding and agent_ip not in dsts[mac]:
+                    # The first flooding entry is added, the others appended
+                    op = 'append' if dsts[mac] else 'add'
+                    dsts[mac].add(agent_ip)
+                    commands.append((op, mac, interface, agent_ip))
+        bridge_lib.FdbInterface.execute_batch(commands,
+                                              check_exit_code=False)
+        self.update_fdb_ip_entries(interface, add=ip_add, remove=ip_remove)
 
     def add_fdb_entries(self, agent_ip, ports, interface):
-        for mac, ip in ports:
-            if mac != constants.FLOODING_ENTRY[0]:
-                self.add_fdb_ip_entry(mac, ip, interface)
-                bridge_lib.FdbInterface.replace(mac, interface, agent_ip,
-                                                check_exit_code=False)
-            elif self.vxlan_mode == lconst.VXLAN_UCAST:
-                if self.fdb_bridge_entry_exists(mac, interface):
-                    bridge_lib.FdbInterface.append(mac, interface, agent_ip,
-                                                   check_exit_code=False)
-                else:
-                    bridge_lib.FdbInterface.add(mac, interface, agent_ip,
-                                                check_exit_code=False)
+        self.update_fdb_entries(interface, add={agent_ip: ports})
 
     def remove_fdb_entries(self, agent_ip, ports, interface):
-        for mac, ip in ports:
-            if mac != constants.FLOODING_ENTRY[0]:
-                self.remove_fdb_ip_entry(mac, ip, interface)
-                bridge_lib.FdbInterface.delete(mac, interface, agent_ip,
-                                               check_exit_code=False)
-            elif self.vxlan_mode == lconst.VXLAN_UCAST:
-                bridge_lib.FdbInterface.delete(mac, interface, agent_ip,
-                                               check_exit_code=False)
+        self.update_fdb_entries(interface, remove={agent_ip: ports})
 
     def get_agent_id(self):
         if self.bridge_mappings:
@@ -866,74 +942,53 @@ class LinuxBridgeRpcCallbacks(
         for port_data in self.agent.network_ports[network_id]:
             self.updated_devices.add(port_data['device'])
 
+    def _get_fdb_interface(self, network_id):
+        segment = self.network_map.get(network_id)
+        if segment and segment.network_type == constants.TYPE_VXLAN:
+            return self.agent.mgr.get_vxlan_device_name(
+                segment.segmentation_id)
+
+    def _get_remote_entries(self, agent_entries):
+        return {agent_ip: entries
+                for agent_ip, entries in agent_entries.items()
+                if agent_ip != self.agent.mgr.local_ip}
+
     def fdb_add(self, context, fdb_entries):
         LOG.debug("fdb_add received")
         for network_id, values in fdb_entries.items():
-            segment = self.network_map.get(network_id)
-            if not segment:
+            interface = self._get_fdb_interface(network_id)
+            if not interface:
                 return
 
-            if segment.network_type != constants.TYPE_VXLAN:
-                return
-
-            interface = self.agent.mgr.get_vxlan_device_name(
-                segment.segmentation_id)
-
-            agent_ports = values.get('ports')
-            for agent_ip, ports in agent_ports.items():
-                if agent_ip == self.agent.mgr.local_ip:
-                    continue
-
-                self.agent.mgr.add_fdb_entries(agent_ip,
-                                               ports,
-                                               interface)
+            self.agent.mgr.update_fdb_entries(
+                interface,
+                add=self._get_remote_entries(values.get('ports')))
 
     def fdb_remove(self, context, fdb_entries):
         LOG.debug("fdb_remove received")
         for network_id, values in fdb_entries.items():
-            segment = self.network_map.get(network_id)
-            if not segment:
+            interface = self._get_fdb_interface(network_id)
+            if not interface:
                 return
 
-            if segment.network_type != constants.TYPE_VXLAN:
-                return
-
-            interface = self.agent.mgr.get_vxlan_device_name(
-                segment.segmentation_id)
-
-            agent_ports = values.get('ports')
-            for agent_ip, ports in agent_ports.items():
-                if agent_ip == self.agent.mgr.local_ip:
-                    continue
-
-                self.agent.mgr.remove_fdb_entries(agent_ip,
-                                                  ports,
-                                                  interface)
+            self.agent.mgr.update_fdb_entries(
+                interface,
+                remove=self._get_remote_entries(values.get('ports')))
 
     def _fdb_chg_ip(self, context, fdb_entries):
         LOG.debug("update chg_ip received")
         for network_id, agent_ports in fdb_entries.items():
-            segment = self.network_map.get(network_id)
-            if not segment:
-                return
-
-            if segment.network_type != constants.TYPE_VXLAN:
+            interface = self._get_fdb_interface(network_id)
+            if not interface:
                 return
 
-            interface = self.agent.mgr.get_vxlan_device_name(
-                segment.segmentation_id)
-
-            for agent_ip, state in agent_ports.items():
-                if agent_ip == self.agent.mgr.local_ip:
-                    continue
-
-                after = state.get('after', [])
-                for mac, ip in after:
-                    self.agent.mgr.add_fdb_ip_entry(mac, ip, interface)
-
-                before = state.get('before', [])
-                for mac, ip in before:
-                    self.agent.mgr.remove_fdb_ip_entry(mac, ip, interface)
+            after = []
+            before = []
+            for state in self._get_remote_entries(agent_ports).values():
+                after.extend(state.get('after', []))
+                before.extend(state.get('before', []))
+            self.agent.mgr.update_fdb_ip_entries(interface, add=after,
+                                                 remove=before)
 
     def fdb_update(self, context, fdb_entries):
         LOG.debug("fdb_update received")
@@ -36,6 +36,8 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
         self.br_int = None
         self.agent_api = None
         self.ports = collections.defaultdict(dict)
+        # The bandwidth limits gathered while updating several ports
+        self._bw_limits = None
 
     def consume_api(self, agent_api):
         self.agent_api = agent_api
@@ -44,6 +46,32 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
         self.br_int = self.agent_api.request_int_br()
         self.cookie = self.br_int.default_cookie
 
+    def update_ports(self, ports, old_qos_policy, qos_policy):
+        # Set the bandwidth limits of all the ports with a single OVSDB
+        # transaction instead of (at least) one per port and rule
+        self._bw_limits = {constants.EGRESS_DIRECTION: {},
+                           constants.INGRESS_DIRECTION: {}}
+        try:
+            super(QosOVSAgentDriver, self).update_ports(
+                ports, old_qos_policy, qos_policy)
+            self.br_int.set_bw_limits_for_ports(
+                egress_limits=self._bw_limits[constants.EGRESS_DIRECTION],
+                ingress_limits=self._bw_limits[constants.INGRESS_DIRECTION])
+        finally:
+            self._bw_limits = None
+
+    def _defer_bw_limit(self, direction, port_name, limit):
+        """Gather the limit of the port if updating several ports.
+
+        :param limit: (max_kbps, max_burst_kbps), None to delete the limit.
+        :returns: True if the limit is deferred, False if it is to be set.
+        """
+        if self._bw_limits is None:
+            return False
+        # The last change of the port wins, as each one replaces the limit
+        self._bw_limits[direction][port_name] = limit
+        return True
+
     def create_bandwidth_limit(self, port, rule):
         self.update_bandwidth_limit(port, rule)
 
@@ -74,6 +102,9 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
                       port_id)
             return
         vif_port = port.get('vif_port')
+        if self._defer_bw_limit(constants.EGRESS_DIRECTION,
+                                vif_port.port_name, None):
+            return
         self.br_int.delete_egress_bw_limit_for_port(vif_port.port_name)
 
     def delete_bandwidth_limit_ingress(self, port):
@@ -88,6 +119,9 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
                       port_id)
             return
         vif_port = port.get('vif_port')
+        if self._defer_bw_limit(constants.INGRESS_DIRECTION,
+                                vif_port.port_name, None):
+            return
         self.br_int.delete_ingress_bw_limit_for_port(vif_port.port_name)
 
     def create_dscp_marking(self, port, rule):
@@ -152,6 +186,10 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
         # ovs accepts only integer values of burst:
         max_burst_kbps = int(self._get_egress_burst_value(rule))
 
+        if self._defer_bw_limit(constants.EGRESS_DIRECTION,
+                                vif_port.port_name,
+                                (max_kbps, max_burst_kbps)):
+            return
         self.br_int.create_egress_bw_limit_for_port(vif_port.port_name,
                                                     max_kbps,
                                                     max_burst_kbps)
@@ -161,6 +199,9 @@ class QosOVSAgentDriver(qos.QosLinuxAgentDriver):
         max_kbps = rule.max_kbps or 0
         max_burst_kbps = rule.max_burst_kbps or 0
 
+        if self._defer_bw_limit(constants.INGRESS_DIRECTION, port_name,
+                                (max_kbps, max_burst_kbps)):
+            return
         self.br_int.update_ingress_bw_limit_for_port(
             port_name,
             max_kbps,
@@ -0,0 +1,135 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import contextlib
+import time
+
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+import webob
+
+from neutron.agent.linux import utils as agent_utils
+
+LOG = logging.getLogger(__name__)
+
+METRICS_SERVER_BACKLOG = 128
+
+# The phases of an rpc_loop iteration
+PHASE_OVSDB = 'ovsdb'
+PHASE_RPC = 'rpc'
+PHASE_FIREWALL = 'firewall'
+PHASE_FLOWS = 'flows'
+PHASES = (PHASE_OVSDB, PHASE_RPC, PHASE_FIREWALL, PHASE_FLOWS)
+
+
+def _round(seconds):
+    return round(seconds, 3)
+
+
+class LoopMetrics(object):
+    """Time spent by the agent rpc_loop iterations in each of their phases.
+
+    A phase entered while another one is running pauses it, so that the
+    time of the RPC calls made while installing the flows of a port is
+    accounted to the RPC phase only.
+    """
+
+    def __init__(self):
+        self.iterations = 0
+        self.elapsed = 0.0
+        self.phases = collections.defaultdict(float)
+        self.last_iteration = {}
+        self._iteration_phases = collections.defaultdict(float)
+        self._running = []
+        self._started = None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        now = time.time()
+        if self._running:
+            self._iteration_phases[self._running[-1]] += now - self._started
+        self._running.append(name)
+        self._started = now
+        try:
+            yield
+        finally:
+            now = time.time()
+            self._iteration_phases[self._running.pop()] += (
+                now - self._started)
+            self._started = now
+
+    def end_iteration(self, iter_num, elapsed):
+        phases = self._iteration_phases
+        self._iteration_phases = collections.defaultdict(float)
+        for name, seconds in phases.items():
+            self.phases[name] += seconds
+        self.iterations += 1
+        self.elapsed += elapsed
+        self.last_iteration = {
+            'iteration': iter_num,
+            'elapsed': _round(elapsed),
+            'phases': {name: _round(seconds)
+                       for name, seconds in phases.items()}}
+
+    @staticmethod
+    def _get_flow_mods(bridge):
+        flow_mods = collections.defaultdict(dict)
+        for (table_id, action), count in bridge.flow_mod_counts.items():
+            table = 'all' if table_id is None else str(table_id)
+            flow_mods[table][action] = count
+        return dict(flow_mods)
+
+    def get_summary(self):
+        """Return the totals of the phases.
+
+        Unlike the report, its size does not grow with the bridges and
+        tables, so that it fits in the configurations of the agent state.
+        """
+        return {
+            'iterations': self.iterations,
+            'elapsed': _round(self.elapsed),
+            'last_elapsed': self.last_iteration.get('elapsed', 0.0),
+            'phases': {name: _round(self.phases.get(name, 0.0))
+                       for name in PHASES}}
+
+    def get_report(self, bridges):
+        """Return the metrics, with the flow-mod counts of the bridges."""
+        return {
+            'iterations': self.iterations,
+            'elapsed': _round(self.elapsed),
+            'phases': {name: _round(seconds)
+                       for name, seconds in self.phases.items()},
+            'last_iteration': self.last_iteration,
+            'flow_mods': {bridge.br_name: self._get_flow_mods(bridge)
+                          for bridge in bridges}}
+
+
+class LoopMetricsHandler(object):
+    def __init__(self, get_report):
+        self.get_report = get_report
+
+    @webob.dec.wsgify(RequestClass=webob.Request)
+    def __call__(self, req):
+        return webob.Response(
+            body=jsonutils.dump_as_bytes(self.get_report()),
+            content_type='application/json')
+
+
+def start_metrics_server(socket_path, get_report):
+    """Serve the report returned by get_report on a UNIX domain socket."""
+    agent_utils.ensure_directory_exists_without_file(socket_path)
+    server = agent_utils.UnixDomainWSGIServer('neutron-ovs-agent-metrics')
+    server.start(LoopMetricsHandler(get_report), socket_path,
+                 workers=0, backlog=METRICS_SERVER_BACKLOG)
+    LOG.info("Serving the agent metrics on %s", socket_path)
+    return server
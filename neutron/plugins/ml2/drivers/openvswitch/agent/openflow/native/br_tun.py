@@ -29,6 +29,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
+from oslo_log import log as logging
 from ryu.lib.packet import arp
 from ryu.lib.packet import ether_types
 
@@ -38,6 +41,8 @@ from neutron.plugins.ml2.drivers.openvswitch.agent.openflow.native \
 from neutron.plugins.ml2.drivers.openvswitch.agent.openflow.native \
     import ovs_bridge
 
+LOG = logging.getLogger(__name__)
+
 
 class OVSTunnelBridge(ovs_bridge.OVSAgentBridge,
                       br_dvr_process.OVSDVRProcessMixin):
@@ -282,7 +287,10 @@ class OVSTunnelBridge(ovs_bridge.OVSAgentBridge,
         # It might be possible to send multiple flow-mods with a single
         # barrier.  But it's unclear that level of performance optimization
         # is desirable while it would certainly complicate error handling.
-        return self
+        # Only the updates of the flood to tun flows, which are recomputed
+        # for each tunnel of a vlan, are deferred so that each of these
+        # flows is sent once.
+        return DeferredOVSTunnelBridge(self)
 
     def __enter__(self):
         # REVISIT(yamamoto): See the comment on deferred().
@@ -291,3 +299,45 @@ class OVSTunnelBridge(ovs_bridge.OVSAgentBridge,
     def __exit__(self, exc_type, exc_value, traceback):
         # REVISIT(yamamoto): See the comment on deferred().
         pass
+
+
+class DeferredOVSTunnelBridge(object):
+    """Deferred OVSTunnelBridge.
+
+    Only the last update of the flood to tun flow of each vlan is sent, on
+    apply_flows call, the other calls go through to the wrapped bridge.
+    Like ovs_lib.DeferredOVSBridge, this class can be used as a context.
+    """
+
+    def __init__(self, br):
+        self.br = br
+        self._flood_to_tun = collections.OrderedDict()
+
+    def __getattr__(self, name):
+        return getattr(self.br, name)
+
+    def install_flood_to_tun(self, vlan, tun_id, ports):
+        self._flood_to_tun[vlan] = (tun_id, list(ports))
+
+    def delete_flood_to_tun(self, vlan):
+        self._flood_to_tun[vlan] = None
+
+    def apply_flows(self):
+        flood_to_tun = self._flood_to_tun
+        self._flood_to_tun = collections.OrderedDict()
+        for vlan, flood in flood_to_tun.items():
+            if flood is None:
+                self.br.delete_flood_to_tun(vlan)
+            else:
+                tun_id, ports = flood
+                self.br.install_flood_to_tun(vlan, tun_id, ports)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.apply_flows()
+        else:
+            LOG.exception("OVS flows could not be applied on bridge %s",
+                          self.br.br_name)
@@ -14,6 +14,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import functools
+import itertools
+
 import eventlet
 import netaddr
 from oslo_config import cfg
@@ -33,6 +37,232 @@ LOG = logging.getLogger(__name__)
 
 COOKIE_DEFAULT = object()
 
+# The external id of the bridges recording the cookie of the flows of the
+# agent, see OpenFlowSwitchMixin.start_flows_diff
+FLOWS_COOKIE = 'neutron-flows-cookie'
+
+_bundle_ids = itertools.count(1)
+
+
+def _encode(items):
+    buf = bytearray()
+    for item in items:
+        item.serialize(buf, len(buf))
+    return bytes(buf)
+
+
+def _flow_key(table_id, priority, match):
+    return table_id, priority, _encode([match])
+
+
+def _to_int(value):
+    """Return an integer, MAC or IP address match value as an integer."""
+    if isinstance(value, six.integer_types):
+        return value
+    try:
+        if netaddr.valid_mac(value):
+            return int(netaddr.EUI(value))
+        return int(netaddr.IPAddress(value))
+    except (netaddr.AddrFormatError, TypeError, ValueError):
+        return None
+
+
+def _field_covers(value, installed):
+    """Return whether a match field value covers an installed one.
+
+    Either may be a (value, mask) tuple. None is returned when they cannot
+    be compared.
+    """
+    if value == installed:
+        return True
+    if not isinstance(value, tuple):
+        # A masked installed value is wider than an exact one
+        return (not isinstance(installed, tuple) and
+                _to_int(value) is not None and
+                _to_int(value) == _to_int(installed))
+    value, mask = (_to_int(v) for v in value)
+    if isinstance(installed, tuple):
+        installed, installed_mask = (_to_int(v) for v in installed)
+        if installed_mask is None:
+            return None
+    else:
+        installed, installed_mask = _to_int(installed), None
+    if None in (value, mask, installed):
+        return None
+    if installed_mask is not None and installed_mask & mask != mask:
+        return False
+    return installed & mask == value & mask
+
+
+class InstalledFlows(object):
+    """The flows installed on a switch with a cookie.
+
+    Flows are identified by their table, priority and encoded match, and
+    compared on their encoded instructions.
+    """
+
+    def __init__(self, cookie, flows):
+        self.cookie = cookie
+        self.cookies = set()
+        self.active = True
+        # The flows by table and key
+        self._flows = collections.defaultdict(dict)
+        self._desired = set()
+        # The flows by key which a flow-mod may have deleted
+        self._doubtful = {}
+        for flow in flows:
+            self.cookies.add(flow.cookie)
+            if (flow.cookie != cookie or flow.idle_timeout or
+                    flow.hard_timeout):
+                continue
+            key = _flow_key(flow.table_id, flow.priority, flow.match)
+            self._flows[flow.table_id][key] = (flow,
+                                               _encode(flow.instructions))
+
+    def __len__(self):
+        return sum(len(flows) for flows in self._flows.values())
+
+    def needs_sending(self, ofp, ofpp, msg):
+        """Return whether a message changes the installed flows.
+
+        Adding one of the flows unchanged does not, the flows a flow-mod
+        deletes or modifies are forgotten.
+        """
+        if not isinstance(msg, ofpp.OFPFlowMod):
+            return True
+        if msg.command != ofp.OFPFC_ADD:
+            self._forget(ofp, msg)
+            return True
+        key = _flow_key(msg.table_id, msg.priority, msg.match)
+        self._desired.add(key)
+        installed = self._flows.get(msg.table_id, {}).get(key)
+        return not (installed is not None and msg.cookie == self.cookie and
+                    not msg.idle_timeout and not msg.hard_timeout and
+                    installed[1] == _encode(msg.instructions))
+
+    def _forget(self, ofp, msg):
+        if msg.table_id == ofp.OFPTT_ALL:
+            table_ids = list(self._flows)
+        else:
+            table_ids = [msg.table_id]
+        strict = msg.command in (ofp.OFPFC_DELETE_STRICT,
+                                 ofp.OFPFC_MODIFY_STRICT)
+        for table_id in table_ids:
+            flows = self._flows.get(table_id, {})
+            if strict:
+                # Only the flow with the same priority and match
+                keys = [_flow_key(table_id, msg.priority, msg.match)]
+            else:
+                keys = list(flows)
+            for key in keys:
+                if key not in flows:
+                    continue
+                matches = self._matches(msg, flows[key][0], strict)
+                if matches is None:
+                    # Added again if desired, else deleted as stale
+                    self._doubtful[key] = flows[key][0]
+                if matches is not False:
+                    del flows[key]
+
+    @staticmethod
+    def _matches(msg, flow, strict):
+        """Return whether a flow-mod matches a flow, None if unknown."""
+        if (msg.cookie ^ flow.cookie) & msg.cookie_mask:
+            return False
+        if strict:
+            return True
+        # A non-strict flow-mod matches the flows with all of its fields,
+        # with values within its own
+        fields = dict(flow.match.items())
+        matches = True
+        for name, value in msg.match.items():
+            covers = name in fields and _field_covers(value, fields[name])
+            if covers is False:
+                return False
+            if covers is None:
+                matches = None
+        return matches
+
+    def get_stale_flows(self):
+        """Return the flows which were not added again."""
+        flows = dict(self._doubtful)
+        for table_flows in self._flows.values():
+            flows.update((key, flow) for key, (flow, _instructions)
+                         in table_flows.items())
+        return [flow for key, flow in flows.items()
+                if key not in self._desired]
+
+
+class BundledOpenFlowBridge(object):
+    """Send the flow-mods of an OpenFlow bridge in a bundle.
+
+    The bundle is opened on __enter__ and committed on __exit__, or
+    discarded if an exception is raised.  It requires the OpenFlow 1.3
+    bundle extension, supported by Open vSwitch 2.6 and later.
+    """
+
+    def __init__(self, br, atomic=False, ordered=False):
+        self.br = br
+        self.atomic = atomic
+        self.ordered = ordered
+        self.bundle_id = None
+        self.bundle_flags = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.br, name)
+        if self.bundle_id is not None and name.startswith(('install',
+                                                           'uninstall')):
+            # Bound to this object for the flow-mods to go to its _send_msg
+            return functools.partial(attr.__func__, self)
+        return attr
+
+    def _send_msg(self, msg, reply_cls=None, reply_multi=False):
+        (dp, _ofp, ofpp) = self.br._get_dp()
+        msg = ofpp.ONFBundleAddMsg(dp, self.bundle_id, self.bundle_flags,
+                                   msg, [])
+        return self.br._send_msg(msg, reply_cls, reply_multi)
+
+    def _control(self, type_, reply_type):
+        (dp, _ofp, ofpp) = self.br._get_dp()
+        msg = ofpp.ONFBundleCtrlMsg(dp, self.bundle_id, type_,
+                                    self.bundle_flags, [])
+        reply = self.br._send_msg(msg, reply_cls=ofpp.ONFBundleCtrlMsg)
+        if reply.type != reply_type:
+            m = _("Unexpected reply %(reply)s to bundle request "
+                  "%(request)s") % {"reply": reply, "request": msg}
+            LOG.error(m)
+            # NOTE(yamamoto): use RuntimeError for compat with ovs_lib
+            raise RuntimeError(m)
+
+    def __enter__(self):
+        (_dp, ofp, _ofpp) = self.br._get_dp()
+        self.bundle_flags = 0
+        if self.atomic:
+            self.bundle_flags |= ofp.ONF_BF_ATOMIC
+        if self.ordered:
+            self.bundle_flags |= ofp.ONF_BF_ORDERED
+        self.bundle_id = next(_bundle_ids) & 0xffffffff
+        try:
+            self._control(ofp.ONF_BCT_OPEN_REQUEST, ofp.ONF_BCT_OPEN_REPLY)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                self.bundle_id = None
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        (_dp, ofp, _ofpp) = self.br._get_dp()
+        try:
+            if exc_type is None:
+                self._control(ofp.ONF_BCT_COMMIT_REQUEST,
+                              ofp.ONF_BCT_COMMIT_REPLY)
+            else:
+                LOG.exception("OVS flows could not be applied on bridge %s",
+                              self.br.br_name)
+                self._control(ofp.ONF_BCT_DISCARD_REQUEST,
+                              ofp.ONF_BCT_DISCARD_REPLY)
+        finally:
+            self.bundle_id = None
+
 
 class OpenFlowSwitchMixin(object):
     """Mixin to provide common convenient routines for an openflow switch.
@@ -50,6 +280,9 @@ class OpenFlowSwitchMixin(object):
 
     def __init__(self, *args, **kwargs):
         self._app = kwargs.pop('ryu_app')
+        self._installed_flows = None
+        # The number of flow-mods sent per (table, action)
+        self.flow_mod_counts = collections.Counter()
         super(OpenFlowSwitchMixin, self).__init__(*args, **kwargs)
 
     def _get_dp_by_dpid(self, dpid_int):
@@ -71,6 +304,11 @@ class OpenFlowSwitchMixin(object):
         return dp
 
     def _send_msg(self, msg, reply_cls=None, reply_multi=False):
+        installed_flows = self._installed_flows
+        if installed_flows is not None and installed_flows.active:
+            (_dp, ofp, ofpp) = self._get_dp()
+            if not installed_flows.needs_sending(ofp, ofpp, msg):
+                return None
         timeout_sec = cfg.CONF.OVS.of_request_timeout
         timeout = eventlet.Timeout(seconds=timeout_sec)
         try:
@@ -108,6 +346,7 @@ class OpenFlowSwitchMixin(object):
     def uninstall_flows(self, table_id=None, strict=False, priority=0,
                         cookie=COOKIE_DEFAULT, cookie_mask=0,
                         match=None, **match_kwargs):
+        self.flow_mod_counts[(table_id, 'del')] += 1
         (dp, ofp, ofpp) = self._get_dp()
         if table_id is None:
             table_id = ofp.OFPTT_ALL
@@ -150,7 +389,71 @@ class OpenFlowSwitchMixin(object):
             flows += rep.body
         return flows
 
+    def bundled(self, atomic=False, ordered=False):
+        return BundledOpenFlowBridge(self, atomic=atomic, ordered=ordered)
+
+    def start_flows_diff(self):
+        """Only send the flows which changed since the last agent run.
+
+        The flows installed with the cookie recorded by the last run are
+        dumped once and adopted: until cleanup_flows is called, adding one
+        of them unchanged is not sent to the switch. cleanup_flows then
+        deletes those which were not added again, with the flows of the
+        stale cookies, in one atomic bundle.
+        """
+        if self._installed_flows is not None:
+            self._installed_flows.active = False
+            self._installed_flows = None
+        external_ids = self.db_get_val('Bridge', self.br_name,
+                                       'external_ids') or {}
+        cookie = external_ids.get(FLOWS_COOKIE)
+        if cookie:
+            installed_flows = InstalledFlows(int(cookie), self.dump_flows())
+            if len(installed_flows):
+                LOG.info("Diffing the flows of bridge %(bridge)s with its "
+                         "%(count)d installed flows",
+                         {'bridge': self.br_name,
+                          'count': len(installed_flows)})
+                self.set_agent_uuid_stamp(installed_flows.cookie)
+                self._installed_flows = installed_flows
+        self.set_db_attribute('Bridge', self.br_name, 'external_ids',
+                              {FLOWS_COOKIE: str(self.default_cookie)})
+
+    def _cleanup_installed_flows(self, installed_flows):
+        stale_flows = installed_flows.get_stale_flows()
+        cookies = installed_flows.cookies - self.reserved_cookies
+        LOG.info("Deleting %(flows)d stale flows and the flows with "
+                 "%(cookies)d stale cookies from bridge %(bridge)s",
+                 {'flows': len(stale_flows), 'cookies': len(cookies),
+                  'bridge': self.br_name})
+        if not stale_flows and not cookies:
+            return
+
+        def uninstall_flows(br):
+            for flow in stale_flows:
+                br.uninstall_flows(table_id=flow.table_id, strict=True,
+                                   priority=flow.priority, match=flow.match,
+                                   cookie=installed_flows.cookie,
+                                   cookie_mask=ovs_lib.UINT64_BITMASK)
+            for c in cookies:
+                br.uninstall_flows(cookie=c,
+                                   cookie_mask=ovs_lib.UINT64_BITMASK)
+
+        try:
+            with self.bundled(atomic=True) as br:
+                uninstall_flows(br)
+        except RuntimeError:
+            LOG.warning("Stale flows could not be deleted atomically from "
+                        "bridge %s, deleting them one by one", self.br_name)
+            uninstall_flows(self)
+
     def cleanup_flows(self):
+        installed_flows = self._installed_flows
+        if installed_flows is not None:
+            installed_flows.active = False
+            self._installed_flows = None
+            self._cleanup_installed_flows(installed_flows)
+            return
         cookies = set([f.cookie for f in self.dump_flows()]) - \
                   self.reserved_cookies
         LOG.debug("Reserved cookies for %s: %s", self.br_name,
@@ -195,6 +498,7 @@ class OpenFlowSwitchMixin(object):
     def install_instructions(self, instructions,
                              table_id=0, priority=0,
                              match=None, **match_kwargs):
+        self.flow_mod_counts[(table_id, 'add')] += 1
         (dp, ofp, ofpp) = self._get_dp()
         match = self._match(ofp, ofpp, match, **match_kwargs)
         if isinstance(instructions, six.string_types):
@@ -29,6 +29,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import functools
 
 import netaddr
@@ -245,8 +246,6 @@ class DeferredOVSTunnelBridge(ovs_lib.DeferredOVSBridge):
     _METHODS = [
         'install_unicast_to_tun',
         'delete_unicast_to_tun',
-        'install_flood_to_tun',
-        'delete_flood_to_tun',
         'install_arp_responder',
         'delete_arp_responder',
         'setup_tunnel_port',
@@ -258,3 +257,27 @@ class DeferredOVSTunnelBridge(ovs_lib.DeferredOVSBridge):
             m = getattr(self.br, name)
             return functools.partial(m, deferred_br=self)
         return super(DeferredOVSTunnelBridge, self).__getattr__(name)
+
+    def __init__(self, br, *args, **kwargs):
+        super(DeferredOVSTunnelBridge, self).__init__(br, *args, **kwargs)
+        self._flood_to_tun = collections.OrderedDict()
+
+    # The flood to tun flow of a vlan is updated for each of its tunnels,
+    # only its last update is applied.
+    def install_flood_to_tun(self, vlan, tun_id, ports):
+        self._flood_to_tun[vlan] = (tun_id, list(ports))
+
+    def delete_flood_to_tun(self, vlan):
+        self._flood_to_tun[vlan] = None
+
+    def apply_flows(self):
+        flood_to_tun = self._flood_to_tun
+        self._flood_to_tun = collections.OrderedDict()
+        for vlan, flood in flood_to_tun.items():
+            if flood is None:
+                self.br.delete_flood_to_tun(vlan, deferred_br=self)
+            else:
+                tun_id, ports = flood
+                self.br.install_flood_to_tun(vlan, tun_id, ports,
+                                             deferred_br=self)
+        super(DeferredOVSTunnelBridge, self).apply_flows()
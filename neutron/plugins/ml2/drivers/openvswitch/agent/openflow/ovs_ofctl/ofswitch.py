@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import re
 
 from oslo_log import log as logging
@@ -33,6 +34,11 @@ _keywords = {
 class OpenFlowSwitchMixin(object):
     """Mixin to provide common convenient routines for an openflow switch."""
 
+    def __init__(self, *args, **kwargs):
+        # The number of flow-mods sent per (table, action)
+        self.flow_mod_counts = collections.Counter()
+        super(OpenFlowSwitchMixin, self).__init__(*args, **kwargs)
+
     @staticmethod
     def _conv_args(kwargs):
         for our_name, ovs_ofctl_name in _keywords.items():
@@ -86,6 +92,11 @@ class OpenFlowSwitchMixin(object):
         super(OpenFlowSwitchMixin, self).delete_flows(
               **self._conv_args(kwargs))
 
+    def do_action_flows(self, action, kwargs_list):
+        for kwargs in kwargs_list:
+            self.flow_mod_counts[(kwargs.get('table'), action)] += 1
+        super(OpenFlowSwitchMixin, self).do_action_flows(action, kwargs_list)
+
     def _filter_flows(self, flows):
         cookie_list = self.reserved_cookies
         LOG.debug("Bridge cookies used to filter flows: %s",
@@ -104,6 +115,14 @@ class OpenFlowSwitchMixin(object):
                 fl_table = fl_table.group(1)
                 yield flow, fl_cookie, fl_table
 
+    def start_flows_diff(self):
+        # NOTE: diffing the flows relies on OpenFlow bundles to delete the
+        # stale ones atomically, which are only used by the "native"
+        # interface.  All the flows are installed again with this one.
+        LOG.debug("Flows diff is not supported by the ovs-ofctl interface, "
+                  "all the flows of bridge %s are installed again",
+                  self.br_name)
+
     def cleanup_flows(self):
         flows = self.dump_flows_all_tables()
         for flow, cookie, table in self._filter_flows(flows):
@@ -37,7 +37,6 @@ from oslo_service import loopingcall
 from oslo_service import systemd
 from oslo_utils import netutils
 from osprofiler import profiler
-from six import moves
 
 from neutron._i18n import _
 from neutron.agent.common import ip_lib
@@ -60,6 +59,7 @@ from neutron.plugins.ml2.drivers.agent import capabilities
 from neutron.plugins.ml2.drivers.l2pop.rpc_manager import l2population_rpc
 from neutron.plugins.ml2.drivers.openvswitch.agent.common \
     import constants
+from neutron.plugins.ml2.drivers.openvswitch.agent import loop_metrics
 from neutron.plugins.ml2.drivers.openvswitch.agent \
     import ovs_agent_extension_api as ovs_ext_api
 from neutron.plugins.ml2.drivers.openvswitch.agent \
@@ -147,8 +147,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
 
         self.use_veth_interconnection = ovs_conf.use_veth_interconnection
         self.veth_mtu = agent_conf.veth_mtu
-        self.available_local_vlans = set(moves.range(n_const.MIN_VLAN_TAG,
-                                                     n_const.MAX_VLAN_TAG + 1))
+        self.available_local_vlans = vlanmanager.LocalVlanPool()
         self.tunnel_types = agent_conf.tunnel_types or []
         self.l2_pop = agent_conf.l2_population
         # TODO(ethuleau): Change ARP responder so it's not dependent on the
@@ -166,6 +165,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
 
         # Keep track of int_br's device count for use by _report_state()
         self.int_br_device_count = 0
+        self.loop_metrics = loop_metrics.LoopMetrics()
 
         self.int_br = self.br_int_cls(ovs_conf.integration_bridge)
         self.setup_integration_br()
@@ -182,6 +182,10 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             ovs_conf.bridge_mappings)
         self.setup_physical_bridges(self.bridge_mappings)
         self.vlan_manager = vlanmanager.LocalVlanManager()
+        self.local_vlan_map_file = None
+        if agent_conf.local_vlan_map_file:
+            self.local_vlan_map_file = vlanmanager.LocalVlanMapFile(
+                agent_conf.local_vlan_map_file)
 
         self._reset_tunnel_ofports()
 
@@ -295,6 +299,10 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
 
         self.quitting_rpc_timeout = agent_conf.quitting_rpc_timeout
 
+        if agent_conf.metrics_socket:
+            loop_metrics.start_metrics_server(agent_conf.metrics_socket,
+                                              self.get_loop_metrics)
+
     def _parse_bridge_mappings(self, bridge_mappings):
         try:
             return helpers.parse_mappings(bridge_mappings)
@@ -307,6 +315,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             self.int_br_device_count)
         self.agent_state.get('configurations')['in_distributed_mode'] = (
             self.dvr_agent.in_distributed_mode())
+        self.agent_state.get('configurations')['loop_metrics'] = (
+            self.loop_metrics.get_summary())
 
         try:
             agent_status = self.state_rpc.report_state(self.context,
@@ -326,8 +336,16 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         except Exception:
             LOG.exception("Failed reporting state!")
 
+    def get_loop_metrics(self):
+        return self.loop_metrics.get_report(self._get_agent_bridges())
+
     def _restore_local_vlan_map(self):
         self._local_vlan_hints = {}
+        if self.local_vlan_map_file:
+            networks = self.local_vlan_map_file.load()
+            if networks is not None:
+                self._restore_saved_local_vlan_map(networks)
+                return
         # skip INVALID and UNASSIGNED to match scan_ports behavior
         ofport_filter = (ovs_lib.INVALID_OFPORT, ovs_lib.UNASSIGNED_OFPORT)
         cur_ports = self.int_br.get_vif_ports(ofport_filter)
@@ -344,19 +362,68 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                 local_vlan = by_name[port.port_name]['tag']
             except KeyError:
                 continue
-            if not local_vlan:
+            self._add_local_vlan_hint(local_vlan_map.get('net_uuid'),
+                                      local_vlan)
+
+    def _restore_saved_local_vlan_map(self, networks):
+        """Restore the local VLAN hints from the saved local VLAN map.
+
+        Only the configuration of the ports whose tag does not match the
+        saved map is read from OVSDB.
+        """
+        port_networks = {port_name: net_uuid
+                         for net_uuid, network in networks.items()
+                         for port_name in network['ports']}
+        changed_ports = []
+        for record in self.int_br.get_port_snapshot().records:
+            # skip INVALID and UNASSIGNED to match scan_ports behavior
+            if (not record.iface_id or record.mac is None or
+                    record.ofport in (ovs_lib.INVALID_OFPORT,
+                                      ovs_lib.UNASSIGNED_OFPORT)):
                 continue
-            net_uuid = local_vlan_map.get('net_uuid')
-            if (net_uuid and net_uuid not in self._local_vlan_hints
-                and local_vlan != constants.DEAD_VLAN_TAG):
-                self.available_local_vlans.remove(local_vlan)
-                self._local_vlan_hints[local_vlan_map['net_uuid']] = \
-                    local_vlan
+            net_uuid = port_networks.get(record.port_name)
+            if net_uuid and record.tag == networks[net_uuid]['vlan']:
+                self._add_local_vlan_hint(net_uuid, record.tag)
+            else:
+                changed_ports.append(record.port_name)
+        LOG.debug("Restoring the local VLAN map, %d ports changed since it "
+                  "was saved", len(changed_ports))
+        if not changed_ports:
+            return
+        port_info = self.int_br.get_ports_attributes(
+            "Port", columns=["name", "other_config", "tag"],
+            ports=changed_ports, if_exists=True)
+        for port in port_info:
+            self._add_local_vlan_hint(port['other_config'].get('net_uuid'),
+                                      port['tag'])
+
+    def _add_local_vlan_hint(self, net_uuid, local_vlan):
+        if (net_uuid and local_vlan and
+                net_uuid not in self._local_vlan_hints and
+                local_vlan != constants.DEAD_VLAN_TAG and
+                local_vlan in self.available_local_vlans):
+            self.available_local_vlans.remove(local_vlan)
+            self._local_vlan_hints[net_uuid] = local_vlan
 
     def _dispose_local_vlan_hints(self):
         self.available_local_vlans.update(self._local_vlan_hints.values())
         self._local_vlan_hints = {}
 
+    def _save_local_vlan_map(self):
+        if not self.local_vlan_map_file:
+            return
+        try:
+            networks = {
+                net_uuid: {'vlan': lvm.vlan,
+                           'ports': sorted(vif_port.port_name for vif_port
+                                           in lvm.vif_ports.values())}
+                for net_uuid, lvm in self.vlan_manager.items()}
+            self.local_vlan_map_file.save(networks)
+        except Exception:
+            # The map is only an optimization of the next restart, it must
+            # not fail the processing of the ports
+            LOG.exception("Unable to save the local VLAN map")
+
     def _reset_tunnel_ofports(self):
         self.tun_br_ofports = {n_const.TYPE_GENEVE: {},
                                n_const.TYPE_GRE: {},
@@ -507,32 +574,43 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
     def _tunnel_port_lookup(self, network_type, remote_ip):
         return self.tun_br_ofports[network_type].get(remote_ip)
 
-    def fdb_add(self, context, fdb_entries):
-        LOG.debug("fdb_add received")
+    def _get_remote_agent_ports(self, fdb_entries):
         for lvm, agent_ports in self.get_agent_ports(fdb_entries):
             agent_ports.pop(self.local_ip, None)
             if len(agent_ports):
-                if not self.enable_distributed_routing:
-                    with self.tun_br.deferred() as deferred_br:
-                        self.fdb_add_tun(context, deferred_br, lvm,
-                                         agent_ports, self._tunnel_port_lookup)
-                else:
-                    self.fdb_add_tun(context, self.tun_br, lvm,
-                                     agent_ports, self._tunnel_port_lookup)
+                yield lvm, agent_ports
+
+    def fdb_add(self, context, fdb_entries):
+        LOG.debug("fdb_add received")
+        networks = list(self._get_remote_agent_ports(fdb_entries))
+        if not networks:
+            return
+        if self.enable_distributed_routing:
+            for lvm, agent_ports in networks:
+                self.fdb_add_tun(context, self.tun_br, lvm,
+                                 agent_ports, self._tunnel_port_lookup)
+            return
+        # The flows of all the networks are applied together, each flood to
+        # tun flow once
+        with self.tun_br.deferred() as deferred_br:
+            for lvm, agent_ports in networks:
+                self.fdb_add_tun(context, deferred_br, lvm,
+                                 agent_ports, self._tunnel_port_lookup)
 
     def fdb_remove(self, context, fdb_entries):
         LOG.debug("fdb_remove received")
-        for lvm, agent_ports in self.get_agent_ports(fdb_entries):
-            agent_ports.pop(self.local_ip, None)
-            if len(agent_ports):
-                if not self.enable_distributed_routing:
-                    with self.tun_br.deferred() as deferred_br:
-                        self.fdb_remove_tun(context, deferred_br, lvm,
-                                            agent_ports,
-                                            self._tunnel_port_lookup)
-                else:
-                    self.fdb_remove_tun(context, self.tun_br, lvm,
-                                        agent_ports, self._tunnel_port_lookup)
+        networks = list(self._get_remote_agent_ports(fdb_entries))
+        if not networks:
+            return
+        if self.enable_distributed_routing:
+            for lvm, agent_ports in networks:
+                self.fdb_remove_tun(context, self.tun_br, lvm,
+                                    agent_ports, self._tunnel_port_lookup)
+            return
+        with self.tun_br.deferred() as deferred_br:
+            for lvm, agent_ports in networks:
+                self.fdb_remove_tun(context, deferred_br, lvm,
+                                    agent_ports, self._tunnel_port_lookup)
 
     def add_fdb_flow(self, br, port_info, remote_ip, lvm, ofport):
         if port_info == n_const.FLOODING_ENTRY:
@@ -886,9 +964,10 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                 LOG.debug("Setting status for %s to DOWN", device)
                 devices_down.append(device)
         if devices_up or devices_down:
-            devices_set = self.plugin_rpc.update_device_list(
-                self.context, devices_up, devices_down, self.agent_id,
-                self.conf.host)
+            with self.loop_metrics.phase(loop_metrics.PHASE_RPC):
+                devices_set = self.plugin_rpc.update_device_list(
+                    self.context, devices_up, devices_down, self.agent_id,
+                    self.conf.host)
             failed_devices = (devices_set.get('failed_devices_up') +
                 devices_set.get('failed_devices_down'))
             if failed_devices:
@@ -1010,6 +1089,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             # while flows are missing.
             self.int_br.delete_port(self.conf.OVS.int_peer_patch_port)
             self.int_br.uninstall_flows(cookie=ovs_lib.COOKIE_ANY)
+        elif self.conf.OVS.diff_flows_on_start:
+            self.int_br.start_flows_diff()
         self.int_br.setup_default_table()
 
     def setup_ancillary_bridges(self, integ_br, tun_br):
@@ -1072,6 +1153,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             sys.exit(1)
         if self.conf.AGENT.drop_flows_on_start:
             self.tun_br.uninstall_flows(cookie=ovs_lib.COOKIE_ANY)
+        elif self.conf.OVS.diff_flows_on_start:
+            self.tun_br.start_flows_diff()
 
     def setup_tunnel_br_flows(self):
         '''Setup the tunnel bridge.
@@ -1116,6 +1199,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             br.setup_controllers(self.conf)
             if cfg.CONF.AGENT.drop_flows_on_start:
                 br.uninstall_flows(cookie=ovs_lib.COOKIE_ANY)
+            elif cfg.CONF.OVS.diff_flows_on_start:
+                br.start_flows_diff()
             br.setup_default_table()
             self.phys_brs[physical_network] = br
 
@@ -1194,7 +1279,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         # ARP spoofing rules and drop-flow upon port-delete
         # use ofport-based rules
         previous = self.vifname_to_ofport_map
-        current = self.int_br.get_vif_port_to_ofport_map()
+        current = self.int_br.get_vif_port_to_ofport_map(
+            self.int_br.get_port_snapshot())
 
         # if any ofport numbers have changed, re-process the devices as
         # added ports so any rules based on ofport numbers are updated.
@@ -1353,12 +1439,13 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         return port_info, ancillary_port_info, ports_not_ready_yet
 
     def scan_ports(self, registered_ports, sync, updated_ports=None):
-        cur_ports = self.int_br.get_vif_port_set()
+        port_snapshot = self.int_br.get_port_snapshot()
+        cur_ports = self.int_br.get_vif_port_set(port_snapshot)
         self.int_br_device_count = len(cur_ports)
         port_info = self._get_port_info(registered_ports, cur_ports, sync)
         if updated_ports is None:
             updated_ports = set()
-        updated_ports.update(self.check_changed_vlans())
+        updated_ports.update(self.check_changed_vlans(port_snapshot))
         if updated_ports:
             # Some updated ports might have been removed in the
             # meanwhile, and therefore should not be processed.
@@ -1375,13 +1462,15 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             cur_ports |= bridge.get_vif_port_set()
         return self._get_port_info(registered_ports, cur_ports, sync)
 
-    def check_changed_vlans(self):
+    def check_changed_vlans(self, port_snapshot=None):
         """Check for changed VLAN tags. If changes, notify server and return.
 
         The returned value is a set of port ids of the ports concerned by a
         vlan tag loss.
         """
-        port_tags = self.int_br.get_port_tag_dict()
+        if port_snapshot is None:
+            port_snapshot = self.int_br.get_port_snapshot()
+        port_tags = self.int_br.get_port_tag_dict(port_snapshot)
         changed_ports = set()
         for lvm in self.vlan_manager:
             for port in lvm.vif_ports.values():
@@ -1510,17 +1599,19 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
     def treat_devices_added_or_updated(self, devices, ovs_restarted):
         skipped_devices = []
         need_binding_devices = []
-        devices_details_list = (
-            self.plugin_rpc.get_devices_details_list_and_failed_devices(
-                self.context,
-                devices,
-                self.agent_id,
-                self.conf.host))
+        with self.loop_metrics.phase(loop_metrics.PHASE_RPC):
+            devices_details_list = (
+                self.plugin_rpc.get_devices_details_list_and_failed_devices(
+                    self.context,
+                    devices,
+                    self.agent_id,
+                    self.conf.host))
         failed_devices = set(devices_details_list.get('failed_devices'))
 
         devices = devices_details_list.get('devices')
         vif_by_id = self.int_br.get_vifs_by_ids(
-            [vif['device'] for vif in devices])
+            [vif['device'] for vif in devices],
+            self.int_br.get_port_snapshot())
         for details in devices:
             device = details['device']
             LOG.debug("Processing port: %s", device)
@@ -1587,13 +1678,12 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         return failed_devices
 
     def treat_devices_removed(self, devices):
-        self.sg_agent.remove_devices_filter(devices)
+        with self.loop_metrics.phase(loop_metrics.PHASE_FIREWALL):
+            self.sg_agent.remove_devices_filter(devices)
         LOG.info("Ports %s removed", devices)
-        devices_down = self.plugin_rpc.update_device_list(self.context,
-                                                          [],
-                                                          devices,
-                                                          self.agent_id,
-                                                          self.conf.host)
+        with self.loop_metrics.phase(loop_metrics.PHASE_RPC):
+            devices_down = self.plugin_rpc.update_device_list(
+                self.context, [], devices, self.agent_id, self.conf.host)
         failed_devices = set(devices_down.get('failed_devices_down'))
         LOG.debug("Port removal failed for %s", failed_devices)
         for device in devices:
@@ -1622,11 +1712,9 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
 
     def treat_devices_skipped(self, devices):
         LOG.info("Ports %s skipped, changing status to down", devices)
-        devices_down = self.plugin_rpc.update_device_list(self.context,
-                                                          [],
-                                                          devices,
-                                                          self.agent_id,
-                                                          self.conf.host)
+        with self.loop_metrics.phase(loop_metrics.PHASE_RPC):
+            devices_down = self.plugin_rpc.update_device_list(
+                self.context, [], devices, self.agent_id, self.conf.host)
         failed_devices = set(devices_down.get('failed_devices_down'))
         if failed_devices:
             LOG.debug("Port down failed for %s", failed_devices)
@@ -1650,10 +1738,11 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         skipped_devices = set()
         if devices_added_updated:
             start = time.time()
-            (skipped_devices, need_binding_devices,
-            failed_devices['added']) = (
-                self.treat_devices_added_or_updated(
-                    devices_added_updated, ovs_restarted))
+            with self.loop_metrics.phase(loop_metrics.PHASE_FLOWS):
+                (skipped_devices, need_binding_devices,
+                failed_devices['added']) = (
+                    self.treat_devices_added_or_updated(
+                        devices_added_updated, ovs_restarted))
             LOG.debug("process_network_ports - iteration:%(iter_num)d - "
                       "treat_devices_added_or_updated completed. "
                       "Skipped %(num_skipped)d devices of "
@@ -1671,15 +1760,20 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
         # TODO(salv-orlando): Optimize avoiding applying filters
         # unnecessarily, (eg: when there are no IP address changes)
         added_ports = port_info.get('added', set()) - skipped_devices
-        self._add_port_tag_info(need_binding_devices)
-        self.sg_agent.setup_port_filters(added_ports,
-                                         port_info.get('updated', set()))
-        failed_devices['added'] |= self._bind_devices(need_binding_devices)
+        with self.loop_metrics.phase(loop_metrics.PHASE_OVSDB):
+            self._add_port_tag_info(need_binding_devices)
+        with self.loop_metrics.phase(loop_metrics.PHASE_FIREWALL):
+            self.sg_agent.setup_port_filters(added_ports,
+                                             port_info.get('updated', set()))
+        with self.loop_metrics.phase(loop_metrics.PHASE_FLOWS):
+            failed_devices['added'] |= self._bind_devices(
+                need_binding_devices)
 
         if 'removed' in port_info and port_info['removed']:
             start = time.time()
-            failed_devices['removed'] |= self.treat_devices_removed(
-                port_info['removed'])
+            with self.loop_metrics.phase(loop_metrics.PHASE_FLOWS):
+                failed_devices['removed'] |= self.treat_devices_removed(
+                    port_info['removed'])
             LOG.debug("process_network_ports - iteration:%(iter_num)d - "
                       "treat_devices_removed completed in %(elapsed).3f",
                       {'iter_num': self.iter_num,
@@ -1805,6 +1899,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
     def loop_count_and_wait(self, start_time, port_stats):
         # sleep till end of polling interval
         elapsed = time.time() - start_time
+        self.loop_metrics.end_iteration(self.iter_num, elapsed)
         LOG.debug("Agent rpc_loop - iteration:%(iter_num)d "
                   "completed. Processed ports statistics: "
                   "%(port_stats)s. Elapsed:%(elapsed).3f",
@@ -1832,12 +1927,15 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                 'removed': len(ancillary_port_info.get('removed', []))}
         return port_stats
 
-    def cleanup_stale_flows(self):
+    def _get_agent_bridges(self):
         bridges = [self.int_br]
         bridges.extend(self.phys_brs.values())
         if self.enable_tunneling:
             bridges.append(self.tun_br)
-        for bridge in bridges:
+        return bridges
+
+    def cleanup_stale_flows(self):
+        for bridge in self._get_agent_bridges():
             LOG.info("Cleaning stale %s flows", bridge.br_name)
             bridge.cleanup_flows()
 
@@ -1991,7 +2089,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             start = time.time()
             LOG.debug("Agent rpc_loop - iteration:%d started",
                       self.iter_num)
-            ovs_status = self.check_ovs_status()
+            with self.loop_metrics.phase(loop_metrics.PHASE_OVSDB):
+                ovs_status = self.check_ovs_status()
             if ovs_status == constants.OVS_RESTARTED:
                 self.setup_integration_br()
                 self.setup_physical_bridges(self.bridge_mappings)
@@ -2031,7 +2130,8 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
             # Notify the plugin of tunnel IP
             if self.enable_tunneling and tunnel_sync:
                 try:
-                    tunnel_sync = self.tunnel_sync()
+                    with self.loop_metrics.phase(loop_metrics.PHASE_RPC):
+                        tunnel_sync = self.tunnel_sync()
                 except Exception:
                     LOG.exception("Error while configuring tunnel endpoints")
                     tunnel_sync = True
@@ -2052,15 +2152,19 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                     # between these two statements, this will be thread-safe
                     updated_ports_copy = self.updated_ports
                     self.updated_ports = set()
-                    (port_info, ancillary_port_info, consecutive_resyncs,
-                     ports_not_ready_yet) = (self.process_port_info(
-                            start, polling_manager, sync, ovs_restarted,
-                            ports, ancillary_ports, updated_ports_copy,
-                            consecutive_resyncs, ports_not_ready_yet,
-                            failed_devices, failed_ancillary_devices))
+                    with self.loop_metrics.phase(loop_metrics.PHASE_OVSDB):
+                        (port_info, ancillary_port_info, consecutive_resyncs,
+                         ports_not_ready_yet) = (self.process_port_info(
+                                start, polling_manager, sync, ovs_restarted,
+                                ports, ancillary_ports, updated_ports_copy,
+                                consecutive_resyncs, ports_not_ready_yet,
+                                failed_devices, failed_ancillary_devices))
                     sync = False
-                    self.process_deleted_ports(port_info)
-                    ofport_changed_ports = self.update_stale_ofport_rules()
+                    with self.loop_metrics.phase(loop_metrics.PHASE_FLOWS):
+                        self.process_deleted_ports(port_info)
+                    with self.loop_metrics.phase(loop_metrics.PHASE_OVSDB):
+                        ofport_changed_ports = (
+                            self.update_stale_ofport_rules())
                     if ofport_changed_ports:
                         port_info.setdefault('updated', set()).update(
                             ofport_changed_ports)
@@ -2079,7 +2183,9 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                         failed_devices = self.process_network_ports(
                             port_info, ovs_restarted)
                         if need_clean_stale_flow:
-                            self.cleanup_stale_flows()
+                            with self.loop_metrics.phase(
+                                    loop_metrics.PHASE_FLOWS):
+                                self.cleanup_stale_flows()
                             need_clean_stale_flow = False
                         LOG.debug("Agent rpc_loop - iteration:%(iter_num)d - "
                                   "ports processed. Elapsed:%(elapsed).3f",
@@ -2104,6 +2210,7 @@ class OVSNeutronAgent(l2population_rpc.L2populationRpcCallBackTunnelMixin,
                         self.update_retries_map_and_remove_devs_not_to_retry(
                             failed_devices, failed_ancillary_devices,
                             failed_devices_retries_map))
+                    self._save_local_vlan_map()
                     # Keep this flag in the last line of "try" block,
                     # so we can sure that no other Exception occurred.
                     ovs_restarted = False
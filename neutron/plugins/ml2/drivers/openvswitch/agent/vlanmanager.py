@@ -13,10 +13,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import errno
+import os
+
+from neutron_lib import constants as n_const
 from neutron_lib import exceptions
+from neutron_lib.utils import file as file_utils
+from oslo_log import log as logging
+from oslo_serialization import jsonutils
+from oslo_utils import fileutils
 
 from neutron._i18n import _
 
+LOG = logging.getLogger(__name__)
+
+# The version of the format of the local VLAN map file
+LOCAL_VLAN_MAP_VERSION = 1
+
 
 class VifIdNotFound(exceptions.NeutronException):
     message = _('VIF ID %(vif_id)s not found in any network managed by '
@@ -108,3 +121,133 @@ class LocalVlanManager(object):
             return self.mapping.pop(net_id)
         except KeyError:
             raise MappingNotFound(net_id=net_id)
+
+
+class LocalVlanPool(object):
+    """The local VLAN ids available for the networks.
+
+    The ids in use are flagged in a bitmap and the free ones are kept in a
+    stack, so that allocating, reserving and releasing an id are O(1)
+    (amortized). The stack may hold ids reserved since they were released,
+    which are skipped when popped, and is rebuilt from the bitmap when it
+    grows too much. It supports the set operations the agent uses.
+    """
+
+    def __init__(self, min_vlan=n_const.MIN_VLAN_TAG,
+                 max_vlan=n_const.MAX_VLAN_TAG):
+        self.min_vlan = min_vlan
+        self.max_vlan = max_vlan
+        self._used = bytearray(max_vlan // 8 + 1)
+        # the lowest ids are popped first
+        self._free = list(range(max_vlan, min_vlan - 1, -1))
+        self._free_count = len(self._free)
+
+    def _is_used(self, vlan):
+        return self._used[vlan >> 3] & (1 << (vlan & 7))
+
+    def _set_used(self, vlan, used):
+        if used:
+            self._used[vlan >> 3] |= 1 << (vlan & 7)
+            self._free_count -= 1
+        else:
+            self._used[vlan >> 3] &= ~(1 << (vlan & 7)) & 0xff
+            self._free_count += 1
+
+    def __contains__(self, vlan):
+        return (isinstance(vlan, int) and
+                self.min_vlan <= vlan <= self.max_vlan and
+                not self._is_used(vlan))
+
+    def __len__(self):
+        return self._free_count
+
+    def __bool__(self):
+        return self._free_count > 0
+
+    __nonzero__ = __bool__
+
+    def pop(self):
+        while self._free:
+            vlan = self._free.pop()
+            if not self._is_used(vlan):
+                self._set_used(vlan, True)
+                return vlan
+        raise KeyError('pop from an empty local VLAN pool')
+
+    def remove(self, vlan):
+        if vlan not in self:
+            raise KeyError(vlan)
+        self._set_used(vlan, True)
+
+    def add(self, vlan):
+        if (self.min_vlan <= vlan <= self.max_vlan and
+                self._is_used(vlan)):
+            self._set_used(vlan, False)
+            self._free.append(vlan)
+            if len(self._free) > 2 * (self.max_vlan - self.min_vlan + 1):
+                # drop the ids reserved or released again since they were
+                # released
+                self._free = [v for v in range(self.max_vlan,
+                                               self.min_vlan - 1, -1)
+                              if not self._is_used(v)]
+
+    def update(self, vlans):
+        for vlan in vlans:
+            self.add(vlan)
+
+
+class LocalVlanMapFile(object):
+    """The local VLAN map of the agent, saved across its restarts.
+
+    The file holds a JSON document with the version of its format and, by
+    network id, the local VLAN id of the network and the names of the
+    ports bound to it.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._saved = None
+
+    def load(self):
+        """Return the saved networks, or None if there is no usable map."""
+        try:
+            with open(self.path) as f:
+                data = jsonutils.loads(f.read())
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                LOG.warning("Unable to read the local VLAN map file %(path)s: "
+                            "%(err)s", {'path': self.path, 'err': e})
+            return None
+        except ValueError:
+            LOG.warning("Invalid local VLAN map file %s, ignoring it",
+                        self.path)
+            return None
+        try:
+            if data['version'] != LOCAL_VLAN_MAP_VERSION:
+                LOG.warning("Unsupported version %(version)s of the local "
+                            "VLAN map file %(path)s, ignoring it",
+                            {'version': data['version'], 'path': self.path})
+                return None
+            networks = {net_uuid: {'vlan': int(network['vlan']),
+                                   'ports': list(network['ports'])}
+                        for net_uuid, network in data['networks'].items()}
+        except (AttributeError, KeyError, TypeError, ValueError):
+            LOG.warning("Invalid local VLAN map file %s, ignoring it",
+                        self.path)
+            return None
+        self._saved = networks
+        return networks
+
+    def save(self, networks):
+        """Save the networks, unless they did not change since last saved.
+
+        :param networks: dict of {'vlan': vlan, 'ports': port names} by
+                         network id.
+        """
+        if networks == self._saved:
+            return
+        fileutils.ensure_tree(os.path.dirname(self.path), mode=0o755)
+        file_utils.replace_file(
+            self.path, jsonutils.dumps({'version': LOCAL_VLAN_MAP_VERSION,
+                                        'networks': networks}))
+        self._saved = networks
@@ -618,7 +618,13 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         return {}
 
     @staticmethod
-    @resource_extend.extends([port_def.COLLECTION_NAME])
+    @resource_extend.extends([port_def.COLLECTION_NAME],
+                             attributes=[portbindings.HOST_ID,
+                                         portbindings.VIF_TYPE,
+                                         portbindings.VIF_DETAILS,
+                                         portbindings.VNIC_TYPE,
+                                         portbindings.PROFILE],
+                             relationships=['port_binding'])
     def _ml2_extend_port_dict_binding(port_res, port_db):
         plugin = directory.get_plugin()
         # None when called during unit tests for other plugins.
@@ -957,7 +963,11 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
             for net in nets_db:
                 if net.mtu is None:
                     net.mtu = self._get_network_mtu(net, validate=False)
-                net_data.append(self._make_network_dict(net, context=context))
+                net_dict = self._make_network_dict(
+                    net, process_extensions=False, context=context)
+                resource_extend.apply_funcs(net_def.COLLECTION_NAME,
+                                            net_dict, net, fields)
+                net_data.append(net_dict)
 
             self.type_manager.extend_networks_dict_provider(context, net_data)
             nets = self._filter_nets_provider(context, net_data, filters)
@@ -1283,105 +1293,154 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
     @utils.transaction_guard
     @db_api.retry_if_session_inactive()
     def update_port(self, context, id, port):
-        attrs = port[port_def.RESOURCE_NAME]
-        need_port_update_notify = False
-        bound_mech_contexts = []
         original_port = self.get_port(context, id)
         registry.notify(resources.PORT, events.BEFORE_UPDATE, self,
-                        context=context, port=attrs,
+                        context=context, port=port[port_def.RESOURCE_NAME],
                         original_port=original_port)
         with db_api.context_manager.writer.using(context):
-            port_db = self._get_port(context, id)
-            binding = port_db.port_binding
-            if not binding:
+            update = self._update_port_precommit(context, id, port)
+        return self._update_port_postcommit(context, update)
+
+    @utils.transaction_guard
+    @db_api.retry_if_session_inactive()
+    def update_port_bulk(self, context, ports):
+        """Update several ports in a single transaction.
+
+        :param ports: list of (port id, port body) pairs, the bodies being
+                      those update_port accepts.
+
+        The mechanism drivers postcommit calls and the notifications follow
+        the commit of all the updates. The agents are sent a single security
+        group member update for all the ports.
+        """
+        port_ids = [id for id, _port in ports]
+        original_ports = {
+            original['id']: original
+            for original in self.get_ports(context, filters={'id': port_ids})}
+        for id, port in ports:
+            if id not in original_ports:
                 raise exc.PortNotFound(port_id=id)
-            mac_address_updated = self._check_mac_update_allowed(
-                port_db, attrs, binding)
-            need_port_update_notify |= mac_address_updated
-            original_port = self._make_port_dict(port_db)
-            updated_port = super(Ml2Plugin, self).update_port(context, id,
-                                                              port)
-            self.extension_manager.process_update_port(context, attrs,
-                                                       updated_port)
-            self._portsec_ext_port_update_processing(updated_port, context,
-                                                     port, id)
-
-            if (psec.PORTSECURITY in attrs) and (
-                        original_port[psec.PORTSECURITY] !=
-                        updated_port[psec.PORTSECURITY]):
-                need_port_update_notify = True
-            # TODO(QoS): Move out to the extension framework somehow.
-            # Follow https://review.openstack.org/#/c/169223 for a solution.
-            if (qos_consts.QOS_POLICY_ID in attrs and
-                    original_port[qos_consts.QOS_POLICY_ID] !=
-                    updated_port[qos_consts.QOS_POLICY_ID]):
-                need_port_update_notify = True
-
-            if addr_apidef.ADDRESS_PAIRS in attrs:
-                need_port_update_notify |= (
-                    self.update_address_pairs_on_port(context, id, port,
-                                                      original_port,
-                                                      updated_port))
-            need_port_update_notify |= self.update_security_group_on_port(
-                context, id, port, original_port, updated_port)
-            network = self.get_network(context, original_port['network_id'])
-            need_port_update_notify |= self._update_extra_dhcp_opts_on_port(
-                context, id, port, updated_port)
-            levels = db.get_binding_levels(context, id, binding.host)
-            # one of the operations above may have altered the model call
-            # _make_port_dict again to ensure latest state is reflected so mech
-            # drivers, callback handlers, and the API caller see latest state.
-            # We expire here to reflect changed relationships on the obj.
-            # Repeatable read will ensure we still get the state from this
-            # transaction in spite of concurrent updates/deletes.
-            context.session.expire(port_db)
-            updated_port.update(self._make_port_dict(port_db))
-            mech_context = driver_context.PortContext(
-                self, context, updated_port, network, binding, levels,
-                original_port=original_port)
-            need_port_update_notify |= self._process_port_binding(
-                mech_context, attrs)
+            registry.notify(resources.PORT, events.BEFORE_UPDATE, self,
+                            context=context, port=port[port_def.RESOURCE_NAME],
+                            original_port=original_ports[id])
+        with db_api.context_manager.writer.using(context):
+            updates = [self._update_port_precommit(context, id, port)
+                       for id, port in ports]
+        with self.coalesce_security_group_member_updates(context):
+            return [self._update_port_postcommit(context, update)
+                    for update in updates]
+
+    def _update_port_precommit(self, context, id, port):
+        """Update the port in the DB, within the caller's transaction."""
+        attrs = port[port_def.RESOURCE_NAME]
+        need_port_update_notify = False
+        bound_mech_contexts = []
+        port_db = self._get_port(context, id)
+        binding = port_db.port_binding
+        if not binding:
+            raise exc.PortNotFound(port_id=id)
+        mac_address_updated = self._check_mac_update_allowed(
+            port_db, attrs, binding)
+        need_port_update_notify |= mac_address_updated
+        original_port = self._make_port_dict(port_db)
+        updated_port = super(Ml2Plugin, self).update_port(context, id,
+                                                          port)
+        self.extension_manager.process_update_port(context, attrs,
+                                                   updated_port)
+        self._portsec_ext_port_update_processing(updated_port, context,
+                                                 port, id)
+
+        if (psec.PORTSECURITY in attrs) and (
+                    original_port[psec.PORTSECURITY] !=
+                    updated_port[psec.PORTSECURITY]):
+            need_port_update_notify = True
+        # TODO(QoS): Move out to the extension framework somehow.
+        # Follow https://review.openstack.org/#/c/169223 for a solution.
+        if (qos_consts.QOS_POLICY_ID in attrs and
+                original_port[qos_consts.QOS_POLICY_ID] !=
+                updated_port[qos_consts.QOS_POLICY_ID]):
+            need_port_update_notify = True
 
-            kwargs = {
-                'context': context,
+        if addr_apidef.ADDRESS_PAIRS in attrs:
+            need_port_update_notify |= (
+                self.update_address_pairs_on_port(context, id, port,
+                                                  original_port,
+                                                  updated_port))
+        need_port_update_notify |= self.update_security_group_on_port(
+            context, id, port, original_port, updated_port)
+        network = self.get_network(context, original_port['network_id'])
+        need_port_update_notify |= self._update_extra_dhcp_opts_on_port(
+            context, id, port, updated_port)
+        levels = db.get_binding_levels(context, id, binding.host)
+        # one of the operations above may have altered the model call
+        # _make_port_dict again to ensure latest state is reflected so mech
+        # drivers, callback handlers, and the API caller see latest state.
+        # We expire here to reflect changed relationships on the obj.
+        # Repeatable read will ensure we still get the state from this
+        # transaction in spite of concurrent updates/deletes.
+        context.session.expire(port_db)
+        updated_port.update(self._make_port_dict(port_db))
+        mech_context = driver_context.PortContext(
+            self, context, updated_port, network, binding, levels,
+            original_port=original_port)
+        need_port_update_notify |= self._process_port_binding(
+            mech_context, attrs)
+
+        kwargs = {
+            'context': context,
+            'port': updated_port,
+            'original_port': original_port,
+        }
+        registry.notify(
+            resources.PORT, events.PRECOMMIT_UPDATE, self, **kwargs)
+
+        # For DVR router interface ports we need to retrieve the
+        # DVRPortbinding context instead of the normal port context.
+        # The normal Portbinding context does not have the status
+        # of the ports that are required by the l2pop to process the
+        # postcommit events.
+
+        # NOTE:Sometimes during the update_port call, the DVR router
+        # interface port may not have the port binding, so we cannot
+        # create a generic bindinglist that will address both the
+        # DVR and non-DVR cases here.
+        # TODO(Swami): This code need to be revisited.
+        if port_db['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
+            dist_binding_list = db.get_distributed_port_bindings(context,
+                                                                 id)
+            for dist_binding in dist_binding_list:
+                levels = db.get_binding_levels(context, id,
+                                               dist_binding.host)
+                dist_mech_context = driver_context.PortContext(
+                    self, context, updated_port, network,
+                    dist_binding, levels, original_port=original_port)
+                self.mechanism_manager.update_port_precommit(
+                    dist_mech_context)
+                bound_mech_contexts.append(dist_mech_context)
+        else:
+            self.mechanism_manager.update_port_precommit(mech_context)
+            if any(updated_port[k] != original_port[k]
+                   for k in ('fixed_ips', 'mac_address')):
+                # only add block if fixed_ips or mac_address changed
+                self._setup_dhcp_agent_provisioning_component(
+                    context, updated_port)
+            bound_mech_contexts.append(mech_context)
+        return {'id': id,
                 'port': updated_port,
                 'original_port': original_port,
-            }
-            registry.notify(
-                resources.PORT, events.PRECOMMIT_UPDATE, self, **kwargs)
-
-            # For DVR router interface ports we need to retrieve the
-            # DVRPortbinding context instead of the normal port context.
-            # The normal Portbinding context does not have the status
-            # of the ports that are required by the l2pop to process the
-            # postcommit events.
-
-            # NOTE:Sometimes during the update_port call, the DVR router
-            # interface port may not have the port binding, so we cannot
-            # create a generic bindinglist that will address both the
-            # DVR and non-DVR cases here.
-            # TODO(Swami): This code need to be revisited.
-            if port_db['device_owner'] == const.DEVICE_OWNER_DVR_INTERFACE:
-                dist_binding_list = db.get_distributed_port_bindings(context,
-                                                                     id)
-                for dist_binding in dist_binding_list:
-                    levels = db.get_binding_levels(context, id,
-                                                   dist_binding.host)
-                    dist_mech_context = driver_context.PortContext(
-                        self, context, updated_port, network,
-                        dist_binding, levels, original_port=original_port)
-                    self.mechanism_manager.update_port_precommit(
-                        dist_mech_context)
-                    bound_mech_contexts.append(dist_mech_context)
-            else:
-                self.mechanism_manager.update_port_precommit(mech_context)
-                if any(updated_port[k] != original_port[k]
-                       for k in ('fixed_ips', 'mac_address')):
-                    # only add block if fixed_ips or mac_address changed
-                    self._setup_dhcp_agent_provisioning_component(
-                        context, updated_port)
-                bound_mech_contexts.append(mech_context)
-
+                'mech_context': mech_context,
+                'bound_mech_contexts': bound_mech_contexts,
+                'mac_address_updated': mac_address_updated,
+                'need_port_update_notify': need_port_update_notify}
+
+    def _update_port_postcommit(self, context, update):
+        """Notify a port update once its transaction is complete."""
+        id = update['id']
+        updated_port = update['port']
+        original_port = update['original_port']
+        mech_context = update['mech_context']
+        mac_address_updated = update['mac_address_updated']
+        need_port_update_notify = update['need_port_update_notify']
         # Notifications must be sent after the above transaction is complete
         kwargs = {
             'context': context,
@@ -1397,7 +1456,7 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
         # Since bound_mech_contexts has both the DVR and non-DVR
         # contexts we can manage just with a single for loop.
         try:
-            for mech_context in bound_mech_contexts:
+            for mech_context in update['bound_mech_contexts']:
                 self.mechanism_manager.update_port_postcommit(
                     mech_context)
         except ml2_exc.MechanismDriverError:
@@ -1507,49 +1566,88 @@ class Ml2Plugin(db_base_plugin_v2.NeutronDbPluginV2,
     @db_api.retry_if_session_inactive()
     def delete_port(self, context, id, l3_port_check=True):
         self._pre_delete_port(context, id, l3_port_check)
-        # TODO(armax): get rid of the l3 dependency in the with block
-        router_ids = []
-        l3plugin = directory.get_plugin(plugin_constants.L3)
-
         with db_api.context_manager.writer.using(context):
             try:
                 port_db = self._get_port(context, id)
-                binding = port_db.port_binding
             except exc.PortNotFound:
                 LOG.debug("The port '%s' was deleted", id)
                 return
-            port = self._make_port_dict(port_db)
+            port, router_ids, bound_mech_contexts = (
+                self._delete_port_precommit(context, port_db))
 
-            network = self.get_network(context, port['network_id'])
-            bound_mech_contexts = []
-            device_owner = port['device_owner']
-            if device_owner == const.DEVICE_OWNER_DVR_INTERFACE:
-                bindings = db.get_distributed_port_bindings(context,
-                                                            id)
-                for bind in bindings:
-                    levels = db.get_binding_levels(context, id,
-                                                   bind.host)
-                    mech_context = driver_context.PortContext(
-                        self, context, port, network, bind, levels)
-                    self.mechanism_manager.delete_port_precommit(mech_context)
-                    bound_mech_contexts.append(mech_context)
-            else:
+        self._post_delete_port(
+            context, port, router_ids, bound_mech_contexts)
+
+    @utils.transaction_guard
+    @db_api.retry_if_session_inactive()
+    def delete_port_bulk(self, context, ids, l3_port_check=True):
+        """Delete several ports in a single transaction.
+
+        The ports which do not exist are ignored, as with delete_port. The
+        mechanism drivers postcommit calls and the notifications follow the
+        commit of all the deletions. The agents are sent a single security
+        group member update and the L3 agents a single update of the
+        routers whose floating IPs were disassociated.
+        """
+        for id in ids:
+            self._pre_delete_port(context, id, l3_port_check)
+        with db_api.context_manager.writer.using(context):
+            port_dbs = self._get_ports_query(
+                context, filters={'id': list(ids)}).all()
+            deleted = [self._delete_port_precommit(context, port_db)
+                       for port_db in port_dbs]
+
+        router_ids = set()
+        with self.coalesce_security_group_member_updates(context):
+            for port, port_router_ids, bound_mech_contexts in deleted:
+                router_ids.update(port_router_ids)
+                self._post_delete_port(
+                    context, port, [], bound_mech_contexts)
+        l3plugin = directory.get_plugin(plugin_constants.L3)
+        if l3plugin and router_ids:
+            l3plugin.notify_routers_updated(context, router_ids)
+
+    def _delete_port_precommit(self, context, port_db):
+        """Delete the port from the DB, within the caller's transaction.
+
+        Return the port dict, the ids of the routers whose floating IPs
+        were disassociated from it and the mechanism driver contexts.
+        """
+        # TODO(armax): get rid of the l3 dependency in the with block
+        router_ids = []
+        l3plugin = directory.get_plugin(plugin_constants.L3)
+        id = port_db.id
+        binding = port_db.port_binding
+        port = self._make_port_dict(port_db)
+
+        network = self.get_network(context, port['network_id'])
+        bound_mech_contexts = []
+        device_owner = port['device_owner']
+        if device_owner == const.DEVICE_OWNER_DVR_INTERFACE:
+            bindings = db.get_distributed_port_bindings(context,
+                                                        id)
+            for bind in bindings:
                 levels = db.get_binding_levels(context, id,
-                                               binding.host)
+                                               bind.host)
                 mech_context = driver_context.PortContext(
-                    self, context, port, network, binding, levels)
+                    self, context, port, network, bind, levels)
                 self.mechanism_manager.delete_port_precommit(mech_context)
                 bound_mech_contexts.append(mech_context)
-            if l3plugin:
-                router_ids = l3plugin.disassociate_floatingips(
-                    context, id, do_notify=False)
-
-            LOG.debug("Calling delete_port for %(port_id)s owned by %(owner)s",
-                      {"port_id": id, "owner": device_owner})
-            super(Ml2Plugin, self).delete_port(context, id)
-
-        self._post_delete_port(
-            context, port, router_ids, bound_mech_contexts)
+        else:
+            levels = db.get_binding_levels(context, id,
+                                           binding.host)
+            mech_context = driver_context.PortContext(
+                self, context, port, network, binding, levels)
+            self.mechanism_manager.delete_port_precommit(mech_context)
+            bound_mech_contexts.append(mech_context)
+        if l3plugin:
+            router_ids = l3plugin.disassociate_floatingips(
+                context, id, do_notify=False)
+
+        LOG.debug("Calling delete_port for %(port_id)s owned by %(owner)s",
+                  {"port_id": id, "owner": device_owner})
+        super(Ml2Plugin, self).delete_port(context, id)
+        return port, router_ids, bound_mech_contexts
 
     def _post_delete_port(
         self, context, port, router_ids, bound_mech_contexts):
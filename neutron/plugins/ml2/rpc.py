@@ -30,6 +30,7 @@ from neutron.common import rpc as n_rpc
 from neutron.common import topics
 from neutron.db import l3_hamode_db
 from neutron.db import provisioning_blocks
+from neutron.db import query_stats
 from neutron.plugins.ml2 import db as ml2_db
 from neutron.plugins.ml2.drivers import type_tunnel
 # REVISIT(kmestery): Allow the type and mechanism drivers to supply the
@@ -50,7 +51,8 @@ class RpcCallbacks(type_tunnel.TunnelRpcCallbackMixin):
     #   1.4 tunnel_sync rpc signature upgrade to obtain 'host'
     #   1.5 Support update_device_list and
     #       get_devices_details_list_and_failed_devices
-    target = oslo_messaging.Target(version='1.5')
+    #   1.6 Support get_network_fdb and get_network_fdb_digests
+    target = oslo_messaging.Target(version='1.6')
 
     def __init__(self, notifier, type_manager):
         self.setup_tunnel_callback_mixin(notifier, type_manager)
@@ -144,6 +146,7 @@ class RpcCallbacks(type_tunnel.TunnelRpcCallbackMixin):
         LOG.debug("Returning: %s", entry)
         return entry
 
+    @query_stats.instrument
     def get_devices_details_list(self, rpc_context, **kwargs):
         # cached networks used for reducing number of network db calls
         cached_networks = {}
@@ -330,6 +333,34 @@ class RpcCallbacks(type_tunnel.TunnelRpcCallbackMixin):
         else:
             l2pop_driver.obj.update_port_down(port_context)
 
+    @staticmethod
+    def _get_l2pop_driver():
+        plugin = directory.get_plugin()
+        l2pop_driver = plugin.mechanism_manager.mech_drivers.get(
+            'l2population')
+        return l2pop_driver and l2pop_driver.obj
+
+    def get_network_fdb(self, rpc_context, **kwargs):
+        """Return the l2pop forwarding entries of a network for a host."""
+        l2pop_driver = self._get_l2pop_driver()
+        if not l2pop_driver:
+            return {}
+        return l2pop_driver.get_network_fdb(
+            rpc_context, kwargs.get('host'), kwargs.get('network_id'))
+
+    def get_network_fdb_digests(self, rpc_context, **kwargs):
+        """Return the digests of the l2pop forwarding entries of networks.
+
+        An agent out of sync compares them with the digests of its own
+        entries, and fetches those of the networks which differ with
+        get_network_fdb.
+        """
+        l2pop_driver = self._get_l2pop_driver()
+        if not l2pop_driver:
+            return {}
+        return l2pop_driver.get_network_fdb_digests(
+            rpc_context, kwargs.get('host'), kwargs.get('network_ids', []))
+
     def update_device_list(self, rpc_context, **kwargs):
         devices_up = []
         failed_devices_up = []
@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import copy
 import re
 
 from neutron_lib import constants
@@ -23,6 +24,9 @@ from neutron_lib.plugins import directory
 from oslo_config import cfg
 from oslo_db import exception as db_exc
 from oslo_log import log as logging
+# NOTE: the constant and credential checks are only exposed by the private
+# module; they are needed to tell them apart when compiling rules.
+from oslo_policy import _checks
 from oslo_policy import policy
 from oslo_utils import excutils
 import six
@@ -38,6 +42,16 @@ LOG = logging.getLogger(__name__)
 _ENFORCER = None
 ADMIN_CTX_POLICY = 'context_is_admin'
 ADVSVC_CTX_POLICY = 'context_is_advsvc'
+# Bumped whenever the rules are changed in place, so that rules compiled
+# for a request are not used past a rule change.
+_RULES_GENERATION = 0
+# Attribute of the neutron context holding the rules compiled for it
+_COMPILED_RULES_ATTR = '_compiled_policy_rules'
+
+
+def _rules_changed():
+    global _RULES_GENERATION
+    _RULES_GENERATION += 1
 
 
 def reset():
@@ -45,6 +59,7 @@ def reset():
     if _ENFORCER:
         _ENFORCER.clear()
         _ENFORCER = None
+    _rules_changed()
 
 
 def init(conf=cfg.CONF, policy_file=None):
@@ -83,6 +98,7 @@ def set_rules(policies, overwrite=True):
     LOG.debug("Loading policies from file: %s", _ENFORCER.policy_path)
     init()
     _ENFORCER.set_rules(policies, overwrite)
+    _rules_changed()
 
 
 def _is_attribute_explicitly_set(attribute_name, resource, target, action):
@@ -328,6 +344,127 @@ def _prepare_check(context, action, target, pluralized):
     return match_rule, target, credentials
 
 
+class CompiledRules(object):
+    """Policy rules partially evaluated for a given set of credentials.
+
+    Checks only depending on the credentials (roles, is_admin, constant
+    rules, ...) are evaluated once and folded into constants, so what is
+    left of a rule only holds the checks depending on the target, like
+    ownership or field checks. Rules which end up constant need no
+    evaluation at all for each item of a collection.
+
+    Instances are meant to live for a single request, see
+    get_compiled_rules().
+    """
+
+    _TRUE = _checks.TrueCheck()
+    _FALSE = _checks.FalseCheck()
+
+    def __init__(self, enforcer, credentials):
+        self.enforcer = enforcer
+        self.rules = enforcer.rules
+        self.generation = _RULES_GENERATION
+        # Keep a copy, the context could be changed in place (e.g. roles)
+        self.credentials = copy.deepcopy(credentials)
+        # rule name -> compiled check
+        self._compiled = {}
+
+    def is_current(self, enforcer, credentials):
+        return (self.enforcer is enforcer and
+                self.rules is enforcer.rules and
+                self.generation == _RULES_GENERATION and
+                self.credentials == credentials)
+
+    def get(self, action):
+        """Return the compiled check for the rule named action."""
+        return self._compile(policy.RuleCheck('rule', action), ())
+
+    def is_constant(self, action):
+        rule = self.get(action)
+        return rule is self._TRUE or rule is self._FALSE
+
+    def check(self, action, target):
+        rule = self.get(action)
+        if rule is self._TRUE:
+            return True
+        if rule is self._FALSE:
+            return False
+        return self.enforcer.enforce(rule, target, self.credentials)
+
+    def _constant(self, result):
+        return self._TRUE if result else self._FALSE
+
+    def _compile(self, rule, rule_names):
+        if isinstance(rule, _checks.TrueCheck):
+            return self._TRUE
+        if isinstance(rule, _checks.FalseCheck):
+            return self._FALSE
+        if isinstance(rule, policy.RuleCheck):
+            if rule.match in self._compiled:
+                return self._compiled[rule.match]
+            if rule.match in rule_names:
+                # A loop in the rules, leave it to the policy engine
+                return rule
+            try:
+                referenced = self.rules[rule.match]
+            except KeyError:
+                # Same as the policy engine: fail closed
+                compiled = self._FALSE
+            else:
+                compiled = self._compile(referenced,
+                                         rule_names + (rule.match,))
+            self._compiled[rule.match] = compiled
+            return compiled
+        if isinstance(rule, policy.NotCheck):
+            sub_rule = self._compile(rule.rule, rule_names)
+            if sub_rule is self._TRUE or sub_rule is self._FALSE:
+                return self._constant(sub_rule is self._FALSE)
+            return policy.NotCheck(sub_rule)
+        if isinstance(rule, (policy.AndCheck, policy.OrCheck)):
+            is_and = isinstance(rule, policy.AndCheck)
+            # The value deciding the result on its own, and the neutral one
+            decisive, neutral = ((self._FALSE, self._TRUE) if is_and else
+                                 (self._TRUE, self._FALSE))
+            sub_rules = []
+            for sub_rule in rule.rules:
+                sub_rule = self._compile(sub_rule, rule_names)
+                if sub_rule is decisive:
+                    return decisive
+                if sub_rule is not neutral:
+                    sub_rules.append(sub_rule)
+            if not sub_rules:
+                return neutral
+            if len(sub_rules) == 1:
+                return sub_rules[0]
+            return (policy.AndCheck(sub_rules) if is_and else
+                    policy.OrCheck(sub_rules))
+        if (type(rule) in (_checks.GenericCheck, _checks.RoleCheck) and
+                '%(' not in rule.match):
+            # The match is not a template: only the credentials matter
+            return self._constant(
+                self.enforcer.enforce(rule, {}, self.credentials))
+        return rule
+
+
+def get_compiled_rules(context):
+    """Return the policy rules compiled for the credentials of context.
+
+    The compiled rules are kept on the context, so that they are built
+    once per request and reused for every item of a collection. They are
+    rebuilt if either the rules or the credentials change.
+    """
+    credentials = context.to_policy_values()
+    compiled = getattr(context, _COMPILED_RULES_ATTR, None)
+    if (not isinstance(compiled, CompiledRules) or
+            not compiled.is_current(_ENFORCER, credentials)):
+        # Make sure a modified policy file is taken into account, as the
+        # policy engine would do on each enforcement
+        _ENFORCER.load_rules()
+        compiled = CompiledRules(_ENFORCER, credentials)
+        setattr(context, _COMPILED_RULES_ATTR, compiled)
+    return compiled
+
+
 def log_rule_list(match_rule):
     if LOG.isEnabledFor(logging.DEBUG):
         rules = _process_rules_list([], match_rule)
@@ -360,6 +497,11 @@ def check(context, action, target, plugin=None, might_not_exist=False,
         return True
     if might_not_exist and not (_ENFORCER.rules and action in _ENFORCER.rules):
         return True
+    if not get_resource_and_action(action, pluralized)[1]:
+        # The rule to match does not depend on the attributes of the target,
+        # use the rules compiled for this request
+        return get_compiled_rules(context).check(
+            action, {} if target is None else target)
     match_rule, target, credentials = _prepare_check(context,
                                                      action,
                                                      target,
@@ -52,7 +52,7 @@ class TagPlugin(common_db_mixin.CommonDbMixin, tagging.TagPluginBase):
         return inst
 
     @staticmethod
-    @resource_extend.extends(list(resource_model_map))
+    @resource_extend.extends(list(resource_model_map), attributes=['tags'])
     def _extend_tags_dict(response_data, db_data):
         if not directory.get_plugin(tagging.TAG_PLUGIN_TYPE):
             return
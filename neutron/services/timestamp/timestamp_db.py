@@ -25,16 +25,13 @@ CHANGED_SINCE = 'changed_since'
 TIME_FORMAT_WHOLE_SECONDS = '%Y-%m-%dT%H:%M:%S'
 
 
-def _change_since_result_filter_hook(query, filters):
+def _change_since_criterion(values):
     # this block is for change_since query
     # we get the changed_since string from filters.
     # And translate it from string to datetime type.
     # Then compare with the timestamp in db which has
     # datetime type.
-    values = filters and filters.get(CHANGED_SINCE, [])
-    if not values:
-        return query
-    data = filters[CHANGED_SINCE][0]
+    data = values[0]
     try:
         changed_since_string = timeutils.parse_isotime(data)
     except Exception:
@@ -43,13 +40,7 @@ def _change_since_result_filter_hook(query, filters):
         raise n_exc.InvalidInput(error_message=msg)
     changed_since = (timeutils.
                      normalize_time(changed_since_string))
-    target_model_class = query.column_descriptions[0]['type']
-    query = query.join(standard_attr.StandardAttribute,
-                       target_model_class.standard_attr_id ==
-                       standard_attr.StandardAttribute.id).filter(
-                       standard_attr.StandardAttribute.updated_at
-                       >= changed_since)
-    return query
+    return standard_attr.StandardAttribute.updated_at >= changed_since
 
 
 def _update_timestamp(session, context, instances):
@@ -82,14 +73,8 @@ class TimeStamp_db_mixin(object):
     """Mixin class to add Time Stamp methods."""
 
     def __new__(cls, *args, **kwargs):
-        rs_model_maps = standard_attr.get_standard_attr_resource_model_map()
-        for model in rs_model_maps.values():
-            model_query.register_hook(
-                model,
-                "change_since_query",
-                query_hook=None,
-                filter_hook=None,
-                result_filters=_change_since_result_filter_hook)
+        model_query.register_standard_attr_filter(CHANGED_SINCE,
+                                                  _change_since_criterion)
         return super(TimeStamp_db_mixin, cls).__new__(cls, *args, **kwargs)
 
     def register_db_events(self):
@@ -100,7 +85,8 @@ class TimeStamp_db_mixin(object):
 
     @staticmethod
     @resource_extend.extends(
-        list(standard_attr.get_standard_attr_resource_model_map()))
+        list(standard_attr.get_standard_attr_resource_model_map()),
+        attributes=['created_at', 'updated_at'])
     def _extend_resource_dict_timestamp(resource_res, resource_db):
         if (resource_db and resource_db.created_at and
                 resource_db.updated_at):
@@ -66,7 +66,9 @@ class TrunkPlugin(service_base.ServicePluginBase,
         self.check_compatibility()
 
     @staticmethod
-    @resource_extend.extends([port_def.COLLECTION_NAME])
+    @resource_extend.extends([port_def.COLLECTION_NAME],
+                             attributes=['trunk_details'],
+                             relationships=['trunk_port'])
     def _extend_port_trunk_details(port_res, port_db):
         """Add trunk details to a port."""
         if port_db.trunk_port:
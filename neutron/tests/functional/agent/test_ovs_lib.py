@@ -398,6 +398,25 @@ class OVSBridgeTestCase(OVSBridgeTestBase):
         self.assertIsNone(max_rate)
         self.assertIsNone(burst)
 
+    def test_bw_limits_for_ports(self):
+        port_name, _ = self.create_ovs_port()
+        self.br.set_bw_limits_for_ports(
+            egress_limits={port_name: (700, 70)},
+            ingress_limits={port_name: (750, 100)})
+        self.assertEqual((700, 70),
+                         self.br.get_egress_bw_limit_for_port(port_name))
+        self.assertEqual((750, 100),
+                         self.br.get_ingress_bw_limit_for_port(port_name))
+
+        self.br.set_bw_limits_for_ports(
+            egress_limits={port_name: None},
+            ingress_limits={port_name: None})
+        self.assertEqual((None, None),
+                         self.br.get_egress_bw_limit_for_port(port_name))
+        self.assertEqual((None, None),
+                         self.br.get_ingress_bw_limit_for_port(port_name))
+        self.assertIsNone(self.br.find_qos(port_name))
+
     def test_db_create_references(self):
         with self.ovs.ovsdb.transaction(check_error=True) as txn:
             queue = txn.add(self.ovs.ovsdb.db_create("Queue",
@@ -550,6 +550,71 @@ class TestResourceController(TestRootController):
         self.assertIn('ports', json_body)
         self.assertEqual(1, len(json_body['ports']))
 
+    def _create_second_port(self):
+        return self.plugin.create_port(context.get_admin_context(), {
+            'port':
+            {'tenant_id': 'tenid', 'network_id': self.port['network_id'],
+             'fixed_ips': n_const.ATTR_NOT_SPECIFIED,
+             'mac_address': n_const.ATTR_NOT_SPECIFIED,
+             'admin_state_up': True, 'device_id': 'FF',
+             'device_owner': 'pecan', 'name': 'pecan2'}})
+
+    def test_bulk_update(self):
+        port2 = self._create_second_port()
+        response = self.app.put_json(
+            '/v2.0/ports.json',
+            params={'ports': [{'id': self.port['id'], 'name': 'one'},
+                              {'id': port2['id'], 'name': 'two'}]},
+            headers={'X-Project-Id': 'tenid'})
+        self.assertEqual(200, response.status_int)
+        json_body = jsonutils.loads(response.body)
+        self.assertEqual(
+            {self.port['id']: 'one', port2['id']: 'two'},
+            {port['id']: port['name'] for port in json_body['ports']})
+
+    def test_bulk_update_without_id_returns_400(self):
+        response = self.app.put_json(
+            '/v2.0/ports.json',
+            params={'ports': [{'name': 'one'}]},
+            headers={'X-Project-Id': 'tenid'},
+            expect_errors=True)
+        self.assertEqual(400, response.status_int)
+
+    def test_bulk_update_duplicate_ids_returns_400(self):
+        response = self.app.put_json(
+            '/v2.0/ports.json',
+            params={'ports': [{'id': self.port['id'], 'name': 'one'},
+                              {'id': self.port['id'], 'name': 'two'}]},
+            headers={'X-Project-Id': 'tenid'},
+            expect_errors=True)
+        self.assertEqual(400, response.status_int)
+
+    def test_bulk_update_not_found_returns_404(self):
+        response = self.app.put_json(
+            '/v2.0/ports.json',
+            params={'ports': [{'id': self.port['id'], 'name': 'one'},
+                              {'id': uuidutils.generate_uuid(),
+                               'name': 'two'}]},
+            headers={'X-Project-Id': 'tenid'},
+            expect_errors=True)
+        self.assertEqual(404, response.status_int)
+
+    def test_bulk_delete(self):
+        port2 = self._create_second_port()
+        response = self.app.delete(
+            '/v2.0/ports.json?id=%s&id=%s' % (self.port['id'], port2['id']),
+            headers={'X-Project-Id': 'tenid'})
+        self.assertEqual(204, response.status_int)
+        response = self.app.get('/v2.0/ports.json',
+                                headers={'X-Project-Id': 'tenid'})
+        self.assertEqual([], jsonutils.loads(response.body)['ports'])
+
+    def test_bulk_delete_without_ids_returns_400(self):
+        response = self.app.delete('/v2.0/ports.json',
+                                   headers={'X-Project-Id': 'tenid'},
+                                   expect_errors=True)
+        self.assertEqual(400, response.status_int)
+
 
 class TestPaginationAndSorting(test_functional.PecanFunctionalTest):
 
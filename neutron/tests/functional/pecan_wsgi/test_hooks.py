@@ -21,13 +21,17 @@ from neutron_lib.plugins import directory
 from oslo_config import cfg
 from oslo_policy import policy as oslo_policy
 from oslo_serialization import jsonutils
+from pecan import jsonify
 
 from neutron.api.v2 import attributes
+from neutron.db import query_stats
 from neutron.db.quota import driver as quota_driver
 from neutron import manager
 from neutron.pecan_wsgi.controllers import resource
+from neutron.pecan_wsgi.hooks import query_stats as query_stats_hook
 from neutron import policy
 from neutron.tests.functional.pecan_wsgi import test_functional
+from neutron import wsgi
 
 
 class TestOwnershipHook(test_functional.PecanFunctionalTest):
@@ -91,6 +95,104 @@ class TestQueryParamatersHookWithRevision(test_functional.PecanFunctionalTest):
                                    'If-Match': 'revision_number=%s' % rev})
 
 
+class TestQueryStatsHook(test_functional.PecanFunctionalTest):
+
+    def _list_networks(self):
+        return self.app.get('/v2.0/networks.json',
+                            headers={'X-Project-Id': 'tenid'})
+
+    def test_header_disabled_by_default(self):
+        response = self._list_networks()
+        self.assertNotIn(query_stats.HEADER, response.headers)
+
+    def test_header(self):
+        cfg.CONF.set_override('query_stats', True)
+        cfg.CONF.set_override('query_stats_header', True)
+        response = self._list_networks()
+        self.assertIn('statements=', response.headers[query_stats.HEADER])
+
+    def test_stats_logged_without_header(self):
+        cfg.CONF.set_override('query_stats', True)
+        with mock.patch.object(query_stats, '_report') as report:
+            response = self._list_networks()
+        self.assertNotIn(query_stats.HEADER, response.headers)
+        stats = report.call_args[0][0]
+        self.assertEqual('GET /v2.0/networks.json', stats.name)
+        self.assertGreater(stats.statements, 0)
+
+    def test_stats_cleared_on_error(self):
+        cfg.CONF.set_override('query_stats', True)
+        hook = query_stats_hook.QueryStatsHook()
+        state = mock.Mock()
+        state.request.context = {}
+        state.request.environ = {}
+        hook.before(state)
+        self.assertIsNotNone(state.request.context['query_stats'])
+        with mock.patch.object(query_stats, '_report') as report:
+            hook.on_error(state, RuntimeError())
+        self.assertTrue(report.called)
+        # the next request of the green thread is recorded on its own
+        stats = query_stats.begin('next')
+        self.assertEqual('next', stats.name)
+        query_stats.end(stats)
+
+
+class TestStreamedListResponses(test_functional.PecanFunctionalTest):
+
+    def setUp(self):
+        super(TestStreamedListResponses, self).setUp()
+        cfg.CONF.set_override('stream_list_responses', True)
+        for name in ('meh', 'bah'):
+            self.app.post_json('/v2.0/networks.json',
+                               params={'network': {'name': name}},
+                               headers={'X-Project-Id': 'tenid'})
+        serialize_chunks = mock.patch.object(
+            wsgi.JSONDictSerializer, 'serialize_chunks', autospec=True,
+            side_effect=wsgi.JSONDictSerializer.serialize_chunks)
+        self.serialize_chunks = serialize_chunks.start()
+
+    def _list_networks(self, query=''):
+        response = self.app.get('/v2.0/networks.json%s' % query,
+                                headers={'X-Project-Id': 'tenid'})
+        return jsonutils.loads(response.body)
+
+    def test_list_streamed(self):
+        networks = self._list_networks()['networks']
+        self.assertTrue(self.serialize_chunks.called)
+        self.assertEqual(['bah', 'meh'],
+                         sorted(net['name'] for net in networks))
+        self.assertIn('tenant_id', networks[0])
+
+    def test_list_streamed_not_rendered(self):
+        # the plugin result goes straight to the streamed body, without
+        # being rendered and parsed back first
+        with mock.patch.object(jsonify, 'encode',
+                               side_effect=jsonify.encode) as encode:
+            response = self.app.get('/v2.0/networks.json',
+                                    headers={'X-Project-Id': 'tenid'})
+        self.assertFalse(encode.called)
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual(2, len(jsonutils.loads(response.body)['networks']))
+
+    def test_list_streamed_user_fields(self):
+        networks = self._list_networks('?fields=name')['networks']
+        self.assertTrue(self.serialize_chunks.called)
+        self.assertEqual([{'name': 'bah'}, {'name': 'meh'}],
+                         sorted(networks, key=lambda net: net['name']))
+
+    def test_list_natively_sorted_streamed(self):
+        networks = self._list_networks(
+            '?sort_key=name&sort_dir=desc')['networks']
+        self.assertTrue(self.serialize_chunks.called)
+        self.assertEqual(['meh', 'bah'], [net['name'] for net in networks])
+
+    def test_list_paginated_not_streamed(self):
+        body = self._list_networks('?limit=1')
+        self.assertFalse(self.serialize_chunks.called)
+        self.assertEqual(1, len(body['networks']))
+        self.assertIn('networks_links', body)
+
+
 class TestQuotaEnforcementHook(test_functional.PecanFunctionalTest):
 
     def test_quota_enforcement_single(self):
@@ -31,6 +31,7 @@ from oslo_utils import timeutils
 import unittest2
 
 from neutron.common import constants as n_const
+from neutron.db import query_stats
 from neutron.services.logapi.common import constants as log_const
 
 
@@ -70,6 +71,64 @@ class OpenFixture(fixtures.Fixture):
         self.addCleanup(self._patch.stop)
 
 
+class QueryBudgetFixture(fixtures.Fixture):
+    """Count the SQL statements issued by the plugin entry points a test runs.
+
+    Usage:
+        budget = self.useFixture(tools.QueryBudgetFixture(self))
+        budget.assert_budget(10, plugin.get_ports, ctx)
+    """
+
+    def __init__(self, test):
+        super(QueryBudgetFixture, self).__init__()
+        self.test = test
+
+    def count(self, func, *args, **kwargs):
+        """Return the QueryStats of func(*args, **kwargs)."""
+        with query_stats.record(getattr(func, '__name__', 'test')) as stats:
+            func(*args, **kwargs)
+        return stats
+
+    def assert_budget(self, max_statements, func, *args, **kwargs):
+        stats = self.count(func, *args, **kwargs)
+        self.test.assertLessEqual(
+            stats.statements, max_statements,
+            "%s issued %s" % (getattr(func, '__name__', func), stats))
+        return stats
+
+    def assert_constant(self, func, grow, *args, **kwargs):
+        """Assert the statements of func do not depend on the data size.
+
+        func is called once before and once after calling grow, which is
+        expected to add resources func returns.
+        """
+        before = self.count(func, *args, **kwargs)
+        grow()
+        after = self.count(func, *args, **kwargs)
+        self.test.assertEqual(
+            before.statements, after.statements,
+            "%s issued %s before and %s after adding resources, the most "
+            "repeated statement is: %s" % (
+                getattr(func, '__name__', func), before, after,
+                after.most_repeated()))
+
+    def assert_linear(self, func, items):
+        """Assert the statements of func(items) grow at most linearly.
+
+        For the entry points which handle each item on its own, func is
+        called with the first item, then with all of them, and may not
+        issue more statements per item the second time.
+        """
+        one = self.count(func, items[:1])
+        every = self.count(func, items)
+        self.test.assertLessEqual(
+            every.statements, len(items) * one.statements,
+            "%s issued %s for one item and %s for %d items, the most "
+            "repeated statement is: %s" % (
+                getattr(func, '__name__', func), one, every, len(items),
+                every.most_repeated()))
+
+
 class SafeCleanupFixture(fixtures.Fixture):
     """Catch errors in daughter fixture cleanup."""
 
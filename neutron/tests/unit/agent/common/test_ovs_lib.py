@@ -813,6 +813,45 @@ class OVS_Lib_Test(base.BaseTestCase):
             port_exists_mock.assert_called_once_with("test_port")
             set_egress_mock.assert_not_called()
 
+    def test_set_bw_limits_for_ports(self):
+        self.br.ovsdb = mock.MagicMock()
+        ovsdb = self.br.ovsdb
+        ovsdb.list_ports.return_value.execute.return_value = [
+            'qvo1', 'qvo2']
+        ovsdb.db_find.return_value.execute.side_effect = [
+            [{'_uuid': 'qos2', 'external_ids': {'id': 'qvo2'}},
+             {'_uuid': 'qos-other', 'external_ids': {}}],
+            [{'_uuid': 'queue2',
+              'external_ids': {'id': 'qvo2', 'queue_type': '0'}}]]
+        txn = ovsdb.transaction.return_value.__enter__.return_value
+        self.br.set_bw_limits_for_ports(
+            egress_limits={'qvo1': (100, 80), 'qvo3': (100, 80)},
+            ingress_limits={'qvo1': (200, 20), 'qvo2': None})
+        ovsdb.transaction.assert_called_once_with(check_error=True)
+        # qvo3 is not on the bridge anymore
+        ovsdb.db_set.assert_has_calls([
+            mock.call('Interface', 'qvo1', ('ingress_policing_rate', 100)),
+            mock.call('Interface', 'qvo1', ('ingress_policing_burst', 80)),
+            mock.call('Port', 'qvo1', ('qos', txn.add.return_value))])
+        self.assertEqual(3, ovsdb.db_set.call_count)
+        ovsdb.db_create.assert_has_calls([
+            mock.call('Queue', external_ids={'id': 'qvo1', 'queue_type': '0'},
+                      other_config={'max-rate': '200000', 'burst': '20000'}),
+            mock.call('QoS', external_ids={'id': 'qvo1'}, type='linux-htb',
+                      queues={0: txn.add.return_value})])
+        ovsdb.db_clear.assert_called_once_with('Port', 'qvo2', 'qos')
+        ovsdb.db_destroy.assert_has_calls([
+            mock.call('QoS', 'qos2'), mock.call('Queue', 'queue2')])
+
+    def test_set_bw_limits_for_ports_egress_only(self):
+        self.br.ovsdb = mock.MagicMock()
+        self.br.ovsdb.list_ports.return_value.execute.return_value = ['qvo1']
+        self.br.set_bw_limits_for_ports(egress_limits={'qvo1': None})
+        self.assertFalse(self.br.ovsdb.db_find.called)
+        self.br.ovsdb.db_set.assert_has_calls([
+            mock.call('Interface', 'qvo1', ('ingress_policing_rate', 0)),
+            mock.call('Interface', 'qvo1', ('ingress_policing_burst', 0))])
+
     def test_get_vifs_by_ids(self):
         db_list_res = [
             {'name': 'qvo1', 'ofport': 1,
@@ -840,6 +879,66 @@ class OVS_Lib_Test(base.BaseTestCase):
             [mock.call('Interface', columns=['name', 'external_ids', 'ofport'],
                        if_exists=True)])
 
+    _PORT_SNAPSHOT_ROWS = [
+        ('qvo1', 'qvo1', 1, 5, {'iface-id': 'pid1', 'attached-mac': '11'}),
+        ('qvo2', 'qvo2', [], [], {'iface-id': 'pid2', 'attached-mac': '22'}),
+        ('qvo4', 'qvo4', 2, -1, {'iface-id': 'pid4', 'attached-mac': '44'}),
+        ('patch-tun', 'patch-tun', [], 1, {}),
+    ]
+
+    def test_get_port_snapshot(self):
+        self.br.ovsdb = mock.Mock()
+        execute = self.br.ovsdb.port_snapshot.return_value.execute
+        execute.return_value = (7, self._PORT_SNAPSHOT_ROWS)
+        snapshot = self.br.get_port_snapshot()
+        self.br.ovsdb.port_snapshot.assert_called_once_with(self.BR_NAME,
+                                                            None)
+        self.assertEqual(7, snapshot.seqno)
+        self.assertEqual(['qvo1', 'qvo2', 'qvo4', 'patch-tun'],
+                         [record.name for record in snapshot.records])
+        # The IDL sequence number did not change
+        execute.return_value = None
+        self.assertIs(snapshot, self.br.get_port_snapshot())
+        self.br.ovsdb.port_snapshot.assert_called_with(self.BR_NAME, 7)
+
+    def test_get_port_snapshot_vsctl(self):
+        self.br.get_ports_attributes = mock.Mock(side_effect=[
+            [{'name': 'qvo1', 'tag': 1}],
+            [{'name': 'qvo1', 'ofport': 5,
+              'external_ids': {'iface-id': 'pid1', 'attached-mac': '11'}}]])
+        snapshot = self.br.get_port_snapshot()
+        self.assertIsNone(snapshot.seqno)
+        record = snapshot.by_iface_id['pid1']
+        self.assertEqual(('qvo1', 1, 5, '11'),
+                         (record.name, record.tag, record.ofport, record.mac))
+        self.br.get_ports_attributes.assert_has_calls([
+            mock.call('Port', columns=['name', 'tag'], if_exists=True),
+            mock.call('Interface', columns=['name', 'external_ids', 'ofport'],
+                      if_exists=True)])
+
+    def test_port_snapshot(self):
+        records = [ovs_lib.PortRecord(*row)
+                   for row in self._PORT_SNAPSHOT_ROWS]
+        snapshot = ovs_lib.PortSnapshot(self.br, records)
+        self.assertEqual(4, len(snapshot))
+        self.assertEqual({5: records[0], 1: records[3]}, snapshot.by_ofport)
+        self.assertEqual(records[3], snapshot.by_name['patch-tun'])
+        self.assertEqual({'pid1', 'pid2', 'pid4'}, set(snapshot.by_iface_id))
+        self.assertEqual({'pid1'}, self.br.get_vif_port_set(snapshot))
+        self.assertEqual({'qvo1': 1, 'qvo2': [], 'qvo4': 2, 'patch-tun': []},
+                         self.br.get_port_tag_dict(snapshot))
+        self.assertEqual({'pid1': 5, 'pid4': -1, 'patch-tun': 1},
+                         self.br.get_vif_port_to_ofport_map(snapshot))
+        by_id = self.br.get_vifs_by_ids(['pid1', 'pid2', 'pid3', 'pid4'],
+                                        snapshot)
+        self.assertIsNone(by_id['pid2'])
+        self.assertIsNone(by_id['pid3'])
+        self.assertIsNone(by_id['pid4'])
+        self.assertEqual(('qvo1', 5, 'pid1', '11', self.br),
+                         (by_id['pid1'].port_name, by_id['pid1'].ofport,
+                          by_id['pid1'].vif_id, by_id['pid1'].vif_mac,
+                          by_id['pid1'].switch))
+
     def _test_get_vif_port_by_id(self, iface_id, data, br_name=None,
                                  extra_calls_and_values=None):
         headings = ['external_ids', 'name', 'ofport']
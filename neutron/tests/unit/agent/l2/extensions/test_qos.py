@@ -141,6 +141,51 @@ class QosAgentDriverTestCase(base.BaseTestCase):
         self.driver.delete_bandwidth_limit_ingress.assert_called_with(
             self.port)
 
+    def _create_policy_revision(self, rules):
+        new_policy = policy.QosPolicy(context=None, id=self.policy.id,
+                                      name='test1')
+        new_policy.rules = rules
+        return new_policy
+
+    def test_update_ports_changed_rule(self):
+        egress_rule = rule.QosBandwidthLimitRule(
+            context=None, id=FAKE_RULE_ID, qos_policy_id=self.policy.id,
+            max_kbps=300, max_burst_kbps=200,
+            direction=common_constants.EGRESS_DIRECTION)
+        new_policy = self._create_policy_revision(
+            [egress_rule, self.ingress_bandwidth_limit_rule, self.fake_rule])
+        port2 = dict(self.port)
+        self.driver.update_ports([self.port, port2], self.policy, new_policy)
+        # The unchanged ingress rule is not applied again
+        self.driver.update_bandwidth_limit.assert_has_calls([
+            mock.call(self.port, egress_rule),
+            mock.call(port2, egress_rule)])
+        self.assertEqual(2, self.driver.update_bandwidth_limit.call_count)
+        self.driver.delete_bandwidth_limit.assert_not_called()
+        self.driver.delete_bandwidth_limit_ingress.assert_not_called()
+
+    def test_update_ports_deleted_rule(self):
+        new_policy = self._create_policy_revision(
+            [self.egress_bandwidth_limit_rule])
+        self.driver.update_ports([self.port], self.policy, new_policy)
+        self.driver.delete_bandwidth_limit_ingress.assert_called_once_with(
+            self.port)
+        self.driver.delete_bandwidth_limit.assert_not_called()
+        self.driver.update_bandwidth_limit.assert_not_called()
+
+    def test_update_ports_changed_direction(self):
+        ingress_rule = rule.QosBandwidthLimitRule(
+            context=None, id=FAKE_RULE_ID, qos_policy_id=self.policy.id,
+            max_kbps=100, max_burst_kbps=200,
+            direction=common_constants.INGRESS_DIRECTION)
+        old_policy = self._create_policy_revision(
+            [self.egress_bandwidth_limit_rule])
+        new_policy = self._create_policy_revision([ingress_rule])
+        self.driver.update_ports([self.port], old_policy, new_policy)
+        self.driver.delete_bandwidth_limit.assert_called_once_with(self.port)
+        self.driver.update_bandwidth_limit.assert_called_once_with(
+            self.port, ingress_rule)
+
     def test__iterate_rules_with_unknown_rule_type(self):
         self.policy.rules.append(self.fake_rule)
         rules = list(self.driver._iterate_rules(self.policy.rules))
@@ -333,12 +378,14 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
         policy_obj = mock.Mock()
         policy_obj.id = port1['qos_policy_id']
         self.qos_ext._process_update_policy(policy_obj)
-        self.qos_ext.qos_driver.update.assert_called_with(port1, policy_obj)
+        self.qos_ext.qos_driver.update_ports.assert_called_with(
+            [port1], TEST_POLICY, policy_obj)
 
-        self.qos_ext.qos_driver.update.reset_mock()
+        self.qos_ext.qos_driver.update_ports.reset_mock()
         policy_obj.id = port2['qos_policy_id']
         self.qos_ext._process_update_policy(policy_obj)
-        self.qos_ext.qos_driver.update.assert_called_with(port2, policy_obj)
+        self.qos_ext.qos_driver.update_ports.assert_called_with(
+            [port2], TEST_POLICY2, policy_obj)
 
     def test__process_update_policy_descr_not_propagated_into_driver(self):
         port = self._create_test_port_dict(qos_policy_id=TEST_POLICY.id)
@@ -349,6 +396,7 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
             TEST_POLICY_DESCR)
         self.assertFalse(self.qos_ext.qos_driver.delete.called)
         self.assertFalse(self.qos_ext.qos_driver.update.called)
+        self.assertFalse(self.qos_ext.qos_driver.update_ports.called)
         self.assertEqual(TEST_POLICY_DESCR,
                          self.qos_ext.policy_map.get_policy(TEST_POLICY.id))
 
@@ -358,6 +406,7 @@ class QosExtensionRpcTestCase(QosExtensionBaseTestCase):
         self.assertFalse(self.qos_ext._policy_rules_modified.called)
         self.assertFalse(self.qos_ext.qos_driver.delete.called)
         self.assertFalse(self.qos_ext.qos_driver.update.called)
+        self.assertFalse(self.qos_ext.qos_driver.update_ports.called)
         self.assertIsNone(self.qos_ext.policy_map.get_policy(
             TEST_POLICY_DESCR.id))
 
@@ -206,7 +206,8 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
         non_existent_router = 42
 
         # Make sure the exceptional code path has coverage
-        agent.enqueue_state_change(non_existent_router, 'master')
+        self.assertFalse(
+            agent._process_state_change(non_existent_router, 'master'))
 
     def test_enqueue_state_change_metadata_disable(self):
         self.conf.set_override('enable_metadata_proxy', False)
@@ -215,7 +216,7 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
         router_info = mock.MagicMock()
         agent.router_info[router.id] = router_info
         agent._update_metadata_proxy = mock.Mock()
-        agent.enqueue_state_change(router.id, 'master')
+        agent._process_state_change(router.id, 'master')
         self.assertFalse(agent._update_metadata_proxy.call_count)
 
     def test_enqueue_state_change_l3_extension(self):
@@ -224,11 +225,53 @@ class TestBasicRouterOperations(BasicRouterOperationsFramework):
         router_info = mock.MagicMock()
         agent.router_info[router.id] = router_info
         agent.l3_ext_manager.ha_state_change = mock.Mock()
-        agent.enqueue_state_change(router.id, 'master')
+        agent._process_state_change(router.id, 'master')
         agent.l3_ext_manager.ha_state_change.assert_called_once_with(
             agent.context,
             {'router_id': router.id, 'state': 'master'})
 
+    def test_enqueue_state_change_is_batched(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        with mock.patch.object(agent.state_change_batcher,
+                               'queue_event') as queue_event:
+            agent.enqueue_state_change('router_id', 'master')
+            queue_event.assert_called_once_with(('router_id', 'master'))
+
+    def test_process_state_changes_merges_transitions(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        with mock.patch.object(agent, '_process_state_change',
+                               return_value=True) as process,\
+                mock.patch.object(agent.state_change_notifier,
+                                  'queue_event') as queue_event:
+            agent._process_state_changes([('r1', 'master'),
+                                          ('r2', 'master'),
+                                          ('r1', 'backup')])
+        self.assertEqual(2, process.call_count)
+        process.assert_has_calls([mock.call('r1', 'backup'),
+                                  mock.call('r2', 'master')],
+                                 any_order=True)
+        queue_event.assert_has_calls([mock.call(('r2', 'master')),
+                                      mock.call(('r1', 'backup'))])
+
+    def test_process_state_changes_failure_not_reported(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        with mock.patch.object(agent, '_process_state_change',
+                               side_effect=[RuntimeError, True]),\
+                mock.patch.object(agent.state_change_notifier,
+                                  'queue_event') as queue_event:
+            agent._process_state_changes([('r1', 'master'),
+                                          ('r2', 'master')])
+        queue_event.assert_called_once_with(('r2', 'master'))
+
+    def test_process_state_change_reports_nothing_by_itself(self):
+        agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
+        agent.router_info['router_id'] = mock.MagicMock()
+        with mock.patch.object(agent.state_change_notifier,
+                               'queue_event') as queue_event:
+            self.assertTrue(
+                agent._process_state_change('router_id', 'master'))
+        queue_event.assert_not_called()
+
     def _test__configure_ipv6_params_on_ext_gw_port_if_necessary_helper(
             self, state, enable_expected):
         agent = l3_agent.L3NATAgent(HOSTNAME, self.conf)
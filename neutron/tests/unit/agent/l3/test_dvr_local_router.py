@@ -408,6 +408,113 @@ class TestDvrRouterOperations(base.BaseTestCase):
                                               table=16,
                                               priority=FIP_PRI)
 
+    def _prepare_fip_batch_router(self, num_fips):
+        ri = self._create_router(mock.MagicMock())
+        ri.fip_ns = mock.Mock()
+        ri.fip_ns.get_name.return_value = 'fip-ns'
+        ri.fip_ns.get_int_device_name.return_value = 'fpr-dev'
+        ri.fip_ns.get_ext_device_name.return_value = 'fg-dev'
+        ri.fip_ns.agent_gateway_port = {'id': _uuid()}
+        ri.fip_ns.allocate_rule_priority.side_effect = (
+            lambda fip: FIP_PRI + int(fip.split('.')[-1]))
+        ri.rtr_fip_subnet = lla.LinkLocalAddressPair('169.254.30.42/31')
+        ri._check_if_floatingip_bound_to_host = mock.Mock(return_value=True)
+        ri._get_gw_ips_cidr = mock.Mock(return_value=set())
+        ri.get_router_cidrs = mock.Mock(return_value=set())
+        self.mock_rule.rule.list_rules.return_value = []
+        fips = [{'id': _uuid(),
+                 'host': HOSTNAME,
+                 'status': lib_constants.FLOATINGIP_STATUS_DOWN,
+                 'floating_ip_address': '15.1.%d.%d' % divmod(i, 250),
+                 'fixed_ip_address': '192.168.%d.%d' % divmod(i, 250)}
+                for i in range(num_fips)]
+        ri.get_floating_ips = mock.Mock(return_value=fips)
+        return ri, fips
+
+    @mock.patch.object(ip_lib, 'execute_batch')
+    def test_process_floating_ip_addresses_batched(self, execute_batch):
+        ri, fips = self._prepare_fip_batch_router(2)
+        list_rules = self.mock_rule.rule.list_rules
+        # the rule of the first floating IP is already there
+        list_rules.return_value = [
+            {'from': '192.168.0.0', 'table': '16',
+             'priority': str(FIP_PRI), 'type': 'unicast'}]
+        manager = mock.Mock()
+        manager.attach_mock(execute_batch, 'execute_batch')
+        manager.attach_mock(self.send_adv_notif, 'send_adv_notif')
+
+        fip_statuses = ri.process_floating_ip_addresses('rfp-dev')
+
+        self.assertEqual(
+            dict.fromkeys([fip['id'] for fip in fips],
+                          lib_constants.FLOATINGIP_STATUS_ACTIVE),
+            fip_statuses)
+        list_rules.assert_called_once_with(lib_constants.IP_VERSION_4)
+        self.assertFalse(self.mock_ip_dev.route.add_route.called)
+        self.assertFalse(self.mock_rule.rule.add.called)
+        manager.assert_has_calls([
+            mock.call.execute_batch(
+                [('rule', 'add', 'from', '192.168.0.1', 'table', 16,
+                  'priority', FIP_PRI + 1)],
+                namespace=ri.ns_name, force=True),
+            mock.call.execute_batch(
+                [('route', 'replace', '15.1.0.0/32', 'via',
+                  ri.rtr_fip_subnet.get_pair()[0].ip, 'dev', 'fpr-dev'),
+                 ('route', 'replace', '15.1.0.1/32', 'via',
+                  ri.rtr_fip_subnet.get_pair()[0].ip, 'dev', 'fpr-dev')],
+                namespace='fip-ns', force=True),
+            mock.call.send_adv_notif('fip-ns', 'fg-dev', '15.1.0.0'),
+            mock.call.send_adv_notif('fip-ns', 'fg-dev', '15.1.0.1')])
+        self.assertIsNone(ri._fip_batch)
+
+    @mock.patch.object(ip_lib, 'execute_batch')
+    def test_process_floating_ip_addresses_batched_remove(self,
+                                                          execute_batch):
+        ri, fips = self._prepare_fip_batch_router(0)
+        ri.get_router_cidrs.return_value = set(['15.1.0.7/32'])
+        ri.floating_ips_dict['15.1.0.7'] = FIP_PRI
+
+        ri.process_floating_ip_addresses('rfp-dev')
+
+        rtr_2_fip = ri.rtr_fip_subnet.get_pair()[0].ip
+        execute_batch.assert_has_calls([
+            mock.call([('rule', 'del', 'table', 16, 'priority', FIP_PRI)],
+                      namespace=ri.ns_name, force=True),
+            mock.call([('route', 'del', '15.1.0.7/32', 'via', rtr_2_fip,
+                        'dev', 'fpr-dev')],
+                      namespace='fip-ns', force=True)])
+        ri.fip_ns.deallocate_rule_priority.assert_called_once_with(
+            '15.1.0.7')
+        self.assertFalse(self.mock_rule.rule.delete.called)
+        self.assertFalse(self.mock_ip_dev.route.delete_route.called)
+
+    @mock.patch.object(ip_lib, 'execute_batch')
+    def test_process_floating_ip_addresses_batch_failure(self,
+                                                         execute_batch):
+        ri, fips = self._prepare_fip_batch_router(1)
+        execute_batch.side_effect = RuntimeError
+
+        self.assertRaises(RuntimeError,
+                          ri.process_floating_ip_addresses, 'rfp-dev')
+        self.assertFalse(self.send_adv_notif.called)
+        self.assertIsNone(ri._fip_batch)
+        self.assertEqual([], ri._fip_batch_garps)
+
+    @mock.patch.object(ip_lib, 'execute_batch')
+    def test_process_floating_ip_addresses_batch_scale(self, execute_batch):
+        # The number of ip invocations does not grow with the number of
+        # floating IPs: one listing and one batch per namespace.
+        ri, fips = self._prepare_fip_batch_router(200)
+
+        ri.process_floating_ip_addresses('rfp-dev')
+
+        self.assertEqual(1, self.mock_rule.rule.list_rules.call_count)
+        self.assertEqual(2, execute_batch.call_count)
+        self.assertEqual(
+            [200, 200],
+            [len(c[0][0]) for c in execute_batch.call_args_list])
+        self.assertEqual(200, self.send_adv_notif.call_count)
+
     def _test_add_floating_ip(self, ri, fip, is_failure=False):
         if not is_failure:
             ri.floating_ip_added_dist = mock.Mock(
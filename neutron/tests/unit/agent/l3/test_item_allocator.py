@@ -135,4 +135,67 @@ class TestItemAllocator(base.BaseTestCase):
         self.assertNotIn('deadbeef', a.allocations)
         self.assertIn(allocation, a.pool)
         self.assertEqual({}, a.allocations)
-        write.assert_called_once_with([])
+        write.assert_called_once_with(['deadbeef,\n'], append=True)
+
+    def test_allocate_appends_record(self):
+        test_pool = set([TestObject(33000)])
+        with mock.patch.object(ia.ItemAllocator, '_write') as write:
+            a = ia.ItemAllocator('/file', TestObject, test_pool)
+            a.allocate('deadbeef')
+
+        write.assert_called_once_with(['deadbeef,33000\n'], append=True)
+
+    def test__init__replays_journal(self):
+        test_pool = set(TestObject(s) for s in range(32768, 40000))
+        with mock.patch.object(ia.ItemAllocator, '_read') as read,\
+                mock.patch.object(ia.ItemAllocator, '_write') as write:
+            read.return_value = ["da873ca2,10\n",
+                                 "42c9daf7,11\n",
+                                 "da873ca2,\n",
+                                 "42c9daf7,12\n"]
+            a = ia.ItemAllocator('/file', TestObject, test_pool)
+
+        self.assertEqual(['42c9daf7'], list(a.remembered))
+        self.assertEqual('12', str(a.remembered['42c9daf7']))
+        # the journal is compacted on load
+        write.assert_called_once_with(['42c9daf7,12\n'])
+
+    def test__init__compacted_file_not_rewritten(self):
+        test_pool = set(TestObject(s) for s in range(32768, 40000))
+        with mock.patch.object(ia.ItemAllocator, '_read') as read,\
+                mock.patch.object(ia.ItemAllocator, '_write') as write:
+            read.return_value = ["da873ca2,10\n", "42c9daf7,11\n"]
+            ia.ItemAllocator('/file', TestObject, test_pool)
+
+        self.assertFalse(write.called)
+
+    def test_journal_compaction(self):
+        test_pool = set(TestObject(s) for s in range(32768, 40000))
+        with mock.patch.object(ia.ItemAllocator, '_write') as write:
+            a = ia.ItemAllocator('/file', TestObject, test_pool)
+            allocation = a.allocate('deadbeef')
+            for _i in range(ia.COMPACTION_MIN_RECORDS):
+                a.release('deadbeef')
+                allocation = a.allocate('deadbeef')
+
+        compactions = [c for c in write.call_args_list
+                       if not c[1].get('append')]
+        self.assertEqual(
+            [mock.call(['deadbeef,%s\n' % allocation])], compactions[-1:])
+        self.assertLessEqual(a._journal_records,
+                             ia.COMPACTION_MIN_RECORDS + 1)
+
+    def test_journal_on_disk(self):
+        state_file = self.get_temp_file_path('allocations')
+        test_pool = set([TestObject(33000), TestObject(33001)])
+        a = ia.ItemAllocator(state_file, TestObject, test_pool)
+        first = a.allocate('first')
+        a.allocate('second')
+        a.release('second')
+
+        test_pool = set([TestObject(33000), TestObject(33001)])
+        b = ia.ItemAllocator(state_file, TestObject, test_pool)
+        self.assertEqual(['first'], list(b.remembered))
+        self.assertEqual(str(first), str(b.remembered['first']))
+        with open(state_file) as f:
+            self.assertEqual(['first,%s\n' % first], f.readlines())
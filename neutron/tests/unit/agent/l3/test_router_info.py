@@ -271,6 +271,43 @@ class TestBasicRouterOperations(BasicRouterTestCaseFramework):
         # Be sure that add_rule is called somewhere in the middle
         self.assertFalse(ipv4_nat.add_rule.called)
 
+    def test_process_floating_ip_nat_rules_incremental(self):
+        ri = self._create_router()
+        fip1 = {'fixed_ip_address': '10.0.0.1',
+                'floating_ip_address': '172.24.4.1'}
+        fip2 = {'fixed_ip_address': '10.0.0.2',
+                'floating_ip_address': '172.24.4.2'}
+        ri.get_floating_ips = mock.Mock(return_value=[fip1, fip2])
+        ri.iptables_manager = mock.MagicMock()
+        ipv4_nat = ri.iptables_manager.ipv4['nat']
+        ri.process_floating_ip_nat_rules()
+        self.assertEqual(6, ipv4_nat.add_rule.call_count)
+        ipv4_nat.reset_mock()
+
+        moved_fip2 = dict(fip2, fixed_ip_address='10.0.0.3')
+        ri.get_floating_ips.return_value = [fip1, moved_fip2]
+        ri.process_floating_ip_nat_rules()
+
+        self.assertFalse(ipv4_nat.clear_rules_by_tag.called)
+        ipv4_nat.remove_rule.assert_has_calls(
+            [mock.call(chain, rule)
+             for chain, rule in ri.floating_forward_rules(fip2)])
+        self.assertEqual(3, ipv4_nat.remove_rule.call_count)
+        ipv4_nat.add_rule.assert_has_calls(
+            [mock.call(chain, rule, tag='floating_ip')
+             for chain, rule in ri.floating_forward_rules(moved_fip2)])
+        self.assertEqual(3, ipv4_nat.add_rule.call_count)
+
+    def test_process_floating_ip_nat_rules_failure_resets(self):
+        ri = self._create_router()
+        ri.get_floating_ips = mock.Mock(return_value=[])
+        ri.iptables_manager = mock.MagicMock()
+        ri.iptables_manager.apply.side_effect = [RuntimeError, None]
+        ipv4_nat = ri.iptables_manager.ipv4['nat']
+        self.assertRaises(RuntimeError, ri.process_floating_ip_nat_rules)
+        ri.process_floating_ip_nat_rules()
+        self.assertEqual(2, ipv4_nat.clear_rules_by_tag.call_count)
+
     def test_process_floating_ip_address_scope_rules_diff_scopes(self):
         ri = self._create_router()
         fips = [{'fixed_ip_address': mock.sentinel.ip,
@@ -326,6 +363,89 @@ class TestBasicRouterOperations(BasicRouterTestCaseFramework):
         # Be sure that add_rule is not called somewhere in the middle
         self.assertFalse(ipv4_mangle.add_rule.called)
 
+    def _prepare_process(self, router):
+        ri = self._create_router(router)
+        for name in ('_process_internal_ports', 'process_external',
+                     'process_address_scope', 'routes_updated'):
+            setattr(ri, name, mock.Mock())
+        return ri
+
+    def _assert_sections_processed(self, ri, internal_ports, external,
+                                   address_scope, routes=True):
+        self.assertEqual(internal_ports, ri._process_internal_ports.called)
+        self.assertEqual(internal_ports, ri.agent.pd.sync_router.called)
+        self.assertEqual(external, ri.process_external.called)
+        self.assertEqual(address_scope, ri.process_address_scope.called)
+        self.assertEqual(routes, ri.routes_updated.called)
+        for name in ('_process_internal_ports', 'process_external',
+                     'process_address_scope', 'routes_updated'):
+            getattr(ri, name).reset_mock()
+        ri.agent.pd.sync_router.reset_mock()
+
+    def _get_router_dict(self):
+        return {'id': _uuid(), 'routes': [], 'revision_number': 1,
+                lib_constants.INTERFACE_KEY: [{'id': _uuid()}],
+                lib_constants.FLOATINGIP_KEY: [
+                    {'id': _uuid(), 'floating_ip_address': '172.24.4.1',
+                     'fixed_ip_address': '10.0.0.1'}]}
+
+    def test_process_unchanged_router_skips_sections(self):
+        router = self._get_router_dict()
+        ri = self._prepare_process(router)
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
+        router['revision_number'] = 2
+        ri.process()
+        self._assert_sections_processed(ri, False, False, False)
+        self.assertIn('routes', ri.section_timings)
+
+    def test_process_floating_ip_update_skips_internal_ports(self):
+        router = self._get_router_dict()
+        ri = self._prepare_process(router)
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
+        router[lib_constants.FLOATINGIP_KEY][0]['fixed_ip_address'] = (
+            '10.0.0.2')
+        ri.process()
+        self._assert_sections_processed(ri, False, True, True)
+
+        router['routes'] = [{'destination': '10.1.0.0/24',
+                             'nexthop': '10.0.0.10'}]
+        ri.process()
+        self._assert_sections_processed(ri, False, False, False)
+
+    def test_process_interface_update_processes_all(self):
+        router = self._get_router_dict()
+        ri = self._prepare_process(router)
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
+        router[lib_constants.INTERFACE_KEY].append({'id': _uuid()})
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
+    def test_process_after_reset_applied_state(self):
+        router = self._get_router_dict()
+        ri = self._prepare_process(router)
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
+        ri.reset_applied_state()
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
+    def test_process_failure_processes_all_next_time(self):
+        router = self._get_router_dict()
+        ri = self._prepare_process(router)
+        ri.process_external.side_effect = [RuntimeError, None]
+        self.assertRaises(RuntimeError, ri.process)
+        self._assert_sections_processed(ri, True, True, False, routes=False)
+
+        ri.process()
+        self._assert_sections_processed(ri, True, True, True)
+
     def _test_add_fip_addr_to_device_error(self, device):
         ri = self._create_router()
         ip = '15.1.2.3'
@@ -108,3 +108,39 @@ class BridgeLibTest(base.BaseTestCase):
         with mock.patch('os.listdir', side_effect=[interfaces, OSError()]):
             self.assertEqual(interfaces, br.get_interfaces())
             self.assertEqual([], br.get_interfaces())
+
+
+class FdbInterfaceTest(base.BaseTestCase):
+
+    def setUp(self):
+        super(FdbInterfaceTest, self).setUp()
+        self.execute = mock.patch.object(bridge_lib.utils, 'execute').start()
+
+    def test_get_dsts(self):
+        self.execute.return_value = (
+            '00:00:00:00:00:00 dst 10.0.0.2 self permanent\n'
+            '00:00:00:00:00:00 dst 10.0.0.3 self permanent\n'
+            'fa:16:3e:00:00:01 dst 10.0.0.2 self permanent\n'
+            'fa:16:3e:00:00:02 master brq1\n')
+        self.assertEqual(
+            {'00:00:00:00:00:00': {'10.0.0.2', '10.0.0.3'},
+             'fa:16:3e:00:00:01': {'10.0.0.2'}},
+            bridge_lib.FdbInterface.get_dsts('vxlan-1'))
+        self.execute.assert_called_once_with(
+            ['bridge', 'fdb', 'show', 'dev', 'vxlan-1'], run_as_root=True)
+
+    def test_execute_batch(self):
+        bridge_lib.FdbInterface.execute_batch(
+            [('replace', 'fa:16:3e:00:00:01', 'vxlan-1', '10.0.0.2'),
+             ('delete', 'fa:16:3e:00:00:02', 'vxlan-1', None)],
+            check_exit_code=False)
+        self.execute.assert_called_once_with(
+            ['bridge', '-force', '-batch', '-'],
+            process_input='fdb replace fa:16:3e:00:00:01 dev vxlan-1 '
+                          'dst 10.0.0.2\n'
+                          'fdb delete fa:16:3e:00:00:02 dev vxlan-1\n',
+            run_as_root=True, check_exit_code=False)
+
+    def test_execute_batch_empty(self):
+        bridge_lib.FdbInterface.execute_batch([])
+        self.assertFalse(self.execute.called)
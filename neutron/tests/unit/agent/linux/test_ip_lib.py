@@ -1749,6 +1749,48 @@ class TestAddNamespaceToCmd(base.BaseTestCase):
         self.assertEqual(cmd, ip_lib.add_namespace_to_cmd(cmd, None))
 
 
+class TestExecuteBatch(base.BaseTestCase):
+    def setUp(self):
+        super(TestExecuteBatch, self).setUp()
+        self.execute = mock.patch.object(ip_lib.utils, 'execute').start()
+
+    def test_execute_batch(self):
+        ip_lib.execute_batch([('route', 'del', '1.2.3.4/32', 'dev', 'eth0'),
+                              ('rule', 'del', 'priority', 100)],
+                             namespace='ns')
+        self.execute.assert_called_once_with(
+            ['ip', 'netns', 'exec', 'ns', 'ip', '-force', '-batch', '-'],
+            process_input='route del 1.2.3.4/32 dev eth0\n'
+                          'rule del priority 100\n',
+            run_as_root=True)
+
+    def test_execute_batch_no_force(self):
+        ip_lib.execute_batch([('link', 'del', 'eth0')], force=False)
+        self.execute.assert_called_once_with(
+            ['ip', '-batch', '-'], process_input='link del eth0\n',
+            run_as_root=True)
+
+    def test_execute_batch_empty(self):
+        ip_lib.execute_batch([], namespace='ns')
+        self.assertFalse(self.execute.called)
+
+    def test_ip_batch(self):
+        batch = ip_lib.IPBatch()
+        batch.add('ns1', 'route', 'del', '1.2.3.4/32')
+        batch.add('ns2', 'rule', 'del', 'priority', 100)
+        batch.add('ns1', 'route', 'del', '1.2.3.5/32')
+        self.assertEqual(3, len(batch))
+        with mock.patch.object(ip_lib, 'execute_batch') as execute_batch:
+            batch.execute()
+        execute_batch.assert_has_calls([
+            mock.call([('route', 'del', '1.2.3.4/32'),
+                       ('route', 'del', '1.2.3.5/32')],
+                      namespace='ns1', force=True),
+            mock.call([('rule', 'del', 'priority', 100)],
+                      namespace='ns2', force=True)])
+        self.assertEqual(0, len(batch))
+
+
 class TestSetIpNonlocalBindForHaNamespace(base.BaseTestCase):
     def test_setting_failure(self):
         """Make sure message is formatted correctly."""
@@ -34,3 +34,47 @@ class TestIPMonitorEvent(base.BaseTestCase):
         self.assertEqual('lo', event.interface)
         self.assertFalse(event.added)
         self.assertEqual('127.0.0.2/8', event.cidr)
+
+
+class TestIPLinkMonitorEvent(base.BaseTestCase):
+    def test_from_text_parses_added_line(self):
+        event = ip_monitor.IPLinkMonitorEvent.from_text(
+            '12: tap6a1b2c3d-4e: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1450 '
+            'qdisc pfifo_fast master brq1 state UNKNOWN \\    link/ether '
+            'fe:16:3e:11:22:33 brd ff:ff:ff:ff:ff:ff')
+        self.assertFalse(event.deleted)
+        self.assertEqual(12, event.index)
+        self.assertEqual('tap6a1b2c3d-4e', event.name)
+        self.assertEqual('fe:16:3e:11:22:33', event.mac)
+
+    def test_from_text_parses_deleted_line(self):
+        event = ip_monitor.IPLinkMonitorEvent.from_text(
+            'Deleted 13: veth0@veth1: <BROADCAST,MULTICAST,M-DOWN> mtu 1500 '
+            'qdisc noop state DOWN')
+        self.assertTrue(event.deleted)
+        self.assertEqual(13, event.index)
+        self.assertEqual('veth0', event.name)
+        self.assertIsNone(event.mac)
+
+    def test_from_text_unparsable_line(self):
+        self.assertRaises(ValueError,
+                          ip_monitor.IPLinkMonitorEvent.from_text,
+                          'Deleted foo')
+
+
+class TestIPLinkMonitor(base.BaseTestCase):
+    def setUp(self):
+        super(TestIPLinkMonitor, self).setUp()
+        self.monitor = ip_monitor.IPLinkMonitor()
+
+    def test_get_events(self):
+        self.monitor._stdout_lines.put('3: tap1: <UP> mtu 1500')
+        self.monitor._stdout_lines.put('garbage')
+        self.monitor._stdout_lines.put('Deleted 4: tap2: <UP> mtu 1500')
+        events = self.monitor.get_events()
+        self.assertEqual([('tap1', False), ('tap2', True)],
+                         [(event.name, event.deleted) for event in events])
+        self.assertEqual([], self.monitor.get_events())
+
+    def test_get_events_timeout(self):
+        self.assertEqual([], self.monitor.get_events(timeout=0.01))
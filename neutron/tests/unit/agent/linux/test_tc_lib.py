@@ -302,3 +302,47 @@ class TestTcCommand(base.BaseTestCase):
     def test__get_tbf_burst_value_when_burst_smaller_then_minimal(self):
         result = self.tc._get_tbf_burst_value(BW_LIMIT, 0)
         self.assertEqual(2, result)
+
+
+class TestTcBatch(base.BaseTestCase):
+    def setUp(self):
+        super(TestTcBatch, self).setUp()
+        self.execute = mock.patch.object(tc_lib.utils, 'execute').start()
+
+    def test_execute_batch(self):
+        tc_lib.execute_batch(
+            [('qdisc', 'del', 'dev', 'tap1', 'root'),
+             ('filter', 'add', 'dev', 'tap1', 'mtu', tc_lib.MAX_MTU_VALUE)],
+            namespace='ns', check_exit_code=False)
+        self.execute.assert_called_once_with(
+            ['ip', 'netns', 'exec', 'ns', 'tc', '-force', '-batch', '-'],
+            process_input='qdisc del dev tap1 root\n'
+                          'filter add dev tap1 mtu 65535\n',
+            run_as_root=True, check_exit_code=False)
+
+    def test_execute_batch_empty(self):
+        tc_lib.execute_batch([])
+        self.assertFalse(self.execute.called)
+
+    def test_tc_batch(self):
+        batch = tc_lib.TcBatch()
+        tc1 = tc_lib.TcCommand('tap1', KERNEL_HZ_VALUE, batch=batch)
+        tc2 = tc_lib.TcCommand('tap2', KERNEL_HZ_VALUE, batch=batch)
+        tc1.update_tbf_bw_limit(BW_LIMIT, BURST, LATENCY)
+        tc2.delete_tbf_bw_limit()
+        tc1.delete_filters_bw_limit()
+        self.assertEqual(3, len(batch))
+        self.assertFalse(self.execute.called)
+        with mock.patch.object(tc_lib, 'execute_batch') as execute_batch:
+            batch.execute()
+        # The deletions are run first and allowed to fail
+        execute_batch.assert_has_calls([
+            mock.call([['qdisc', 'del', 'dev', 'tap2', 'root'],
+                       ['qdisc', 'del', 'dev', 'tap1', 'ingress']],
+                      namespace=None, check_exit_code=False,
+                      log_fail_as_error=False),
+            mock.call([['qdisc', 'replace', 'dev', 'tap1', 'root', 'tbf',
+                        'rate', '2000kbit', 'latency', '50ms',
+                        'burst', '100kbit']],
+                      namespace=None)])
+        self.assertEqual(0, len(batch))
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import eventlet
 import mock
 from neutron_lib import constants as n_const
 import testtools
@@ -448,6 +449,64 @@ class TestMetadataProxyHandlerNoCache(TestMetadataProxyHandlerCache):
             2, self.handler.plugin_rpc.get_ports.call_count)
 
 
+class PortPushCacheConfFixture(ConfFixture):
+    def setUp(self):
+        super(PortPushCacheConfFixture, self).setUp()
+        self.config(metadata_port_push_cache=True)
+
+
+class TestMetadataProxyHandlerPortPushCache(TestMetadataProxyHandlerBase):
+    fake_conf = cfg.CONF
+    fake_conf_fixture = PortPushCacheConfFixture(fake_conf)
+
+    def setUp(self):
+        super(TestMetadataProxyHandlerPortPushCache, self).setUp()
+        mock.patch.object(agent.resource_cache,
+                          'RemoteResourceCache').start()
+
+    def test_time_based_cache_disabled(self):
+        self.assertFalse(self.handler._cache)
+
+    def test_port_index_built_once(self):
+        port_index = self.handler._get_port_index()
+        self.assertIs(port_index, self.handler._get_port_index())
+        agent.resource_cache.RemoteResourceCache.assert_called_once_with(
+            [agent.resources.PORT])
+
+    def test_port_index_built_once_concurrently(self):
+        rcache = agent.resource_cache.RemoteResourceCache.return_value
+        # yield to the other request while the first one starts the cache
+        rcache.start_watcher.side_effect = lambda: eventlet.sleep(0.01)
+        requests = [eventlet.spawn(self.handler._get_port_index)
+                    for _i in range(2)]
+        port_indexes = [request.wait() for request in requests]
+        self.assertIs(port_indexes[0], port_indexes[1])
+        rcache.start_watcher.assert_called_once_with()
+
+    def test_get_router_networks_twice(self):
+        self.handler.plugin_rpc.get_ports.return_value = [
+            {'id': 'port_id', 'network_id': 'net_id', 'device_id': 'r_id',
+             'device_owner': n_const.DEVICE_OWNER_ROUTER_INTF,
+             'tenant_id': 'tenant_id',
+             'fixed_ips': [{'ip_address': '10.0.0.1'}]}]
+        for _i in range(2):
+            self.assertEqual(('net_id',),
+                             self.handler._get_router_networks('r_id'))
+        self.assertEqual(1, self.handler.plugin_rpc.get_ports.call_count)
+
+    def test_get_ports_for_remote_address_twice(self):
+        self.handler.plugin_rpc.get_ports.return_value = [
+            {'id': 'port_id', 'network_id': 'net_id',
+             'device_id': 'device_id', 'device_owner': 'compute:nova',
+             'tenant_id': 'tenant_id',
+             'fixed_ips': [{'ip_address': '10.0.0.5'}]}]
+        for _i in range(2):
+            ports = self.handler._get_ports_for_remote_address(
+                '10.0.0.5', ('net_id',))
+            self.assertEqual('device_id', ports[0]['device_id'])
+        self.assertEqual(1, self.handler.plugin_rpc.get_ports.call_count)
+
+
 class TestUnixDomainMetadataProxy(base.BaseTestCase):
     def setUp(self):
         super(TestUnixDomainMetadataProxy, self).setUp()
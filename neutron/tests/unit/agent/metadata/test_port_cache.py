@@ -0,0 +1,147 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+import mock
+from neutron_lib import constants as n_const
+
+from neutron.agent.metadata import port_cache
+from neutron.api.rpc.callbacks import resources
+from neutron.callbacks import events
+from neutron.tests import base
+
+
+def _port_dict(port_id, network_id, ip_address, device_id='vm',
+               device_owner='compute:nova'):
+    return {'id': port_id, 'network_id': network_id,
+            'device_id': device_id, 'device_owner': device_owner,
+            'tenant_id': 'tenant',
+            'fixed_ips': [{'ip_address': ip_address}]}
+
+
+def _port_obj(port_id, network_id, ip_address, device_id='vm',
+              device_owner='compute:nova'):
+    return mock.Mock(id=port_id, network_id=network_id, device_id=device_id,
+                     device_owner=device_owner, project_id='tenant',
+                     fixed_ips=[mock.Mock(ip_address=ip_address)])
+
+
+class TestMetadataPortIndex(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestMetadataPortIndex, self).setUp()
+        self.index = port_cache.MetadataPortIndex()
+        self.fetch = mock.Mock(
+            return_value=[_port_dict('p1', 'net1', '10.0.0.5')])
+
+    def _push(self, port_obj=None, port_id=None, event=events.AFTER_UPDATE):
+        self.index._handle_port_event(
+            resources.PORT, event, mock.ANY, updated=port_obj,
+            resource_id=port_id or port_obj.id)
+
+    def _get(self, ip='10.0.0.5', networks=('net1',)):
+        return self.index.get_ports_for_remote_address(ip, networks,
+                                                       self.fetch)
+
+    def test_subscribe(self):
+        with mock.patch.object(port_cache.registry, 'subscribe') as sub:
+            self.index.subscribe()
+        sub.assert_has_calls(
+            [mock.call(self.index._handle_port_event, resources.PORT,
+                       events.AFTER_UPDATE),
+             mock.call(self.index._handle_port_event, resources.PORT,
+                       events.AFTER_DELETE)])
+
+    def test_lookup_is_served_from_index_after_first_fetch(self):
+        ports = self._get()
+        self.assertEqual('vm', ports[0]['device_id'])
+        ports = self._get()
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertEqual(['p1'], [p['id'] for p in ports])
+        self.assertEqual('tenant', ports[0]['tenant_id'])
+
+    def test_push_update_moves_port(self):
+        self._get()
+        self._push(_port_obj('p1', 'net1', '10.0.0.6'))
+        self.assertEqual([], self._get())
+        self.assertEqual(1, self.fetch.call_count)
+        # the new address was never asked for, so it is not complete yet
+        self._get(ip='10.0.0.6')
+        self.assertEqual(2, self.fetch.call_count)
+
+    def test_push_create_on_complete_key(self):
+        self.fetch.return_value = []
+        self.assertEqual([], self._get())
+        self._push(_port_obj('p2', 'net1', '10.0.0.5', device_id='vm2'))
+        ports = self._get()
+        self.assertEqual(1, self.fetch.call_count)
+        self.assertEqual('vm2', ports[0]['device_id'])
+
+    def test_push_for_unknown_port_is_not_indexed(self):
+        self._push(_port_obj('p2', 'net2', '10.0.0.5'))
+        self.assertNotIn('p2', self.index._ports)
+
+    def test_push_delete(self):
+        self._get()
+        self._push(port_id='p1', event=events.AFTER_DELETE)
+        self.assertEqual([], self._get())
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_router_networks(self):
+        owner = n_const.DEVICE_OWNER_ROUTER_INTF
+        self.fetch.return_value = [
+            _port_dict('p1', 'net2', '10.0.1.1', 'r1', owner),
+            _port_dict('p2', 'net1', '10.0.0.1', 'r1', owner)]
+        self.assertEqual(('net1', 'net2'),
+                         self.index.get_router_networks('r1', self.fetch))
+        self._push(_port_obj('p3', 'net3', '10.0.2.1', 'r1', owner))
+        self.assertEqual(('net1', 'net2', 'net3'),
+                         self.index.get_router_networks('r1', self.fetch))
+        self.assertEqual(1, self.fetch.call_count)
+
+    def test_push_during_fetch_does_not_complete_key(self):
+        def fetch():
+            self._push(_port_obj('p1', 'net1', '10.0.0.7'))
+            return [_port_dict('p1', 'net1', '10.0.0.5')]
+        self.fetch.side_effect = fetch
+        self._get()
+        # the reply was stale and the pushed port was not asked for yet,
+        # so it is left to the next fetch
+        self.assertNotIn('p1', self.index._ports)
+        self.assertNotIn(port_cache._address_key('net1', '10.0.0.5'),
+                         self.index._complete)
+        self.assertEqual({}, self.index._touched)
+
+    def test_fetch_error_is_not_cached(self):
+        self.fetch.side_effect = [RuntimeError, []]
+        self.assertRaises(RuntimeError, self._get)
+        self.assertEqual([], self._get())
+        self.assertEqual({}, self.index._inflight)
+
+    def test_concurrent_misses_share_one_fetch(self):
+        fetch_started = eventlet.event.Event()
+        release = eventlet.event.Event()
+
+        def fetch():
+            fetch_started.send()
+            release.wait()
+            return [_port_dict('p1', 'net1', '10.0.0.5')]
+        self.fetch.side_effect = fetch
+        first = eventlet.spawn(self._get)
+        fetch_started.wait()
+        others = [eventlet.spawn(self._get) for _i in range(5)]
+        eventlet.sleep(0)
+        release.send()
+        results = [gt.wait() for gt in [first] + others]
+        self.assertEqual(1, self.fetch.call_count)
+        for ports in results:
+            self.assertEqual('p1', ports[0]['id'])
@@ -35,3 +35,37 @@ class TransactionTestCase(base.BaseTestCase):
             transaction = impl_idl.NeutronOVSDBTransaction(mock.sentinel,
                                                            mock.Mock(), 0)
             transaction.post_commit(mock.Mock())
+
+
+class PortSnapshotCommandTestCase(base.BaseTestCase):
+    def setUp(self):
+        super(PortSnapshotCommandTestCase, self).setUp()
+        self.api = mock.Mock()
+        self.api.idl.change_seqno = 7
+        iface = mock.Mock(ofport=[5], external_ids={'iface-id': 'pid1'})
+        iface.name = 'qvo1'
+        port = mock.Mock(tag=[1], interfaces=[iface])
+        port.name = 'qvo1'
+        local_port = mock.Mock(interfaces=[mock.Mock()])
+        local_port.name = 'br-int'
+        self.row_by_value = mock.patch.object(
+            impl_idl.idlutils, 'row_by_value',
+            return_value=mock.Mock(ports=[local_port, port])).start()
+        # Optional columns are returned as a single value
+        mock.patch.object(impl_idl.idlutils, 'get_column_value',
+                          side_effect=lambda row, col: getattr(row, col)[0]
+                          ).start()
+
+    def test_run_idl(self):
+        cmd = impl_idl.PortSnapshotCommand(self.api, 'br-int')
+        cmd.run_idl(None)
+        self.assertEqual(
+            (7, [('qvo1', 'qvo1', 1, 5, {'iface-id': 'pid1'})]), cmd.result)
+        self.row_by_value.assert_called_once_with(
+            self.api.idl, 'Bridge', 'name', 'br-int')
+
+    def test_run_idl_unchanged(self):
+        cmd = impl_idl.PortSnapshotCommand(self.api, 'br-int', seqno=7)
+        cmd.run_idl(None)
+        self.assertIsNone(cmd.result)
+        self.assertFalse(self.row_by_value.called)
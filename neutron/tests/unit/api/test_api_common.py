@@ -13,8 +13,11 @@
 #    under the License.
 
 from oslo_config import cfg
+from six.moves.urllib import parse
+import webob
 
 from neutron.api import api_common
+from neutron.common import utils
 from neutron.tests import base
 
 
@@ -31,3 +34,43 @@ class PrepareUrlTestCase(base.BaseTestCase):
         requrl = 'http://neutron.example/sub/ports.json?test=1'
         expected = 'http://quantum.example/sub/ports.json?test=1'
         self.assertEqual(expected, api_common.prepare_url(requrl))
+
+
+class PaginationNativeHelperTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(PaginationNativeHelperTestCase, self).setUp()
+        request = webob.Request.blank(
+            '/v2.0/networks?limit=2&sort_key=name&sort_dir=asc')
+        self.helper = api_common.PaginationNativeHelper(request)
+        self.args = {'sorts': [('name', True)]}
+        self.helper.update_args(self.args)
+        self.items = [{'id': 'id1', 'name': 'net1'},
+                      {'id': 'id2', 'name': 'net2'}]
+
+    def _get_next_marker(self):
+        links = self.helper.get_links(self.items)
+        href = [link['href'] for link in links if link['rel'] == 'next'][0]
+        return parse.parse_qs(parse.urlparse(href).query)['marker'][0]
+
+    def test_id_markers(self):
+        self.assertEqual('id2', self._get_next_marker())
+
+    def test_cursor_markers(self):
+        cfg.CONF.set_override('pagination_cursor_markers', True)
+        self.assertEqual([('name', True), ('id', True)], self.args['sorts'])
+        self.assertEqual((['name', 'id'], ['net2', 'id2']),
+                         utils.decode_pagination_cursor(
+                             self._get_next_marker()))
+
+    def test_cursor_markers_fall_back_to_id(self):
+        cfg.CONF.set_override('pagination_cursor_markers', True)
+        self.items[-1]['name'] = None
+        self.assertEqual('id2', self._get_next_marker())
+
+    def test_update_fields_adds_sort_keys(self):
+        cfg.CONF.set_override('pagination_cursor_markers', True)
+        fields, to_add = ['status'], []
+        self.helper.update_fields(fields, to_add)
+        self.assertEqual(['status', 'id', 'name'], fields)
+        self.assertEqual(['id', 'name'], to_add)
@@ -13,6 +13,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+from neutron_lib.api import converters
+from webob import exc
+
 from neutron.api.v2 import attributes
 from neutron.tests import base
 
@@ -30,3 +34,79 @@ class TestHelpers(base.DietTestCase):
 
     def test_get_collection_info_missing(self):
         self.assertFalse(attributes.get_collection_info('meh'))
+
+
+class TestBodyValidator(base.DietTestCase):
+
+    def setUp(self):
+        super(TestBodyValidator, self).setUp()
+        mock.patch.dict(attributes._body_validators, clear=True).start()
+        # NOTE: a real non-admin context would initialize the policy engine,
+        # which needs the configuration a DietTestCase does not parse
+        self.context = mock.Mock(tenant_id='project', project_id='project',
+                                 is_admin=False)
+        self.attr_info = {
+            'id': {'allow_post': False, 'allow_put': False},
+            'name': {'allow_post': True, 'allow_put': True,
+                     'validate': {'type:string': 10}, 'default': ''},
+            'size': {'allow_post': True, 'allow_put': True,
+                     'convert_to': converters.convert_to_int,
+                     'validate': {'type:range': [1, 5]}},
+            'tenant_id': {'allow_post': True, 'allow_put': False}}
+
+    def _validate(self, res_dict, is_create=True):
+        validator = attributes.get_body_validator('thing', self.attr_info,
+                                                  is_create)
+        validator(self.context, res_dict)
+        return res_dict
+
+    def _assert_bad_request(self, res_dict, message, is_create=True):
+        e = self.assertRaises(exc.HTTPBadRequest, self._validate, res_dict,
+                              is_create)
+        self.assertIn(message, str(e))
+
+    def test_create(self):
+        self.assertEqual(
+            {'name': '', 'size': 3, 'tenant_id': 'project',
+             'project_id': 'project'},
+            self._validate({'size': '3'}))
+
+    def test_create_required(self):
+        self._assert_bad_request({'name': 'foo'}, "'size' not specified")
+
+    def test_create_not_allowed(self):
+        self._assert_bad_request({'id': 'foo', 'size': 3},
+                                 "'id' not allowed in POST")
+
+    def test_unrecognized(self):
+        self._assert_bad_request({'foo': 'bar', 'size': 3},
+                                 "Unrecognized attribute(s) 'foo'")
+
+    def test_invalid(self):
+        self._assert_bad_request({'size': 6}, "Invalid input for size")
+
+    def test_update(self):
+        self.assertEqual({'size': 2},
+                         self._validate({'size': '2'}, is_create=False))
+
+    def test_update_read_only(self):
+        self._assert_bad_request({'id': 'foo'},
+                                 "Cannot update read-only attribute id",
+                                 is_create=False)
+
+    def test_compiled_once(self):
+        validator = attributes.get_body_validator('thing', self.attr_info,
+                                                  True)
+        self.assertIs(validator, attributes.get_body_validator(
+            'thing', self.attr_info, True))
+        self.assertIsNot(validator, attributes.get_body_validator(
+            'thing', self.attr_info, False))
+        self.assertIn('project_id', self.attr_info)
+
+    def test_compiled_again_on_change(self):
+        self._validate({'size': 3})
+        self.attr_info['size'] = dict(self.attr_info['size'],
+                                      validate={'type:range': [1, 2]})
+        self._assert_bad_request({'size': 3}, "Invalid input for size")
+        self.attr_info['color'] = {'allow_post': True, 'allow_put': True}
+        self._assert_bad_request({'size': 1}, "'color' not specified")
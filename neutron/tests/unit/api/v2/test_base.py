@@ -45,6 +45,7 @@ from neutron.tests import base
 from neutron.tests import fake_notifier
 from neutron.tests.unit import dummy_plugin
 from neutron.tests.unit import testlib_api
+from neutron import wsgi
 
 
 EXTDIR = os.path.join(base.ROOTDIR, 'unit/extensions')
@@ -544,6 +545,33 @@ class JSONV2TestCase(APIv2TestBase, testlib_api.WebTestCase):
         tenant_id = _uuid()
         self._test_list(tenant_id + "bad", tenant_id)
 
+    def _test_list_streamed(self, req_tenant_id, real_tenant_id,
+                            streamed=True):
+        cfg.CONF.set_override('stream_list_responses', True)
+        with mock.patch.object(
+                wsgi.JSONDictSerializer, 'serialize_chunks', autospec=True,
+                side_effect=wsgi.JSONDictSerializer.serialize_chunks) as sc:
+            self._test_list(req_tenant_id, real_tenant_id)
+        self.assertEqual(streamed, sc.called)
+
+    def test_list_streamed_noauth(self):
+        self._test_list_streamed(None, _uuid())
+
+    def test_list_streamed_keystone(self):
+        tenant_id = _uuid()
+        self._test_list_streamed(tenant_id, tenant_id)
+
+    def test_list_streamed_keystone_bad(self):
+        tenant_id = _uuid()
+        self._test_list_streamed(tenant_id + "bad", tenant_id)
+
+    def test_list_streamed_not_used_with_pagination_links(self):
+        cfg.CONF.set_override('stream_list_responses', True)
+        with mock.patch.object(wsgi.JSONDictSerializer,
+                               'serialize_chunks') as serialize_chunks:
+            self.test_list_pagination()
+        self.assertFalse(serialize_chunks.called)
+
     def test_list_pagination(self):
         id1 = str(_uuid())
         id2 = str(_uuid())
@@ -16,6 +16,7 @@
 import mock
 from neutron_lib import context
 from neutron_lib import exceptions as n_exc
+from oslo_config import cfg
 import oslo_i18n
 from webob import exc
 import webtest
@@ -23,6 +24,7 @@ import webtest
 from neutron._i18n import _
 from neutron.api.v2 import resource as wsgi_resource
 from neutron.common import utils
+from neutron.db import query_stats
 from neutron.tests import base
 from neutron import wsgi
 
@@ -312,6 +314,28 @@ class ResourceTestCase(base.BaseTestCase):
         res = resource.delete('', extra_environ=environ)
         self.assertEqual(204, res.status_int)
 
+    def _test_query_stats_header(self, enabled):
+        cfg.CONF.set_override('query_stats', True)
+        cfg.CONF.set_override('query_stats_header', enabled)
+        stats = query_stats.QueryStats('test')
+        stats.record('SELECT 1', 0.002, 1)
+        controller = mock.MagicMock()
+        controller.test = lambda request: {'foo': 'bar'}
+        resource = webtest.TestApp(wsgi_resource.Resource(controller))
+        environ = {'wsgiorg.routing_args': (None, {'action': 'test'})}
+        with mock.patch.object(query_stats, 'record') as record:
+            record.return_value.__enter__.return_value = stats
+            res = resource.get('', extra_environ=environ)
+        self.assertEqual(200, res.status_int)
+        return res.headers.get(query_stats.HEADER)
+
+    def test_query_stats_header(self):
+        self.assertEqual('statements=1; time=0.002; rows=1',
+                         self._test_query_stats_header(True))
+
+    def test_query_stats_header_disabled(self):
+        self.assertIsNone(self._test_query_stats_header(False))
+
     def test_action_status(self):
         controller = mock.MagicMock()
         controller.test = lambda request: {'foo': 'bar'}
@@ -757,3 +757,32 @@ class TestThrottler(base.BaseTestCase):
 
         obj = Klass()
         obj.method()
+
+
+class TestPaginationCursor(base.BaseTestCase):
+
+    def test_round_trip(self):
+        cursor = utils.encode_pagination_cursor(
+            ['name', 'mtu', 'id'], ['net 1/2', 1450, 'uuid'])
+        self.assertEqual((['name', 'mtu', 'id'], ['net 1/2', 1450, 'uuid']),
+                         utils.decode_pagination_cursor(cursor))
+
+    def test_round_trip_scalars(self):
+        values = [None, True, 1.5, 'uuid']
+        cursor = utils.encode_pagination_cursor(
+            ['a', 'b', 'c', 'id'], values)
+        self.assertEqual(values, utils.decode_pagination_cursor(cursor)[1])
+
+    def test_not_a_cursor(self):
+        for marker in (None, 'ab40ef6c-63ec-4d4c-8f8e-10ce8e5b1d67',
+                       mock.sentinel.marker):
+            self.assertIsNone(utils.decode_pagination_cursor(marker))
+
+    def test_invalid_cursor(self):
+        for marker in ('k1.not-base64!', 'k1.' + 'W10',
+                       utils.encode_pagination_cursor(['id'], [['uuid']]),
+                       utils.encode_pagination_cursor(['id'], [{'a': 1}]),
+                       utils.encode_pagination_cursor(['name', 'id'],
+                                                      ['uuid'])):
+            self.assertRaises(exc.BadRequest,
+                              utils.decode_pagination_cursor, marker)
@@ -0,0 +1,77 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import datetime
+
+import mock
+from neutron_lib import context
+from oslo_utils import uuidutils
+
+from neutron.db import _model_query as model_query
+from neutron.db import api as db_api
+from neutron.db import models_v2
+from neutron.db import standard_attr
+from neutron.tests.unit import testlib_api
+
+
+class TestStandardAttrFilters(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(TestStandardAttrFilters, self).setUp()
+        self.ctx = context.get_admin_context()
+        mock.patch.dict(model_query._standard_attr_filters,
+                        {'changed_since': self._changed_since}).start()
+        self.old = datetime.datetime(2017, 1, 1)
+        self.new = datetime.datetime(2017, 6, 1)
+        self.nets = {}
+        with db_api.context_manager.writer.using(self.ctx):
+            for name, description, updated_at in (
+                    ('n1', 'foo', self.old), ('n2', 'foo', self.new),
+                    ('n3', 'bar', self.new)):
+                net = models_v2.Network(
+                    id=uuidutils.generate_uuid(), name=name,
+                    project_id='project', admin_state_up=True,
+                    status='ACTIVE', description=description,
+                    created_at=self.old, updated_at=updated_at)
+                self.ctx.session.add(net)
+                self.nets[name] = net.id
+
+    @staticmethod
+    def _changed_since(values):
+        return standard_attr.StandardAttribute.updated_at >= values[0]
+
+    def _query(self, filters):
+        return model_query.get_collection_query(
+            self.ctx, models_v2.Network, filters=filters)
+
+    def _names(self, filters):
+        return sorted(net.name for net in self._query(filters))
+
+    def test_standard_attr_column_filter(self):
+        self.assertEqual(['n1', 'n2'], self._names({'description': ['foo']}))
+        self.assertEqual(['n1', 'n2', 'n3'],
+                         self._names({'description': ['foo', 'bar']}))
+
+    def test_registered_standard_attr_filter(self):
+        self.assertEqual(['n2', 'n3'],
+                         self._names({'changed_since': [self.new]}))
+
+    def test_standard_attr_filters_share_one_join(self):
+        filters = {'description': ['foo'], 'changed_since': [self.new]}
+        self.assertEqual(['n2'], self._names(filters))
+        statement = str(self._query(filters).statement).upper()
+        self.assertEqual(1, statement.count('JOIN STANDARDATTRIBUTES ON'))
+
+    def test_unregistered_filter_ignored(self):
+        model_query._standard_attr_filters.clear()
+        self.assertEqual(['n1', 'n2', 'n3'],
+                         self._names({'changed_since': [self.new]}))
@@ -0,0 +1,94 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from neutron.db import _resource_extend as resource_extend
+from neutron.tests import base
+
+
+class ResourceExtendTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(ResourceExtendTestCase, self).setUp()
+        for registry in (resource_extend._resource_extend_functions,
+                         resource_extend._EXTEND_FUNC_DECLARATIONS):
+            mock.patch.dict(registry, clear=True).start()
+        self.calls = []
+
+        @resource_extend.has_resource_extenders
+        class Extender(object):
+
+            @staticmethod
+            @resource_extend.extends(['foos'], attributes=['bar'],
+                                     relationships=['bar_rel', 'shared'])
+            def _extend_bar(res, db_obj):
+                self.calls.append('bar')
+                res['bar'] = db_obj.bar
+
+            @staticmethod
+            @resource_extend.extends(['foos'], attributes=['baz', 'qux'],
+                                     relationships=['shared'])
+            def _extend_baz(res, db_obj):
+                self.calls.append('baz')
+                res['baz'] = db_obj.baz
+                res['qux'] = db_obj.qux
+
+            @staticmethod
+            @resource_extend.extends(['foos'])
+            def _extend_undeclared(res, db_obj):
+                self.calls.append('undeclared')
+
+        # instances register their methods, keep one alive for the weak refs
+        self.extender = Extender()
+        self.db_obj = mock.Mock(bar=1, baz=2, qux=3)
+
+    def _apply(self, fields=None):
+        res = {'id': 'foo'}
+        resource_extend.apply_funcs('foos', res, self.db_obj, fields)
+        return res
+
+    def test_apply_funcs_without_fields(self):
+        res = self._apply()
+        self.assertEqual({'id': 'foo', 'bar': 1, 'baz': 2, 'qux': 3}, res)
+        self.assertEqual(['bar', 'baz', 'undeclared'], sorted(self.calls))
+
+    def test_apply_funcs_skips_unrequested(self):
+        res = self._apply(['id', 'qux'])
+        self.assertNotIn('bar', res)
+        self.assertEqual(['baz', 'undeclared'], sorted(self.calls))
+
+    def test_apply_funcs_only_undeclared(self):
+        self._apply(['id'])
+        self.assertEqual(['undeclared'], self.calls)
+
+    def test_register_funcs_with_attributes(self):
+        def _extend_quux(res, db_obj):
+            self.calls.append('quux')
+        resource_extend.register_funcs('foos', [_extend_quux],
+                                       attributes=['quux'])
+        self._apply(['id'])
+        self.assertNotIn('quux', self.calls)
+        self._apply(['quux'])
+        self.assertIn('quux', self.calls)
+
+    def test_get_unneeded_relationships(self):
+        self.assertEqual(set(),
+                         resource_extend.get_unneeded_relationships(
+                             'foos', None))
+        self.assertEqual({'bar_rel', 'shared'},
+                         resource_extend.get_unneeded_relationships(
+                             'foos', ['id']))
+        # relationships read by an applied function are still needed
+        self.assertEqual({'bar_rel'},
+                         resource_extend.get_unneeded_relationships(
+                             'foos', ['id', 'baz']))
@@ -48,6 +48,7 @@ from neutron.common import exceptions as n_exc
 from neutron.common import ipv6_utils
 from neutron.common import test_lib
 from neutron.common import utils
+from neutron.db import _model_query as model_query
 from neutron.db import api as db_api
 from neutron.db import db_base_plugin_common
 from neutron.db import ipam_backend_mixin
@@ -1089,6 +1090,22 @@ class TestPortsV2(NeutronDbPluginV2TestCase):
             count = pl.get_ports_count(ctx, filters={'tenant_id': [tenid]})
             self.assertEqual(4, count)
 
+    def test_get_ports_count_estimated(self):
+        cfg.CONF.set_override('estimated_collection_count', True)
+        with self.port() as p:
+            tenid = p['port']['tenant_id']
+            pl = directory.get_plugin()
+            ctx = context.get_admin_context()
+            # sqlite provides no estimate, the rows are counted
+            self.assertEqual(1, pl.get_ports_count(ctx))
+            with mock.patch.object(model_query, '_estimated_row_count',
+                                   return_value=1000):
+                self.assertEqual(1000, pl.get_ports_count(ctx))
+                self.assertEqual(1, pl.get_ports_count(
+                    ctx, filters={'tenant_id': [tenid]}))
+                user_ctx = context.Context(user_id=None, tenant_id=tenid)
+                self.assertEqual(1, pl.get_ports_count(user_ctx))
+
     def test_create_ports_bulk_emulated_plugin_failure(self):
         real_has_attr = hasattr
 
@@ -1280,6 +1297,62 @@ fixed_ips=ip_address%%3D%s&fixed_ips=ip_address%%3D%s&fixed_ips=subnet_id%%3D%s
                                                     ('mac_address', 'asc'),
                                                     2, 2)
 
+    def test_list_ports_with_pagination_cursor_native(self):
+        if self._skip_native_pagination:
+            self.skipTest("Skip test for not implemented pagination feature")
+        cfg.CONF.set_override('pagination_cursor_markers', True)
+        cfg.CONF.set_default('allow_overlapping_ips', True)
+        with self.port(mac_address='00:00:00:00:00:01') as port1,\
+                self.port(mac_address='00:00:00:00:00:02') as port2,\
+                self.port(mac_address='00:00:00:00:00:03') as port3:
+            plugin = directory.get_plugin()
+            # cursor markers are not looked up
+            with mock.patch.object(plugin, '_get_port',
+                                   side_effect=AssertionError):
+                self._test_list_with_pagination('port',
+                                                (port3, port2, port1),
+                                                ('mac_address', 'desc'), 2, 2,
+                                                query_params='fields=id')
+
+    def test_list_ports_with_pagination_cursor_reverse_native(self):
+        if self._skip_native_pagination:
+            self.skipTest("Skip test for not implemented pagination feature")
+        cfg.CONF.set_override('pagination_cursor_markers', True)
+        cfg.CONF.set_default('allow_overlapping_ips', True)
+        with self.port(mac_address='00:00:00:00:00:01') as port1,\
+                self.port(mac_address='00:00:00:00:00:02') as port2,\
+                self.port(mac_address='00:00:00:00:00:03') as port3:
+            self._test_list_with_pagination_reverse('port',
+                                                    (port1, port2, port3),
+                                                    ('mac_address', 'asc'),
+                                                    2, 2)
+
+    def test_list_ports_with_invalid_pagination_cursor(self):
+        if self._skip_native_pagination:
+            self.skipTest("Skip test for not implemented pagination feature")
+        with self.port() as port:
+            # the cursor does not match the requested sort keys
+            marker = utils.encode_pagination_cursor(
+                ['id'], [port['port']['id']])
+            req = self.new_list_request(
+                'ports', params='limit=2&sort_key=mac_address&sort_dir=asc'
+                                '&marker=%s' % marker)
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPBadRequest.code, res.status_int)
+
+    def test_list_ports_with_crafted_pagination_cursor(self):
+        if self._skip_native_pagination:
+            self.skipTest("Skip test for not implemented pagination feature")
+        with self.port():
+            # the values of a cursor must be scalars
+            marker = utils.encode_pagination_cursor(
+                ['mac_address', 'id'], [{'a': 1}, ['b']])
+            req = self.new_list_request(
+                'ports', params='limit=2&sort_key=mac_address&sort_dir=asc'
+                                '&marker=%s' % marker)
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPBadRequest.code, res.status_int)
+
     def test_show_port(self):
         with self.port() as port:
             req = self.new_show_request('ports', port['port']['id'], self.fmt)
@@ -425,6 +425,24 @@ class L3DvrTestCase(test_db_base_plugin_v2.NeutronDbPluginV2TestCase):
         self.assertIn(const.FLOATINGIP_KEY, router)
         self.assertIn(fip, router[const.FLOATINGIP_KEY])
 
+    def test__notify_floating_ip_changes_centralized_routers(self):
+        router_db = self._create_router({'name': 'r1',
+                                         'admin_state_up': True})
+        fips = [{'router_id': router_db['id'], 'port_id': 'port1'},
+                {'router_id': router_db['id'], 'port_id': 'port1'},
+                {'router_id': router_db['id'], 'port_id': 'port2'},
+                {'router_id': None, 'port_id': None}]
+        self.mixin.l3_rpc_notifier = mock.Mock()
+        with mock.patch.object(self.mixin, '_get_router',
+                               return_value=router_db) as get_router,\
+                mock.patch.object(self.mixin,
+                                  'notify_router_updated') as notify:
+            self.mixin._notify_floating_ip_changes(self.ctx, fips)
+        self.assertEqual(2, get_router.call_count)
+        self.assertFalse(notify.called)
+        self.mixin.l3_rpc_notifier.routers_updated.assert_called_once_with(
+            self.ctx, [router_db['id']])
+
     def _setup_test_create_floatingip(
         self, fip, floatingip_db, router_db):
         port = {
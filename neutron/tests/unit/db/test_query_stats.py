@@ -0,0 +1,106 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+from neutron_lib import context as n_ctx
+from oslo_config import cfg
+
+from neutron.db import api as db_api
+from neutron.db import query_stats
+from neutron.tests.unit import testlib_api
+
+
+class TestQueryStats(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(TestQueryStats, self).setUp()
+        self.ctx = n_ctx.get_admin_context()
+
+    def _select(self, times=1):
+        for i in range(times):
+            self.ctx.session.execute('SELECT 1')
+
+    def test_record(self):
+        with query_stats.record('test', 'req-1') as stats:
+            self._select(3)
+        self.assertEqual(3, stats.statements)
+        self.assertEqual('req-1', stats.request_id)
+        self.assertEqual(('SELECT 1', 3), stats.most_repeated())
+        # statements outside of the block are not counted
+        self._select()
+        self.assertEqual(3, stats.statements)
+
+    def test_record_skips_connection_ping(self):
+        with query_stats.record('test') as stats:
+            engine = db_api.context_manager.writer.get_engine()
+            with engine.connect() as conn:
+                conn.execute('SELECT 2')
+        self.assertEqual(('SELECT 2', 1), stats.most_repeated())
+        self.assertEqual(1, stats.statements)
+
+    def test_record_nested(self):
+        with query_stats.record('outer') as outer:
+            self._select()
+            with query_stats.record('inner') as inner:
+                self._select()
+        self.assertIs(outer, inner)
+        self.assertEqual(2, outer.statements)
+
+    def test_collect_disabled(self):
+        with query_stats.collect('test') as stats:
+            self._select()
+        self.assertIsNone(stats)
+
+    def test_collect_reports_repeated_statements(self):
+        cfg.CONF.set_override('query_stats', True)
+        cfg.CONF.set_override('query_stats_repeat_threshold', 3)
+        with mock.patch.object(query_stats, 'LOG') as log:
+            with query_stats.collect('test'):
+                self._select(2)
+            self.assertFalse(log.warning.called)
+            with query_stats.collect('test') as stats:
+                self._select(3)
+            self.assertEqual(1, log.warning.call_count)
+        self.assertEqual(3, stats.statements)
+
+    def test_begin_end(self):
+        cfg.CONF.set_override('query_stats', True)
+        with mock.patch.object(query_stats, '_report') as report:
+            stats = query_stats.begin('test', 'req-1')
+            self._select(2)
+            # already recording
+            self.assertIsNone(query_stats.begin('inner'))
+            query_stats.end(stats)
+            self._select()
+        report.assert_called_once_with(stats)
+        self.assertEqual(2, stats.statements)
+
+    def test_begin_disabled(self):
+        self.assertIsNone(query_stats.begin('test'))
+        query_stats.end(None)
+
+    def test_instrument(self):
+        cfg.CONF.set_override('query_stats', True)
+
+        class Callback(object):
+            @query_stats.instrument
+            def get_info(self, context, **kwargs):
+                context.session.execute('SELECT 1')
+                return kwargs
+
+        with mock.patch.object(query_stats, '_report') as report:
+            self.assertEqual({'host': 'h'},
+                             Callback().get_info(self.ctx, host='h'))
+        stats = report.call_args[0][0]
+        self.assertEqual('get_info', stats.name)
+        self.assertEqual(self.ctx.request_id, stats.request_id)
+        self.assertEqual(1, stats.statements)
@@ -0,0 +1,103 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from neutron_lib import context as n_ctx
+from neutron_lib import exceptions as n_exc
+from oslo_utils import uuidutils
+
+from neutron.db import api as db_api
+from neutron.db import db_base_plugin_common
+from neutron.db import models_v2
+from neutron.db import query_stats
+from neutron.db import request_cache
+from neutron.db import segments_db
+from neutron.tests.unit import testlib_api
+
+
+class TestRequestCache(testlib_api.SqlTestCase):
+
+    def setUp(self):
+        super(TestRequestCache, self).setUp()
+        request_cache.register()
+        self.ctx = n_ctx.get_admin_context()
+        self.plugin = db_base_plugin_common.DbBasePluginCommon()
+        self.network_id = uuidutils.generate_uuid()
+        with db_api.context_manager.writer.using(self.ctx):
+            self.ctx.session.add(models_v2.Network(
+                id=self.network_id, name='net', project_id='project',
+                admin_state_up=True, status='ACTIVE'))
+        segments_db.add_network_segment(
+            self.ctx, self.network_id, {segments_db.NETWORK_TYPE: 'vxlan',
+                                        segments_db.SEGMENTATION_ID: 42})
+
+    def _count(self, func, *args):
+        with query_stats.record('test') as stats:
+            result = func(*args)
+        return result, stats.statements
+
+    def test_get_network_once_per_transaction(self):
+        with db_api.context_manager.writer.using(self.ctx):
+            network, statements = self._count(
+                self.plugin._get_network, self.ctx, self.network_id)
+            self.assertGreater(statements, 0)
+            cached, statements = self._count(
+                self.plugin._get_network, self.ctx, self.network_id)
+            self.assertIs(network, cached)
+            self.assertEqual(0, statements)
+        # a new transaction reads it again
+        with db_api.context_manager.writer.using(self.ctx):
+            network, statements = self._count(
+                self.plugin._get_network, self.ctx, self.network_id)
+            self.assertGreater(statements, 0)
+
+    def test_get_network_invalidated_on_write(self):
+        with db_api.context_manager.writer.using(self.ctx):
+            network = self.plugin._get_network(self.ctx, self.network_id)
+            self.ctx.session.delete(network)
+            self.ctx.session.flush()
+            self.assertRaises(n_exc.NetworkNotFound,
+                              self.plugin._get_network,
+                              self.ctx, self.network_id)
+
+    def test_get_network_scoped_by_credentials(self):
+        ctx = n_ctx.Context('user', 'other_project')
+        with db_api.context_manager.writer.using(ctx):
+            self.plugin._get_network(ctx.elevated(), self.network_id)
+            self.assertRaises(n_exc.NetworkNotFound,
+                              self.plugin._get_network,
+                              ctx, self.network_id)
+
+    def test_get_network_segments_once_per_transaction(self):
+        with db_api.context_manager.writer.using(self.ctx):
+            segments, statements = self._count(
+                segments_db.get_network_segments, self.ctx, self.network_id)
+            self.assertGreater(statements, 0)
+            segments[0][segments_db.SEGMENTATION_ID] = 43
+            cached, statements = self._count(
+                segments_db.get_network_segments, self.ctx, self.network_id)
+            self.assertEqual(0, statements)
+            # the callers get their own copies
+            self.assertEqual(42, cached[0][segments_db.SEGMENTATION_ID])
+            segments_db.add_network_segment(
+                self.ctx, self.network_id,
+                {segments_db.NETWORK_TYPE: 'vxlan',
+                 segments_db.SEGMENTATION_ID: 44}, segment_index=1)
+            self.assertEqual(2, len(segments_db.get_network_segments(
+                self.ctx, self.network_id)))
+
+    def test_not_cached_without_listeners(self):
+        db_api.sqla_remove_all()
+        with db_api.context_manager.writer.using(self.ctx):
+            self.plugin._get_network(self.ctx, self.network_id)
+            _network, statements = self._count(
+                self.plugin._get_network, self.ctx, self.network_id)
+            self.assertGreater(statements, 0)
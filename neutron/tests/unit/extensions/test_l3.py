@@ -58,6 +58,7 @@ from neutron.services.revisions import revision_plugin
 from neutron.tests import base
 from neutron.tests.common import helpers
 from neutron.tests import fake_notifier
+from neutron.tests import tools
 from neutron.tests.unit.api import test_extensions
 from neutron.tests.unit.api.v2 import test_base
 from neutron.tests.unit.db import test_db_base_plugin_v2
@@ -2502,6 +2503,150 @@ class L3NatTestCaseBase(L3NatTestCaseMixin):
                                            floating_ip_id=fip_id,
                                            router_id=None)
 
+    def test_floatingip_bulk_update_and_delete(self):
+        plugin = directory.get_plugin(plugin_constants.L3)
+        if not hasattr(plugin, 'l3_rpc_notifier'):
+            self.skipTest("Plugin does not support l3_rpc_notifier")
+        ctx = context.get_admin_context()
+        with self.subnet() as private_sub,\
+                self.port(subnet=private_sub) as p1,\
+                self.port(subnet=private_sub) as p2,\
+                self.subnet(cidr='12.0.0.0/24') as public_sub,\
+                self.router() as r:
+            public_net_id = public_sub['subnet']['network_id']
+            router_id = r['router']['id']
+            self._set_net_external(public_net_id)
+            self._add_external_gateway_to_router(router_id, public_net_id)
+            self._router_interface_action('add', router_id,
+                                          private_sub['subnet']['id'], None)
+            fip_ids = [
+                self._make_floatingip(self.fmt,
+                                      public_net_id)['floatingip']['id']
+                for port in (p1, p2)]
+            with mock.patch.object(plugin.l3_rpc_notifier,
+                                   'routers_updated') as routers_updated:
+                fips = plugin.update_floatingip_bulk(
+                    ctx, [(fip_id,
+                           {'floatingip': {'port_id': port['port']['id']}})
+                          for fip_id, port in zip(fip_ids, (p1, p2))])
+                self.assertEqual([p1['port']['id'], p2['port']['id']],
+                                 [fip['port_id'] for fip in fips])
+                # the router is notified once for both floating IPs
+                routers_updated.assert_called_once_with(
+                    ctx, [router_id], 'update_floatingip', {})
+                routers_updated.reset_mock()
+                plugin.delete_floatingip_bulk(ctx, fip_ids)
+                routers_updated.assert_called_once_with(
+                    ctx, [router_id], 'delete_floatingip', {})
+            self.assertEqual(
+                [], plugin.get_floatingips(ctx, filters={'id': fip_ids}))
+
+    def test_floatingip_bulk_update_rolled_back_on_failure(self):
+        plugin = directory.get_plugin(plugin_constants.L3)
+        ctx = context.get_admin_context()
+        with self.subnet() as private_sub,\
+                self.port(subnet=private_sub) as p1,\
+                self.port(subnet=private_sub) as p2,\
+                self.subnet(cidr='12.0.0.0/24') as public_sub,\
+                self.router() as r:
+            public_net_id = public_sub['subnet']['network_id']
+            router_id = r['router']['id']
+            self._set_net_external(public_net_id)
+            self._add_external_gateway_to_router(router_id, public_net_id)
+            self._router_interface_action('add', router_id,
+                                          private_sub['subnet']['id'], None)
+            fip_ids = [
+                self._make_floatingip(self.fmt,
+                                      public_net_id)['floatingip']['id']
+                for port in (p1, p2)]
+            update_fip_assoc = plugin._update_fip_assoc
+
+            def fail_second(*args, **kwargs):
+                if fail_second.calls:
+                    raise RuntimeError()
+                fail_second.calls += 1
+                return update_fip_assoc(*args, **kwargs)
+            fail_second.calls = 0
+
+            with mock.patch.object(plugin, '_update_fip_assoc',
+                                   side_effect=fail_second):
+                self.assertRaises(
+                    RuntimeError, plugin.update_floatingip_bulk, ctx,
+                    [(fip_id,
+                      {'floatingip': {'port_id': port['port']['id']}})
+                     for fip_id, port in zip(fip_ids, (p1, p2))])
+            # the update of the first floating IP is rolled back
+            self.assertEqual(
+                [None, None],
+                [fip['port_id'] for fip in plugin.get_floatingips(
+                    ctx, filters={'id': fip_ids})])
+
+    def _make_floatingips(self, public_net_id, count=2):
+        return [self._make_floatingip(self.fmt,
+                                      public_net_id)['floatingip']['id']
+                for i in range(count)]
+
+    def test_floatingip_bulk_delete_rolled_back_on_failure(self):
+        plugin = directory.get_plugin(plugin_constants.L3)
+        ctx = context.get_admin_context()
+        with self.subnet(cidr='12.0.0.0/24') as public_sub:
+            public_net_id = public_sub['subnet']['network_id']
+            self._set_net_external(public_net_id)
+            fip_ids = self._make_floatingips(public_net_id)
+            delete = l3_db.l3_obj.FloatingIP.delete
+
+            def fail_second(floatingip):
+                if fail_second.calls:
+                    raise RuntimeError()
+                fail_second.calls += 1
+                return delete(floatingip)
+            fail_second.calls = 0
+
+            with mock.patch.object(l3_db.l3_obj.FloatingIP, 'delete',
+                                   autospec=True, side_effect=fail_second):
+                self.assertRaises(RuntimeError,
+                                  plugin.delete_floatingip_bulk, ctx, fip_ids)
+            # the first floating IP is not deleted either
+            self.assertEqual(
+                2, len(plugin.get_floatingips(ctx, filters={'id': fip_ids})))
+
+    def test_floatingip_bulk_delete_ports_after_commit(self):
+        plugin = directory.get_plugin(plugin_constants.L3)
+        core_plugin = directory.get_plugin()
+        ctx = context.get_admin_context()
+        method = ('delete_port_bulk' if hasattr(core_plugin,
+                                                'delete_port_bulk')
+                  else 'delete_port')
+        with self.subnet(cidr='12.0.0.0/24') as public_sub:
+            public_net_id = public_sub['subnet']['network_id']
+            self._set_net_external(public_net_id)
+            fip_ids = self._make_floatingips(public_net_id)
+            delete_ports = getattr(core_plugin, method)
+
+            def check_committed(*args, **kwargs):
+                self.assertFalse(ctx.session.is_active)
+                self.assertEqual([], plugin.get_floatingips(
+                    ctx, filters={'id': fip_ids}))
+                return delete_ports(*args, **kwargs)
+
+            with mock.patch.object(core_plugin, method,
+                                   side_effect=check_committed) as m:
+                plugin.delete_floatingip_bulk(ctx, fip_ids)
+            self.assertTrue(m.called)
+
+    def test_floatingip_bulk_delete_not_found(self):
+        plugin = directory.get_plugin(plugin_constants.L3)
+        ctx = context.get_admin_context()
+        with self.subnet(cidr='12.0.0.0/24') as public_sub:
+            public_net_id = public_sub['subnet']['network_id']
+            self._set_net_external(public_net_id)
+            fip = self._make_floatingip(self.fmt, public_net_id)
+            fip_id = fip['floatingip']['id']
+            self.assertRaises(l3.FloatingIPNotFound,
+                              plugin.delete_floatingip_bulk, ctx,
+                              [fip_id, _uuid()])
+            self._show('floatingips', fip_id)
+
     def test_floatingip_association_on_unowned_router(self):
         # create a router owned by one tenant and associate the FIP with a
         # different tenant, assert that the FIP association succeeds
@@ -3484,6 +3629,23 @@ class L3AgentDbTestCaseBase(L3NatTestCaseMixin):
                 ifaces = self.plugin._get_sync_interfaces(admin_ctx, None)
                 self.assertEqual(0, len(ifaces))
 
+    def test_l3_agent_sync_data_statements(self):
+        budget = self.useFixture(tools.QueryBudgetFixture(self))
+        admin_ctx = context.get_admin_context()
+        with self.router() as r1, self.router() as r2, \
+                self.router() as r3, self.subnet(cidr='10.0.1.0/24') as s1, \
+                self.subnet(cidr='10.0.2.0/24') as s2, \
+                self.subnet(cidr='10.0.3.0/24') as s3:
+            router_ids = []
+            for router, subnet in ((r1, s1), (r2, s2), (r3, s3)):
+                self._router_interface_action('add', router['router']['id'],
+                                              subnet['subnet']['id'], None)
+                router_ids.append(router['router']['id'])
+            budget.assert_linear(
+                lambda router_ids: self.plugin.get_sync_data(admin_ctx,
+                                                             router_ids),
+                router_ids)
+
     def test_l3_agent_routers_query_ignore_interfaces_with_moreThanOneIp(self):
         with self.router() as r:
             with self.subnet(cidr='9.0.1.0/24') as subnet:
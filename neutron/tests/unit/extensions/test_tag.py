@@ -391,3 +391,13 @@ class TestResourceTagFilter(TestTagApiBase):
         resources = self._get_tags_filter_resources(not_tags_any=['red',
                                                                   'blue'])
         self._assertEqualResources([self.res4, self.res5], resources)
+
+    def test_filter_tags_any_multi_no_duplicates(self):
+        resources = self._get_tags_filter_resources(tags_any=['red', 'blue',
+                                                              'green'])
+        self.assertEqual(len(set(resources)), len(resources))
+
+    def test_filter_tags_and_not_tags(self):
+        resources = self._get_tags_filter_resources(tags=['red'],
+                                                    not_tags=['green'])
+        self._assertEqualResources([self.res1, self.res2], resources)
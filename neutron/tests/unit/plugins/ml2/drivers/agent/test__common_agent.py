@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import time
+
 import mock
 from neutron_lib.agent import constants as agent_consts
 from neutron_lib.callbacks import events
@@ -24,6 +26,7 @@ from oslo_config import cfg
 import testtools
 
 from neutron.agent.linux import bridge_lib
+from neutron.agent.linux import ip_monitor
 from neutron.plugins.ml2.drivers.agent import _agent_manager_base as amb
 from neutron.plugins.ml2.drivers.agent import _common_agent as ca
 from neutron.tests import base
@@ -391,6 +394,93 @@ class TestCommonAgentLoop(base.BaseTestCase):
         self.agent.mgr.delete_unreferenced_arp_protection.assert_called_with(
             fake_current)
 
+    def _link_event(self, name, deleted=False):
+        return ip_monitor.IPLinkMonitorEvent('', deleted, 1, name, None)
+
+    def _monitor_links(self, events):
+        self.agent.link_monitor = mock.Mock()
+        self.agent.link_monitor.get_events.side_effect = [events, []]
+        self.agent.last_full_scan = time.time()
+        self.agent.mgr = mock.Mock()
+        self.agent.mgr.get_devices_modified_timestamps.return_value = {}
+        self.agent.mgr.get_link_device.side_effect = (
+            lambda event: event.name if event.name.startswith('tap')
+            else None)
+        self.agent.rpc_callbacks.get_and_clear_updated_devices.return_value =\
+            set()
+
+    def test_scan_devices_from_link_events(self):
+        self._monitor_links([self._link_event('tap3'),
+                             self._link_event('brq1'),
+                             self._link_event('tap1', deleted=True),
+                             self._link_event('tap2')])
+        self.agent.mgr.get_devices_modified_timestamps.return_value = {
+            'tap2': 2, 'tap3': 3}
+        previous = {'current': {'tap1', 'tap2'},
+                    'updated': set(),
+                    'added': set(),
+                    'removed': set(),
+                    'timestamps': {'tap1': 1, 'tap2': 1}}
+        expected = {'current': {'tap2', 'tap3'},
+                    'updated': {'tap2'},
+                    'added': {'tap3'},
+                    'removed': {'tap1'},
+                    'timestamps': {'tap2': 2, 'tap3': 3}}
+        self.assertEqual(expected, self.agent.scan_devices(previous, False))
+        self.assertFalse(self.agent.mgr.get_all_devices.called)
+        self.agent.mgr.get_devices_modified_timestamps.assert_called_once_with(
+            {'tap2', 'tap3'})
+
+    def test_scan_devices_polled_after_full_scan_interval(self):
+        self._monitor_links([])
+        self.agent.last_full_scan -= cfg.CONF.AGENT.full_scan_interval
+        self.agent.mgr.get_all_devices.return_value = {'tap1'}
+        previous = {'current': set(), 'updated': set(), 'added': set(),
+                    'removed': set(), 'timestamps': {}}
+        self.assertEqual({'tap1'},
+                         self.agent.scan_devices(previous, False)['added'])
+        self.assertGreater(self.agent.last_full_scan,
+                           time.time() - cfg.CONF.AGENT.full_scan_interval)
+
+    def test_scan_devices_polled_without_link_events_support(self):
+        self._monitor_links([self._link_event('tap1')])
+        link_monitor = self.agent.link_monitor
+        self.agent.mgr.get_link_device.side_effect = NotImplementedError
+        self.agent.mgr.get_all_devices.return_value = {'tap1'}
+        previous = {'current': set(), 'updated': set(), 'added': set(),
+                    'removed': set(), 'timestamps': {}}
+        self.assertEqual({'tap1'},
+                         self.agent.scan_devices(previous, False)['added'])
+        self.assertIsNone(self.agent.link_monitor)
+        link_monitor.stop.assert_called_once_with()
+
+    def test_scan_devices_polled_when_link_monitor_died(self):
+        self._monitor_links([])
+        self.agent.link_monitor.is_active.return_value = False
+        self.agent.mgr.get_all_devices.return_value = {'tap1'}
+        previous = {'current': set(), 'updated': set(), 'added': set(),
+                    'removed': set(), 'timestamps': {}}
+        with mock.patch.object(ip_monitor, 'IPLinkMonitor') as monitor_cls:
+            self.assertEqual(
+                {'tap1'}, self.agent.scan_devices(previous, False)['added'])
+        monitor_cls.return_value.start.assert_called_once_with()
+        self.assertEqual(monitor_cls.return_value, self.agent.link_monitor)
+
+    def test_wait_for_changes_returns_on_device_change(self):
+        self._monitor_links([])
+        self.agent.link_monitor.get_events.side_effect = [
+            [self._link_event('brq1')], [self._link_event('tap1')]]
+        with mock.patch.object(ca.time, 'sleep') as sleep:
+            self.agent._wait_for_changes(60)
+        self.assertFalse(sleep.called)
+        self.assertEqual(2, self.agent.link_monitor.get_events.call_count)
+        self.assertEqual([('tap1', False)], self.agent.link_changes)
+
+    def test_wait_for_changes_sleeps_without_link_monitor(self):
+        with mock.patch.object(ca.time, 'sleep') as sleep:
+            self.agent._wait_for_changes(2)
+        sleep.assert_called_once_with(2)
+
     def test_process_network_devices(self):
         agent = self.agent
         device_info = {'current': set(),
@@ -1359,3 +1359,145 @@ class TestL2PopulationMechDriver(base.BaseTestCase):
         mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
         with testtools.ExpectedException(exceptions.InvalidInput):
             mech_driver.update_port_precommit(ctx)
+
+    def test_get_network_fdb(self):
+        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
+        segment = {'network_type': 'vxlan', 'segmentation_id': 1}
+        agent = mock.Mock()
+        with mock.patch.object(l2pop_db, 'get_agent_by_host',
+                               return_value=agent),\
+                mock.patch.object(l2pop_mech_driver.segments_db,
+                                  'get_network_segments',
+                                  return_value=[{'network_type': 'vlan'},
+                                                segment]),\
+                mock.patch.object(mech_driver, '_validate_segment',
+                                  side_effect=[False, True]),\
+                mock.patch.object(mech_driver, '_create_agent_fdb',
+                                  return_value={'net1': {}}) as create_fdb:
+            self.assertEqual({'net1': {}}, mech_driver.get_network_fdb(
+                mock.sentinel.context, HOST, 'net1'))
+            create_fdb.assert_called_once_with(
+                mock.sentinel.context, agent, segment, 'net1')
+
+    def test_get_network_fdb_without_agent(self):
+        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
+        with mock.patch.object(l2pop_db, 'get_agent_by_host',
+                               return_value=None):
+            self.assertEqual({}, mech_driver.get_network_fdb(
+                mock.sentinel.context, HOST, 'net1'))
+
+    def test_get_network_fdb_digests(self):
+        mech_driver = l2pop_mech_driver.L2populationMechanismDriver()
+        ports = {'20.0.0.1': [constants.FLOODING_ENTRY,
+                              ['00:00:de:ad:be:ef', '1.1.1.1']]}
+        with mock.patch.object(mech_driver, 'get_network_fdb',
+                               side_effect=[{'net1': {'ports': ports}}, {}]):
+            self.assertEqual(
+                {'net1': l2pop_rpc.get_fdb_digest(ports)},
+                mech_driver.get_network_fdb_digests(
+                    mock.sentinel.context, HOST, ['net1', 'net2']))
+
+
+class TestL2populationAgentNotifyAPI(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestL2populationAgentNotifyAPI, self).setUp()
+        mock.patch.object(l2pop_rpc.n_rpc, 'get_client').start()
+        self.notifier = l2pop_rpc.L2populationAgentNotifyAPI(
+            batch_interval=1)
+        self.cast = mock.patch.object(self.notifier, '_cast_fanout').start()
+
+    @staticmethod
+    def _fdb_entries(ports):
+        return {'net1': {'segment_id': 1, 'network_type': 'vxlan',
+                         'ports': ports}}
+
+    def test_get_fdb_digest(self):
+        entry = ['00:00:de:ad:be:ef', '1.1.1.1']
+        digest = l2pop_rpc.get_fdb_digest(
+            {'20.0.0.1': [constants.FLOODING_ENTRY, entry],
+             '20.0.0.2': [constants.FLOODING_ENTRY]})
+        self.assertEqual(digest, l2pop_rpc.get_fdb_digest(
+            {'20.0.0.2': [constants.FLOODING_ENTRY],
+             '20.0.0.1': [entry, constants.FLOODING_ENTRY]}))
+        self.assertNotEqual(digest, l2pop_rpc.get_fdb_digest(
+            {'20.0.0.1': [constants.FLOODING_ENTRY, entry]}))
+
+    def test_notification_fanout_batched(self):
+        with mock.patch.object(self.notifier._fanout_batch,
+                               'queue_event') as queue_event:
+            self.notifier.add_fdb_entries(mock.sentinel.context,
+                                          mock.sentinel.fdb_entries)
+            queue_event.assert_called_once_with(
+                (mock.sentinel.context, 'add_fdb_entries',
+                 mock.sentinel.fdb_entries))
+        self.assertFalse(self.cast.called)
+
+    def test_send_fanout_batch_merges_changes(self):
+        entry1 = ['00:00:de:ad:be:e1', '1.1.1.1']
+        entry2 = ['00:00:de:ad:be:e2', '1.1.1.2']
+        ctx = mock.sentinel.context
+        self.notifier._send_fanout_batch([
+            (ctx, 'add_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [constants.FLOODING_ENTRY, entry1]})),
+            (ctx, 'remove_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [entry1], '20.0.0.2': [entry2]})),
+            (ctx, 'add_fdb_entries', self._fdb_entries(
+                {'20.0.0.2': [entry2]}))])
+        self.assertEqual(
+            [mock.call(ctx, 'remove_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [entry1]})),
+             mock.call(ctx, 'add_fdb_entries', self._fdb_entries(
+                 {'20.0.0.1': [constants.FLOODING_ENTRY],
+                  '20.0.0.2': [entry2]}))],
+            self.cast.call_args_list)
+
+    def test_send_fanout_batch_port_migration(self):
+        # The removal from the source host must not be sent after the add
+        # to the destination host, as agents remove the flows of a MAC
+        # without regard to the host
+        entry = ['00:00:de:ad:be:ef', '1.1.1.1']
+        ctx = mock.sentinel.context
+        self.notifier._send_fanout_batch([
+            (ctx, 'add_fdb_entries', self._fdb_entries(
+                {'20.0.0.2': [entry]})),
+            (ctx, 'remove_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [entry]}))])
+        self.assertEqual(
+            [mock.call(ctx, 'remove_fdb_entries',
+                       self._fdb_entries({'20.0.0.1': [entry]})),
+             mock.call(ctx, 'add_fdb_entries',
+                       self._fdb_entries({'20.0.0.2': [entry]}))],
+            self.cast.call_args_list)
+
+    def test_send_fanout_batch_last_port_of_agent_removed(self):
+        # The tunnel to the agent is not set up again once its flooding
+        # entry is removed
+        entry = ['00:00:de:ad:be:ef', '1.1.1.1']
+        ctx = mock.sentinel.context
+        self.notifier._send_fanout_batch([
+            (ctx, 'add_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [constants.FLOODING_ENTRY, entry]})),
+            (ctx, 'remove_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [constants.FLOODING_ENTRY, entry]}))])
+        self.assertEqual(
+            [mock.call(ctx, 'remove_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [constants.FLOODING_ENTRY, entry]}))],
+            self.cast.call_args_list)
+
+    def test_send_fanout_batch_keeps_order_of_updates(self):
+        entry = ['00:00:de:ad:be:ef', '1.1.1.1']
+        ctx = mock.sentinel.context
+        update = {'chg_ip': {}}
+        self.notifier._send_fanout_batch([
+            (ctx, 'add_fdb_entries', self._fdb_entries({'20.0.0.1': [entry]})),
+            (ctx, 'update_fdb_entries', update),
+            (ctx, 'remove_fdb_entries', self._fdb_entries(
+                {'20.0.0.1': [entry]}))])
+        self.assertEqual(
+            [mock.call(ctx, 'add_fdb_entries',
+                       self._fdb_entries({'20.0.0.1': [entry]})),
+             mock.call(ctx, 'update_fdb_entries', update),
+             mock.call(ctx, 'remove_fdb_entries',
+                       self._fdb_entries({'20.0.0.1': [entry]}))],
+            self.cast.call_args_list)
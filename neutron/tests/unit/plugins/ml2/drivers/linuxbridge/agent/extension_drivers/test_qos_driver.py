@@ -150,6 +150,48 @@ class QosLinuxbridgeAgentDriverTestCase(base.BaseTestCase):
             self.qos_driver.delete_bandwidth_limit_ingress(self.port)
             delete_tbf_bw_limit.assert_called_once_with()
 
+    def test_update_ports(self):
+        policy_id = uuidutils.generate_uuid()
+        old_policy = mock.Mock(id=policy_id,
+                               rules=[self.rule_egress_bw_limit,
+                                      self.rule_ingress_bw_limit,
+                                      self.rule_dscp_marking])
+        new_policy = mock.Mock(
+            id=policy_id,
+            rules=[self._create_bw_limit_rule_obj(constants.EGRESS_DIRECTION),
+                   self._create_bw_limit_rule_obj(constants.INGRESS_DIRECTION),
+                   self.rule_dscp_marking])
+        for rule_obj in old_policy.rules + new_policy.rules:
+            rule_obj.qos_policy_id = policy_id
+        port = self._create_fake_port(policy_id)
+        port['device_owner'] = 'compute:nova'
+        port2 = dict(port, device='fake_tap2')
+        with mock.patch.object(
+            tc_lib, "execute_batch"
+        ) as execute_batch, mock.patch.object(
+            self.qos_driver, "iptables_manager"
+        ) as iptables_manager:
+            self.qos_driver.update_ports([port, port2], old_policy,
+                                         new_policy)
+            iptables_manager.defer_apply.assert_called_once_with()
+            # The DSCP marking rule did not change
+            self.assertFalse(iptables_manager.ipv4['mangle'].add_rule.called)
+        # A batch for the deletions and one for the new limits
+        self.assertEqual(2, execute_batch.call_count)
+        self.assertEqual(
+            [['qdisc', 'del', 'dev', device, 'ingress']
+             for device in ('fake_tap', 'fake_tap2')],
+            execute_batch.call_args_list[0][0][0])
+        self.assertEqual(
+            {'namespace': None, 'check_exit_code': False,
+             'log_fail_as_error': False},
+            execute_batch.call_args_list[0][1])
+        commands = execute_batch.call_args_list[1][0][0]
+        self.assertEqual(
+            ['qdisc add', 'filter add', 'qdisc replace'] * 2,
+            [' '.join(cmd[:2]) for cmd in commands])
+        self.assertIsNone(self.qos_driver._tc_batch)
+
     def test_create_dscp_marking(self):
         expected_calls = [
             mock.call.add_chain(
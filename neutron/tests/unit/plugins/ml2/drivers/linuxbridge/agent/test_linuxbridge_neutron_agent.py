@@ -21,6 +21,7 @@ from oslo_config import cfg
 
 from neutron.agent.linux import bridge_lib
 from neutron.agent.linux import ip_lib
+from neutron.agent.linux import ip_monitor
 from neutron.agent.linux import utils
 from neutron.common import exceptions
 from neutron.plugins.ml2.drivers.agent import _agent_manager_base as amb
@@ -278,6 +279,12 @@ class TestLinuxBridgeManager(base.BaseTestCase):
                 bridge_lib, 'get_bridge_names', return_value=br_list):
             self.assertEqual(expected, lbm.get_deletable_bridges())
 
+    def test_get_link_device(self):
+        for name, device in (('tap1', 'tap1'), ('brq1', None),
+                             ('vxlan-1000', None)):
+            event = ip_monitor.IPLinkMonitorEvent('', False, 1, name, None)
+            self.assertEqual(device, self.lbm.get_link_device(event))
+
     def test_get_tap_devices_count(self):
         with mock.patch.object(
                 bridge_lib.BridgeDevice, 'get_interfaces') as get_ifs_fn:
@@ -976,34 +983,35 @@ class TestLinuxBridgeRpcCallbacks(base.BaseTestCase):
         fdb_entries = {'net_id':
                        {'ports':
                         {'agent_ip': [constants.FLOODING_ENTRY,
-                                      ['port_mac', 'port_ip']]},
+                                      ['port_mac', '10.0.0.2']]},
                         'network_type': 'vxlan',
                         'segment_id': 1}}
 
         with mock.patch.object(utils, 'execute',
                                return_value='') as execute_fn, \
-                mock.patch.object(ip_lib, 'add_neigh_entry',
-                                  return_value='') as add_fn:
+                mock.patch.object(ip_lib, 'dump_neigh_entries',
+                                  return_value=[]), \
+                mock.patch.object(ip_lib, 'execute_batch') as batch_fn:
             self.lb_rpc.fdb_add(None, fdb_entries)
 
             expected = [
                 mock.call(['bridge', 'fdb', 'show', 'dev', 'vxlan-1'],
                           run_as_root=True),
-                mock.call(['bridge', 'fdb', 'add',
-                           constants.FLOODING_ENTRY[0],
-                           'dev', 'vxlan-1', 'dst', 'agent_ip'],
-                          run_as_root=True,
-                          check_exit_code=False),
-                mock.call(['bridge', 'fdb', 'replace', 'port_mac', 'dev',
-                           'vxlan-1', 'dst', 'agent_ip'],
+                mock.call(['bridge', '-force', '-batch', '-'],
+                          process_input=(
+                              'fdb add %s dev vxlan-1 dst agent_ip\n'
+                              'fdb replace port_mac dev vxlan-1 '
+                              'dst agent_ip\n' % constants.FLOODING_ENTRY[0]),
                           run_as_root=True,
                           check_exit_code=False),
             ]
             execute_fn.assert_has_calls(expected)
             if proxy_enabled:
-                add_fn.assert_called_with('port_ip', 'port_mac', 'vxlan-1')
+                batch_fn.assert_called_once_with(
+                    [('neigh', 'replace', '10.0.0.2', 'lladdr', 'port_mac',
+                      'nud', 'permanent', 'dev', 'vxlan-1')])
             else:
-                add_fn.assert_not_called()
+                batch_fn.assert_not_called()
 
     def test_fdb_add(self):
         self._test_fdb_add(proxy_enabled=False)
@@ -1012,6 +1020,42 @@ class TestLinuxBridgeRpcCallbacks(base.BaseTestCase):
         cfg.CONF.set_override('arp_responder', True, 'VXLAN')
         self._test_fdb_add(proxy_enabled=True)
 
+    def test_fdb_add_existing_entries(self):
+        cfg.CONF.set_override('arp_responder', True, 'VXLAN')
+        fdb_entries = {'net_id':
+                       {'ports':
+                        {'agent_ip': [constants.FLOODING_ENTRY,
+                                      ['port_mac', '10.0.0.2']],
+                         'agent_ip2': [constants.FLOODING_ENTRY,
+                                       ['port_mac2', '10.0.0.3']]},
+                        'network_type': 'vxlan',
+                        'segment_id': 1}}
+        fdb_show = ('%s dst agent_ip self permanent\n'
+                    'port_mac dst agent_ip self permanent\n'
+                    'port_mac2 master brq-net_id\n'
+                    % constants.FLOODING_ENTRY[0])
+        neigh_entries = [{'dst': '10.0.0.2', 'lladdr': 'port_mac',
+                          'device': 'vxlan-1'}]
+
+        with mock.patch.object(utils, 'execute',
+                               return_value=fdb_show) as execute_fn, \
+                mock.patch.object(ip_lib, 'dump_neigh_entries',
+                                  return_value=neigh_entries), \
+                mock.patch.object(ip_lib, 'execute_batch') as batch_fn:
+            self.lb_rpc.fdb_add(None, fdb_entries)
+
+            execute_fn.assert_called_with(
+                ['bridge', '-force', '-batch', '-'],
+                process_input=(
+                    'fdb append %s dev vxlan-1 dst agent_ip2\n'
+                    'fdb replace port_mac2 dev vxlan-1 dst agent_ip2\n'
+                    % constants.FLOODING_ENTRY[0]),
+                run_as_root=True, check_exit_code=False)
+            self.assertEqual(2, execute_fn.call_count)
+            batch_fn.assert_called_once_with(
+                [('neigh', 'replace', '10.0.0.3', 'lladdr', 'port_mac2',
+                  'nud', 'permanent', 'dev', 'vxlan-1')])
+
     def test_fdb_ignore(self):
         fdb_entries = {'net_id':
                        {'ports':
@@ -1045,32 +1089,35 @@ class TestLinuxBridgeRpcCallbacks(base.BaseTestCase):
         fdb_entries = {'net_id':
                        {'ports':
                         {'agent_ip': [constants.FLOODING_ENTRY,
-                                      ['port_mac', 'port_ip']]},
+                                      ['port_mac', '10.0.0.2']]},
                         'network_type': 'vxlan',
                         'segment_id': 1}}
+        fdb_show = ('%s dst agent_ip self permanent\n'
+                    'port_mac dst agent_ip self permanent\n'
+                    % constants.FLOODING_ENTRY[0])
+        neigh_entries = [{'dst': '10.0.0.2', 'lladdr': 'port_mac',
+                          'device': 'vxlan-1'}]
 
         with mock.patch.object(utils, 'execute',
-                               return_value='') as execute_fn, \
-                mock.patch.object(ip_lib, 'delete_neigh_entry',
-                                  return_value='') as del_fn:
+                               return_value=fdb_show) as execute_fn, \
+                mock.patch.object(ip_lib, 'dump_neigh_entries',
+                                  return_value=neigh_entries), \
+                mock.patch.object(ip_lib, 'execute_batch') as batch_fn:
             self.lb_rpc.fdb_remove(None, fdb_entries)
 
-            expected = [
-                mock.call(['bridge', 'fdb', 'delete',
-                           constants.FLOODING_ENTRY[0],
-                           'dev', 'vxlan-1', 'dst', 'agent_ip'],
-                          run_as_root=True,
-                          check_exit_code=False),
-                mock.call(['bridge', 'fdb', 'delete', 'port_mac',
-                           'dev', 'vxlan-1', 'dst', 'agent_ip'],
-                          run_as_root=True,
-                          check_exit_code=False),
-            ]
-            execute_fn.assert_has_calls(expected)
+            execute_fn.assert_called_with(
+                ['bridge', '-force', '-batch', '-'],
+                process_input=(
+                    'fdb delete %s dev vxlan-1 dst agent_ip\n'
+                    'fdb delete port_mac dev vxlan-1 dst agent_ip\n'
+                    % constants.FLOODING_ENTRY[0]),
+                run_as_root=True, check_exit_code=False)
             if proxy_enabled:
-                del_fn.assert_called_with('port_ip', 'port_mac', 'vxlan-1')
+                batch_fn.assert_called_once_with(
+                    [('neigh', 'del', '10.0.0.2', 'lladdr', 'port_mac',
+                      'dev', 'vxlan-1')])
             else:
-                del_fn.assert_not_called()
+                batch_fn.assert_not_called()
 
     def test_fdb_remove(self):
         self._test_fdb_remove(proxy_enabled=False)
@@ -1083,21 +1130,24 @@ class TestLinuxBridgeRpcCallbacks(base.BaseTestCase):
         fdb_entries = {'chg_ip':
                        {'net_id':
                         {'agent_ip':
-                         {'before': [['port_mac', 'port_ip_1']],
-                          'after': [['port_mac', 'port_ip_2']]}}}}
-
-        with mock.patch.object(ip_lib, 'add_neigh_entry',
-                               return_value='') as add_fn, \
-                mock.patch.object(ip_lib, 'delete_neigh_entry',
-                                  return_value='') as del_fn:
+                         {'before': [['port_mac', '10.0.0.2']],
+                          'after': [['port_mac', '10.0.0.3']]}}}}
+        neigh_entries = [{'dst': '10.0.0.2', 'lladdr': 'port_mac',
+                          'device': 'vxlan-1'}]
+
+        with mock.patch.object(ip_lib, 'dump_neigh_entries',
+                               return_value=neigh_entries), \
+                mock.patch.object(ip_lib, 'execute_batch') as batch_fn:
             self.lb_rpc.fdb_update(None, fdb_entries)
 
             if proxy_enabled:
-                del_fn.assert_called_with('port_ip_1', 'port_mac', 'vxlan-1')
-                add_fn.assert_called_with('port_ip_2', 'port_mac', 'vxlan-1')
+                batch_fn.assert_called_once_with(
+                    [('neigh', 'del', '10.0.0.2', 'lladdr', 'port_mac',
+                      'dev', 'vxlan-1'),
+                     ('neigh', 'replace', '10.0.0.3', 'lladdr', 'port_mac',
+                      'nud', 'permanent', 'dev', 'vxlan-1')])
             else:
-                del_fn.assert_not_called()
-                add_fn.assert_not_called()
+                batch_fn.assert_not_called()
 
     def test_fdb_update_chg_ip(self):
         self._test_fdb_update_chg_ip(proxy_enabled=False)
@@ -1106,6 +1156,33 @@ class TestLinuxBridgeRpcCallbacks(base.BaseTestCase):
         cfg.CONF.set_override('arp_responder', True, 'VXLAN')
         self._test_fdb_update_chg_ip(proxy_enabled=True)
 
+    def test_fdb_update_chg_ip_batch_failure(self):
+        cfg.CONF.set_override('arp_responder', True, 'VXLAN')
+        fdb_entries = {'chg_ip':
+                       {'net_id':
+                        {'agent_ip':
+                         {'before': [['port_mac', '10.0.0.2']],
+                          'after': [['port_mac', '10.0.0.3'],
+                                    ['port_mac2', '10.0.0.4']]}}}}
+        neigh_entries = [{'dst': '10.0.0.2', 'lladdr': 'port_mac',
+                          'device': 'vxlan-1'}]
+
+        with mock.patch.object(ip_lib, 'dump_neigh_entries',
+                               return_value=neigh_entries), \
+                mock.patch.object(ip_lib, 'execute_batch',
+                                  side_effect=RuntimeError()), \
+                mock.patch.object(ip_lib, 'delete_neigh_entry') as del_fn, \
+                mock.patch.object(ip_lib, 'add_neigh_entry',
+                                  side_effect=[RuntimeError(), None]
+                                  ) as add_fn:
+            self.lb_rpc.fdb_update(None, fdb_entries)
+
+            # a failing entry does not prevent the others from being added
+            del_fn.assert_called_once_with('10.0.0.2', 'port_mac', 'vxlan-1')
+            add_fn.assert_has_calls(
+                [mock.call('10.0.0.3', 'port_mac', 'vxlan-1'),
+                 mock.call('10.0.0.4', 'port_mac2', 'vxlan-1')])
+
     def test_fdb_update_chg_ip_empty_lists(self):
         fdb_entries = {'chg_ip': {'net_id': {'agent_ip': {}}}}
         self.lb_rpc.fdb_update(None, fdb_entries)
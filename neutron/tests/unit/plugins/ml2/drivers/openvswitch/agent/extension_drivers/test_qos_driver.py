@@ -82,8 +82,8 @@ class QosOVSAgentDriverTestCase(ovs_test_base.OVSAgentConfigTestBase):
         rule_obj.obj_reset_changes()
         return rule_obj
 
-    def _create_qos_policy_obj(self, rules):
-        policy_dict = {'id': uuidutils.generate_uuid(),
+    def _create_qos_policy_obj(self, rules, policy_id=None):
+        policy_dict = {'id': policy_id or uuidutils.generate_uuid(),
                 'project_id': uuidutils.generate_uuid(),
                 'name': 'test',
                 'description': 'test',
@@ -142,6 +142,57 @@ class QosOVSAgentDriverTestCase(ovs_test_base.OVSAgentConfigTestBase):
         self.create_egress.assert_not_called()
         self.update_ingress.assert_not_called()
 
+    def test_update_ports(self):
+        self.qos_driver.create(self.port, self.qos_policy)
+        self.qos_driver.br_int.reset_mock()
+        rules = [self._create_bw_limit_rule_obj(constants.EGRESS_DIRECTION),
+                 self._create_bw_limit_rule_obj(constants.INGRESS_DIRECTION),
+                 self.rules[2]]
+        rules[0].max_kbps = 20
+        rules[1].max_kbps = 30
+        new_policy = self._create_qos_policy_obj(rules, self.qos_policy.id)
+        self.qos_driver.update_ports([self.port], self.qos_policy,
+                                     new_policy)
+        self.qos_driver.br_int.set_bw_limits_for_ports.assert_called_once_with(
+            egress_limits={self.port_name: (20, rules[0].max_burst_kbps)},
+            ingress_limits={self.port_name: (30, rules[1].max_burst_kbps)})
+        self.create_egress.assert_not_called()
+        self.update_ingress.assert_not_called()
+        self.delete_egress.assert_not_called()
+        self.delete_ingress.assert_not_called()
+        # The DSCP marking rule did not change
+        self.qos_driver.br_int.add_flow.assert_not_called()
+        self.qos_driver.br_int.uninstall_flows.assert_not_called()
+
+    def test_update_ports_dscp_only(self):
+        self.qos_driver.create(self.port, self.qos_policy)
+        self.qos_driver.br_int.reset_mock()
+        dscp_rule = self._create_dscp_marking_rule_obj()
+        dscp_rule.dscp_mark = 16
+        new_policy = self._create_qos_policy_obj(
+            self.rules[:2] + [dscp_rule], self.qos_policy.id)
+        self.qos_driver.update_ports([self.port], self.qos_policy,
+                                     new_policy)
+        # The bandwidth limits are not programmed again
+        self.qos_driver.br_int.set_bw_limits_for_ports.assert_called_once_with(
+            egress_limits={}, ingress_limits={})
+        self.qos_driver.br_int.add_flow.assert_called_once_with(
+            actions='mod_nw_tos:64,load:55->NXM_NX_REG2[0..5],resubmit(,0)',
+            in_port=mock.ANY, priority=65535, reg2=0, table=0)
+
+    def test_update_ports_removed_rules(self):
+        self.qos_driver.create(self.port, self.qos_policy)
+        self.qos_driver.br_int.reset_mock()
+        new_policy = self._create_qos_policy_obj([self.rules[2]])
+        self.qos_driver.update_ports([self.port], self.qos_policy,
+                                     new_policy)
+        self.qos_driver.br_int.set_bw_limits_for_ports.assert_called_once_with(
+            egress_limits={self.port_name: None},
+            ingress_limits={self.port_name: None})
+        # The limits are set directly again out of update_ports
+        self.qos_driver.update(self.port, self.qos_policy)
+        self._assert_rules_create_updated()
+
     def _test_delete_rules(self, qos_policy):
         self.qos_driver.br_int.get_ingress_bw_limit_for_port = mock.Mock(
             return_value=(self.rules[1].max_kbps,
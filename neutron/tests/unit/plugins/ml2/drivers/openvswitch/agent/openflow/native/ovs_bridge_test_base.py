@@ -14,15 +14,22 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import itertools
+
 import mock
 from oslo_utils import importutils
 
+from neutron.agent.common import ovs_lib
 from neutron.tests.unit.plugins.ml2.drivers.openvswitch.agent \
     import ovs_test_base
 
 
 call = mock.call  # short hand
 
+_OFSWITCH_MODULE = ('neutron.plugins.ml2.drivers.openvswitch.agent.openflow.'
+                    'native.ofswitch')
+
 
 class OVSBridgeTestBase(ovs_test_base.OVSRyuTestBase):
     _ARP_MODULE = 'ryu.lib.packet.arp'
@@ -145,6 +152,255 @@ class OVSBridgeTestBase(ovs_test_base.OVSRyuTestBase):
             self.br.setup_controllers(cfg)
             set_ccm.assert_called_once_with("out-of-band")
 
+    def test_bundled(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        (dp, ofp, ofpp) = self._get_dp()
+        self.br._send_msg.side_effect = [
+            mock.Mock(type=ofp.ONF_BCT_OPEN_REPLY), None,
+            mock.Mock(type=ofp.ONF_BCT_COMMIT_REPLY)]
+        with mock.patch.object(ofswitch, '_bundle_ids', itertools.count(7)):
+            with self.br.bundled(atomic=True) as br:
+                br.install_drop(priority=99, in_port=666)
+        flags = 0 | ofp.ONF_BF_ATOMIC
+        expected = [
+            call._send_msg(
+                ofpp.ONFBundleCtrlMsg(dp, 7, ofp.ONF_BCT_OPEN_REQUEST,
+                                      flags, []),
+                reply_cls=ofpp.ONFBundleCtrlMsg),
+            call._send_msg(
+                ofpp.ONFBundleAddMsg(dp, 7, flags,
+                    ofpp.OFPFlowMod(dp,
+                        cookie=self.stamp,
+                        instructions=[],
+                        match=ofpp.OFPMatch(in_port=666),
+                        priority=99,
+                        table_id=0), []),
+                None, False),
+            call._send_msg(
+                ofpp.ONFBundleCtrlMsg(dp, 7, ofp.ONF_BCT_COMMIT_REQUEST,
+                                      flags, []),
+                reply_cls=ofpp.ONFBundleCtrlMsg),
+        ]
+        self.assertEqual(expected, self.mock.mock_calls)
+
+    def test_bundled_discarded_on_error(self):
+        (dp, ofp, ofpp) = self._get_dp()
+        self.br._send_msg.side_effect = [
+            mock.Mock(type=ofp.ONF_BCT_OPEN_REPLY),
+            mock.Mock(type=ofp.ONF_BCT_DISCARD_REPLY)]
+
+        def install_flows():
+            with self.br.bundled():
+                raise ValueError()
+
+        self.assertRaises(ValueError, install_flows)
+        self.assertEqual(2, self.br._send_msg.call_count)
+        msg = self.br._send_msg.call_args[0][0]
+        self.assertEqual(ofp.ONF_BCT_DISCARD_REQUEST, msg._args[2])
+
+    def test_start_flows_diff(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        flow = mock.Mock(cookie=1234, idle_timeout=0, hard_timeout=0)
+        mock.patch.object(ofswitch, '_encode', side_effect=repr).start()
+        mock.patch.object(self.br, 'dump_flows', return_value=[flow]).start()
+        mock.patch.object(self.br, 'db_get_val',
+                          return_value={ofswitch.FLOWS_COOKIE: '1234'}).start()
+        with mock.patch.object(self.br, 'set_db_attribute') as set_db_attr:
+            self.br.start_flows_diff()
+        self.assertEqual(1234, self.br.default_cookie)
+        self.assertEqual(1, len(self.br._installed_flows))
+        set_db_attr.assert_called_once_with(
+            'Bridge', self.br.br_name, 'external_ids',
+            {ofswitch.FLOWS_COOKIE: '1234'})
+
+    def test_start_flows_diff_without_cookie(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        mock.patch.object(self.br, 'db_get_val', return_value={}).start()
+        with mock.patch.object(self.br, 'dump_flows') as dump_flows,\
+                mock.patch.object(self.br, 'set_db_attribute') as set_db_attr:
+            self.br.start_flows_diff()
+        self.assertFalse(dump_flows.called)
+        self.assertIsNone(self.br._installed_flows)
+        self.assertEqual(self.stamp, self.br.default_cookie)
+        set_db_attr.assert_called_once_with(
+            'Bridge', self.br.br_name, 'external_ids',
+            {ofswitch.FLOWS_COOKIE: str(self.stamp)})
+
+    def test_send_msg_skips_installed_flows(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        self.br._installed_flows = mock.Mock(active=True)
+        self.br._installed_flows.needs_sending.return_value = False
+        with mock.patch.object(ofswitch.ofctl_api, 'send_msg') as send_msg:
+            self.assertIsNone(ofswitch.OpenFlowSwitchMixin._send_msg(
+                self.br, mock.sentinel.msg))
+        self.assertFalse(send_msg.called)
+        (dp, ofp, ofpp) = self._get_dp()
+        self.br._installed_flows.needs_sending.assert_called_once_with(
+            ofp, ofpp, mock.sentinel.msg)
+
+    def test_cleanup_installed_flows(self):
+        self.br.set_agent_uuid_stamp(1234)
+        stale_flow = mock.Mock(table_id=10, priority=99)
+        installed_flows = mock.Mock(cookie=1234, cookies={1234, 5678})
+        installed_flows.get_stale_flows.return_value = [stale_flow]
+        self.br._installed_flows = installed_flows
+        with mock.patch.object(self.br, 'bundled') as bundled,\
+                mock.patch.object(self.br, 'dump_flows') as dump_flows:
+            self.br.cleanup_flows()
+        self.assertFalse(dump_flows.called)
+        self.assertFalse(installed_flows.active)
+        self.assertIsNone(self.br._installed_flows)
+        bundled.assert_called_once_with(atomic=True)
+        br = bundled().__enter__()
+        self.assertEqual([
+            call(table_id=10, strict=True, priority=99,
+                 match=stale_flow.match, cookie=1234,
+                 cookie_mask=ovs_lib.UINT64_BITMASK),
+            call(cookie=5678, cookie_mask=ovs_lib.UINT64_BITMASK),
+        ], br.uninstall_flows.mock_calls)
+
+    def _flow_mod(self, command, match, instructions=(), cookie=1234,
+                  table_id=0, priority=99):
+        (dp, ofp, ofpp) = self._get_dp()
+        return mock.Mock(spec=ofpp.OFPFlowMod, command=command,
+                         table_id=table_id, priority=priority, match=match,
+                         cookie=cookie, cookie_mask=ovs_lib.UINT64_BITMASK,
+                         idle_timeout=0, hard_timeout=0,
+                         instructions=list(instructions))
+
+    def test_installed_flows(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        (dp, ofp, ofpp) = self._get_dp()
+        # The fake OpenFlow classes are compared on their representation
+        mock.patch.object(ofswitch, '_encode', side_effect=repr).start()
+        flows = [mock.Mock(cookie=1234, table_id=0, priority=99,
+                           idle_timeout=0, hard_timeout=0,
+                           match={'in_port': in_port}, instructions=[])
+                 for in_port in (1, 2, 3, 4)]
+        flows.append(mock.Mock(cookie=5678))
+        installed_flows = ofswitch.InstalledFlows(1234, flows)
+        self.assertEqual(4, len(installed_flows))
+        self.assertEqual({1234, 5678}, installed_flows.cookies)
+
+        needs_sending = functools.partial(installed_flows.needs_sending,
+                                          ofp, ofpp)
+        self.assertTrue(needs_sending(mock.sentinel.msg))
+        # Unchanged
+        self.assertFalse(needs_sending(
+            self._flow_mod(ofp.OFPFC_ADD, {'in_port': 1})))
+        # Changed
+        self.assertTrue(needs_sending(
+            self._flow_mod(ofp.OFPFC_ADD, {'in_port': 2}, ['drop'])))
+        # Deleted then added again
+        self.assertTrue(needs_sending(
+            self._flow_mod(ofp.OFPFC_DELETE, {'in_port': 3})))
+        self.assertTrue(needs_sending(
+            self._flow_mod(ofp.OFPFC_ADD, {'in_port': 3})))
+        # Deleted with another cookie
+        self.assertTrue(needs_sending(
+            self._flow_mod(ofp.OFPFC_DELETE, {'in_port': 4}, cookie=5678)))
+        self.assertEqual([flows[3]], installed_flows.get_stale_flows())
+
+    def test_installed_flows_narrower_deletes(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        (dp, ofp, ofpp) = self._get_dp()
+        mock.patch.object(ofswitch, '_encode', side_effect=repr).start()
+        flows = [mock.Mock(cookie=1234, table_id=table_id, priority=99,
+                           idle_timeout=0, hard_timeout=0,
+                           match=match, instructions=[])
+                 for table_id, match in (
+                     (0, {'in_port': 1}),
+                     (0, {'in_port': 2, 'vlan_vid': 0x100a}),
+                     (0, {'in_port': 3, 'vlan_vid': (0x1000, 0x1000)}),
+                     (1, {'in_port': 1}))]
+        installed_flows = ofswitch.InstalledFlows(1234, flows)
+        needs_sending = functools.partial(installed_flows.needs_sending,
+                                          ofp, ofpp)
+        # The flow lacks one of the fields
+        needs_sending(self._flow_mod(ofp.OFPFC_DELETE,
+                                     {'in_port': 1, 'vlan_vid': 0x100a}))
+        # Another table
+        needs_sending(self._flow_mod(ofp.OFPFC_DELETE, {'in_port': 1},
+                                     table_id=2))
+        # Another priority
+        needs_sending(self._flow_mod(ofp.OFPFC_DELETE_STRICT,
+                                     {'in_port': 1}, priority=1))
+        # Outside of the mask
+        needs_sending(self._flow_mod(ofp.OFPFC_DELETE,
+                                     {'vlan_vid': (0, 0x1000)}))
+        self.assertEqual(flows, installed_flows.get_stale_flows())
+        # The stale flows are still deleted by the cleanup
+        self.br.set_agent_uuid_stamp(1234)
+        self.br._installed_flows = installed_flows
+        with mock.patch.object(self.br, 'bundled') as bundled:
+            self.br.cleanup_flows()
+        br = bundled().__enter__()
+        self.assertEqual([
+            call(table_id=flow.table_id, strict=True, priority=99,
+                 match=flow.match, cookie=1234,
+                 cookie_mask=ovs_lib.UINT64_BITMASK) for flow in flows
+        ], br.uninstall_flows.mock_calls)
+
+        # Deleted by a wider flow-mod, in any table
+        for flow_mod in (
+                self._flow_mod(ofp.OFPFC_DELETE, {'vlan_vid': 0x100a}),
+                self._flow_mod(ofp.OFPFC_DELETE,
+                               {'vlan_vid': (0x1000, 0x1000)}),
+                self._flow_mod(ofp.OFPFC_DELETE_STRICT, {'in_port': 1},
+                               table_id=ofp.OFPTT_ALL)):
+            self.assertTrue(needs_sending(flow_mod))
+        self.assertEqual([], installed_flows.get_stale_flows())
+
+    def test_installed_flows_masked_addresses(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        (dp, ofp, ofpp) = self._get_dp()
+        mock.patch.object(ofswitch, '_encode', side_effect=repr).start()
+        flows = [mock.Mock(cookie=1234, table_id=0, priority=99,
+                           idle_timeout=0, hard_timeout=0,
+                           match=match, instructions=[])
+                 for match in (
+                     {'eth_dst': 'fa:16:3e:00:00:01'},
+                     {'ipv4_dst': '10.0.0.1'},
+                     {'ipv6_dst': ('fe80::', 'ffff::')},
+                     {'eth_src': 'fa:16:3e:00:00:02'})]
+        installed_flows = ofswitch.InstalledFlows(1234, flows)
+        needs_sending = functools.partial(installed_flows.needs_sending,
+                                          ofp, ofpp)
+        # Within the mask
+        needs_sending(self._flow_mod(
+            ofp.OFPFC_DELETE,
+            {'eth_dst': ('FA:16:3E:00:00:00', 'ff:ff:ff:00:00:00')}))
+        # Outside of the mask
+        needs_sending(self._flow_mod(
+            ofp.OFPFC_DELETE, {'ipv4_dst': ('10.0.1.0', '255.255.255.0')}))
+        # A mask narrower than the installed one
+        needs_sending(self._flow_mod(
+            ofp.OFPFC_DELETE, {'ipv6_dst': ('fe80::', 'ffff:ffff::')}))
+        # Cannot be compared
+        needs_sending(self._flow_mod(
+            ofp.OFPFC_DELETE, {'eth_src': ('fa:16:3e:00:00:00', 'bogus')}))
+        self.assertEqual(set(flows[1:]),
+                         set(installed_flows.get_stale_flows()))
+        # The flows which may have been deleted are added again
+        for flow in (flows[0], flows[3]):
+            self.assertTrue(needs_sending(
+                self._flow_mod(ofp.OFPFC_ADD, flow.match)))
+        self.assertFalse(needs_sending(
+            self._flow_mod(ofp.OFPFC_ADD, flows[1].match)))
+        self.assertEqual([flows[2]], installed_flows.get_stale_flows())
+
+    def test_flow_mod_counts(self):
+        ofswitch = importutils.import_module(_OFSWITCH_MODULE)
+        self.br.install_drop(table_id=3, in_port=1)
+        self.br.install_goto(dest_table_id=4, table_id=3, in_port=2)
+        self.br.install_normal()
+        ofswitch.OpenFlowSwitchMixin.uninstall_flows(self.br, table_id=3,
+                                                     in_port=1)
+        ofswitch.OpenFlowSwitchMixin.uninstall_flows(self.br, in_port=2)
+        self.assertEqual({(3, 'add'): 2, (0, 'add'): 1,
+                          (3, 'del'): 1, (None, 'del'): 1},
+                         self.br.flow_mod_counts)
+
 
 class OVSDVRProcessTestMixin(object):
     def test_install_dvr_process_ipv4(self):
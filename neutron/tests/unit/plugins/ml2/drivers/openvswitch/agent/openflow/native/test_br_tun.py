@@ -500,3 +500,18 @@ class OVSTunnelBridgeTest(ovs_bridge_test_base.OVSBridgeTestBase,
             call.uninstall_flows(eth_src=mac, table_id=9),
         ]
         self.assertEqual(expected, self.mock.mock_calls)
+
+    def test_deferred_br_flood_to_tun(self):
+        with mock.patch.object(self.br, 'install_flood_to_tun') as install,\
+                mock.patch.object(self.br, 'delete_flood_to_tun') as delete,\
+                mock.patch.object(self.br, 'install_unicast_to_tun') as ucast:
+            with self.br.deferred() as deferred_br:
+                deferred_br.install_flood_to_tun(3333, 2222, [11])
+                deferred_br.install_unicast_to_tun(3333, 2222, 11, 'mac')
+                deferred_br.install_flood_to_tun(4444, 5555, [11])
+                deferred_br.install_flood_to_tun(3333, 2222, [11, 22])
+                deferred_br.delete_flood_to_tun(4444)
+                ucast.assert_called_once_with(3333, 2222, 11, 'mac')
+                self.assertFalse(install.called)
+            install.assert_called_once_with(3333, 2222, [11, 22])
+            delete.assert_called_once_with(4444)
@@ -17,6 +17,7 @@
 import mock
 from neutron_lib import constants
 
+from neutron.agent.common import ovs_lib
 from neutron.tests.unit.plugins.ml2.drivers.openvswitch.agent \
     import ovs_test_base
 
@@ -90,6 +91,19 @@ class OVSBridgeTestBase(ovs_test_base.OVSOFCtlTestBase):
             self.br.dump_flows_all_tables()
             run_ofctl.assert_has_calls([mock.call("dump-flows", [])])
 
+    def test_do_action_flows_counts_flow_mods(self):
+        with mock.patch.object(ovs_lib.OVSBridge,
+                               'do_action_flows') as do_action_flows:
+            self.br.do_action_flows('add', [{'table': 2}, {'table': 3}])
+            self.br.do_action_flows('del', [{'table': 2}, {'in_port': 1}])
+        do_action_flows.assert_has_calls([
+            call('add', [{'table': 2}, {'table': 3}]),
+            call('del', [{'table': 2}, {'in_port': 1}]),
+        ])
+        self.assertEqual({(2, 'add'): 1, (3, 'add'): 1,
+                          (2, 'del'): 1, (None, 'del'): 1},
+                         self.br.flow_mod_counts)
+
 
 class OVSDVRProcessTestMixin(object):
     def test_install_dvr_process_ipv4(self):
@@ -318,3 +318,18 @@ class OVSTunnelBridgeTest(ovs_bridge_test_base.OVSBridgeTestBase,
 
     def test_deferred_br_delete_port(self):
         self._mock_delete_port(True)
+
+    def test_deferred_br_flood_to_tun(self):
+        with mock.patch.object(self.br, 'do_action_flows') as do_action_flows:
+            with self.br.deferred() as deferred_br:
+                deferred_br.install_flood_to_tun(3333, 2222, [11])
+                deferred_br.install_flood_to_tun(4444, 5555, [11])
+                deferred_br.install_flood_to_tun(3333, 2222, [11, 22])
+                deferred_br.delete_flood_to_tun(4444)
+        expected = [
+            call('mod', [{'table': 22, 'dl_vlan': 3333,
+                          'actions': 'strip_vlan,set_tunnel:2222,'
+                                     'output:11,22'}]),
+            call('del', [{'table': 22, 'dl_vlan': 4444}]),
+        ]
+        self.assertEqual(expected, do_action_flows.mock_calls)
@@ -0,0 +1,115 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+
+import mock
+from oslo_serialization import jsonutils
+import webob
+
+from neutron.plugins.ml2.drivers.openvswitch.agent import loop_metrics
+from neutron.tests import base
+
+
+class TestLoopMetrics(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestLoopMetrics, self).setUp()
+        self.time = mock.patch.object(loop_metrics, 'time').start().time
+        self.metrics = loop_metrics.LoopMetrics()
+
+    def test_nested_phases(self):
+        # The RPC phase pauses the flows phase
+        self.time.side_effect = [10.0, 11.0, 13.0, 13.5, 14.0, 20.0]
+        with self.metrics.phase(loop_metrics.PHASE_FLOWS):
+            with self.metrics.phase(loop_metrics.PHASE_RPC):
+                pass
+            with self.metrics.phase(loop_metrics.PHASE_FIREWALL):
+                pass
+        self.metrics.end_iteration(7, 12.0)
+        self.assertEqual(
+            {'iteration': 7, 'elapsed': 12.0,
+             'phases': {loop_metrics.PHASE_FLOWS: 7.5,
+                        loop_metrics.PHASE_RPC: 2.0,
+                        loop_metrics.PHASE_FIREWALL: 0.5}},
+            self.metrics.last_iteration)
+
+    def test_phase_ended_on_error(self):
+        self.time.side_effect = [10.0, 12.0]
+
+        def fail():
+            with self.metrics.phase(loop_metrics.PHASE_OVSDB):
+                raise RuntimeError()
+
+        self.assertRaises(RuntimeError, fail)
+        self.metrics.end_iteration(0, 2.0)
+        self.assertEqual({loop_metrics.PHASE_OVSDB: 2.0},
+                         self.metrics.last_iteration['phases'])
+
+    def test_get_report(self):
+        self.time.side_effect = [10.0, 11.0, 20.0, 23.0]
+        with self.metrics.phase(loop_metrics.PHASE_OVSDB):
+            pass
+        self.metrics.end_iteration(0, 2.0)
+        with self.metrics.phase(loop_metrics.PHASE_OVSDB):
+            pass
+        self.metrics.end_iteration(1, 4.0)
+        flow_mod_counts = collections.Counter(
+            {(0, 'add'): 3, (0, 'del'): 1, (None, 'del'): 2})
+        bridge = mock.Mock(br_name='br-int', flow_mod_counts=flow_mod_counts)
+        self.assertEqual(
+            {'iterations': 2,
+             'elapsed': 6.0,
+             'phases': {loop_metrics.PHASE_OVSDB: 4.0},
+             'last_iteration': {'iteration': 1, 'elapsed': 4.0,
+                                'phases': {loop_metrics.PHASE_OVSDB: 3.0}},
+             'flow_mods': {'br-int': {'0': {'add': 3, 'del': 1},
+                                      'all': {'del': 2}}}},
+            self.metrics.get_report([bridge]))
+
+    def test_get_summary(self):
+        self.assertEqual(
+            {'iterations': 0, 'elapsed': 0.0, 'last_elapsed': 0.0,
+             'phases': dict.fromkeys(loop_metrics.PHASES, 0.0)},
+            self.metrics.get_summary())
+        self.time.side_effect = [10.0, 11.0]
+        with self.metrics.phase(loop_metrics.PHASE_RPC):
+            pass
+        self.metrics.end_iteration(0, 2.0)
+        self.assertEqual(
+            {'iterations': 1, 'elapsed': 2.0, 'last_elapsed': 2.0,
+             'phases': {loop_metrics.PHASE_OVSDB: 0.0,
+                        loop_metrics.PHASE_RPC: 1.0,
+                        loop_metrics.PHASE_FIREWALL: 0.0,
+                        loop_metrics.PHASE_FLOWS: 0.0}},
+            self.metrics.get_summary())
+
+    def test_handler(self):
+        report = {'iterations': 1}
+        handler = loop_metrics.LoopMetricsHandler(lambda: report)
+        response = webob.Request.blank('/').get_response(handler)
+        self.assertEqual('application/json', response.content_type)
+        self.assertEqual(report, jsonutils.loads(response.body))
+
+    @mock.patch.object(loop_metrics.agent_utils, 'UnixDomainWSGIServer')
+    @mock.patch.object(loop_metrics.agent_utils,
+                       'ensure_directory_exists_without_file')
+    def test_start_metrics_server(self, ensure_dir, server_cls):
+        get_report = mock.Mock()
+        server = loop_metrics.start_metrics_server('/tmp/metrics', get_report)
+        ensure_dir.assert_called_once_with('/tmp/metrics')
+        self.assertEqual(server_cls.return_value, server)
+        server.start.assert_called_once_with(
+            mock.ANY, '/tmp/metrics', workers=0,
+            backlog=loop_metrics.METRICS_SERVER_BACKLOG)
+        handler = server.start.call_args[0][0]
+        self.assertEqual(get_report, handler.get_report)
@@ -119,6 +119,10 @@ class TestOvsNeutronAgent(object):
         mock.patch(
             'neutron.agent.common.ovs_lib.OVSBridge.get_ports_attributes',
             return_value=[]).start()
+        mock.patch.object(ovs_lib.OVSBridge, 'get_port_snapshot',
+                          autospec=True,
+                          side_effect=lambda br: ovs_lib.PortSnapshot(
+                              br, [])).start()
 
         mock.patch('neutron.agent.common.ovs_lib.BaseOVS.config',
                    new_callable=mock.PropertyMock,
@@ -312,6 +316,68 @@ class TestOvsNeutronAgent(object):
     def test_restore_local_vlan_map_segmentation_id_compat(self):
         self._test_restore_local_vlan_maps(2, segmentation_id='None')
 
+    def test_restore_saved_local_vlan_map(self):
+        self.agent.local_vlan_map_file = mock.Mock()
+        self.agent.local_vlan_map_file.load.return_value = {
+            'net1': {'vlan': 5, 'ports': ['tap1', 'tap2']},
+            'net2': {'vlan': 6, 'ports': ['tap3']}}
+        # The map holds the names of the ports, not of their interfaces
+        records = [
+            ovs_lib.PortRecord('iface-' + name, name, tag, ofport,
+                               {'iface-id': name, 'attached-mac': 'mac'})
+            for name, tag, ofport in [('tap1', 5, 1),
+                                      ('tap2', 7, 2),
+                                      ('tap3', 6, ovs_lib.INVALID_OFPORT),
+                                      ('tap4', 8, 4)]]
+        get_ports = [{'name': 'tap2', 'tag': 7,
+                      'other_config': {'net_uuid': 'net1'}},
+                     {'name': 'tap4', 'tag': 8,
+                      'other_config': {'net_uuid': 'net3'}}]
+        with mock.patch.object(
+                self.agent.int_br, 'get_port_snapshot',
+                return_value=ovs_lib.PortSnapshot(self.agent.int_br,
+                                                  records)), \
+                mock.patch.object(self.agent.int_br, 'get_ports_attributes',
+                                  return_value=get_ports) as gpa:
+            self.agent._restore_local_vlan_map()
+        # only the ports whose tag does not match the map are read
+        gpa.assert_called_once_with(
+            'Port', columns=['name', 'other_config', 'tag'],
+            ports=['tap2', 'tap4'], if_exists=True)
+        self.assertEqual({'net1': 5, 'net3': 8}, self.agent._local_vlan_hints)
+        self.assertNotIn(5, self.agent.available_local_vlans)
+        self.assertIn(7, self.agent.available_local_vlans)
+
+    def test_restore_local_vlan_map_no_saved_map(self):
+        self.agent.local_vlan_map_file = mock.Mock()
+        self.agent.local_vlan_map_file.load.return_value = None
+        with mock.patch.object(self.agent,
+                               '_restore_saved_local_vlan_map') as restore, \
+                mock.patch.object(self.agent.int_br, 'get_vif_ports',
+                                  return_value=[]) as get_vif_ports:
+            self.agent._restore_local_vlan_map()
+        self.assertFalse(restore.called)
+        self.assertTrue(get_vif_ports.called)
+
+    def test_save_local_vlan_map(self):
+        self.agent.local_vlan_map_file = mock.Mock()
+        vif_ports = {'vif1': mock.Mock(port_name='tap1'),
+                     'vif2': mock.Mock(port_name='tap0')}
+        self.agent.vlan_manager.add('net1', 5, 'vlan', 'physnet', 100,
+                                    vif_ports)
+        self.agent.vlan_manager.add('net2', 6, 'vxlan', None, 200)
+        self.agent._save_local_vlan_map()
+        self.agent.local_vlan_map_file.save.assert_called_once_with(
+            {'net1': {'vlan': 5, 'ports': ['tap0', 'tap1']},
+             'net2': {'vlan': 6, 'ports': []}})
+
+    def test_save_local_vlan_map_error(self):
+        self.agent.local_vlan_map_file = mock.Mock()
+        self.agent.local_vlan_map_file.save.side_effect = ValueError()
+        with mock.patch.object(self.mod_agent.LOG, 'exception') as log:
+            self.agent._save_local_vlan_map()
+        self.assertTrue(log.called)
+
     def test_check_agent_configurations_for_dvr_raises(self):
         self.agent.enable_distributed_routing = True
         self.agent.enable_tunneling = True
@@ -432,6 +498,18 @@ class TestOvsNeutronAgent(object):
                                       updated_ports)
         self.assertEqual(expected, actual)
 
+    def test_scan_ports_reads_port_snapshot_once(self):
+        snapshot = ovs_lib.PortSnapshot(self.agent.int_br, [
+            ovs_lib.PortRecord('tap1', 'tap1', 1, 1,
+                               {'iface-id': 'id1', 'attached-mac': 'mac1'})])
+        with mock.patch.object(self.agent.int_br, 'get_port_snapshot',
+                               return_value=snapshot) as get_port_snapshot:
+            port_info = self.agent.scan_ports(set(), False)
+        get_port_snapshot.assert_called_once_with()
+        self.assertEqual(
+            {'current': {'id1'}, 'added': {'id1'}, 'removed': set()},
+            port_info)
+
     def test_scan_ports_no_vif_changes_returns_updated_port_only(self):
         vif_port_set = set([1, 2, 3])
         registered_ports = set([1, 2, 3])
@@ -1098,6 +1176,30 @@ class TestOvsNeutronAgent(object):
             self.agent._report_state()
             self.assertTrue(self.agent.fullsync)
 
+    def test_report_state_loop_metrics(self):
+        self.agent.int_br.flow_mod_counts[(0, 'add')] += 2
+        with mock.patch.object(self.agent.state_rpc, "report_state"):
+            self.agent._report_state()
+        # The flow-mod counts are only served on the metrics socket
+        self.assertEqual(
+            self.agent.loop_metrics.get_summary(),
+            self.agent.agent_state['configurations']['loop_metrics'])
+
+    def test_loop_count_and_wait_ends_metrics_iteration(self):
+        with mock.patch.object(self.agent.loop_metrics,
+                               'end_iteration') as end_iteration,\
+                mock.patch.object(time, 'sleep'):
+            self.agent.loop_count_and_wait(time.time(), {})
+        end_iteration.assert_called_once_with(0, mock.ANY)
+
+    def test_metrics_socket(self):
+        cfg.CONF.set_override('metrics_socket', '/tmp/metrics', 'AGENT')
+        with mock.patch.object(self.mod_agent.loop_metrics,
+                               'start_metrics_server') as start_server:
+            agent = self._make_agent()
+        start_server.assert_called_once_with('/tmp/metrics',
+                                             agent.get_loop_metrics)
+
     def test_port_update(self):
         port = {"id": TEST_PORT_ID1,
                 "network_id": TEST_NETWORK_ID1,
@@ -1426,6 +1528,26 @@ class TestOvsNeutronAgent(object):
             self.assertFalse(tun_patch_port.called)
             self.assertTrue(delete.called)
 
+    def test_setup_tunnel_br_diff_flows(self):
+        cfg.CONF.set_override('diff_flows_on_start', True, 'OVS')
+        with mock.patch.object(self.agent.tun_br, 'create'),\
+                mock.patch.object(self.agent.tun_br, 'bridge_exists',
+                                  return_value=True),\
+                mock.patch.object(self.agent.tun_br, 'port_exists',
+                                  return_value=True),\
+                mock.patch.object(self.agent.int_br, 'port_exists',
+                                  return_value=True),\
+                mock.patch.object(self.agent.tun_br, 'setup_controllers'),\
+                mock.patch.object(self.agent, 'patch_tun_ofport', new=2),\
+                mock.patch.object(self.agent, 'patch_int_ofport', new=2),\
+                mock.patch.object(self.agent.tun_br,
+                                  'uninstall_flows') as delete,\
+                mock.patch.object(self.agent.tun_br,
+                                  'start_flows_diff') as start_flows_diff:
+            self.agent.setup_tunnel_br()
+            self.assertFalse(delete.called)
+            start_flows_diff.assert_called_once_with()
+
     def test_setup_tunnel_port(self):
         self.agent.tun_br = mock.Mock()
         self.agent.l2_pop = False
@@ -1461,12 +1583,12 @@ class TestOvsNeutronAgent(object):
     def _prepare_l2_pop_ofports(self):
         lvm1 = mock.Mock()
         lvm1.network_type = 'gre'
-        lvm1.vlan = 'vlan1'
+        lvm1.vlan = 1
         lvm1.segmentation_id = 'seg1'
         lvm1.tun_ofports = set(['1'])
         lvm2 = mock.Mock()
         lvm2.network_type = 'gre'
-        lvm2.vlan = 'vlan2'
+        lvm2.vlan = 2
         lvm2.segmentation_id = 'seg2'
         lvm2.tun_ofports = set(['1', '2'])
         self.agent.vlan_manager.mapping = {'net1': lvm1, 'net2': lvm2}
@@ -1527,15 +1649,37 @@ class TestOvsNeutronAgent(object):
             self.assertFalse(add_tun_fn.called)
             deferred_br_call = mock.call.deferred().__enter__()
             expected_calls = [
-                deferred_br_call.install_arp_responder('vlan1', FAKE_IP1,
+                deferred_br_call.install_arp_responder(1, FAKE_IP1,
                                                        FAKE_MAC),
-                deferred_br_call.install_unicast_to_tun('vlan1', 'seg1', '2',
+                deferred_br_call.install_unicast_to_tun(1, 'seg1', '2',
                                                         FAKE_MAC),
-                deferred_br_call.install_flood_to_tun('vlan1', 'seg1',
+                deferred_br_call.install_flood_to_tun(1, 'seg1',
                                                       set(['1', '2'])),
             ]
             tun_br.assert_has_calls(expected_calls)
 
+    def test_fdb_add_flows_of_networks_deferred_once(self):
+        self._prepare_l2_pop_ofports()
+        fdb_entry = {'net1':
+                     {'network_type': 'gre',
+                      'segment_id': 'tun1',
+                      'ports':
+                      {'2.2.2.2': [n_const.FLOODING_ENTRY]}},
+                     'net2':
+                     {'network_type': 'gre',
+                      'segment_id': 'tun2',
+                      'ports':
+                      {'2.2.2.2':
+                       [l2pop_rpc.PortInfo(FAKE_MAC, FAKE_IP1)]}}}
+        with mock.patch.object(self.agent, 'tun_br', autospec=True) as tun_br:
+            self.agent.fdb_add(None, fdb_entry)
+            tun_br.deferred.assert_called_once_with()
+            deferred_br = tun_br.deferred().__enter__()
+            deferred_br.install_flood_to_tun.assert_called_once_with(
+                1, 'seg1', set(['1', '2']))
+            deferred_br.install_unicast_to_tun.assert_called_once_with(
+                2, 'seg2', '2', FAKE_MAC)
+
     def test_fdb_del_flows(self):
         self._prepare_l2_pop_ofports()
         fdb_entry = {'net2':
@@ -1551,9 +1695,9 @@ class TestOvsNeutronAgent(object):
             expected_calls = [
                 mock.call.deferred(),
                 mock.call.deferred().__enter__(),
-                deferred_br_call.delete_arp_responder('vlan2', FAKE_IP1),
-                deferred_br_call.delete_unicast_to_tun('vlan2', FAKE_MAC),
-                deferred_br_call.install_flood_to_tun('vlan2', 'seg2',
+                deferred_br_call.delete_arp_responder(2, FAKE_IP1),
+                deferred_br_call.delete_unicast_to_tun(2, FAKE_MAC),
+                deferred_br_call.install_flood_to_tun(2, 'seg2',
                                                       set(['1'])),
                 deferred_br_call.delete_port('gre-02020202'),
                 deferred_br_call.cleanup_tunnel_port('2'),
@@ -1605,14 +1749,14 @@ class TestOvsNeutronAgent(object):
             self.agent.fdb_update(None, fdb_entries)
             deferred_br = deferred_fn().__enter__()
             deferred_br.assert_has_calls([
-                mock.call.install_arp_responder('vlan1', FAKE_IP2, FAKE_MAC),
-                mock.call.delete_arp_responder('vlan1', FAKE_IP1)
+                mock.call.install_arp_responder(1, FAKE_IP2, FAKE_MAC),
+                mock.call.delete_arp_responder(1, FAKE_IP1)
             ])
 
     def test_del_fdb_flow_idempotency(self):
         lvm = mock.Mock()
         lvm.network_type = 'gre'
-        lvm.vlan = 'vlan1'
+        lvm.vlan = 1
         lvm.segmentation_id = 'seg1'
         lvm.tun_ofports = set(['1', '2'])
         with mock.patch.object(self.agent.tun_br, 'mod_flow') as mod_flow_fn,\
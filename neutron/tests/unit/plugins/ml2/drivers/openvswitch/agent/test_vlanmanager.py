@@ -14,6 +14,8 @@
 #    under the License.
 
 import fixtures
+import mock
+from oslo_serialization import jsonutils
 import testtools
 
 from neutron.plugins.ml2.drivers.openvswitch.agent import vlanmanager
@@ -118,3 +120,97 @@ class TestLocalVlanManager(base.BaseTestCase):
     def test_pop_non_existing_raises_exception(self):
         with testtools.ExpectedException(vlanmanager.MappingNotFound):
             self.vlan_manager.pop(1)
+
+
+class TestLocalVlanPool(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestLocalVlanPool, self).setUp()
+        self.pool = vlanmanager.LocalVlanPool(1, 10)
+
+    def test_contains(self):
+        self.assertEqual(10, len(self.pool))
+        self.assertIn(1, self.pool)
+        self.assertIn(10, self.pool)
+        self.assertNotIn(0, self.pool)
+        self.assertNotIn(11, self.pool)
+        self.assertNotIn([], self.pool)
+
+    def test_pop_lowest_first(self):
+        self.assertEqual([1, 2, 3], [self.pool.pop() for i in range(3)])
+        self.assertNotIn(1, self.pool)
+        self.assertEqual(7, len(self.pool))
+
+    def test_pop_skips_removed(self):
+        self.pool.remove(1)
+        self.pool.remove(2)
+        self.assertEqual(3, self.pool.pop())
+        self.assertRaises(KeyError, self.pool.remove, 3)
+
+    def test_add(self):
+        self.pool.remove(5)
+        self.pool.add(5)
+        self.pool.add(5)
+        self.pool.update([6, 11])
+        self.assertEqual(10, len(self.pool))
+        # the released ids are reused first
+        self.assertEqual(5, self.pool.pop())
+
+    def test_pop_empty(self):
+        vlans = set()
+        while self.pool:
+            vlans.add(self.pool.pop())
+        self.assertEqual(set(range(1, 11)), vlans)
+        self.assertRaises(KeyError, self.pool.pop)
+
+    def test_free_stack_bounded(self):
+        for i in range(100):
+            self.pool.remove(5)
+            self.pool.add(5)
+        self.assertLessEqual(len(self.pool._free), 20)
+        self.assertEqual(10, len(self.pool))
+
+
+class TestLocalVlanMapFile(base.BaseTestCase):
+
+    NETWORKS = {'net1': {'vlan': 1, 'ports': ['tap1', 'tap2']},
+                'net2': {'vlan': 2, 'ports': []}}
+
+    def setUp(self):
+        super(TestLocalVlanMapFile, self).setUp()
+        self.path = self.get_temp_file_path('ovs/local_vlan_map')
+        self.map_file = vlanmanager.LocalVlanMapFile(self.path)
+
+    def _write(self, data):
+        with open(self.path, 'w') as f:
+            f.write(data)
+
+    def test_save_and_load(self):
+        self.map_file.save(self.NETWORKS)
+        self.assertEqual(
+            self.NETWORKS,
+            vlanmanager.LocalVlanMapFile(self.path).load())
+
+    def test_save_unchanged(self):
+        with mock.patch.object(vlanmanager.file_utils,
+                               'replace_file') as replace_file:
+            self.map_file.save(self.NETWORKS)
+            self.map_file.save(dict(self.NETWORKS))
+        replace_file.assert_called_once_with(self.path, mock.ANY)
+
+    def test_load_missing(self):
+        self.assertIsNone(self.map_file.load())
+
+    def test_load_invalid(self):
+        self.map_file.save(self.NETWORKS)
+        self._write('{"version": 1, "networks": {"net1": {"vlan": 1}}}')
+        self.assertIsNone(self.map_file.load())
+        self._write('not json')
+        self.assertIsNone(self.map_file.load())
+
+    def test_load_unsupported_version(self):
+        self.map_file.save(self.NETWORKS)
+        self._write(jsonutils.dumps(
+            {'version': vlanmanager.LOCAL_VLAN_MAP_VERSION + 1,
+             'networks': self.NETWORKS}))
+        self.assertIsNone(self.map_file.load())
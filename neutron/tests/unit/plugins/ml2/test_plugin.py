@@ -38,11 +38,13 @@ import testtools
 import webob
 
 from neutron._i18n import _
+from neutron.api.rpc.handlers import securitygroups_rpc as sg_rpc
 from neutron.common import utils
 from neutron.db import agents_db
 from neutron.db import api as db_api
 from neutron.db import models_v2
 from neutron.db import provisioning_blocks
+from neutron.db import request_cache
 from neutron.db import segments_db
 from neutron.extensions import multiprovidernet as mpnet
 from neutron.objects import base as base_obj
@@ -54,10 +56,12 @@ from neutron.plugins.ml2.drivers import type_vlan
 from neutron.plugins.ml2 import managers
 from neutron.plugins.ml2 import models
 from neutron.plugins.ml2 import plugin as ml2_plugin
+from neutron.plugins.ml2 import rpc
 from neutron.services.revisions import revision_plugin
 from neutron.services.segments import db as segments_plugin_db
 from neutron.services.segments import plugin as segments_plugin
 from neutron.tests.common import helpers
+from neutron.tests import tools
 from neutron.tests.unit import _test_extension_portbindings as test_bindings
 from neutron.tests.unit.agent import test_securitygroups_rpc as test_sg_rpc
 from neutron.tests.unit.db import test_allowedaddresspairs_db as test_pair
@@ -1061,6 +1065,69 @@ class TestMl2PortsV2(test_plugin.TestPortsV2, Ml2PluginV2TestCase):
             # check that notifier was still triggered
             self.assertTrue(notify.call_counts)
 
+    def test_update_port_bulk(self):
+        ctx = context.get_admin_context()
+        plugin = directory.get_plugin()
+        with self.subnet() as subnet,\
+                self.port(subnet=subnet) as port1,\
+                self.port(subnet=subnet) as port2,\
+                mock.patch.object(plugin.mechanism_manager,
+                                  'update_port_postcommit') as postcommit,\
+                mock.patch.object(plugin.notifier,
+                                  'security_groups_member_updated') as m_upd:
+            ids = [port1['port']['id'], port2['port']['id']]
+            sg_ids = port1['port']['security_groups']
+            ports = plugin.update_port_bulk(
+                ctx, [(id, {'port': {'name': 'bulk', 'security_groups': []}})
+                      for id in ids])
+            self.assertEqual(ids, [port['id'] for port in ports])
+            self.assertEqual(['bulk', 'bulk'],
+                             [port['name'] for port in ports])
+            self.assertEqual(2, postcommit.call_count)
+            # the member updates of both ports are sent at once
+            m_upd.assert_called_once_with(ctx, sg_ids)
+
+    def test_update_port_bulk_port_not_found(self):
+        ctx = context.get_admin_context()
+        plugin = directory.get_plugin()
+        with self.port() as port:
+            port_id = port['port']['id']
+            self.assertRaises(
+                exc.PortNotFound, plugin.update_port_bulk, ctx,
+                [(port_id, {'port': {'name': 'bulk'}}),
+                 (uuidutils.generate_uuid(), {'port': {'name': 'bulk'}})])
+            self.assertEqual(port['port']['name'],
+                             plugin.get_port(ctx, port_id)['name'])
+
+    def test_delete_port_bulk(self):
+        ctx = context.get_admin_context()
+        plugin = directory.get_plugin()
+        l3plugin = directory.get_plugin(plugin_constants.L3)
+        with self.subnet() as subnet,\
+                self.port(subnet=subnet) as port1,\
+                self.port(subnet=subnet) as port2,\
+                mock.patch.object(plugin.mechanism_manager,
+                                  'delete_port_postcommit') as postcommit,\
+                mock.patch.object(plugin.notifier,
+                                  'security_groups_member_updated') as m_upd,\
+                mock.patch.object(plugin.notifier,
+                                  'port_delete') as port_delete,\
+                mock.patch.object(l3plugin, 'disassociate_floatingips',
+                                  return_value={'router'}),\
+                mock.patch.object(l3plugin,
+                                  'notify_routers_updated') as routers_upd:
+            ids = [port1['port']['id'], port2['port']['id']]
+            sg_ids = port1['port']['security_groups']
+            # the ports which do not exist are ignored
+            plugin.delete_port_bulk(ctx, ids + [uuidutils.generate_uuid()])
+            self.assertEqual([], plugin.get_ports(ctx, filters={'id': ids}))
+            self.assertEqual(2, postcommit.call_count)
+            self.assertEqual(2, port_delete.call_count)
+            m_upd.assert_called_once_with(ctx, sg_ids)
+            routers_upd.assert_has_calls([mock.call(ctx, {'router'})])
+            self.assertEqual(1, len([call for call in routers_upd.mock_calls
+                                     if call[1][1]]))
+
     def test_registry_notify_before_after_port_binding(self):
         plugin = directory.get_plugin()
         ctx = context.get_admin_context()
@@ -2789,3 +2856,73 @@ class TestML2Segments(Ml2PluginV2TestCase):
                               context=self.context, segment=segment)
             exist_port = self._show('ports', port['port']['id'])
             self.assertEqual(port['port']['id'], exist_port['port']['id'])
+
+
+class TestMl2QueryBudgets(Ml2PluginV2TestCase):
+
+    def setUp(self):
+        super(TestMl2QueryBudgets, self).setUp()
+        self.budget = self.useFixture(tools.QueryBudgetFixture(self))
+        self.plugin = directory.get_plugin()
+        self.ctx = context.get_admin_context()
+
+    def _make_ports(self, net_id, count):
+        for i in range(count):
+            self._make_port(self.fmt, net_id)
+
+    def test_get_ports_statements_do_not_grow(self):
+        with self.network() as net:
+            net_id = net['network']['id']
+            self._make_ports(net_id, 1)
+            self.budget.assert_constant(
+                self.plugin.get_ports,
+                lambda: self._make_ports(net_id, 3), self.ctx,
+                filters={'network_id': [net_id]})
+
+    def test_create_port_statements_saved_by_request_cache(self):
+        net = self._make_network(self.fmt, 'net', True)
+        self._make_subnet(self.fmt, net, '10.0.0.1', '10.0.0.0/24')
+        net_id = net['network']['id']
+        # the first port of the network is not representative
+        self._make_ports(net_id, 1)
+        with mock.patch.object(request_cache, '_get_cache',
+                               return_value=None):
+            uncached = self.budget.count(self._make_ports, net_id, 1)
+        cached = self.budget.count(self._make_ports, net_id, 1)
+        self.assertLess(cached.statements, uncached.statements,
+                        "a port create issued %s with the request cache "
+                        "and %s without it" % (cached, uncached))
+
+    def _make_bound_ports(self, count):
+        net = self._make_network(self.fmt, 'net', True)
+        self._make_subnet(self.fmt, net, '10.0.0.1', '10.0.0.0/24')
+        return [self._make_port(self.fmt, net['network']['id'],
+                                arg_list=(portbindings.HOST_ID,),
+                                **{portbindings.HOST_ID: HOST})['port']['id']
+                for i in range(count)]
+
+    def test_get_devices_details_list_statements(self):
+        callbacks = rpc.RpcCallbacks(mock.Mock(), mock.Mock())
+        get_details = functools.partial(
+            callbacks.get_devices_details_list, self.ctx,
+            agent_id='agent', host=HOST)
+        devices = self._make_bound_ports(4)
+        # the first call sets the status of the ports
+        get_details(devices=devices)
+        self.budget.assert_linear(
+            lambda devices: get_details(devices=devices), devices)
+
+    def test_security_group_info_for_devices_statements(self):
+        callbacks = sg_rpc.SecurityGroupServerRpcCallback()
+        devices = self._make_bound_ports(4)
+        self.budget.assert_linear(
+            lambda devices: callbacks.security_group_info_for_devices(
+                self.ctx, devices=devices), devices)
+
+    def test_get_networks_statements_do_not_grow(self):
+        self._make_network(self.fmt, 'net0', True)
+        self.budget.assert_constant(
+            self.plugin.get_networks,
+            lambda: [self._make_network(self.fmt, 'net%s' % i, True)
+                     for i in range(1, 4)],
+            self.ctx, fields=['id', 'name'])
@@ -313,6 +313,33 @@ class RpcCallbacksTestCase(base.BaseTestCase):
             'fake_context', devices_up=[], devices_down=[], **kwargs)
         self.assertEqual(expected, res)
 
+    def test_get_network_fdb(self):
+        l2pop_driver = self.plugin.mechanism_manager.mech_drivers.get
+        l2pop_driver.return_value.obj.get_network_fdb.return_value = 'fdb'
+        self.assertEqual('fdb', self.callbacks.get_network_fdb(
+            'fake_context', host='fake_host', network_id='fake_net'))
+        l2pop_driver.assert_called_once_with('l2population')
+        l2pop_driver.return_value.obj.get_network_fdb.assert_called_once_with(
+            'fake_context', 'fake_host', 'fake_net')
+
+    def test_get_network_fdb_digests(self):
+        l2pop_driver = self.plugin.mechanism_manager.mech_drivers.get
+        get_digests = l2pop_driver.return_value.obj.get_network_fdb_digests
+        get_digests.return_value = {'fake_net': 'digest'}
+        self.assertEqual(
+            {'fake_net': 'digest'},
+            self.callbacks.get_network_fdb_digests(
+                'fake_context', host='fake_host', network_ids=['fake_net']))
+        get_digests.assert_called_once_with('fake_context', 'fake_host',
+                                            ['fake_net'])
+
+    def test_get_network_fdb_without_l2pop(self):
+        self.plugin.mechanism_manager.mech_drivers.get.return_value = None
+        self.assertEqual({}, self.callbacks.get_network_fdb(
+            'fake_context', host='fake_host', network_id='fake_net'))
+        self.assertEqual({}, self.callbacks.get_network_fdb_digests(
+            'fake_context', host='fake_host', network_ids=['fake_net']))
+
 
 class RpcApiTestCase(base.BaseTestCase):
 
@@ -457,6 +484,20 @@ class RpcApiTestCase(base.BaseTestCase):
                            host='fake_host',
                            version='1.5')
 
+    def test_get_network_fdb(self):
+        rpcapi = agent_rpc.PluginApi(topics.PLUGIN)
+        self._test_rpc_api(rpcapi, None,
+                           'get_network_fdb', rpc_method='call',
+                           network_id='fake_net', host='fake_host',
+                           version='1.6')
+
+    def test_get_network_fdb_digests(self):
+        rpcapi = agent_rpc.PluginApi(topics.PLUGIN)
+        self._test_rpc_api(rpcapi, None,
+                           'get_network_fdb_digests', rpc_method='call',
+                           network_ids=['fake_net'], host='fake_host',
+                           version='1.6')
+
     def test_devices_details_list_and_failed_devices(self):
         rpcapi = agent_rpc.PluginApi(topics.PLUGIN)
         self._test_rpc_api(rpcapi, None,
@@ -599,3 +599,61 @@ class NeutronPolicyTestCase(base.BaseTestCase):
         result = policy._is_attribute_explicitly_set(
             attr, resource, target, action)
         self.assertFalse(result)
+
+    def test_compiled_rules_fold_credential_checks(self):
+        compiled = policy.get_compiled_rules(self.context)
+        # context_is_admin and context_is_advsvc are folded away
+        rule = compiled.get('get_network')
+        self.assertIsInstance(rule, oslo_policy.OrCheck)
+        self.assertEqual(3, len(rule.rules))
+        self.assertIsInstance(rule.rules[0], policy.OwnerCheck)
+        self.assertTrue(compiled.is_constant('admin_only'))
+        self.assertFalse(compiled.check('admin_only', {}))
+        self.assertTrue(compiled.check('regular_user', {}))
+        # unknown rules fall back to the default one
+        self.assertTrue(compiled.check('get_foo_noexist', {}))
+
+    def test_compiled_rules_not_check(self):
+        self._set_rules(get_thing='not rule:context_is_advsvc',
+                        get_other='not rule:network_device')
+        self.fakepolicyinit()
+        compiled = policy.get_compiled_rules(self.context)
+        self.assertTrue(compiled.check('get_thing', {}))
+        self.assertIsInstance(compiled.get('get_other'),
+                              oslo_policy.NotCheck)
+        self.assertFalse(compiled.check('get_other',
+                                        {'device_owner': 'network:dhcp'}))
+
+    def test_check_get_uses_compiled_rules(self):
+        self._set_rules(**{'get_network:provider': 'rule:admin_only'})
+        self.fakepolicyinit()
+        targets = [{'tenant_id': 'fake', 'shared': False},
+                   {'tenant_id': 'other', 'shared': True},
+                   {'tenant_id': 'other', 'shared': False}]
+        with mock.patch.object(policy._ENFORCER, 'enforce',
+                               wraps=policy._ENFORCER.enforce) as enforce:
+            for target in targets:
+                self.assertFalse(policy.check(
+                    self.context, 'get_network:provider', target,
+                    might_not_exist=True))
+            self.assertEqual([True, True, False],
+                             [policy.check(self.context, 'get_network', t)
+                              for t in targets])
+        # admin_only was evaluated once, get_network once per target with
+        # only the target dependent checks left
+        self.assertEqual(2 + len(targets), enforce.call_count)
+
+    def test_compiled_rules_follow_rule_changes(self):
+        self.assertTrue(policy.check(self.context, 'get_port',
+                                     {'tenant_id': 'fake'}))
+        self._set_rules(get_port='rule:admin_only')
+        policy.set_rules(self.rules)
+        self.assertFalse(policy.check(self.context, 'get_port',
+                                      {'tenant_id': 'fake'}))
+
+    def test_compiled_rules_follow_credential_changes(self):
+        self.assertFalse(policy.check(self.context, 'get_port',
+                                      {'tenant_id': 'other'}))
+        self.context.roles.append('advsvc')
+        self.assertTrue(policy.check(self.context, 'get_port',
+                                     {'tenant_id': 'other'}))
@@ -36,9 +36,10 @@ class TestRpcWorker(test_wsgi.TestServiceBase):
 class TestRunWsgiApp(base.BaseTestCase):
     def setUp(self):
         super(TestRunWsgiApp, self).setUp()
-        self.processor_count = mock.patch(
-            'oslo_concurrency.processutils.get_worker_count'
-        ).start().return_value
+        self.processor_count = 4
+        mock.patch('oslo_concurrency.processutils.get_worker_count',
+                   return_value=self.processor_count).start()
+        self.warm_up = mock.patch.object(service, '_warm_up_api').start()
 
     def _test_api_workers(self, config_value, expected_passed_value):
         if config_value is not None:
@@ -59,6 +60,19 @@ class TestRunWsgiApp(base.BaseTestCase):
     def test_api_workers_defined(self):
         self._test_api_workers(42, 42)
 
+    def test_api_warm_up_before_forking(self):
+        self._test_api_workers(42, 42)
+        self.warm_up.assert_called_once_with()
+
+    def test_api_warm_up_without_workers(self):
+        self._test_api_workers(0, 0)
+        self.assertFalse(self.warm_up.called)
+
+    def test_api_warm_up_disabled(self):
+        cfg.CONF.set_override('api_warm_up', False)
+        self._test_api_workers(42, 42)
+        self.assertFalse(self.warm_up.called)
+
     def test_start_all_workers(self):
         cfg.CONF.set_override('api_workers', 0)
         mock.patch.object(service, '_get_rpc_workers').start()
@@ -70,3 +84,18 @@ class TestRunWsgiApp(base.BaseTestCase):
         service.start_all_workers()
         callback.assert_called_once_with(
             resources.PROCESS, events.AFTER_SPAWN, mock.ANY)
+
+
+class TestWarmUpApi(base.BaseTestCase):
+
+    @mock.patch.object(service, '_freeze_gc')
+    @mock.patch.object(service, '_compile_body_validators')
+    @mock.patch.object(service.orm, 'configure_mappers')
+    @mock.patch.object(service.policy, 'init')
+    def test_warm_up_api(self, init, configure_mappers,
+                         compile_body_validators, freeze_gc):
+        service._warm_up_api()
+        init.assert_called_once_with()
+        configure_mappers.assert_called_once_with()
+        compile_body_validators.assert_called_once_with()
+        freeze_gc.assert_called_once_with()
@@ -20,6 +20,7 @@ import ssl
 import mock
 from neutron_lib import exceptions as exception
 from oslo_config import cfg
+from oslo_serialization import jsonutils
 import six.moves.urllib.request as urlrequest
 import testtools
 import webob
@@ -76,6 +77,14 @@ class TestWorkerService(TestServiceBase):
         workerservice.start()
         self.assertFalse(apimock.called)
 
+    @mock.patch.object(wsgi, 'LOG')
+    @mock.patch.object(wsgi.psutil, 'Process')
+    def test_start_logs_startup_time(self, process, log):
+        process.return_value.create_time.return_value = 0
+        workerservice = wsgi.WorkerService(mock.Mock(), mock.Mock())
+        workerservice.start()
+        self.assertGreater(log.info.call_args[0][1], 0)
+
     def test_reset(self):
         _service = mock.Mock()
         _app = mock.Mock()
@@ -536,6 +545,36 @@ class JSONDictSerializerTest(base.BaseTestCase):
 
         self.assertEqual(expected_json, result)
 
+    def test_json_streamed_collection(self):
+        input_dict = {'servers': wsgi.StreamedCollection(iter([1, 2]))}
+        serializer = wsgi.JSONDictSerializer()
+        self.assertEqual(b'{"servers": [1, 2]}',
+                         serializer.serialize(input_dict))
+
+    def test_serialize_chunks(self):
+        items = [{'id': i, 'name': u'\u7f51%d' % i} for i in range(100)]
+        serializer = wsgi.JSONDictSerializer()
+        expected = serializer.serialize({'servers': items, 'next': None})
+        streamed = {'servers': wsgi.StreamedCollection(iter(items)),
+                    'next': None}
+        self.assertTrue(wsgi.is_streamed(streamed))
+        self.assertFalse(wsgi.is_streamed({'servers': items}))
+        with mock.patch.object(serializer, 'CHUNK_SIZE', 100):
+            chunks = list(serializer.serialize_chunks(streamed))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(jsonutils.loads(expected),
+                         jsonutils.loads(b''.join(chunks)))
+
+    def test_serialize_chunks_is_lazy(self):
+        def items():
+            yield {'id': 1}
+            raise AssertionError('consumed too early')
+        serializer = wsgi.JSONDictSerializer()
+        chunks = serializer.serialize_chunks(
+            {'servers': wsgi.StreamedCollection(items())})
+        with mock.patch.object(serializer, 'CHUNK_SIZE', 1):
+            self.assertEqual(b'{', next(chunks))
+
 
 class TextDeserializerTest(base.BaseTestCase):
 
@@ -35,6 +35,7 @@ from oslo_service import systemd
 from oslo_service import wsgi
 from oslo_utils import encodeutils
 from oslo_utils import excutils
+import psutil
 import six
 import webob.dec
 import webob.exc
@@ -83,6 +84,8 @@ class WorkerService(neutron_worker.BaseWorker):
         self._server = self._service.pool.spawn(self._service._run,
                                                 self._application,
                                                 dup_sock)
+        LOG.info("API worker started %.3f seconds after its process "
+                 "was created", time.time() - psutil.Process().create_time())
 
     def wait(self):
         if isinstance(self._server, eventlet.greenthread.GreenThread):
@@ -303,13 +306,77 @@ class DictSerializer(ActionDispatcher):
         return ""
 
 
+class StreamedCollection(object):
+    """A collection to be serialized item by item as it is iterated.
+
+    It allows a controller to return the items of a collection lazily, so
+    that they never need to be all built and serialized in memory at once.
+    """
+
+    def __init__(self, items):
+        self._items = items
+
+    def __iter__(self):
+        return iter(self._items)
+
+
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
+    # Size of the chunks of a streamed body
+    CHUNK_SIZE = 64 * 1024
+
+    @staticmethod
+    def _sanitizer(obj):
+        if isinstance(obj, StreamedCollection):
+            return list(obj)
+        return six.text_type(obj)
+
     def default(self, data):
-        def sanitizer(obj):
-            return six.text_type(obj)
-        return encode_body(jsonutils.dumps(data, default=sanitizer))
+        return encode_body(jsonutils.dumps(data, default=self._sanitizer))
+
+    def serialize_chunks(self, data):
+        """Serialize the data dict, yielding the JSON body in chunks.
+
+        The StreamedCollection values of data are consumed and serialized
+        one item at a time, so the size of the chunks is bounded by the
+        size of the largest item rather than by the size of the data.
+        """
+        buf = []
+        size = 0
+        for part in self._iter_parts(data):
+            buf.append(part)
+            size += len(part)
+            if size >= self.CHUNK_SIZE:
+                yield encode_body(''.join(buf))
+                buf = []
+                size = 0
+        if buf:
+            yield encode_body(''.join(buf))
+
+    def _iter_parts(self, data):
+        yield '{'
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                yield ', '
+            yield jsonutils.dumps(key)
+            yield ': '
+            if not isinstance(value, StreamedCollection):
+                yield jsonutils.dumps(value, default=self._sanitizer)
+                continue
+            yield '['
+            for item_index, item in enumerate(value):
+                if item_index:
+                    yield ', '
+                yield jsonutils.dumps(item, default=self._sanitizer)
+            yield ']'
+        yield '}'
+
+
+def is_streamed(data):
+    """Whether a controller result holds a StreamedCollection."""
+    return isinstance(data, dict) and any(
+        isinstance(value, StreamedCollection) for value in data.values())
 
 
 class ResponseHeaderSerializer(ActionDispatcher):
@@ -0,0 +1,64 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally import consts
+from rally.plugins.openstack import scenario
+from rally.plugins.openstack.scenarios.neutron import utils
+from rally.task import atomic
+from rally.task import validation
+
+
+"""Scenarios for the QoS policy updates."""
+
+
+@validation.required_services(consts.Service.NEUTRON)
+@validation.required_openstack(users=True)
+@scenario.configure(context={"cleanup@openstack": ["neutron"]},
+                    name="NeutronQoS.update_policy_rules_of_ports")
+class QosPolicyUpdate(utils.NeutronScenario):
+
+    def run(self, port_count=50, max_kbps=1000, dscp_mark=16):
+        client = self.clients("neutron")
+        policy = client.create_qos_policy(
+            {'policy': {'name': self.generate_random_name()}})['policy']
+        bw_rule = client.create_bandwidth_limit_rule(
+            policy['id'], {'bandwidth_limit_rule': {
+                'max_kbps': max_kbps}})['bandwidth_limit_rule']
+        dscp_rule = client.create_dscp_marking_rule(
+            policy['id'], {'dscp_marking_rule': {
+                'dscp_mark': dscp_mark}})['dscp_marking_rule']
+        # the network policy applies to all the ports of the network
+        net = self._create_network({'qos_policy_id': policy['id']})
+        self._create_subnet(net, {'cidr': '10.0.0.0/8'})
+        for i in range(port_count):
+            self._create_port(net, {})
+        # only the DSCP marking of the ports changes
+        self._update_dscp_marking_rule(dscp_rule['id'], policy['id'],
+                                       dscp_mark + 8)
+        self._update_bandwidth_limit_rule(bw_rule['id'], policy['id'],
+                                          max_kbps * 2)
+        client.update_network(net['network']['id'],
+                              {'network': {'qos_policy_id': None}})
+        client.delete_qos_policy(policy['id'])
+
+    @atomic.action_timer("neutron.update_dscp_marking_rule")
+    def _update_dscp_marking_rule(self, rule_id, policy_id, dscp_mark):
+        self.clients("neutron").update_dscp_marking_rule(
+            rule_id, policy_id,
+            {'dscp_marking_rule': {'dscp_mark': dscp_mark}})
+
+    @atomic.action_timer("neutron.update_bandwidth_limit_rule")
+    def _update_bandwidth_limit_rule(self, rule_id, policy_id, max_kbps):
+        self.clients("neutron").update_bandwidth_limit_rule(
+            rule_id, policy_id,
+            {'bandwidth_limit_rule': {'max_kbps': max_kbps}})
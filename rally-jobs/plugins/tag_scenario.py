@@ -0,0 +1,49 @@
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally import consts
+from rally.plugins.openstack import scenario
+from rally.plugins.openstack.scenarios.neutron import utils
+from rally.task import atomic
+from rally.task import validation
+
+
+"""Scenarios for the tag filters."""
+
+
+@validation.required_services(consts.Service.NEUTRON)
+@validation.required_openstack(users=True)
+@scenario.configure(context={"cleanup@openstack": ["neutron"]},
+                    name="NeutronTags.create_and_list_ports_by_tag")
+class TagFilters(utils.NeutronScenario):
+
+    def run(self, port_count=50, tags=("red", "blue", "green")):
+        net = self._create_network({})
+        self._create_subnet(net, {'cidr': '10.0.0.0/8'})
+        for i in range(port_count):
+            port = self._create_port(net, {})
+            # every port gets a growing prefix of the tags
+            self._replace_tags(port['port']['id'],
+                               list(tags[:i % (len(tags) + 1)]))
+        self._list_ports_by_tags(tags=tags[0])
+        self._list_ports_by_tags(tags=','.join(tags))
+        self._list_ports_by_tags(**{'tags-any': ','.join(tags)})
+        self._list_ports_by_tags(**{'not-tags': ','.join(tags)})
+
+    @atomic.action_timer("neutron.replace_tags")
+    def _replace_tags(self, port_id, tags):
+        self.clients("neutron").replace_tag('ports', port_id, {'tags': tags})
+
+    @atomic.optional_action_timer("neutron.list_ports_by_tags")
+    def _list_ports_by_tags(self, **kwargs):
+        return self.clients("neutron").list_ports(**kwargs)["ports"]